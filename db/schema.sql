@@ -152,7 +152,8 @@ CREATE TABLE IF NOT EXISTS sources (
 
   company_id BIGINT REFERENCES companies(id) ON DELETE CASCADE,
   source_url TEXT NOT NULL,                   -- canonical URL of the page
-  html TEXT,                                  -- raw HTML body
+  html TEXT,                                  -- raw HTML body (legacy; NULL when in page_blobs)
+  html_sha256 TEXT,                           -- page_blobs.sha256 of the body
   fetched_at TEXT DEFAULT CURRENT_TIMESTAMP    -- when this page was fetched
 );
 
@@ -171,6 +172,32 @@ CREATE INDEX IF NOT EXISTS idx_sources_tenant_source_url
 CREATE INDEX IF NOT EXISTS idx_sources_tenant_run_id
   ON sources(tenant_id, run_id);
 
+CREATE INDEX IF NOT EXISTS idx_sources_html_sha256
+  ON sources(html_sha256);
+
+-- Content-addressed page bodies (src/page_store.py): one compressed blob per
+-- distinct HTML, shared by every sources row with that content.
+CREATE TABLE IF NOT EXISTS page_blobs (
+  sha256 TEXT PRIMARY KEY,                    -- hex SHA-256 of the raw UTF-8 HTML
+  codec TEXT NOT NULL,                        -- zstd | gzip | raw
+  raw_size INTEGER NOT NULL,
+  stored_size INTEGER NOT NULL,
+  body BYTEA NOT NULL,
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP
+);
+
+-- Per-page extraction cache (src/extract/extraction_cache.py): final
+-- candidates a page yielded, keyed by its content hash, extractor version and
+-- the company it was extracted for, so re-runs only extract new or changed pages.
+CREATE TABLE IF NOT EXISTS page_extractions (
+  content_sha256 TEXT NOT NULL,               -- page_blobs.sha256 / SHA-256 of the HTML
+  extractor_version TEXT NOT NULL,
+  scope TEXT NOT NULL,                        -- company domain (+ name in AI mode)
+  candidates_json TEXT NOT NULL,              -- {"role": [...], "people": [...]}
+  created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (content_sha256, extractor_version, scope)
+);
+
 -- ---------------------------------------------------------------------------
 -- people
 -- ---------------------------------------------------------------------------
@@ -380,28 +407,64 @@ CREATE INDEX IF NOT EXISTS idx_domain_resolutions_company_id
 CREATE INDEX IF NOT EXISTS idx_domain_resolutions_tenant_company_id
   ON domain_resolutions(tenant_id, company_id);
 
+-- Domain-keyed MX cache (src/resolve/mx.py): MX answers shared by every
+-- company/tenant, valid until expires_at (DNS TTL; negative answers included).
+CREATE TABLE IF NOT EXISTS mx_cache (
+  domain         TEXT PRIMARY KEY,             -- norm_domain() (punycode)
+  mx_hosts       TEXT NOT NULL,                -- JSON list, preference order
+  preference_map TEXT NOT NULL,                -- JSON {host: preference}
+  lowest_mx      TEXT,
+  failure        TEXT,                         -- "null_mx" / NXDOMAIN / NoAnswer
+  resolved_at    TEXT NOT NULL,
+  expires_at     DOUBLE PRECISION NOT NULL     -- epoch seconds
+);
+
+-- ---------------------------------------------------------------------------
+-- emails_latest: maintained pointer to the latest verification result per email
+--   Kept up to date by src.db.upsert_verification_result (refresh_email_latest).
+--   Deleting some of an email's results cascades its row away: follow such
+--   deletes with src.db.refresh_emails_latest_for to re-point the email.
+--   Latest = COALESCE(verified_at, checked_at) DESC (NULLs first), then id DESC.
+--   Rebuild / consistency check: python -m scripts.emails_latest {rebuild,check}
+-- ---------------------------------------------------------------------------
+
+CREATE TABLE IF NOT EXISTS emails_latest (
+  tenant_id TEXT NOT NULL REFERENCES tenants(id) ON DELETE CASCADE,
+  email_id BIGINT NOT NULL REFERENCES emails(id) ON DELETE CASCADE,
+  verification_result_id BIGINT NOT NULL
+    REFERENCES verification_results(id) ON DELETE CASCADE,
+  updated_at TEXT DEFAULT CURRENT_TIMESTAMP,
+  PRIMARY KEY (tenant_id, email_id)
+);
+
+CREATE INDEX IF NOT EXISTS idx_emails_latest_vr
+  ON emails_latest(verification_result_id);
+
+-- One-time backfill for databases that predate emails_latest (no-op once populated).
+INSERT INTO emails_latest (tenant_id, email_id, verification_result_id)
+SELECT DISTINCT ON (vr.tenant_id, vr.email_id)
+  vr.tenant_id,
+  vr.email_id,
+  vr.id
+FROM verification_results AS vr
+WHERE NOT EXISTS (SELECT 1 FROM emails_latest)
+ORDER BY
+  vr.tenant_id,
+  vr.email_id,
+  COALESCE(vr.verified_at, vr.checked_at) DESC,
+  vr.id DESC;
+
 -- ---------------------------------------------------------------------------
 -- View: v_emails_latest
 --   Latest verification result per email, joined to people/companies.
 --   Exposes R18 canonical verify_status/verify_reason/verified_at.
---   Uses DISTINCT ON to guarantee exactly one verification row per (tenant_id,email_id).
+--   Compatibility shim over emails_latest: exactly one verification row per
+--   (tenant_id,email_id) via primary-key joins instead of a DISTINCT ON scan.
 -- ---------------------------------------------------------------------------
 
 DROP VIEW IF EXISTS v_emails_latest;
 
 CREATE VIEW v_emails_latest AS
-WITH latest_verification AS (
-  SELECT DISTINCT ON (vr.tenant_id, vr.email_id)
-    vr.tenant_id,
-    vr.email_id,
-    vr.id AS verification_result_id
-  FROM verification_results AS vr
-  ORDER BY
-    vr.tenant_id,
-    vr.email_id,
-    COALESCE(vr.verified_at, vr.checked_at) DESC,
-    vr.id DESC
-)
 SELECT
   e.tenant_id   AS tenant_id,
   e.id          AS email_id,
@@ -456,7 +519,7 @@ LEFT JOIN people AS p
   ON p.id = e.person_id AND p.tenant_id = e.tenant_id
 LEFT JOIN companies AS c
   ON c.id = e.company_id AND c.tenant_id = e.tenant_id
-LEFT JOIN latest_verification AS lv
+LEFT JOIN emails_latest AS lv
   ON lv.email_id = e.id AND lv.tenant_id = e.tenant_id
 LEFT JOIN verification_results AS vr
   ON vr.id = lv.verification_result_id AND vr.tenant_id = e.tenant_id;
@@ -339,6 +339,7 @@ def _print_summary(conn) -> None:
         "people",
         "emails",
         "verification_results",
+        "emails_latest",
     ):
         exists = "yes" if _object_exists(conn, t, "table") else "no"
         print(f"Â· {t:24} exists: {exists}")
@@ -426,6 +427,11 @@ def main(argv: Iterable[str] | str | None = None) -> int:
         _verify_postgres(conn)
         _print_summary(conn)
 
+    # Workers cache the catalog (src.db.schema_registry); make them all reload it.
+    from src.db import invalidate_schema_cache  # type: ignore
+
+    invalidate_schema_cache()
+
     print(f"âœ” Schema applied; migrations applied this run: {applied_now}")
     return 0
 
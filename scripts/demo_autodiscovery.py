@@ -51,6 +51,7 @@ import httpx
 from bs4 import BeautifulSoup, Tag  # noqa: F401
 
 import src.extract.candidates as _extract_mod  # noqa: F401
+from src import page_store
 from src.autodiscovery_result import AutodiscoveryResult
 from src.crawl.runner import Page, crawl_domain
 from src.db import get_conn, upsert_generated_email  # noqa: F401
@@ -800,20 +801,32 @@ def _iter_sources_for_company(
             return row[idx]
         return row.get(key, row[idx]) if hasattr(row, "get") else row[idx]
 
+    def _html(row: Any) -> Any:
+        return page_store.row_html(
+            _get_row_val(row, 1, "html"),
+            _get_row_val(row, 2, "html_codec"),
+            _get_row_val(row, 3, "html_body"),
+            lazy=False,
+        )
+
+    html_cols, html_join = page_store.html_select(conn, "s")
     if "company_id" in cols:
         cur = conn.execute(
-            "SELECT source_url, html FROM sources WHERE company_id = ? ORDER BY id ASC",
+            f"SELECT s.source_url, {html_cols} FROM sources AS s{html_join} "
+            "WHERE s.company_id = ? ORDER BY s.id ASC",
             (company_id,),
         )
         for row in cur.fetchall():
-            yield _get_row_val(row, 0, "source_url"), _get_row_val(row, 1, "html")
+            yield _get_row_val(row, 0, "source_url"), _html(row)
         return
 
     # Fallback: no company_id column; filter by host/domain in Python.
-    cur = conn.execute("SELECT source_url, html FROM sources ORDER BY id ASC")
+    cur = conn.execute(
+        f"SELECT s.source_url, {html_cols} FROM sources AS s{html_join} ORDER BY s.id ASC"
+    )
     for row in cur.fetchall():
         url = _get_row_val(row, 0, "source_url")
-        html = _get_row_val(row, 1, "html")
+        html = _html(row)
         try:
             host = (urlparse(url).netloc or "").lower()
         except Exception:
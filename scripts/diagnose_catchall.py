@@ -279,7 +279,7 @@ def _step7_fix_stubs(conn) -> None:
     print("\n[7] Fixing stub verifications (deleting so they can be re-verified)...")
     try:
         result = conn.execute("""
-            SELECT vr.id, vr.email_id
+            SELECT vr.id, vr.email_id, vr.tenant_id
             FROM verification_results vr
             WHERE vr.verify_reason IN ('stub', 'stub_not_verified')
         """)
@@ -299,6 +299,10 @@ def _step7_fix_stubs(conn) -> None:
         """,
             tuple(vr_ids),
         )
+        # The cascade drops emails_latest pointers even where older results remain.
+        from src.db import refresh_emails_latest_for
+
+        refresh_emails_latest_for(conn, [(row[2], row[1]) for row in rows if row[1]])
         conn.commit()
         print(f"    Deleted {len(vr_ids)} stub verification results")
 
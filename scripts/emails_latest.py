@@ -0,0 +1,65 @@
+# scripts/emails_latest.py
+"""
+Maintain the emails_latest table behind v_emails_latest.
+
+  python -m scripts.emails_latest rebuild [--tenant-id T]
+  python -m scripts.emails_latest check [--tenant-id T] [--json]
+
+`rebuild` recomputes the latest-verification pointers from verification_results.
+`check` reports missing/stale/extra pointers and exits 1 if any are found.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+from contextlib import closing
+
+from src.db import check_emails_latest, get_conn, rebuild_emails_latest  # type: ignore[import]
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Rebuild or check the emails_latest table.")
+    parser.add_argument("command", choices=["rebuild", "check"])
+    parser.add_argument(
+        "--tenant-id",
+        dest="tenant_id",
+        default=None,
+        help="Optional tenant_id to scope the command to one tenant. Default: all tenants.",
+    )
+    parser.add_argument(
+        "--dsn",
+        dest="dsn",
+        default=None,
+        help="Optional Postgres DSN/URL override. If provided, sets DATABASE_URL for this run.",
+    )
+    parser.add_argument("--json", action="store_true", help="check: print the full report as JSON.")
+    args = parser.parse_args(argv)
+
+    if args.dsn:
+        os.environ["DATABASE_URL"] = args.dsn
+
+    with closing(get_conn()) as conn:
+        if args.command == "rebuild":
+            n = rebuild_emails_latest(conn, tenant_id=args.tenant_id)
+            conn.commit()
+            print(f"[emails_latest] Rebuilt {n} rows.")
+            return 0
+
+        report = check_emails_latest(conn, tenant_id=args.tenant_id)
+
+    if args.json:
+        print(json.dumps(report, indent=2, default=str))
+    else:
+        print("[emails_latest] missing={missing} stale={stale} extra={extra}".format(**report))
+        for s in report["samples"]:
+            print(f"  - {s}")
+    if not report["ok"]:
+        print("[emails_latest] Inconsistent; run `python -m scripts.emails_latest rebuild`.")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -39,6 +39,7 @@ if str(_REPO_ROOT) not in sys.path:
     sys.path.insert(0, str(_REPO_ROOT))
 
 import src.extract.candidates as _extract_mod  # noqa: E402
+from src import page_store  # noqa: E402
 from src.emails.classify import is_role_or_placeholder_email  # noqa: E402
 from src.extract import Candidate, extract_candidates  # noqa: E402
 from src.extract.url_filters import is_people_page_url
@@ -133,15 +134,16 @@ def _select_sources_by_domain(con: sqlite3.Connection, domain: str) -> list[sqli
     source_cols = _table_columns(con, "sources")
     has_company_id = "company_id" in source_cols
 
+    html_cols, html_join = page_store.html_select(con, "s")
     if has_company_id:
-        select_cols = "id, company_id, source_url, html"
+        select_cols = f"s.id, s.company_id, s.source_url, {html_cols}"
     else:
         # project a NULL company_id column so row['company_id'] works
-        select_cols = "id, NULL AS company_id, source_url, html"
+        select_cols = f"s.id, NULL AS company_id, s.source_url, {html_cols}"
 
     # Build OR chain
-    ors = " OR ".join(["source_url LIKE ?"] * len(patterns))
-    sql = f"SELECT {select_cols} FROM sources WHERE {ors}"
+    ors = " OR ".join(["s.source_url LIKE ?"] * len(patterns))
+    sql = f"SELECT {select_cols} FROM sources AS s{html_join} WHERE {ors}"
     cur = con.execute(sql, patterns)
     return cur.fetchall()
 
@@ -155,13 +157,14 @@ def _select_source_by_url(con: sqlite3.Connection, url: str) -> list[sqlite3.Row
     source_cols = _table_columns(con, "sources")
     has_company_id = "company_id" in source_cols
 
+    html_cols, html_join = page_store.html_select(con, "s")
     if has_company_id:
-        select_cols = "id, company_id, source_url, html"
+        select_cols = f"s.id, s.company_id, s.source_url, {html_cols}"
     else:
-        select_cols = "id, NULL AS company_id, source_url, html"
+        select_cols = f"s.id, NULL AS company_id, s.source_url, {html_cols}"
 
     cur = con.execute(
-        f"SELECT {select_cols} FROM sources WHERE source_url = ? LIMIT 1",
+        f"SELECT {select_cols} FROM sources AS s{html_join} WHERE s.source_url = ? LIMIT 1",
         (url,),
     )
     return cur.fetchall()
@@ -661,7 +664,9 @@ def main(argv: Sequence[str] | None = None) -> int:
 
     for row in src_rows:
         source_url = row["source_url"]
-        html = row["html"] or ""
+        html = (
+            page_store.row_html(row["html"], row["html_codec"], row["html_body"], lazy=False) or ""
+        )
         company_id = row["company_id"]
 
         cands = extract_candidates(
@@ -29,6 +29,7 @@ import sqlite3
 from pathlib import Path
 from typing import Any
 
+from src import page_store
 from src.extract.ai_candidates import AI_PEOPLE_ENABLED, extract_ai_candidates
 
 
@@ -50,15 +51,16 @@ def _load_source_row(db_path: str, source_id: int) -> sqlite3.Row | None:
     con = sqlite3.connect(db_path)
     con.row_factory = sqlite3.Row
     try:
+        html_cols, html_join = page_store.html_select(con, "s")
         row = con.execute(
-            """
+            f"""
             SELECT
               s.id,
               s.company_id,
               s.source_url,
-              s.html,
+              {html_cols},
               COALESCE(c.official_domain, c.domain) AS domain
-            FROM sources AS s
+            FROM sources AS s{html_join}
             LEFT JOIN companies AS c
               ON c.id = s.company_id
             WHERE s.id = ?
@@ -101,7 +103,9 @@ def main() -> None:
         print(f"source id={args.source_id} not found in {db_path}")
         return
 
-    html_str = _decode_html(row["html"])
+    html_str = _decode_html(
+        page_store.row_html(row["html"], row["html_codec"], row["html_body"], lazy=False)
+    )
     source_url = row["source_url"] or ""
     domain = row["domain"] or ""
 
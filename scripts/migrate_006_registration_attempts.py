@@ -38,7 +38,7 @@ CREATE INDEX IF NOT EXISTS idx_users_email_verified
 
 
 def main() -> int:
-    from src.db import get_conn
+    from src.db import get_conn, invalidate_schema_cache
 
     conn = get_conn()
     try:
@@ -50,6 +50,7 @@ def main() -> int:
             conn.execute(stmt + ";")
 
         conn.commit()
+        invalidate_schema_cache()
         logger.info("Migration 006 complete: registration_attempts table created")
         return 0
     except Exception as e:
@@ -35,7 +35,7 @@ def main() -> None:
 
     sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
 
-    from src.db import get_conn
+    from src.db import get_conn, invalidate_schema_cache
 
     con = get_conn()
 
@@ -71,6 +71,7 @@ def main() -> None:
             (dev_tenant, old_tenant),
         )
         con.commit()
+        invalidate_schema_cache()
         print(f"Updated {count} user(s) to tenant_id='{dev_tenant}'.")
 
     finally:
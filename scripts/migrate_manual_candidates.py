@@ -64,7 +64,7 @@ def run() -> None:
     if os.path.isdir("src") and "src" not in sys.path:
         sys.path.insert(0, ".")
 
-    from src.db import get_conn
+    from src.db import get_conn, invalidate_schema_cache
 
     con = get_conn()
     try:
@@ -73,6 +73,7 @@ def run() -> None:
             if stmt and not stmt.startswith("--"):
                 con.execute(stmt)
         con.commit()
+        invalidate_schema_cache()
         log.info("manual_candidate_attempts table created (or already exists).")
     except Exception:
         log.exception("Migration failed")
@@ -24,7 +24,7 @@ import os
 import sys
 from typing import Any
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 
 def apply_dsn_override(dsn: str | None) -> None:
@@ -128,6 +128,7 @@ def main() -> None:
             except Exception:
                 pass
         conn.commit()
+        invalidate_schema_cache()
     except Exception:
         try:
             conn.rollback()
@@ -5,7 +5,7 @@ import argparse
 import os
 import sys
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 UTC_NOW_TEXT_SQL = "to_char((now() at time zone 'utc'), 'YYYY-MM-DD HH24:MI:SS')"
 
@@ -59,6 +59,7 @@ def main() -> None:
             except Exception:
                 pass
         conn.commit()
+        invalidate_schema_cache()
     except Exception:
         try:
             conn.rollback()
@@ -6,7 +6,7 @@ import os
 import sys
 from typing import Any
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 
 def _apply_dsn_override(dsn: str | None) -> None:
@@ -160,6 +160,7 @@ def main() -> None:
             conn.rollback()
         else:
             conn.commit()
+            invalidate_schema_cache()
     except Exception:
         try:
             conn.rollback()
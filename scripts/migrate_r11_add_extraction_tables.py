@@ -5,7 +5,7 @@ import os
 import sys
 from typing import Any
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 
 def _apply_dsn_override(dsn: str | None) -> None:
@@ -71,6 +71,7 @@ def migrate(*, schema: str) -> None:
             except Exception:
                 pass
         conn.commit()
+        invalidate_schema_cache()
         print(f"Migration complete. Ensured people/emails/email_provenance in schema={schema}")
     except Exception:
         try:
@@ -31,7 +31,7 @@ import sys
 from collections.abc import Iterable
 from typing import Any
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 REQUIRED_COLUMNS: tuple[tuple[str, str, str | None], ...] = (
     # (name, type, default_sql)
@@ -175,6 +175,7 @@ def run(*, schema: str) -> None:
             ensure_indices(cur, schema=schema)
 
             conn.commit()
+            invalidate_schema_cache()
 
             print("✔ R15 migration completed.")
             print_status(cur, schema=schema)
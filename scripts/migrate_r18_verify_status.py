@@ -25,7 +25,7 @@ import os
 import sys
 from typing import Any
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 
 def _apply_dsn_override(dsn: str | None) -> None:
@@ -149,6 +149,7 @@ def main(argv: list[str] | None = None) -> None:
             except Exception:
                 pass
         conn.commit()
+        invalidate_schema_cache()
         print("✔ R18 migration complete.")
     except Exception:
         try:
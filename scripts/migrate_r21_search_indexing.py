@@ -22,7 +22,7 @@ import os
 import sys
 from typing import Any
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 
 def _apply_dsn_override(dsn: str | None) -> None:
@@ -447,6 +447,7 @@ def run_migration(dsn: str | None, *, schema: str) -> None:
                 pass
 
         conn.commit()
+        invalidate_schema_cache()
         print("✔ R21 search indexing migration applied successfully.")
     except Exception:
         try:
@@ -20,7 +20,7 @@ import sys
 from typing import Any
 from urllib.parse import urlparse
 
-from src.db import get_conn
+from src.db import get_conn, invalidate_schema_cache
 
 
 def _apply_dsn_override(dsn: str | None) -> None:
@@ -316,6 +316,7 @@ def main(argv: list[str] | None = None) -> None:
                 pass
 
         conn.commit()
+        invalidate_schema_cache()
         print(f"Migration completed successfully. Updated={updated}, skipped={skipped}.")
     except Exception:
         try:
@@ -0,0 +1,188 @@
+# scripts/migrate_r27_page_store.py
+"""
+R27 migration — content-addressed page store for sources HTML.
+
+Subcommands:
+  migrate   create page_blobs, add sources.html_sha256 (+ index), relax
+            NOT NULL on sources.html (legacy R10 schema). Idempotent.
+  backfill  move inline sources.html into compressed page_blobs, in batches
+            (each batch commits, so it can be interrupted and re-run).
+  gc        delete page_blobs no sources row references.
+  stats     blob count and raw vs stored bytes.
+
+Connects via src.db.get_conn() (DATABASE_URL / PG_DSN).
+
+Usage:
+  python scripts/migrate_r27_page_store.py migrate
+  python scripts/migrate_r27_page_store.py backfill --batch-size 500
+  python scripts/migrate_r27_page_store.py gc --dry-run
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import sys
+from typing import Any
+
+from src import page_store
+from src.db import get_conn, invalidate_schema_cache
+
+
+def _apply_dsn_override(dsn: str | None) -> None:
+    if not dsn:
+        return
+    os.environ["DATABASE_URL"] = dsn
+    os.environ["PG_DSN"] = dsn
+
+
+def _qi(ident: str) -> str:
+    return '"' + ident.replace('"', '""') + '"'
+
+
+def _table_exists(cur: Any, *, schema: str, table: str) -> bool:
+    cur.execute("SELECT to_regclass(%s)", (f"{schema}.{table}",))
+    row = cur.fetchone()
+    return row is not None and row[0] is not None
+
+
+def _column_nullable(cur: Any, *, schema: str, table: str, column: str) -> bool | None:
+    """True/False for an existing column's nullability; None if it does not exist."""
+    cur.execute(
+        """
+        SELECT is_nullable
+          FROM information_schema.columns
+         WHERE table_schema = %s
+           AND table_name = %s
+           AND column_name = %s
+         LIMIT 1
+        """,
+        (schema, table, column),
+    )
+    row = cur.fetchone()
+    if row is None:
+        return None
+    return str(row[0]).upper() == "YES"
+
+
+def ensure_page_store(cur: Any, *, schema: str) -> None:
+    if not _table_exists(cur, schema=schema, table="sources"):
+        raise SystemExit(
+            f'Table "{schema}.sources" not found. Run the R10 migration '
+            "(migrate_r10_add_sources.py) first."
+        )
+    sources = f"{_qi(schema)}.{_qi('sources')}"
+    blobs = f"{_qi(schema)}.{_qi('page_blobs')}"
+
+    cur.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {blobs} (
+          sha256 TEXT PRIMARY KEY,
+          codec TEXT NOT NULL,
+          raw_size INTEGER NOT NULL,
+          stored_size INTEGER NOT NULL,
+          body BYTEA NOT NULL,
+          created_at TEXT DEFAULT CURRENT_TIMESTAMP
+        )
+        """.strip()
+    )
+    print("page_blobs ensured.")
+
+    if _column_nullable(cur, schema=schema, table="sources", column="html_sha256") is None:
+        cur.execute(f"ALTER TABLE {sources} ADD COLUMN html_sha256 TEXT")
+        print("sources.html_sha256 added.")
+    else:
+        print("sources.html_sha256 already exists; skipping ALTER TABLE.")
+
+    cur.execute(f"CREATE INDEX IF NOT EXISTS idx_sources_html_sha256 ON {sources}(html_sha256)")
+
+    # R10 created html as NOT NULL; rows in the store keep it NULL.
+    if _column_nullable(cur, schema=schema, table="sources", column="html") is False:
+        cur.execute(f"ALTER TABLE {sources} ALTER COLUMN html DROP NOT NULL")
+        print("sources.html NOT NULL dropped.")
+
+
+def _run(args: argparse.Namespace) -> None:
+    conn = get_conn()
+    try:
+        if args.command == "migrate":
+            cur = conn.cursor()
+            try:
+                ensure_page_store(cur, schema=args.schema)
+            finally:
+                try:
+                    cur.close()
+                except Exception:
+                    pass
+            conn.commit()
+            invalidate_schema_cache()
+            print("Migration completed successfully.")
+            return
+
+        if not page_store.store_enabled(conn):
+            raise SystemExit("Page store schema not found; run the 'migrate' subcommand first.")
+
+        if args.command == "backfill":
+            moved = page_store.backfill(conn, batch_size=args.batch_size, limit=args.limit)
+            print(f"Backfill complete: {moved} sources rows moved to page_blobs.")
+        elif args.command == "gc":
+            n = page_store.gc_unreferenced(conn, dry_run=args.dry_run)
+            conn.commit()
+            verb = "would delete" if args.dry_run else "deleted"
+            print(f"GC: {verb} {n} unreferenced page blobs.")
+
+        st = page_store.stats(conn)
+        ratio = (st["stored_bytes"] / st["raw_bytes"]) if st["raw_bytes"] else 0.0
+        print(
+            f"page_blobs: {st['blobs']} blobs, {st['raw_bytes']} raw bytes, "
+            f"{st['stored_bytes']} stored bytes (ratio {ratio:.3f})."
+        )
+    except Exception:
+        try:
+            conn.rollback()
+        except Exception:
+            pass
+        raise
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(
+        description="R27: content-addressed, compressed page store for sources HTML."
+    )
+    parser.add_argument(
+        "--dsn",
+        "--db",
+        dest="dsn",
+        default=None,
+        help="Postgres DSN/URL override (otherwise uses env DATABASE_URL/PG_DSN).",
+    )
+    parser.add_argument(
+        "--schema",
+        default=os.getenv("PGSCHEMA", "public"),
+        help="Target Postgres schema for 'migrate' (default: public, or PGSCHEMA env var).",
+    )
+    sub = parser.add_subparsers(dest="command", required=True)
+    sub.add_parser("migrate", help="Create page_blobs and sources.html_sha256.")
+    p_backfill = sub.add_parser("backfill", help="Move inline sources.html into page_blobs.")
+    p_backfill.add_argument("--batch-size", type=int, default=200)
+    p_backfill.add_argument("--limit", type=int, default=None, help="Stop after N rows.")
+    p_gc = sub.add_parser("gc", help="Delete unreferenced page blobs.")
+    p_gc.add_argument("--dry-run", action="store_true", help="Only count what would go.")
+    sub.add_parser("stats", help="Print page_blobs size stats.")
+
+    args = parser.parse_args(argv)
+    _apply_dsn_override(args.dsn)
+    _run(args)
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except Exception as e:
+        print(f"ERROR: {e}", file=sys.stderr)
+        raise
@@ -53,7 +53,7 @@ TEST_QUEUE = os.environ["QUEUE_NAME"]
 
 # Import after env is set so the code reads these values
 from src.queueing import tasks  # noqa: E402
-from src.queueing.rate_limit import RPS_KEY_GLOBAL, can_consume_rps  # noqa: E402
+from src.queueing.rate_limit import acquire  # noqa: E402
 from src.queueing.redis_conn import get_redis  # noqa: E402
 
 r: Redis = get_redis()
@@ -216,8 +216,8 @@ def main() -> None:
         a_ok = False
         problems.append("DLQ/Failed registry is empty; expected at least 1 failed job.")
 
-    # -------- Phase B: RPS primitive (unit) ----------
-    # Enable a tiny window and call the primitive multiple times within one second
+    # -------- Phase B: RPS token bucket (unit) ----------
+    # Rate 2/s with burst 2: a tight loop of 5 calls admits at most 2 in one second
     os.environ["GLOBAL_RPS"] = "2"
 
     samples: list[tuple[bool, int]] = []
@@ -229,7 +229,7 @@ def main() -> None:
 
     for _ in range(5):
         # allow at most 2 in the current second
-        ok = can_consume_rps(r, RPS_KEY_GLOBAL, 2)
+        ok = acquire(r, buckets=((k("tb:rps"), 2, 2, "rps"),)).ok
         samples.append((ok, int(time.time())))
         # tight loop within same second
 
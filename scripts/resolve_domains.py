@@ -3,6 +3,11 @@
 """
 Resolve official domains for companies (manual/backlog runs).
 
+Companies are resolved --batch-size at a time through
+src.resolve.domain.resolve_many(), which dedupes candidate hosts across the
+batch and probes them concurrently; each decision is then persisted exactly
+like the resolve_company_domain task does.
+
 This script is PostgreSQL-native and uses src.db.get_conn() for database access.
 The CompatConnection layer handles SQL translation automatically.
 """
@@ -216,6 +221,12 @@ def main() -> int:
         action="store_true",
         help="Process all rows (ignore unresolved filter).",
     )
+    ap.add_argument(
+        "--batch-size",
+        type=int,
+        default=200,
+        help="Companies resolved together per resolve_many() batch.",
+    )
     ap.add_argument(
         "--dry-run",
         action="store_true",
@@ -227,8 +238,9 @@ def main() -> int:
     if args.db_url:
         os.environ["DATABASE_URL"] = args.db_url
 
-    # Import after env is set so the task's get_conn() picks the right DB.
-    from src.queueing.tasks import resolve_company_domain
+    # Import after env is set so the task helpers' get_conn() picks the right DB.
+    from src.queueing.tasks import record_domain_decision
+    from src.resolve.domain import resolve, resolve_many
 
     with get_conn() as conn:
         rows = _iter_targets(conn, args.limit, only_missing=(not args.all))
@@ -236,42 +248,68 @@ def main() -> int:
             print("[]")
             return 0
 
+        targets: list[tuple[Any, Any, Any]] = []
         for r in rows:
             # Handle both tuple and dict-like row access
             if isinstance(r, tuple):
-                cid, name, hint = r[0], r[1], r[2]
+                targets.append((r[0], r[1], r[2]))
             else:
-                cid = r.get("id", r[0])
-                name = r.get("name", r[1])
-                hint = r.get("user_supplied_domain", r[2])
-
-            try:
-                if args.dry_run:
-                    res = {
-                        "company_id": cid,
-                        "chosen": None,
-                        "method": "dry_run",
-                        "confidence": 0,
-                    }
-                else:
-                    res = resolve_company_domain(cid, name, hint)
-
-                # Emit a compact JSON line for every processed company
-                print(json.dumps(res, separators=(",", ":")), flush=True)
-
-                # Best-effort audit write (idempotent) for real runs
-                if not args.dry_run and isinstance(res, dict):
-                    _audit_resolution(
-                        conn=conn,
-                        company_id=cid,
-                        company_name=name,
-                        domain=res.get("chosen"),
-                        confidence=res.get("confidence"),
-                        method=res.get("method"),
+                targets.append(
+                    (
+                        r.get("id", r[0]),
+                        r.get("name", r[1]),
+                        r.get("user_supplied_domain", r[2]),
                     )
-            except Exception as e:  # pylint: disable=broad-except
-                err = {"company_id": cid, "error": type(e).__name__, "message": str(e)}
-                print(json.dumps(err, separators=(",", ":")), file=sys.stderr, flush=True)
+                )
+
+        step = max(1, int(args.batch_size))
+        for start in range(0, len(targets), step):
+            batch = targets[start : start + step]
+            decisions: list[Any] = [None] * len(batch)
+            if not args.dry_run:
+                try:
+                    decisions = resolve_many((name or "", hint) for _cid, name, hint in batch)
+                except Exception as e:  # pylint: disable=broad-except
+                    # Resolve this batch one company at a time instead
+                    print(
+                        json.dumps(
+                            {"batch_start": start, "error": type(e).__name__, "message": str(e)},
+                            separators=(",", ":"),
+                        ),
+                        file=sys.stderr,
+                        flush=True,
+                    )
+
+            for (cid, name, hint), dec in zip(batch, decisions, strict=True):
+                try:
+                    if not args.dry_run and dec is None:
+                        dec = resolve(name or "", hint)
+                    if args.dry_run:
+                        res = {
+                            "company_id": cid,
+                            "chosen": None,
+                            "method": "dry_run",
+                            "confidence": 0,
+                        }
+                    else:
+                        res = record_domain_decision(cid, name, hint, dec)
+
+                    # Emit a compact JSON line for every processed company
+                    print(json.dumps(res, separators=(",", ":")), flush=True)
+
+                    # Best-effort audit write (idempotent) for real runs
+                    if not args.dry_run and isinstance(res, dict):
+                        _audit_resolution(
+                            conn=conn,
+                            company_id=cid,
+                            company_name=name,
+                            domain=res.get("chosen"),
+                            confidence=res.get("confidence"),
+                            method=res.get("method"),
+                        )
+                except Exception as e:  # pylint: disable=broad-except
+                    err = {"company_id": cid, "error": type(e).__name__, "message": str(e)}
+                    print(json.dumps(err, separators=(",", ":")), file=sys.stderr, flush=True)
 
     return 0
 
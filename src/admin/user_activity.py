@@ -21,7 +21,7 @@ from dataclasses import dataclass
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from src.db import get_conn
+from src.db import cached_schema, get_conn
 
 log = logging.getLogger(__name__)
 
@@ -107,6 +107,9 @@ def _utc_now_iso() -> str:
 
 def _table_exists(conn, table: str) -> bool:
     """Check if a table exists."""
+    snap = cached_schema(conn)
+    if snap is not None:
+        return table in snap.tables
     try:
         conn.execute(f"SELECT 1 FROM {table} LIMIT 1")
         return True
@@ -14,6 +14,8 @@ from fastapi import APIRouter, Depends, HTTPException, Query, Request
 from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field, field_validator
 
+from src import page_store
+
 RQ_REDIS_URL = (
     os.getenv("RQ_REDIS_URL") or os.getenv("REDIS_URL") or "redis://127.0.0.1:6379/0"
 ).strip()
@@ -79,6 +81,11 @@ def _utc_now_iso() -> str:
 
 
 def _has_table(con: Any, table: str) -> bool:
+    from src.db import cached_schema
+
+    snap = cached_schema(con)
+    if snap is not None:
+        return table in snap.tables
     try:
         row = con.execute(
             "SELECT 1 FROM information_schema.tables "
@@ -91,6 +98,11 @@ def _has_table(con: Any, table: str) -> bool:
 
 
 def _has_column(con: Any, table: str, column: str) -> bool:
+    from src.db import cached_schema
+
+    snap = cached_schema(con)
+    if snap is not None:
+        return column in snap.column_names(table)
     try:
         row = con.execute(
             "SELECT 1 FROM information_schema.columns "
@@ -811,12 +823,21 @@ def get_company(
             (company_id,),
         ).fetchall()
 
-        pages = con.execute(
-            "SELECT id, source_url, LENGTH(html), fetched_at "
-            "FROM sources WHERE company_id = %s "
-            "ORDER BY fetched_at DESC",
-            (company_id,),
-        ).fetchall()
+        if page_store.store_enabled(con):
+            pages = con.execute(
+                "SELECT s.id, s.source_url, COALESCE(LENGTH(s.html), pb.raw_size), s.fetched_at "
+                "FROM sources AS s LEFT JOIN page_blobs AS pb ON pb.sha256 = s.html_sha256 "
+                "WHERE s.company_id = %s "
+                "ORDER BY s.fetched_at DESC",
+                (company_id,),
+            ).fetchall()
+        else:
+            pages = con.execute(
+                "SELECT id, source_url, LENGTH(html), fetched_at "
+                "FROM sources WHERE company_id = %s "
+                "ORDER BY fetched_at DESC",
+                (company_id,),
+            ).fetchall()
 
         risk_map = _domain_risk_levels_for_company_ids(
             con,
@@ -45,6 +45,8 @@ class AutodiscoveryResult:
     ai_input_candidates: int = 0  # How many candidates did we send to AI?
     ai_returned_people: int = 0  # How many people did AI return? (may be 0)
     fallback_used: bool = False  # Did we fall back to heuristics after AI returned 0?
+    ai_cache_hit: bool = False  # Was the AI response served from the response cache?
+    ai_tokens_saved: int = 0  # Tokens the cached response originally cost
 
     # Legacy field for backward compat (computed from ai_returned_people or fallback)
     ai_approved_people: int = 0  # Final count after AI or fallback
@@ -149,6 +151,8 @@ class AutodiscoveryResult:
             "ai_input_candidates": self.ai_input_candidates,
             "ai_returned_people": self.ai_returned_people,
             "fallback_used": self.fallback_used,
+            "ai_cache_hit": self.ai_cache_hit,
+            "ai_tokens_saved": self.ai_tokens_saved,
             "ai_approved_people": self.ai_approved_people,
             # Persistence metrics
             "people_upserted": self.people_upserted,
@@ -186,6 +190,8 @@ class AutodiscoveryResult:
             ai_input_candidates=data.get("ai_input_candidates", 0),
             ai_returned_people=data.get("ai_returned_people", 0),
             fallback_used=data.get("fallback_used", False),
+            ai_cache_hit=data.get("ai_cache_hit", False),
+            ai_tokens_saved=data.get("ai_tokens_saved", 0),
             ai_approved_people=data.get("ai_approved_people", 0),
             people_upserted=data.get("people_upserted", 0),
             people_skipped_quality=data.get("people_skipped_quality", 0),
@@ -331,6 +331,9 @@ SMTP_MX_MAX_ADDRS: int = _getenv_int("SMTP_MX_MAX_ADDRS", 3)
 # Prefer IPv4 over IPv6 (many residential ISPs block outbound port 25 on IPv6)
 SMTP_PREFER_IPV4: bool = _getenv_bool("SMTP_PREFER_IPV4", True)
 
+# SmtpSession: RCPTs per MAIL transaction before RSET (one connection per MX)
+SMTP_SESSION_MAX_RCPT_PER_TXN: int = _getenv_int("SMTP_SESSION_MAX_RCPT_PER_TXN", 5)
+
 # ---------------------------------------------------------------------------
 # O07: Third-party fallback verification (env-overridable)
 # ---------------------------------------------------------------------------
@@ -694,6 +697,7 @@ __all__ = [
     "SMTP_PREFLIGHT_CACHE_TTL_SECONDS",
     "SMTP_MX_MAX_ADDRS",
     "SMTP_PREFER_IPV4",
+    "SMTP_SESSION_MAX_RCPT_PER_TXN",
     # O07 fallback config
     "THIRD_PARTY_VERIFY_URL",
     "THIRD_PARTY_VERIFY_API_KEY",
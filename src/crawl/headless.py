@@ -7,7 +7,15 @@ this module can re-render the page with a real browser to get the full DOM.
 
 Design:
   - Playwright is an OPTIONAL dependency; all functions degrade gracefully.
-  - A single browser instance is reused across renders within a crawl session.
+  - One long-lived RenderPool per worker process owns the Chromium instance. It is
+    launched on the first render and reused by every crawl (sync or async) until
+    the process exits, so Chromium startup is paid once, not once per domain.
+  - The pool keeps warm browser contexts (one per concurrent render slot) and
+    recycles them after HEADLESS_CONTEXT_MAX_USES renders.
+  - Images, fonts and media are aborted at the network layer (HEADLESS_BLOCK_RESOURCES).
+  - Instead of a fixed sleep, renders wait until the DOM has stopped mutating for
+    HEADLESS_DOM_QUIET_MS (capped at HEADLESS_DOM_STABLE_MAX_MS).
+  - HEADLESS_MAX_CONCURRENT_RENDERS bounds renders in flight across all crawls.
   - Strict timeouts prevent runaway renders from blocking the pipeline.
   - Only used when SPA shell detection triggers (not for every page).
 
@@ -15,17 +23,24 @@ Usage:
     from src.crawl.headless import is_spa_shell, render_page, HeadlessBrowser
 
     if is_spa_shell(body):
-        with HeadlessBrowser() as browser:
+        with HeadlessBrowser() as browser:  # per-crawl lease on the shared pool
             rendered = browser.render(url, timeout_ms=15000)
             if rendered:
                 body = rendered
+
+    # asyncio callers: ``await browser.arender(url)``
 """
 
 from __future__ import annotations
 
+import asyncio
+import atexit
 import logging
 import os
 import re
+import threading
+from collections.abc import Awaitable, Callable
+from concurrent.futures import Future
 from typing import Any
 
 log = logging.getLogger(__name__)
@@ -35,12 +50,12 @@ log = logging.getLogger(__name__)
 # ---------------------------------------------------------------------------
 
 try:
-    from playwright.sync_api import sync_playwright
+    from playwright.async_api import async_playwright
 
     _HAS_PLAYWRIGHT = True
 except ImportError:
     _HAS_PLAYWRIGHT = False
-    sync_playwright = None  # type: ignore[assignment]
+    async_playwright = None  # type: ignore[assignment]
 
 # ---------------------------------------------------------------------------
 # Configuration
@@ -53,8 +68,23 @@ HEADLESS_ENABLED: bool = os.getenv("HEADLESS_BROWSER_ENABLED", "true").strip().l
     "on",
 }
 HEADLESS_TIMEOUT_MS: int = int(os.getenv("HEADLESS_TIMEOUT_MS", "15000"))
-HEADLESS_WAIT_UNTIL: str = os.getenv("HEADLESS_WAIT_UNTIL", "networkidle")
+HEADLESS_WAIT_UNTIL: str = os.getenv("HEADLESS_WAIT_UNTIL", "domcontentloaded")
 HEADLESS_MAX_RENDERS_PER_CRAWL: int = int(os.getenv("HEADLESS_MAX_RENDERS_PER_CRAWL", "8"))
+# Renders in flight at once across every crawl in this process (= warm contexts kept)
+HEADLESS_MAX_CONCURRENT_RENDERS: int = max(
+    1, int(os.getenv("HEADLESS_MAX_CONCURRENT_RENDERS", "2"))
+)
+# Recycle a browser context after this many renders (bounds cookie/cache/memory growth)
+HEADLESS_CONTEXT_MAX_USES: int = max(1, int(os.getenv("HEADLESS_CONTEXT_MAX_USES", "50")))
+# Playwright resource types aborted before they hit the network
+HEADLESS_BLOCK_RESOURCES: frozenset[str] = frozenset(
+    r.strip().lower()
+    for r in os.getenv("HEADLESS_BLOCK_RESOURCES", "image,font,media").split(",")
+    if r.strip()
+)
+# DOM-stability wait: done once no mutations for QUIET_MS, or after STABLE_MAX_MS
+HEADLESS_DOM_QUIET_MS: int = int(os.getenv("HEADLESS_DOM_QUIET_MS", "500"))
+HEADLESS_DOM_STABLE_MAX_MS: int = int(os.getenv("HEADLESS_DOM_STABLE_MAX_MS", "5000"))
 
 # ---------------------------------------------------------------------------
 # SPA Shell Detection
@@ -183,6 +213,369 @@ def is_spa_shell(body: bytes, *, strict: bool = False) -> bool:
     return is_shell
 
 
+# ---------------------------------------------------------------------------
+# Render pool (one browser per process)
+# ---------------------------------------------------------------------------
+
+# Resolves once the document has gone QUIET_MS without a mutation (or MAX_MS elapsed).
+_DOM_STABLE_JS = """
+([quietMs, maxMs]) => new Promise((resolve) => {
+  const start = Date.now();
+  let last = start;
+  const obs = new MutationObserver(() => { last = Date.now(); });
+  obs.observe(document.documentElement || document,
+              {subtree: true, childList: true, characterData: true});
+  const step = Math.max(25, Math.min(100, quietMs));
+  const tick = () => {
+    const now = Date.now();
+    if (now - last >= quietMs || now - start >= maxMs) {
+      obs.disconnect();
+      resolve(now - start);
+    } else {
+      setTimeout(tick, step);
+    }
+  };
+  setTimeout(tick, step);
+})
+"""
+
+# async () -> (playwright_handle, browser)
+Launcher = Callable[[], Awaitable[tuple[Any, Any]]]
+
+
+async def _launch_chromium() -> tuple[Any, Any]:
+    pw = await async_playwright().start()  # type: ignore[misc]
+    try:
+        browser = await pw.chromium.launch(
+            headless=True,
+            args=["--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu"],
+        )
+    except Exception:
+        await pw.stop()
+        raise
+    return pw, browser
+
+
+class _WarmContext:
+    __slots__ = ("context", "user_agent", "uses")
+
+    def __init__(self, context: Any, user_agent: str | None) -> None:
+        self.context = context
+        self.user_agent = user_agent
+        self.uses = 0
+
+
+class RenderPool:
+    """
+    Long-lived headless renderer shared by every crawl in the process.
+
+    Playwright runs on a private asyncio loop in a daemon thread; ``render`` (sync)
+    and ``render_async`` (any other loop) both submit to it. Chromium is launched
+    lazily on the first render and relaunched if it disconnects.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_concurrency: int | None = None,
+        context_max_uses: int | None = None,
+        block_resources: frozenset[str] | None = None,
+        wait_until: str | None = None,
+        timeout_ms: int | None = None,
+        dom_quiet_ms: int | None = None,
+        dom_stable_max_ms: int | None = None,
+        launcher: Launcher | None = None,
+    ) -> None:
+        self.max_concurrency = max(1, max_concurrency or HEADLESS_MAX_CONCURRENT_RENDERS)
+        self.context_max_uses = max(1, context_max_uses or HEADLESS_CONTEXT_MAX_USES)
+        self.block_resources = (
+            HEADLESS_BLOCK_RESOURCES if block_resources is None else frozenset(block_resources)
+        )
+        self.wait_until = wait_until or HEADLESS_WAIT_UNTIL
+        self.timeout_ms = timeout_ms or HEADLESS_TIMEOUT_MS
+        self.dom_quiet_ms = HEADLESS_DOM_QUIET_MS if dom_quiet_ms is None else dom_quiet_ms
+        self.dom_stable_max_ms = (
+            HEADLESS_DOM_STABLE_MAX_MS if dom_stable_max_ms is None else dom_stable_max_ms
+        )
+        self._launcher: Launcher = launcher or _launch_chromium
+
+        self._lock = threading.Lock()
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._closed = False
+
+        # Loop-owned state (only touched from the pool thread)
+        self._sem: asyncio.Semaphore | None = None
+        self._launch_lock: asyncio.Lock | None = None
+        self._pw: Any = None
+        self._browser: Any = None
+        self._idle: list[_WarmContext] = []
+
+        # Counters (diagnostics / tests)
+        self.launches = 0
+        self.contexts_created = 0
+        self.renders = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+
+    # ---- loop thread -----------------------------------------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._closed:
+                raise RuntimeError("RenderPool is closed")
+            if self._loop is None:
+                loop = asyncio.new_event_loop()
+                t = threading.Thread(
+                    target=loop.run_forever, name="headless-render-pool", daemon=True
+                )
+                t.start()
+                self._loop, self._thread = loop, t
+            return self._loop
+
+    def _submit(self, coro: Any) -> Future:
+        try:
+            loop = self._ensure_loop()
+        except RuntimeError:
+            coro.close()
+            raise
+        return asyncio.run_coroutine_threadsafe(coro, loop)
+
+    def _result_timeout_s(self, timeout_ms: int | None) -> float:
+        return ((timeout_ms or self.timeout_ms) + self.dom_stable_max_ms) / 1000.0 + 10.0
+
+    # ---- public API ------------------------------------------------------
+
+    def render(
+        self,
+        url: str,
+        *,
+        timeout_ms: int | None = None,
+        user_agent: str | None = None,
+        wait_until: str | None = None,
+    ) -> bytes | None:
+        """Render ``url`` and return the DOM as UTF-8 bytes (None on any failure)."""
+        try:
+            fut = self._submit(self._render(url, timeout_ms, user_agent, wait_until))
+            return fut.result(timeout=self._result_timeout_s(timeout_ms))
+        except Exception as exc:
+            log.warning("Headless render failed for %s: %s", url, exc)
+            return None
+
+    async def render_async(
+        self,
+        url: str,
+        *,
+        timeout_ms: int | None = None,
+        user_agent: str | None = None,
+        wait_until: str | None = None,
+    ) -> bytes | None:
+        """``render`` for asyncio callers; never blocks the caller's loop."""
+        try:
+            fut = self._submit(self._render(url, timeout_ms, user_agent, wait_until))
+            return await asyncio.wait_for(
+                asyncio.wrap_future(fut), timeout=self._result_timeout_s(timeout_ms)
+            )
+        except Exception as exc:
+            log.warning("Headless render failed for %s: %s", url, exc)
+            return None
+
+    def close(self) -> None:
+        """Close contexts and the browser, then stop the loop thread."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            loop, thread = self._loop, self._thread
+        if loop is None:
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(timeout=30)
+        except Exception as exc:
+            log.debug("Headless pool shutdown error (ignored): %s", exc)
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+
+    # ---- loop-side implementation ---------------------------------------
+
+    async def _ensure_browser(self) -> Any:
+        if self._launch_lock is None:
+            self._launch_lock = asyncio.Lock()
+        async with self._launch_lock:
+            if self._browser is not None and not _is_connected(self._browser):
+                log.warning("Headless browser disconnected; relaunching")
+                await self._drop_browser()
+            if self._browser is None:
+                self._pw, self._browser = await self._launcher()
+                self.launches += 1
+                log.info(
+                    "Headless render pool launched browser (max_concurrency=%d)",
+                    self.max_concurrency,
+                )
+        return self._browser
+
+    async def _block_route(self, route: Any) -> None:
+        try:
+            if route.request.resource_type in self.block_resources:
+                await route.abort()
+            else:
+                await route.continue_()
+        except Exception:
+            pass
+
+    async def _checkout(self, browser: Any, user_agent: str | None) -> _WarmContext:
+        for i, wc in enumerate(self._idle):
+            if wc.user_agent == user_agent:
+                return self._idle.pop(i)
+        opts: dict[str, Any] = {}
+        if user_agent:
+            opts["user_agent"] = user_agent
+        context = await browser.new_context(**opts)
+        if self.block_resources:
+            await context.route("**/*", self._block_route)
+        self.contexts_created += 1
+        return _WarmContext(context, user_agent)
+
+    async def _checkin(self, wc: _WarmContext, *, healthy: bool) -> None:
+        wc.uses += 1
+        if (
+            healthy
+            and wc.uses < self.context_max_uses
+            and len(self._idle) < self.max_concurrency
+            and _is_connected(self._browser)
+        ):
+            try:
+                await wc.context.clear_cookies()
+                self._idle.append(wc)
+                return
+            except Exception:
+                pass
+        await _close_quietly(wc.context)
+
+    async def _wait_dom_stable(self, page: Any) -> None:
+        if self.dom_stable_max_ms <= 0:
+            return
+        try:
+            await page.evaluate(_DOM_STABLE_JS, [self.dom_quiet_ms, self.dom_stable_max_ms])
+        except Exception as exc:
+            # Navigation during the wait, CSP, etc. The DOM we have is still usable.
+            log.debug("DOM-stability wait interrupted: %s", exc)
+
+    async def _render(
+        self,
+        url: str,
+        timeout_ms: int | None,
+        user_agent: str | None,
+        wait_until: str | None,
+    ) -> bytes | None:
+        if self._sem is None:
+            self._sem = asyncio.Semaphore(self.max_concurrency)
+        async with self._sem:
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+            try:
+                return await self._render_one(url, timeout_ms, user_agent, wait_until)
+            finally:
+                self.in_flight -= 1
+
+    async def _render_one(
+        self,
+        url: str,
+        timeout_ms: int | None,
+        user_agent: str | None,
+        wait_until: str | None,
+    ) -> bytes | None:
+        browser = await self._ensure_browser()
+        wc = await self._checkout(browser, user_agent)
+        page = None
+        healthy = False
+        try:
+            page = await wc.context.new_page()
+            await page.goto(
+                url,
+                wait_until=wait_until or self.wait_until,
+                timeout=timeout_ms or self.timeout_ms,
+            )
+            await self._wait_dom_stable(page)
+            rendered = (await page.content()).encode("utf-8")
+            healthy = True
+            self.renders += 1
+            return rendered
+        except Exception as exc:
+            log.warning("Headless render failed for %s: %s", url, exc)
+            return None
+        finally:
+            if page is not None:
+                await _close_quietly(page)
+            await self._checkin(wc, healthy=healthy)
+
+    async def _drop_browser(self) -> None:
+        idle, self._idle = self._idle, []
+        for wc in idle:
+            await _close_quietly(wc.context)
+        if self._browser is not None:
+            await _close_quietly(self._browser)
+        if self._pw is not None:
+            try:
+                await self._pw.stop()
+            except Exception:
+                pass
+        self._browser = None
+        self._pw = None
+
+    async def _shutdown(self) -> None:
+        await self._drop_browser()
+
+
+def _is_connected(browser: Any) -> bool:
+    try:
+        return bool(browser.is_connected())
+    except Exception:
+        return False
+
+
+async def _close_quietly(obj: Any) -> None:
+    try:
+        await obj.close()
+    except Exception:
+        pass
+
+
+_pool: RenderPool | None = None
+_pool_pid: int | None = None
+_pool_lock = threading.Lock()
+
+
+def get_render_pool() -> RenderPool:
+    """
+    The process-wide RenderPool (created on first use).
+
+    Threads do not survive fork(), so a forked child (e.g. an RQ work horse)
+    gets its own pool rather than inheriting the parent's dead loop thread.
+    """
+    global _pool, _pool_pid
+    with _pool_lock:
+        if _pool is None or _pool_pid != os.getpid():
+            _pool = RenderPool()
+            _pool_pid = os.getpid()
+        return _pool
+
+
+def shutdown_render_pool() -> None:
+    """Close the process-wide pool (registered with atexit)."""
+    global _pool, _pool_pid
+    with _pool_lock:
+        pool, _pool = _pool, None
+        owned = _pool_pid == os.getpid()
+        _pool_pid = None
+    if pool is not None and owned:
+        pool.close()
+
+
+atexit.register(shutdown_render_pool)
+
+
 # ---------------------------------------------------------------------------
 # Headless Browser Wrapper
 # ---------------------------------------------------------------------------
@@ -190,13 +583,15 @@ def is_spa_shell(body: bytes, *, strict: bool = False) -> bool:
 
 class HeadlessBrowser:
     """
-    Context-managed headless browser for rendering SPA pages.
+    Per-crawl lease on the shared RenderPool.
 
     Usage:
         with HeadlessBrowser() as browser:
             html_bytes = browser.render("https://example.com/team")
 
-    The browser instance is reused for multiple renders within the context.
+    Entering/leaving the context no longer launches or closes Chromium; it only
+    scopes the HEADLESS_MAX_RENDERS_PER_CRAWL budget. The pool's browser stays warm
+    for the next crawl.
     """
 
     def __init__(
@@ -205,12 +600,12 @@ class HeadlessBrowser:
         timeout_ms: int | None = None,
         wait_until: str | None = None,
         user_agent: str | None = None,
+        pool: RenderPool | None = None,
     ) -> None:
         self._timeout_ms = timeout_ms or HEADLESS_TIMEOUT_MS
-        self._wait_until = wait_until or HEADLESS_WAIT_UNTIL
+        self._wait_until = wait_until
         self._user_agent = user_agent
-        self._pw: Any = None
-        self._browser: Any = None
+        self._pool = pool
         self._render_count = 0
 
     @property
@@ -218,45 +613,43 @@ class HeadlessBrowser:
         """True if Playwright is installed and headless rendering is enabled."""
         return _HAS_PLAYWRIGHT and HEADLESS_ENABLED
 
+    @property
+    def pool(self) -> RenderPool | None:
+        if self._pool is None and self.available:
+            self._pool = get_render_pool()
+        return self._pool
+
     def __enter__(self) -> HeadlessBrowser:
-        if not self.available:
-            return self
-        try:
-            self._pw = sync_playwright().__enter__()  # type: ignore[union-attr]
-            launch_args = {
-                "headless": True,
-                "args": [
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                    "--disable-gpu",
-                    "--single-process",
-                ],
-            }
-            self._browser = self._pw.chromium.launch(**launch_args)
-            log.info("Headless browser launched for SPA rendering")
-        except Exception as exc:
-            log.warning("Failed to launch headless browser: %s", exc)
-            self._pw = None
-            self._browser = None
         return self
 
     def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
-        if self._browser is not None:
-            try:
-                self._browser.close()
-            except Exception:
-                pass
-        if self._pw is not None:
-            try:
-                self._pw.__exit__(None, None, None)
-            except Exception:
-                pass
-        self._browser = None
-        self._pw = None
+        return None
+
+    def _budget_left(self, url: str) -> bool:
+        if self._render_count >= HEADLESS_MAX_RENDERS_PER_CRAWL:
+            log.debug(
+                "Headless render limit reached (%d/%d), skipping %s",
+                self._render_count,
+                HEADLESS_MAX_RENDERS_PER_CRAWL,
+                url,
+            )
+            return False
+        return True
+
+    def _note(self, url: str, rendered: bytes | None) -> bytes | None:
+        if rendered is not None:
+            self._render_count += 1
+            log.info(
+                "Headless render succeeded: url=%s size=%d render_count=%d",
+                url,
+                len(rendered),
+                self._render_count,
+            )
+        return rendered
 
     def render(self, url: str, *, timeout_ms: int | None = None) -> bytes | None:
         """
-        Render a URL with a headless browser and return the fully rendered HTML.
+        Render a URL with the shared headless browser and return the rendered HTML.
 
         Args:
             url: The URL to render
@@ -265,63 +658,29 @@ class HeadlessBrowser:
         Returns:
             Rendered HTML as bytes, or None if rendering failed or is unavailable.
         """
-        if self._browser is None:
+        pool = self.pool
+        if pool is None or not self._budget_left(url):
             return None
+        rendered = pool.render(
+            url,
+            timeout_ms=timeout_ms or self._timeout_ms,
+            user_agent=self._user_agent,
+            wait_until=self._wait_until,
+        )
+        return self._note(url, rendered)
 
-        if self._render_count >= HEADLESS_MAX_RENDERS_PER_CRAWL:
-            log.debug(
-                "Headless render limit reached (%d/%d), skipping %s",
-                self._render_count,
-                HEADLESS_MAX_RENDERS_PER_CRAWL,
-                url,
-            )
-            return None
-
-        effective_timeout = timeout_ms or self._timeout_ms
-
-        try:
-            context_opts: dict[str, Any] = {}
-            if self._user_agent:
-                context_opts["user_agent"] = self._user_agent
-
-            context = self._browser.new_context(**context_opts)
-            page = context.new_page()
-
-            try:
-                page.goto(
-                    url,
-                    wait_until=self._wait_until,
-                    timeout=effective_timeout,
-                )
-
-                # Extra wait for lazy-loaded team sections
-                page.wait_for_timeout(2000)
-
-                content = page.content()
-                rendered_bytes = content.encode("utf-8")
-
-                self._render_count += 1
-                log.info(
-                    "Headless render succeeded: url=%s size=%d render_count=%d",
-                    url,
-                    len(rendered_bytes),
-                    self._render_count,
-                )
-                return rendered_bytes
-
-            finally:
-                try:
-                    page.close()
-                except Exception:
-                    pass
-                try:
-                    context.close()
-                except Exception:
-                    pass
-
-        except Exception as exc:
-            log.warning("Headless render failed for %s: %s", url, exc)
+    async def arender(self, url: str, *, timeout_ms: int | None = None) -> bytes | None:
+        """``render`` for asyncio callers (the concurrent crawl engine)."""
+        pool = self.pool
+        if pool is None or not self._budget_left(url):
             return None
+        rendered = await pool.render_async(
+            url,
+            timeout_ms=timeout_ms or self._timeout_ms,
+            user_agent=self._user_agent,
+            wait_until=self._wait_until,
+        )
+        return self._note(url, rendered)
 
 
 # ---------------------------------------------------------------------------
@@ -331,10 +690,10 @@ class HeadlessBrowser:
 
 def render_page(url: str, *, user_agent: str | None = None) -> bytes | None:
     """
-    One-shot convenience: launch browser, render a single page, close.
+    One-shot convenience: render a single page on the shared pool.
 
     For batch rendering (multiple pages in one crawl), use HeadlessBrowser
-    as a context manager instead.
+    as a context manager instead so the per-crawl render budget applies.
     """
     with HeadlessBrowser(user_agent=user_agent) as browser:
         return browser.render(url)
@@ -349,6 +708,9 @@ __all__ = [
     "is_spa_shell",
     "is_headless_available",
     "render_page",
+    "get_render_pool",
+    "shutdown_render_pool",
     "HeadlessBrowser",
+    "RenderPool",
     "HEADLESS_ENABLED",
 ]
@@ -45,19 +45,35 @@ Efficiency controls (batch-polish additions):
   - Dynamic nav-link expansion (last-resort):
       * if all seed tiers are exhausted and 0 pages were persisted, fetch discovery pages
         and enqueue the top N high-signal internal nav links (team/leadership/about/etc.)
+
+Concurrent engine:
+  - crawl_domains(domains, concurrency=N) runs many crawls on one asyncio event loop
+    with a shared httpx.AsyncClient; per-domain behavior matches crawl_domain()
+  - At most one in-flight request per host across the whole batch, paced by
+    src.fetch.throttle (crawl-delay and WAF cool-off; THROTTLE_BACKEND=redis
+    shares each host's schedule across crawl workers)
+
+HTTP cache (opt-in, CRAWL_HTTP_CACHE=1):
+  - page fetches go through src.fetch.cache: fresh entries skip the request, stale
+    ones are revalidated conditionally (304 reuses the stored body)
+  - force=True (forced re-discovery) always refetches and refreshes the stored entry
 """
 
 from __future__ import annotations
 
+import asyncio
 import logging
 import os
 import re
 import time
 from collections import deque
+from collections.abc import Sequence
 from dataclasses import dataclass, field
 from typing import Any
 from urllib.parse import urljoin, urlparse
 
+import httpx
+
 from src.config import (
     CRAWL_CONNECT_TIMEOUT_S,
     CRAWL_DISCOVERY_PATHS,
@@ -76,6 +92,8 @@ from src.config import (
 CRAWL_HTML_MAX_BYTES = 2_000_000  # 2 MB
 
 # Import robots helpers - is_allowed is required, explain_block is optional
+from src.fetch import cache as http_cache  # noqa: E402
+from src.fetch import throttle  # noqa: E402
 from src.fetch.robots import is_allowed  # noqa: E402
 
 # Optional: robots explainability (non-fatal if not available)
@@ -144,7 +162,9 @@ class _CrawlState:
     # SPA shell detection and headless rendering metrics
     spa_shells_detected: int = 0
     spa_shells_rendered: int = 0
-    headless_browser: Any = None  # HeadlessBrowser instance (set by crawl_domain)
+    headless_browser: Any = None  # HeadlessBrowser lease (set by crawl_domain)
+
+    force: bool = False  # forced re-discovery: bypass the HTTP cache
 
 
 # ---------------------------------------------------------------------------
@@ -204,6 +224,11 @@ _CRAWL_SPARSE_DISCOVERY_THRESHOLD = max(1, _env_int("CRAWL_SPARSE_DISCOVERY_THRE
 _CRAWL_SPARSE_FALLBACK_MIN_PAGES = max(1, _env_int("CRAWL_SPARSE_FALLBACK_MIN_PAGES", 5))
 _CRAWL_SPARSE_FALLBACK_ENABLED = _env_bool("CRAWL_SPARSE_FALLBACK_ENABLED", True)
 
+# HTTP cache for page fetches (src.fetch.cache default backend). Fresh entries are served
+# without a request; stale ones are revalidated with If-None-Match / If-Modified-Since, so
+# re-crawling the same domains mostly costs 304s.
+_CRAWL_HTTP_CACHE = _env_bool("CRAWL_HTTP_CACHE", False)
+
 _EXPECTED_NAV_PATHS = frozenset(
     {
         "/about",
@@ -713,6 +738,71 @@ def _extract_internal_paths(
     return out
 
 
+def _discovery_requests(*, base_host: str, origin_base: str) -> list[tuple[str, str]]:
+    """Return (normalized_path, absolute_url) pairs for the robots-allowed discovery pages."""
+    out: list[tuple[str, str]] = []
+    for p in CRAWL_DISCOVERY_PATHS:
+        dp = _normalize_path(p)
+        if _looks_like_soft_404_path(dp):
+            continue
+
+        if not is_allowed(base_host, dp):
+            continue
+
+        out.append((dp, urljoin(origin_base, dp)))
+    return out
+
+
+def _discovered_paths_from_response(
+    resp: Any,
+    *,
+    dp: str,
+    origin_base: str,
+    base_host: str,
+) -> set[str]:
+    """Collect internal paths from one discovery response (empty set if unusable)."""
+    discovered: set[str] = set()
+
+    if resp.status_code != 200:
+        return discovered
+
+    content_type = resp.headers.get("content-type", "")
+    if "text/html" not in content_type.lower():
+        return discovered
+
+    body = resp.content
+    final_path = urlparse(str(resp.url)).path or dp
+    final_path_norm = _normalize_path(final_path)
+
+    final_url_canon = urljoin(origin_base, final_path_norm)
+    if _is_soft_404(final_url_canon, body):
+        return discovered
+
+    discovered.add(dp)
+    if dp != "/":
+        discovered.add(dp + "/")
+
+    discovered.add(final_path_norm)
+    if final_path_norm != "/":
+        discovered.add(final_path_norm + "/")
+
+    try:
+        text = resp.text
+    except Exception:
+        try:
+            text = body.decode("utf-8", "ignore")
+        except Exception:
+            return discovered
+
+    discovered |= _extract_internal_paths(
+        text,
+        base_url=str(resp.url),
+        base_host=base_host,
+        origin_base=origin_base,
+    )
+    return discovered
+
+
 def _build_discovered_paths(
     client: Any,
     *,
@@ -730,56 +820,17 @@ def _build_discovered_paths(
     """
     discovered: set[str] = set()
 
-    for p in CRAWL_DISCOVERY_PATHS:
-        dp = _normalize_path(p)
-        if _looks_like_soft_404_path(dp):
-            continue
-
-        if not is_allowed(base_host, dp):
-            continue
-
-        url = urljoin(origin_base, dp)
+    for dp, url in _discovery_requests(base_host=base_host, origin_base=origin_base):
         try:
             resp = client.get(url, timeout=timeout)
         except Exception:
             continue
 
-        if resp.status_code != 200:
-            continue
-
-        content_type = resp.headers.get("content-type", "")
-        if "text/html" not in content_type.lower():
-            continue
-
-        body = resp.content
-        final_path = urlparse(str(resp.url)).path or dp
-        final_path_norm = _normalize_path(final_path)
-
-        final_url_canon = urljoin(origin_base, final_path_norm)
-        if _is_soft_404(final_url_canon, body):
-            continue
-
-        discovered.add(dp)
-        if dp != "/":
-            discovered.add(dp + "/")
-
-        discovered.add(final_path_norm)
-        if final_path_norm != "/":
-            discovered.add(final_path_norm + "/")
-
-        try:
-            text = resp.text
-        except Exception:
-            try:
-                text = body.decode("utf-8", "ignore")
-            except Exception:
-                continue
-
-        discovered |= _extract_internal_paths(
-            text,
-            base_url=str(resp.url),
-            base_host=base_host,
+        discovered |= _discovered_paths_from_response(
+            resp,
+            dp=dp,
             origin_base=origin_base,
+            base_host=base_host,
         )
 
     return discovered
@@ -998,13 +1049,23 @@ def _resolve_origin(client: Any, *, dom: str, timeout: Any) -> tuple[str, str]:
     fallback = f"https://{dom}/"
     try:
         resp = client.get(fallback, timeout=timeout)
-        scheme = resp.url.scheme
-        host = resp.url.host
-        if scheme and host:
-            origin = f"{scheme}://{host}".rstrip("/") + "/"
-            return origin, host.lower()
     except Exception:
-        pass
+        resp = None
+    return _origin_from_response(resp, dom=dom)
+
+
+def _origin_from_response(resp: Any, *, dom: str) -> tuple[str, str]:
+    """Derive (origin_base, base_host) from the root response (or fall back to https://dom/)."""
+    fallback = f"https://{dom}/"
+    if resp is not None:
+        try:
+            scheme = resp.url.scheme
+            host = resp.url.host
+            if scheme and host:
+                origin = f"{scheme}://{host}".rstrip("/") + "/"
+                return origin, host.lower()
+        except Exception:
+            pass
 
     parsed = urlparse(fallback)
     return fallback, (parsed.netloc or dom).lower()
@@ -1134,13 +1195,7 @@ def _maybe_nav_expand(
     Last-resort: when tiered seeding is exhausted and 0 pages were persisted,
     enqueue a small set of high-signal internal nav links.
     """
-    if state.nav_expanded or not _CRAWL_NAV_EXPANSION_ENABLED:
-        return False
-    if state.pages:
-        return False
-    if next_tier_idx < len(CRAWL_SEED_TIERS):
-        return False
-    if state.meaningful_fetches >= 3 and state.meaningful_403 >= state.meaningful_fetches:
+    if not _nav_expand_eligible(state, next_tier_idx=next_tier_idx):
         return False
 
     if CRAWL_SEEDS_LINKED_ONLY and discovered_paths:
@@ -1154,6 +1209,35 @@ def _maybe_nav_expand(
         )
         cand_paths.add("/")
 
+    return _apply_nav_expansion(
+        state,
+        stage=stage,
+        cand_paths=cand_paths,
+        origin_base=origin_base,
+        base_host=base_host,
+    )
+
+
+def _nav_expand_eligible(state: _CrawlState, *, next_tier_idx: int) -> bool:
+    if state.nav_expanded or not _CRAWL_NAV_EXPANSION_ENABLED:
+        return False
+    if state.pages:
+        return False
+    if next_tier_idx < len(CRAWL_SEED_TIERS):
+        return False
+    if state.meaningful_fetches >= 3 and state.meaningful_403 >= state.meaningful_fetches:
+        return False
+    return True
+
+
+def _apply_nav_expansion(
+    state: _CrawlState,
+    *,
+    stage: str,
+    cand_paths: set[str],
+    origin_base: str,
+    base_host: str,
+) -> bool:
     scored = _nav_candidates(
         cand_paths=cand_paths,
         origin_base=origin_base,
@@ -1180,6 +1264,71 @@ def _maybe_nav_expand(
     return state.nav_enqueued > 0
 
 
+def _response_from_cache(url: str, entry: http_cache.CacheEntry) -> httpx.Response:
+    return httpx.Response(
+        int(entry.status),
+        content=entry.body or b"",
+        headers={"content-type": entry.content_type or "text/html"},
+        request=httpx.Request("GET", url),
+    )
+
+
+def _cache_lookup(
+    cache: http_cache.Cache, key: str
+) -> tuple[httpx.Response | None, dict[str, str], http_cache.CacheEntry | None]:
+    """
+    Returns (cached_response, conditional_headers, entry). A fresh HTML 200 with a body is
+    served directly; otherwise we hand back validators for a conditional request.
+    """
+    entry, fresh = cache.get(key)
+    if entry is None or entry.body is None or entry.status != 200:
+        return None, {}, None
+    if fresh:
+        return _response_from_cache(key, entry), {}, entry
+    return None, dict(cache.conditionals(key)), entry
+
+
+def _cache_record(
+    cache: http_cache.Cache,
+    key: str,
+    resp: Any,
+    entry: http_cache.CacheEntry | None,
+) -> Any:
+    """Store/refresh the cache from a live response; a 304 becomes the cached 200."""
+    if resp.status_code == 304 and entry is not None:
+        cache.store_304(key, resp.headers)
+        return _response_from_cache(key, entry)
+    # Redirected responses are not stored under the requested key.
+    if resp.status_code == 200 and str(resp.url) == key:
+        cache.store_200(
+            key, 200, resp.headers.get("content-type"), resp.content, dict(resp.headers)
+        )
+    return resp
+
+
+def _flush_http_cache() -> None:
+    """Commit pending cache writes; RQ work horses exit without running atexit hooks."""
+    if not _CRAWL_HTTP_CACHE:
+        return
+    try:
+        http_cache.default().flush()
+    except Exception as exc:
+        log.warning("HTTP cache flush failed: %s", exc)
+
+
+def _get_page(client: Any, key: str, *, force: bool = False) -> Any:
+    if not _CRAWL_HTTP_CACHE:
+        return client.get(key)
+    cache = http_cache.default()
+    if force:
+        return _cache_record(cache, key, client.get(key), None)
+    cached, cond, entry = _cache_lookup(cache, key)
+    if cached is not None:
+        return cached
+    resp = client.get(key, headers=cond) if cond else client.get(key)
+    return _cache_record(cache, key, resp, entry)
+
+
 def _fetch_html_page(
     *,
     client: Any,
@@ -1188,8 +1337,45 @@ def _fetch_html_page(
     base_host: str,
     state: _CrawlState,
 ) -> tuple[str, bytes] | None:
-    resp = client.get(key)
+    resp = _get_page(client, key, force=state.force)
 
+    screened = _screen_html_response(
+        resp,
+        key=key,
+        origin_base=origin_base,
+        base_host=base_host,
+        state=state,
+    )
+    if screened is None:
+        return None
+    final_url, final_key, body = screened
+
+    # --- SPA shell detection and headless browser fallback ---
+    # If the fetched HTML looks like a JS framework shell (e.g. Next.js, React),
+    # attempt to re-render with a headless browser to get the full DOM.
+    if _needs_spa_render(state, final_url=final_url, body=body):
+        rendered = state.headless_browser.render(final_url)
+        body = _apply_spa_render(state, final_url=final_url, body=body, rendered=rendered)
+
+    state.seen_final_keys.add(final_key)
+    state.seen_final_keys.add(key)
+
+    return final_url, body
+
+
+def _screen_html_response(
+    resp: Any,
+    *,
+    key: str,
+    origin_base: str,
+    base_host: str,
+    state: _CrawlState,
+) -> tuple[str, str, bytes] | None:
+    """
+    Apply WAF accounting and the HTML/size/soft-404/dup filters to a page response.
+
+    Returns (final_url, final_key, body) for a usable page, otherwise None.
+    """
     state.meaningful_fetches += 1
     if resp.status_code == 403:
         state.meaningful_403 += 1
@@ -1233,35 +1419,49 @@ def _fetch_html_page(
         log.debug("Skipping soft-404 page: %s", final_url)
         return None
 
-    # --- SPA shell detection and headless browser fallback ---
-    # If the fetched HTML looks like a JS framework shell (e.g. Next.js, React),
-    # attempt to re-render with a headless browser to get the full DOM.
-    if _HAS_HEADLESS and is_spa_shell is not None and is_spa_shell(body):
-        state.spa_shells_detected += 1
-        log.info("SPA shell detected: url=%s size=%d", final_url, len(body))
-
-        if state.headless_browser is not None:
-            rendered = state.headless_browser.render(final_url)
-            if rendered and len(rendered) > len(body):
-                log.info(
-                    "Headless re-render succeeded: url=%s original=%d rendered=%d",
-                    final_url,
-                    len(body),
-                    len(rendered),
-                )
-                body = rendered
-                state.spa_shells_rendered += 1
+    return final_url, final_key, body
 
-                # Re-check size limit after render (rendered DOM can be larger)
-                if len(body) > CRAWL_HTML_MAX_BYTES:
-                    body = body[:CRAWL_HTML_MAX_BYTES]
-            else:
-                log.debug("Headless re-render returned no improvement for %s", final_url)
 
-    state.seen_final_keys.add(final_key)
-    state.seen_final_keys.add(key)
+def _headless_lease() -> Any:
+    """A HeadlessBrowser lease on the shared render pool, or None when unavailable."""
+    if not (_HAS_HEADLESS and is_headless_available is not None and is_headless_available()):
+        return None
+    return HeadlessBrowser(user_agent=FETCH_USER_AGENT)  # type: ignore[misc]
 
-    return final_url, body
+
+def _needs_spa_render(state: _CrawlState, *, final_url: str, body: bytes) -> bool:
+    """Count SPA shells and return True when a headless re-render should be attempted."""
+    if not (_HAS_HEADLESS and is_spa_shell is not None and is_spa_shell(body)):
+        return False
+
+    state.spa_shells_detected += 1
+    log.info("SPA shell detected: url=%s size=%d", final_url, len(body))
+    return state.headless_browser is not None
+
+
+def _apply_spa_render(
+    state: _CrawlState,
+    *,
+    final_url: str,
+    body: bytes,
+    rendered: bytes | None,
+) -> bytes:
+    if not rendered or len(rendered) <= len(body):
+        log.debug("Headless re-render returned no improvement for %s", final_url)
+        return body
+
+    log.info(
+        "Headless re-render succeeded: url=%s original=%d rendered=%d",
+        final_url,
+        len(body),
+        len(rendered),
+    )
+    state.spa_shells_rendered += 1
+
+    # Re-check size limit after render (rendered DOM can be larger)
+    if len(rendered) > CRAWL_HTML_MAX_BYTES:
+        return rendered[:CRAWL_HTML_MAX_BYTES]
+    return rendered
 
 
 def _enqueue_dynamic_high_value_paths(
@@ -1542,26 +1742,7 @@ def _maybe_do_discovery(
         base_host=base_host,
         timeout=timeout,
     )
-    discovered_paths.add("/")
-
-    sparse_active, sparse_reason = _is_sparse_discovery(discovered_paths)
-    if sparse_active:
-        log.info(
-            "Sparse discovery detected for %s: %s. Falling back to exhaustive seed probing "
-            "(target=%d pages).",
-            dom,
-            sparse_reason,
-            _CRAWL_SPARSE_FALLBACK_MIN_PAGES,
-        )
-    else:
-        log.debug(
-            "Discovery found %d paths for %s (threshold=%d, fallback not needed)",
-            len(discovered_paths),
-            dom,
-            _CRAWL_SPARSE_DISCOVERY_THRESHOLD,
-        )
-
-    return discovered_paths, sparse_active, sparse_reason
+    return _discovery_outcome(dom, discovered_paths)
 
 
 def _enqueue_high_value_discovered(
@@ -1749,6 +1930,27 @@ def _fetch_persist_extract(
         return not state.aborted
 
     final_url, body = fetched
+    return _persist_and_extract(
+        run,
+        state,
+        key=key,
+        depth=depth,
+        from_seed=from_seed,
+        final_url=final_url,
+        body=body,
+    )
+
+
+def _persist_and_extract(
+    run: _CrawlRun,
+    state: _CrawlState,
+    *,
+    key: str,
+    depth: int,
+    from_seed: bool,
+    final_url: str,
+    body: bytes,
+) -> bool:
     state.pages.append(Page(url=final_url, html=body, fetched_at=time.time()))
     log.debug("Crawled page: %s (from %s)", final_url, key)
 
@@ -1786,7 +1988,7 @@ def _maybe_expand_when_empty(
     run: _CrawlRun,
     state: _CrawlState,
 ) -> bool:
-    if state.seed_q or state.crawl_q or state.pages or state.aborted:
+    if not _queues_exhausted_without_pages(state):
         return False
 
     return _maybe_nav_expand(
@@ -1801,6 +2003,10 @@ def _maybe_expand_when_empty(
     )
 
 
+def _queues_exhausted_without_pages(state: _CrawlState) -> bool:
+    return not (state.seed_q or state.crawl_q or state.pages or state.aborted)
+
+
 def _crawl_loop(client: Any, run: _CrawlRun, state: _CrawlState, *, result: Any) -> None:
     while (state.seed_q or state.crawl_q) and len(state.pages) < run.max_pages:
         if _check_time_budget(state=state, start_monotonic=run.start_monotonic, stage="loop_start"):
@@ -1854,20 +2060,14 @@ def _init_run(
 ) -> _CrawlRun | None:
     origin_base, base_host = _resolve_origin(client, dom=dom, timeout=timeout)
 
-    if _robots_deny_all(base_host):
-        root_url = urljoin(origin_base, "/")
-        if not is_allowed(base_host, "/"):
-            _log_robots_block(base_host, "/", root_url, result=result)
-
-        log.info("Crawl blocked by robots for %s: deny-all detected (no seeds attempted).", dom)
-        _attach_robots_deny_all_metrics(
-            dom=dom,
-            origin_base=origin_base,
-            base_host=base_host,
-            stop_min_people=stop_min_people,
-            start_monotonic=start_monotonic,
-            result=result,
-        )
+    if _blocked_by_robots(
+        dom=dom,
+        origin_base=origin_base,
+        base_host=base_host,
+        stop_min_people=stop_min_people,
+        start_monotonic=start_monotonic,
+        result=result,
+    ):
         return None
 
     discovered_paths, sparse_active, sparse_reason = _maybe_do_discovery(
@@ -1878,6 +2078,91 @@ def _init_run(
         timeout=timeout,
     )
 
+    return _seed_run(
+        state,
+        dom=dom,
+        origin_base=origin_base,
+        base_host=base_host,
+        timeout=timeout,
+        stop_min_people=stop_min_people,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        hints=hints,
+        start_monotonic=start_monotonic,
+        discovered_paths=discovered_paths,
+        sparse_active=sparse_active,
+        sparse_reason=sparse_reason,
+    )
+
+
+def _blocked_by_robots(
+    *,
+    dom: str,
+    origin_base: str,
+    base_host: str,
+    stop_min_people: int,
+    start_monotonic: float,
+    result: Any,
+) -> bool:
+    if not _robots_deny_all(base_host):
+        return False
+
+    root_url = urljoin(origin_base, "/")
+    if not is_allowed(base_host, "/"):
+        _log_robots_block(base_host, "/", root_url, result=result)
+
+    log.info("Crawl blocked by robots for %s: deny-all detected (no seeds attempted).", dom)
+    _attach_robots_deny_all_metrics(
+        dom=dom,
+        origin_base=origin_base,
+        base_host=base_host,
+        stop_min_people=stop_min_people,
+        start_monotonic=start_monotonic,
+        result=result,
+    )
+    return True
+
+
+def _discovery_outcome(dom: str, discovered_paths: set[str]) -> tuple[set[str], bool, str]:
+    """Finish a discovery pass: add "/" and evaluate the sparse-discovery fallback."""
+    discovered_paths.add("/")
+
+    sparse_active, sparse_reason = _is_sparse_discovery(discovered_paths)
+    if sparse_active:
+        log.info(
+            "Sparse discovery detected for %s: %s. Falling back to exhaustive seed probing "
+            "(target=%d pages).",
+            dom,
+            sparse_reason,
+            _CRAWL_SPARSE_FALLBACK_MIN_PAGES,
+        )
+    else:
+        log.debug(
+            "Discovery found %d paths for %s (threshold=%d, fallback not needed)",
+            len(discovered_paths),
+            dom,
+            _CRAWL_SPARSE_DISCOVERY_THRESHOLD,
+        )
+
+    return discovered_paths, sparse_active, sparse_reason
+
+
+def _seed_run(
+    state: _CrawlState,
+    *,
+    dom: str,
+    origin_base: str,
+    base_host: str,
+    timeout: Any,
+    stop_min_people: int,
+    max_pages: int,
+    max_depth: int,
+    hints: list[str],
+    start_monotonic: float,
+    discovered_paths: set[str],
+    sparse_active: bool,
+    sparse_reason: str,
+) -> _CrawlRun:
     high_value_enqueued = _enqueue_high_value_discovered(
         state,
         dom=dom,
@@ -1982,34 +2267,24 @@ def _attach_result_metrics_from_run(run: _CrawlRun, state: _CrawlState, *, resul
 # ---------------------------------------------------------------------------
 
 
-def crawl_domain(domain: str, *, result: Any = None) -> list[Page]:
+def crawl_domain(domain: str, *, result: Any = None, force: bool = False) -> list[Page]:
     """
     BFS crawl from seed paths, respecting robots.txt.
 
+    force=True refetches every page instead of serving fresh HTTP cache entries.
     See module docstring for behavior details.
     """
-    import httpx
-
     dom = _sanitize_domain(domain)
     max_pages = CRAWL_MAX_PAGES_PER_DOMAIN
     max_depth = CRAWL_MAX_DEPTH
     stop_min_people = max(1, int(CRAWL_SEED_STOP_MIN_PEOPLE_PAGES))
     hints = _build_hints()
 
-    state = _CrawlState()
+    state = _CrawlState(force=bool(force))
 
-    # Set up headless browser for SPA shell re-rendering (if available).
-    # The browser is lazily initialized and shared across the entire crawl session.
-    _headless_ctx = None
-    if _HAS_HEADLESS and is_headless_available is not None and is_headless_available():
-        try:
-            _headless_ctx = HeadlessBrowser(user_agent=FETCH_USER_AGENT)
-            state.headless_browser = _headless_ctx.__enter__()
-            log.debug("Headless browser available for SPA rendering")
-        except Exception as exc:
-            log.debug("Headless browser setup failed (non-fatal): %s", exc)
-            _headless_ctx = None
-            state.headless_browser = None
+    # Headless renderer for SPA shell re-rendering (if available). This is a per-crawl
+    # lease on the process-wide render pool; Chromium is launched once per worker.
+    state.headless_browser = _headless_lease()
 
     headers = {"User-Agent": FETCH_USER_AGENT}
     timeout = httpx.Timeout(CRAWL_READ_TIMEOUT_S, connect=CRAWL_CONNECT_TIMEOUT_S)
@@ -2035,14 +2310,13 @@ def crawl_domain(domain: str, *, result: Any = None) -> list[Page]:
             _crawl_loop(client, run, state, result=result)
 
     finally:
-        # Clean up headless browser
-        if _headless_ctx is not None:
-            try:
-                _headless_ctx.__exit__(None, None, None)
-            except Exception:
-                pass
-            state.headless_browser = None
+        state.headless_browser = None
+        _flush_http_cache()
+
+    return _finish_run(run, state, result=result)
 
+
+def _finish_run(run: _CrawlRun, state: _CrawlState, *, result: Any) -> list[Page]:
     _final_log(
         dom=run.dom,
         origin_base=run.origin_base,
@@ -2072,3 +2346,371 @@ def crawl_domain_for_company(domain: str, company_id: int, *, result: Any = None
     for p in pages:
         p.company_id = company_id
     return pages
+
+
+# ---------------------------------------------------------------------------
+# Concurrent multi-domain engine (asyncio)
+# ---------------------------------------------------------------------------
+#
+# crawl_domain() spends nearly all of its wall-clock time waiting on the network.
+# crawl_domains() runs many _CrawlRun/_CrawlState pairs on one event loop instead,
+# reusing the same seeding/early-stop/budget helpers as the sync path. Only the
+# network calls differ (await on a shared httpx.AsyncClient).
+#
+# Politeness is unchanged: each run still fetches one page at a time, and the
+# _HostGate keeps it to one in-flight request per host even when several runs in
+# the same batch land on the same site (parent domains, shared careers hosts).
+
+_CRAWL_DOMAINS_CONCURRENCY = max(1, _env_int("CRAWL_DOMAINS_CONCURRENCY", 16))
+_CRAWL_ASYNC_MAX_CONNECTIONS = max(1, _env_int("CRAWL_ASYNC_MAX_CONNECTIONS", 100))
+
+
+class _HostGate:
+    """One asyncio.Lock per (www-normalized) host."""
+
+    def __init__(self) -> None:
+        self._locks: dict[str, asyncio.Lock] = {}
+
+    def lock_for(self, url: str) -> asyncio.Lock:
+        host = _normalize_host(urlparse(url).hostname or "")
+        lk = self._locks.get(host)
+        if lk is None:
+            lk = asyncio.Lock()
+            self._locks[host] = lk
+        return lk
+
+
+class _GatedAsyncClient:
+    """
+    httpx.AsyncClient facade whose get() waits for the per-host gate and the
+    host's throttle turn (crawl-delay, WAF cool-off; shared across workers with
+    THROTTLE_BACKEND=redis), then reports the response status back to it.
+    """
+
+    def __init__(self, client: Any, gate: _HostGate) -> None:
+        self._client = client
+        self._gate = gate
+
+    async def get(self, url: str, **kwargs: Any) -> Any:
+        host = (urlparse(url).hostname or "").lower()
+        async with self._gate.lock_for(url):
+            await throttle.wait_for_turn_async(host)
+            try:
+                resp = await self._client.get(url, **kwargs)
+            except Exception:
+                await asyncio.to_thread(throttle.after_response, host, 599)
+                raise
+            await asyncio.to_thread(throttle.after_response, host, int(resp.status_code))
+            return resp
+
+
+async def _resolve_origin_async(client: Any, *, dom: str, timeout: Any) -> tuple[str, str]:
+    try:
+        resp = await client.get(f"https://{dom}/", timeout=timeout)
+    except Exception:
+        resp = None
+    return _origin_from_response(resp, dom=dom)
+
+
+async def _build_discovered_paths_async(
+    client: Any,
+    *,
+    origin_base: str,
+    base_host: str,
+    timeout: Any,
+) -> set[str]:
+    discovered: set[str] = set()
+    for dp, url in _discovery_requests(base_host=base_host, origin_base=origin_base):
+        try:
+            resp = await client.get(url, timeout=timeout)
+        except Exception:
+            continue
+        discovered |= _discovered_paths_from_response(
+            resp,
+            dp=dp,
+            origin_base=origin_base,
+            base_host=base_host,
+        )
+    return discovered
+
+
+async def _init_run_async(
+    client: Any,
+    state: _CrawlState,
+    *,
+    dom: str,
+    timeout: Any,
+    stop_min_people: int,
+    max_pages: int,
+    max_depth: int,
+    hints: list[str],
+    start_monotonic: float,
+    result: Any,
+) -> _CrawlRun | None:
+    origin_base, base_host = await _resolve_origin_async(client, dom=dom, timeout=timeout)
+
+    # robots.txt is fetched synchronously on first use; warm it off the event loop so
+    # every later is_allowed()/explain_block() call for this host is a memo hit.
+    await asyncio.to_thread(is_allowed, base_host, "/")
+
+    if _blocked_by_robots(
+        dom=dom,
+        origin_base=origin_base,
+        base_host=base_host,
+        stop_min_people=stop_min_people,
+        start_monotonic=start_monotonic,
+        result=result,
+    ):
+        return None
+
+    discovered_paths: set[str] = set()
+    sparse_active, sparse_reason = False, ""
+    if CRAWL_SEEDS_LINKED_ONLY:
+        discovered = await _build_discovered_paths_async(
+            client,
+            origin_base=origin_base,
+            base_host=base_host,
+            timeout=timeout,
+        )
+        discovered_paths, sparse_active, sparse_reason = _discovery_outcome(dom, discovered)
+
+    return _seed_run(
+        state,
+        dom=dom,
+        origin_base=origin_base,
+        base_host=base_host,
+        timeout=timeout,
+        stop_min_people=stop_min_people,
+        max_pages=max_pages,
+        max_depth=max_depth,
+        hints=hints,
+        start_monotonic=start_monotonic,
+        discovered_paths=discovered_paths,
+        sparse_active=sparse_active,
+        sparse_reason=sparse_reason,
+    )
+
+
+async def _get_page_async(client: Any, key: str, *, force: bool = False) -> Any:
+    if not _CRAWL_HTTP_CACHE:
+        return await client.get(key)
+    cache = http_cache.default()
+    if force:
+        resp = await client.get(key)
+        return await asyncio.to_thread(_cache_record, cache, key, resp, None)
+    cached, cond, entry = await asyncio.to_thread(_cache_lookup, cache, key)
+    if cached is not None:
+        return cached
+    resp = await (client.get(key, headers=cond) if cond else client.get(key))
+    return await asyncio.to_thread(_cache_record, cache, key, resp, entry)
+
+
+async def _fetch_html_page_async(
+    client: Any,
+    run: _CrawlRun,
+    state: _CrawlState,
+    *,
+    key: str,
+) -> tuple[str, bytes] | None:
+    resp = await _get_page_async(client, key, force=state.force)
+
+    screened = _screen_html_response(
+        resp,
+        key=key,
+        origin_base=run.origin_base,
+        base_host=run.base_host,
+        state=state,
+    )
+    if screened is None:
+        return None
+    final_url, final_key, body = screened
+
+    if _needs_spa_render(state, final_url=final_url, body=body):
+        rendered = await state.headless_browser.arender(final_url)
+        body = _apply_spa_render(state, final_url=final_url, body=body, rendered=rendered)
+
+    state.seen_final_keys.add(final_key)
+    state.seen_final_keys.add(key)
+
+    return final_url, body
+
+
+async def _maybe_expand_when_empty_async(client: Any, run: _CrawlRun, state: _CrawlState) -> bool:
+    if not _queues_exhausted_without_pages(state):
+        return False
+    if not _nav_expand_eligible(state, next_tier_idx=run.next_tier_idx):
+        return False
+
+    if CRAWL_SEEDS_LINKED_ONLY and run.discovered_paths:
+        cand_paths = set(run.discovered_paths)
+    else:
+        cand_paths = await _build_discovered_paths_async(
+            client,
+            origin_base=run.origin_base,
+            base_host=run.base_host,
+            timeout=run.timeout,
+        )
+        cand_paths.add("/")
+
+    return _apply_nav_expansion(
+        state,
+        stage="queues_empty",
+        cand_paths=cand_paths,
+        origin_base=run.origin_base,
+        base_host=run.base_host,
+    )
+
+
+async def _crawl_loop_async(
+    client: Any,
+    run: _CrawlRun,
+    state: _CrawlState,
+    *,
+    result: Any,
+) -> None:
+    """Mirror of _crawl_loop() with awaited fetches."""
+    while (state.seed_q or state.crawl_q) and len(state.pages) < run.max_pages:
+        if _check_time_budget(state=state, start_monotonic=run.start_monotonic, stage="loop_start"):
+            break
+
+        _maybe_enqueue_more_seed_tiers(run, state)
+
+        step = _prepare_next_request(run, state)
+        if step is None:
+            continue
+        key, depth, from_seed = step
+
+        if not _pre_fetch_checks(run, state, key=key, result=result):
+            continue
+
+        if _check_time_budget(state=state, start_monotonic=run.start_monotonic, stage="pre_fetch"):
+            break
+
+        try:
+            fetched = await _fetch_html_page_async(client, run, state, key=key)
+            if fetched is None:
+                ok = not state.aborted
+            else:
+                final_url, body = fetched
+                ok = _persist_and_extract(
+                    run,
+                    state,
+                    key=key,
+                    depth=depth,
+                    from_seed=from_seed,
+                    final_url=final_url,
+                    body=body,
+                )
+        except Exception as exc:
+            log.debug("Error fetching %s: %s", key, exc)
+            ok = True
+
+        if not ok:
+            break
+
+        if await _maybe_expand_when_empty_async(client, run, state):
+            continue
+
+
+async def _crawl_domain_async(
+    client: Any, domain: str, *, result: Any = None, force: bool = False
+) -> list[Page]:
+    dom = _sanitize_domain(domain)
+    stop_min_people = max(1, int(CRAWL_SEED_STOP_MIN_PEOPLE_PAGES))
+    timeout = httpx.Timeout(CRAWL_READ_TIMEOUT_S, connect=CRAWL_CONNECT_TIMEOUT_S)
+
+    state = _CrawlState(force=bool(force))
+    state.headless_browser = _headless_lease()
+
+    start_monotonic = time.monotonic()
+    try:
+        run = await _init_run_async(
+            client,
+            state,
+            dom=dom,
+            timeout=timeout,
+            stop_min_people=stop_min_people,
+            max_pages=CRAWL_MAX_PAGES_PER_DOMAIN,
+            max_depth=CRAWL_MAX_DEPTH,
+            hints=_build_hints(),
+            start_monotonic=start_monotonic,
+            result=result,
+        )
+        if run is None:
+            return []
+
+        await _crawl_loop_async(client, run, state, result=result)
+    finally:
+        state.headless_browser = None
+
+    return _finish_run(run, state, result=result)
+
+
+async def crawl_domains_async(
+    domains: Sequence[str],
+    *,
+    concurrency: int | None = None,
+    results: Sequence[Any] | None = None,
+    force: Sequence[bool] | None = None,
+) -> list[list[Page]]:
+    """
+    Crawl many domains concurrently on the running event loop.
+
+    Returns one page list per input domain, in input order. `results` (optional)
+    is a parallel sequence of AutodiscoveryResult-like objects that receive the
+    same crawl metrics crawl_domain(..., result=...) would attach; `force`
+    (optional) is a parallel sequence of crawl_domain(..., force=...) flags.
+    """
+    n = max(1, int(concurrency or _CRAWL_DOMAINS_CONCURRENCY))
+    sem = asyncio.Semaphore(n)
+    gate = _HostGate()
+
+    headers = {"User-Agent": FETCH_USER_AGENT}
+    timeout = httpx.Timeout(CRAWL_READ_TIMEOUT_S, connect=CRAWL_CONNECT_TIMEOUT_S)
+    limits = httpx.Limits(
+        max_connections=_CRAWL_ASYNC_MAX_CONNECTIONS,
+        max_keepalive_connections=min(n, _CRAWL_ASYNC_MAX_CONNECTIONS),
+    )
+
+    async with httpx.AsyncClient(
+        follow_redirects=True,
+        headers=headers,
+        timeout=timeout,
+        limits=limits,
+    ) as raw_client:
+        client = _GatedAsyncClient(raw_client, gate)
+
+        async def _one(idx: int, domain: str) -> list[Page]:
+            result = results[idx] if results is not None and idx < len(results) else None
+            forced = bool(force[idx]) if force is not None and idx < len(force) else False
+            async with sem:
+                try:
+                    return await _crawl_domain_async(client, domain, result=result, force=forced)
+                except Exception as exc:
+                    log.warning("Concurrent crawl failed for %s: %s", domain, exc)
+                    return []
+
+        return list(await asyncio.gather(*(_one(i, d) for i, d in enumerate(domains))))
+
+
+def crawl_domains(
+    domains: Sequence[str],
+    *,
+    concurrency: int | None = None,
+    results: Sequence[Any] | None = None,
+    force: Sequence[bool] | None = None,
+) -> list[list[Page]]:
+    """
+    Synchronous entry point for the concurrent engine (for RQ tasks and scripts).
+
+    Same per-domain behavior as crawl_domain(); up to `concurrency` domains
+    (default CRAWL_DOMAINS_CONCURRENCY) are in flight at once.
+    """
+    if not domains:
+        return []
+    try:
+        return asyncio.run(
+            crawl_domains_async(domains, concurrency=concurrency, results=results, force=force)
+        )
+    finally:
+        _flush_http_cache()
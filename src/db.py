@@ -1,16 +1,22 @@
 # src/db.py
 from __future__ import annotations
 
+import csv
+import io
 import logging
 import os
 import re
-from collections.abc import Sequence
+import threading
+import time
+import uuid
+from collections.abc import Callable, Iterable, Iterator, Sequence
 from datetime import UTC, datetime
 from typing import Any
 
 try:  # Required for Postgres. Kept as optional to avoid hard import errors in tooling.
     import psycopg2  # type: ignore
     import psycopg2.extras  # type: ignore
+    import psycopg2.pool  # type: ignore
 except Exception:  # pragma: no cover
     psycopg2 = None  # type: ignore
 
@@ -157,6 +163,15 @@ _RX_PRAGMA_FK_LIST = re.compile(
 _RX_PRAGMA_FK_ENFORCE = re.compile(r"^\s*pragma\s+foreign_keys\s*(=|$)", re.IGNORECASE)
 _RX_SQLITE_MASTER = re.compile(r"\bsqlite_master\b", re.IGNORECASE)
 _RX_INSTR = re.compile(r"\binstr\s*\(", re.IGNORECASE)
+# NULL marker for CompatConnection.copy_rows (CSV COPY)
+_COPY_NULL = "\\N"
+# DDL that can change the set of tables/views/columns (invalidates the schema registry)
+_RX_SCHEMA_DDL = re.compile(
+    r"^\s*(?:create\s+(?:or\s+replace\s+)?(?:(?:temp|temporary|unlogged)\s+)?"
+    r"(?:table|view|materialized\s+view)|alter\s+table|drop\s+(?:table|view|materialized\s+view)"
+    r"|alter\s+view)\b",
+    re.IGNORECASE | re.MULTILINE,
+)
 
 
 def _normalize_ident(raw: str) -> str:
@@ -338,6 +353,9 @@ class CompatCursor:
 
         self._cursor.execute(q, params)
 
+        if self._is_pg and _RX_SCHEMA_DDL.search(q):
+            self._parent._note_schema_change()
+
         try:
             self.rowcount = int(getattr(self._cursor, "rowcount", -1))
         except Exception:
@@ -392,6 +410,18 @@ class CompatCursor:
 
         return self._cursor.fetchall()
 
+    def fetchmany(self, size: int = 1):
+        if self._emulated_rows is not None or self._prefetch is not None:
+            out = []
+            for _ in range(max(1, int(size))):
+                row = self.fetchone()
+                if row is None:
+                    break
+                out.append(row)
+            return out
+
+        return self._cursor.fetchmany(size)
+
     def __iter__(self):
         while True:
             row = self.fetchone()
@@ -416,15 +446,34 @@ class CompatConnection:
       - On Postgres: adds helpers to emulate a few SQLite introspection operations
     """
 
-    def __init__(self, conn: Any, is_pg: bool):
+    def __init__(
+        self,
+        conn: Any,
+        is_pg: bool,
+        *,
+        release: Callable[[Any], None] | None = None,
+        url: str | None = None,
+    ):
         self._conn = conn
         self._is_pg = is_pg
+        # Pooled connections: close() hands the raw connection back via release().
+        self._release = release
+        # Schema registry key; None disables process-wide schema caching.
+        self.url = url
+        # DDL ran in the current transaction: bypass the shared registry until it ends.
+        self._schema_dirty = False
 
     @property
     def is_postgres(self) -> bool:
         return bool(self._is_pg)
 
+    @property
+    def is_pooled(self) -> bool:
+        return self._release is not None
+
     def cursor(self) -> CompatCursor:
+        if self._conn is None:
+            raise RuntimeError("CompatConnection is closed (returned to the pool)")
         cur = self._conn.cursor()
         return CompatCursor(self, cur, self._is_pg)
 
@@ -433,24 +482,126 @@ class CompatConnection:
         cur.execute(sql, params or ())
         return cur
 
+    def iter_query(
+        self, sql: str, params: Sequence[Any] | None = None, *, batch_size: int | None = None
+    ) -> Iterator[Any]:
+        """
+        Stream a SELECT in fixed-size batches.
+
+        On Postgres this uses a named (server-side) cursor, so the result set is
+        never materialized client-side. SQLite uses fetchmany() on a plain cursor.
+        """
+        if self._conn is None:
+            raise RuntimeError("CompatConnection is closed (returned to the pool)")
+        size = max(1, batch_size or _env_int("DB_STREAM_BATCH", 2000))
+        if self._is_pg:
+            raw = self._conn.cursor(
+                name=f"stream_{uuid.uuid4().hex}",
+                withhold=bool(getattr(self._conn, "autocommit", False)),
+            )
+            raw.itersize = size
+            cur = CompatCursor(self, raw, True)
+        else:
+            cur = self.cursor()
+        try:
+            cur.execute(sql, params or ())
+            while True:
+                batch = cur.fetchmany(size)
+                if not batch:
+                    break
+                yield from batch
+        finally:
+            cur.close()
+
+    def copy_rows(self, table: str, columns: Sequence[str], rows: Iterable[Sequence[Any]]) -> int:
+        """
+        Bulk-load ``rows`` into ``table`` (caller commits). Postgres streams them
+        through ``COPY ... FROM STDIN`` as CSV; SQLite uses executemany().
+        Returns the number of rows sent.
+        """
+        if self._conn is None:
+            raise RuntimeError("CompatConnection is closed (returned to the pool)")
+        data = [tuple(r) for r in rows]
+        if not data:
+            return 0
+        cols_sql = ", ".join(columns)
+        if not self._is_pg:
+            phs = ", ".join("?" for _ in columns)
+            self._conn.executemany(f"INSERT INTO {table} ({cols_sql}) VALUES ({phs})", data)
+            return len(data)
+
+        buf = io.StringIO()
+        writer = csv.writer(buf, lineterminator="\n")
+        for row in data:
+            writer.writerow([_COPY_NULL if v is None else v for v in row])
+        buf.seek(0)
+        cur = self._conn.cursor()
+        try:
+            cur.copy_expert(
+                f"COPY {table} ({cols_sql}) FROM STDIN WITH (FORMAT csv, NULL '{_COPY_NULL}')",
+                buf,
+            )
+        finally:
+            cur.close()
+        return len(data)
+
     def commit(self) -> None:
         try:
             self._conn.commit()
         except Exception:
             _db_log.debug("CompatConnection.commit() failed", exc_info=True)
+        self._end_schema_txn()
 
     def rollback(self) -> None:
         try:
             self._conn.rollback()
         except Exception:
             _db_log.debug("CompatConnection.rollback() failed", exc_info=True)
+        self._end_schema_txn()
+
+    def _note_schema_change(self) -> None:
+        self._schema_dirty = True
+        schema_registry.invalidate(self.url)
+
+    def _end_schema_txn(self) -> None:
+        if self._schema_dirty:
+            self._schema_dirty = False
+            # The DDL is now visible (or rolled back): tell other processes too.
+            schema_registry.invalidate(self.url, broadcast=True)
+
+    def _schema(self) -> SchemaSnapshot | None:
+        """Registry snapshot for this connection (None if unavailable)."""
+        try:
+            return schema_registry.snapshot(self)
+        except Exception:
+            _db_log.debug("schema registry load failed", exc_info=True)
+            return None
 
     def close(self) -> None:
+        conn, release = self._conn, self._release
+        if conn is None:
+            return
+        if release is not None:
+            # Pooled: the pool rolls back any open transaction and keeps the socket.
+            self._conn = None
+            try:
+                release(conn)
+            except Exception:
+                _db_log.debug("CompatConnection.close() pool release failed", exc_info=True)
+            return
         try:
-            self._conn.close()
+            conn.close()
         except Exception:
             _db_log.debug("CompatConnection.close() failed", exc_info=True)
 
+    def __del__(self):
+        # A pooled connection that is never closed would pin a pool slot forever.
+        if getattr(self, "_release", None) is not None and getattr(self, "_conn", None):
+            try:
+                self.close()
+            except Exception:
+                pass
+
     def __enter__(self):
         return self
 
@@ -478,6 +629,9 @@ class CompatConnection:
         c = (col or "").strip()
         if not t or not c:
             return False
+        snap = self._schema()
+        if snap is not None:
+            return c in snap.column_names(t)
         q = """
             SELECT 1
             FROM information_schema.columns
@@ -500,6 +654,10 @@ class CompatConnection:
         if not t:
             return []
 
+        snap = self._schema()
+        if snap is not None:
+            return list(snap.columns.get(t, ()))
+
         q = """
             SELECT
               ordinal_position - 1 AS cid,
@@ -627,6 +785,12 @@ class CompatConnection:
         if not name:
             return []
 
+        snap = self._schema()
+        if snap is not None:
+            if _normalize_ident(name) not in snap.tables:
+                return []
+            return [(1,)] if select_one else [(name,)]
+
         want_views = bool(
             re.search(r"type\s+in\s*\(\s*'table'\s*,\s*'view'\s*\)", s, re.IGNORECASE)
         )
@@ -674,6 +838,546 @@ class CompatConnection:
 # ---------------------------------------------------------------------------
 
 
+def stream_query(
+    conn: Any, sql: str, params: Sequence[Any] | None = None, *, batch_size: int | None = None
+) -> Iterator[Any]:
+    """
+    Iterate a SELECT without loading the whole result set.
+
+    CompatConnection goes through iter_query() (server-side cursor on Postgres);
+    plain DB-API connections (sqlite3 in tests/scripts) use fetchmany() batches.
+    """
+    if isinstance(conn, CompatConnection):
+        yield from conn.iter_query(sql, params, batch_size=batch_size)
+        return
+    size = max(1, batch_size or _env_int("DB_STREAM_BATCH", 2000))
+    cur = conn.execute(sql, params or ())
+    while True:
+        batch = cur.fetchmany(size)
+        if not batch:
+            break
+        yield from batch
+
+
+# ---------------------------------------------------------------------------
+# Schema registry (process-wide catalog cache)
+# ---------------------------------------------------------------------------
+
+_SCHEMA_COLUMNS_SQL = """
+    SELECT
+      c.table_name,
+      c.ordinal_position - 1 AS cid,
+      c.column_name,
+      c.data_type,
+      CASE WHEN c.is_nullable = 'NO' THEN 1 ELSE 0 END AS notnull,
+      c.column_default,
+      CASE WHEN pk.column_name IS NOT NULL THEN 1 ELSE 0 END AS pk
+    FROM information_schema.columns c
+    LEFT JOIN (
+      SELECT kcu.table_name, kcu.column_name
+      FROM information_schema.table_constraints tc
+      JOIN information_schema.key_column_usage kcu
+        ON tc.constraint_name = kcu.constraint_name
+       AND tc.table_schema = kcu.table_schema
+      WHERE tc.table_schema = 'public' AND tc.constraint_type = 'PRIMARY KEY'
+    ) pk
+      ON pk.table_name = c.table_name AND pk.column_name = c.column_name
+    WHERE c.table_schema = 'public'
+    ORDER BY c.table_name, c.ordinal_position
+"""
+
+_SCHEMA_TABLES_SQL = """
+    SELECT table_name FROM information_schema.tables WHERE table_schema = 'public'
+"""
+
+
+class SchemaSnapshot:
+    """Tables/views and PRAGMA-shaped column rows for one database."""
+
+    __slots__ = ("columns", "tables", "loaded_at", "_names")
+
+    def __init__(self, columns: dict[str, tuple[tuple[Any, ...], ...]], tables: frozenset[str]):
+        self.columns = columns
+        self.tables = tables
+        self.loaded_at = time.monotonic()
+        self._names = {t: frozenset(str(r[1]) for r in rows) for t, rows in columns.items()}
+
+    def column_names(self, table: str) -> frozenset[str]:
+        return self._names.get(table, frozenset())
+
+
+class SchemaRegistry:
+    """
+    Process-wide cache of the Postgres catalog, keyed by database URL.
+
+    One snapshot (two catalog queries) replaces the per-call information_schema /
+    PRAGMA emulation / probe queries. Snapshots are dropped when:
+      - this process runs schema DDL through CompatConnection (CREATE/ALTER/DROP
+        TABLE or VIEW), again when that transaction ends
+      - invalidate_schema_cache() is called (e.g. after applying migrations)
+      - another process did either of the above: both bump a shared version key
+        in Redis, polled every SCHEMA_CACHE_VERSION_POLL_SEC (default 2s)
+      - they are older than SCHEMA_CACHE_TTL_SEC (default 300s), which bounds
+        staleness when Redis is unavailable
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._snapshots: dict[str, SchemaSnapshot] = {}
+        self.loads = 0
+        self.invalidations = 0
+        # Shared version (Redis); None client = process-local invalidation only
+        self._version_client: Any = None
+        self._version_client_init = False
+        self._seen_version: Any = None
+        self._version_checked_at = float("-inf")
+
+    def _ttl_s(self) -> float:
+        return _env_float("SCHEMA_CACHE_TTL_SEC", 300.0)
+
+    def set_version_client(self, client: Any) -> None:
+        """Use ``client`` (a Redis connection, or None to disable) for the shared version."""
+        with self._lock:
+            self._version_client = client
+            self._version_client_init = True
+            self._seen_version = None
+            self._version_checked_at = float("-inf")
+
+    def _client(self) -> Any:
+        if not self._version_client_init:
+            client = None
+            try:
+                from src.queueing.redis_conn import get_redis  # local import (optional dep)
+
+                client = get_redis()
+            except Exception:
+                client = None
+            with self._lock:
+                if not self._version_client_init:
+                    self._version_client = client
+                    self._version_client_init = True
+        return self._version_client
+
+    def _sync_shared_version(self) -> None:
+        """Drop every snapshot once another process has bumped the shared version."""
+        now = time.monotonic()
+        with self._lock:
+            if now - self._version_checked_at < _env_float("SCHEMA_CACHE_VERSION_POLL_SEC", 2.0):
+                return
+            self._version_checked_at = now
+        client = self._client()
+        if client is None:
+            return
+        try:
+            version = client.get(_SCHEMA_VERSION_KEY)
+        except Exception:
+            with self._lock:  # Redis down: back off, the TTL still bounds staleness
+                self._version_checked_at = now + 60.0
+            return
+        with self._lock:
+            if version != self._seen_version:
+                self._snapshots.clear()
+                self._seen_version = version
+
+    @staticmethod
+    def _load(raw_conn: Any) -> SchemaSnapshot:
+        cur = raw_conn.cursor()
+        cur.execute(_SCHEMA_COLUMNS_SQL)
+        by_table: dict[str, list[tuple[Any, ...]]] = {}
+        for table, cid, name, ctype, notnull, dflt, pk in cur.fetchall() or []:
+            by_table.setdefault(str(table), []).append((cid, name, ctype, notnull, dflt, pk))
+        cur.execute(_SCHEMA_TABLES_SQL)
+        tables = frozenset(str(r[0]) for r in (cur.fetchall() or []))
+        return SchemaSnapshot({t: tuple(rows) for t, rows in by_table.items()}, tables)
+
+    def snapshot(self, conn: CompatConnection) -> SchemaSnapshot | None:
+        if not conn.is_postgres or conn._conn is None:
+            return None
+        key = conn.url
+        if key is None or conn._schema_dirty:
+            # Unkeyed, or mid-transaction DDL: never share this view of the catalog.
+            return self._load(conn._conn)
+
+        self._sync_shared_version()
+        ttl = self._ttl_s()
+        with self._lock:
+            snap = self._snapshots.get(key)
+        if snap is not None and (ttl <= 0 or time.monotonic() - snap.loaded_at < ttl):
+            return snap
+
+        snap = self._load(conn._conn)
+        with self._lock:
+            self._snapshots[key] = snap
+            self.loads += 1
+        return snap
+
+    def invalidate(self, url: str | None = None, *, broadcast: bool = False) -> None:
+        with self._lock:
+            if url is None:
+                self._snapshots.clear()
+            else:
+                self._snapshots.pop(url, None)
+            self.invalidations += 1
+        if not broadcast:
+            return
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.incr(_SCHEMA_VERSION_KEY)
+        except Exception:
+            _db_log.debug("schema registry: version bump failed", exc_info=True)
+
+
+_SCHEMA_VERSION_KEY = "schema_registry:version"
+
+schema_registry = SchemaRegistry()
+
+
+def invalidate_schema_cache(url: str | None = None, *, broadcast: bool = True) -> None:
+    """
+    Forget cached catalog data for ``url`` (or every database). Call after
+    migrations; ``broadcast`` also makes every other process reload.
+    """
+    schema_registry.invalidate(url, broadcast=broadcast)
+
+
+def cached_schema(conn: Any) -> SchemaSnapshot | None:
+    """Registry snapshot for a Postgres CompatConnection; None for anything else."""
+    if isinstance(conn, CompatConnection):
+        return conn._schema()
+    return None
+
+
+def get_table_columns(conn: Any, table: str) -> frozenset[str]:
+    """
+    Column names of ``table`` (empty if it does not exist).
+
+    Postgres CompatConnections are served from the schema registry; SQLite and
+    other connections fall back to PRAGMA table_info.
+    """
+    t = _normalize_ident(table)
+    if not t:
+        return frozenset()
+    snap = cached_schema(conn)
+    if snap is not None:
+        return snap.column_names(t)
+    try:
+        rows = conn.execute(f"PRAGMA table_info({t})").fetchall() or []
+    except Exception:
+        return frozenset()
+    return frozenset(str(r[1]) for r in rows if r and len(r) > 1 and r[1])
+
+
+def table_exists(conn: Any, table: str) -> bool:
+    """True if ``table`` exists as a table or view."""
+    t = _normalize_ident(table)
+    if not t:
+        return False
+    snap = cached_schema(conn)
+    if snap is not None:
+        return t in snap.tables
+    try:
+        row = conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type IN ('table','view') AND name = ?", (t,)
+        ).fetchone()
+    except Exception:
+        return False
+    return row is not None
+
+
+def column_exists(conn: Any, table: str, column: str) -> bool:
+    return (column or "").strip() in get_table_columns(conn, table)
+
+
+# ---------------------------------------------------------------------------
+# Connection pooling (Postgres)
+# ---------------------------------------------------------------------------
+
+
+def _env_int(name: str, default: int) -> int:
+    try:
+        return int((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float((os.getenv(name) or "").strip() or default)
+    except ValueError:
+        return default
+
+
+def _pool_enabled() -> bool:
+    return (os.getenv("DB_POOL_ENABLED") or "1").strip().lower() not in {"0", "false", "no", "off"}
+
+
+class PgPool:
+    """
+    Per-process pool of psycopg2 connections behind get_conn().
+
+      - DB_POOL_MIN / DB_POOL_MAX        pool sizing (default 1 / 10)
+      - DB_POOL_TIMEOUT_SEC              wait for a free connection (default 30s)
+      - DB_POOL_HEALTHCHECK_IDLE_SEC     SELECT 1 on checkout after this much idle time
+      - DB_POOL_MAX_LIFETIME_SEC         recycle connections older than this (0 = never)
+
+    Session settings (UTC time zone, DictCursor) are applied once per physical
+    connection instead of on every get_conn(). Returned connections are rolled
+    back by psycopg2's pool if a transaction was left open.
+
+    Failure mode: a first checkout on a thread waits up to DB_POOL_TIMEOUT_SEC
+    for a free connection and then raises RuntimeError("DB pool exhausted"),
+    where unpooled get_conn() would simply have opened another connection.
+    Nested checkouts (a thread that already holds a pooled connection calls
+    get_conn() again, e.g. resolve_mx -> MXCache) never wait: when the pool is
+    full they get an overflow connection that is closed on release, so a
+    thread can't deadlock on itself and keeps its own transaction per call.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        *,
+        minconn: int | None = None,
+        maxconn: int | None = None,
+        timeout_s: float | None = None,
+        healthcheck_idle_s: float | None = None,
+        max_lifetime_s: float | None = None,
+        pool_factory: Callable[..., Any] | None = None,
+    ):
+        self.url = url
+        self.maxconn = max(1, maxconn or _env_int("DB_POOL_MAX", 10))
+        self.minconn = max(0, min(self.maxconn, _env_int("DB_POOL_MIN", 1)))
+        if minconn is not None:
+            self.minconn = max(0, min(self.maxconn, minconn))
+        self.timeout_s = _env_float("DB_POOL_TIMEOUT_SEC", 30.0) if timeout_s is None else timeout_s
+        self.healthcheck_idle_s = (
+            _env_float("DB_POOL_HEALTHCHECK_IDLE_SEC", 30.0)
+            if healthcheck_idle_s is None
+            else healthcheck_idle_s
+        )
+        self.max_lifetime_s = (
+            _env_float("DB_POOL_MAX_LIFETIME_SEC", 3600.0)
+            if max_lifetime_s is None
+            else max_lifetime_s
+        )
+        self.pid = os.getpid()
+
+        factory = pool_factory or psycopg2.pool.ThreadedConnectionPool  # type: ignore[union-attr]
+        kwargs: dict[str, Any] = {}
+        if pool_factory is None:
+            kwargs["cursor_factory"] = psycopg2.extras.DictCursor  # type: ignore[union-attr]
+        self._pool = factory(self.minconn, self.maxconn, url, **kwargs)
+        # psycopg2 pre-opens ``minconn`` but also closes any returned connection beyond
+        # ``minconn`` idle ones; keep up to ``maxconn`` warm instead.
+        self._pool.minconn = self.maxconn
+        self._slots = threading.BoundedSemaphore(self.maxconn)
+        self._lock = threading.Lock()
+        # id(raw conn) -> [created_at, last_used_at]
+        self._meta: dict[int, list[float]] = {}
+        # Checked-out connections per thread, and each connection's owner thread
+        self._held: dict[int, int] = {}
+        self._owner: dict[int, int] = {}
+        # id(raw conn) of nested-checkout connections opened beyond maxconn
+        self._overflow: set[int] = set()
+
+        self.checkouts = 0
+        self.connections_opened = 0
+        self.discarded = 0
+        self.overflow_opened = 0
+
+    # ---- checkout / checkin ------------------------------------------------
+
+    def _init_session(self, conn: Any) -> None:
+        try:
+            conn.autocommit = False
+        except Exception:
+            pass
+        # Best-effort: enforce UTC session timezone to reduce surprises
+        try:
+            cur = conn.cursor()
+            cur.execute("SET TIME ZONE 'UTC'")
+            conn.commit()
+        except Exception:
+            pass
+
+    def _usable(self, conn: Any, meta: list[float] | None, now: float) -> bool:
+        if getattr(conn, "closed", 0):
+            return False
+        if meta is None:
+            return True
+        if self.max_lifetime_s > 0 and now - meta[0] > self.max_lifetime_s:
+            return False
+        if now - meta[1] < self.healthcheck_idle_s:
+            return True
+        try:
+            cur = conn.cursor()
+            cur.execute("SELECT 1")
+            cur.fetchone()
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _discard(self, conn: Any) -> None:
+        with self._lock:
+            self._meta.pop(id(conn), None)
+            self.discarded += 1
+        try:
+            self._pool.putconn(conn, close=True)
+        except Exception:
+            _db_log.debug("PgPool discard failed", exc_info=True)
+
+    def _track(self, conn: Any) -> Any:
+        ident = threading.get_ident()
+        with self._lock:
+            self._held[ident] = self._held.get(ident, 0) + 1
+            self._owner[id(conn)] = ident
+        return conn
+
+    def _untrack(self, conn: Any) -> None:
+        with self._lock:
+            ident = self._owner.pop(id(conn), None)
+            if ident is not None:
+                left = self._held.get(ident, 0) - 1
+                if left > 0:
+                    self._held[ident] = left
+                else:
+                    self._held.pop(ident, None)
+
+    def _open_overflow(self) -> Any:
+        conn = psycopg2.connect(  # type: ignore[union-attr]
+            self.url, cursor_factory=psycopg2.extras.DictCursor
+        )
+        self._init_session(conn)
+        with self._lock:
+            self._overflow.add(id(conn))
+            self.overflow_opened += 1
+            self.checkouts += 1
+        return conn
+
+    def acquire(self) -> Any:
+        with self._lock:
+            nested = self._held.get(threading.get_ident(), 0) > 0
+        if nested:
+            if not self._slots.acquire(blocking=False):
+                return self._track(self._open_overflow())
+        elif not self._slots.acquire(timeout=max(0.0, self.timeout_s)):
+            raise RuntimeError(
+                f"DB pool exhausted: no connection available within {self.timeout_s:.1f}s "
+                f"(DB_POOL_MAX={self.maxconn})"
+            )
+        try:
+            for _ in range(self.maxconn + 1):
+                conn = self._pool.getconn()
+                now = time.monotonic()
+                with self._lock:
+                    meta = self._meta.get(id(conn))
+                if not self._usable(conn, meta, now):
+                    self._discard(conn)
+                    continue
+                if meta is None:
+                    self._init_session(conn)
+                    with self._lock:
+                        self._meta[id(conn)] = [now, now]
+                        self.connections_opened += 1
+                with self._lock:
+                    self.checkouts += 1
+                return self._track(conn)
+            raise RuntimeError("DB pool could not provide a healthy connection")
+        except BaseException:
+            self._slots.release()
+            raise
+
+    def release(self, conn: Any) -> None:
+        self._untrack(conn)
+        with self._lock:
+            overflow = id(conn) in self._overflow
+            self._overflow.discard(id(conn))
+        if overflow:
+            try:
+                conn.close()
+            except Exception:
+                _db_log.debug("PgPool overflow close failed", exc_info=True)
+            return
+        try:
+            if getattr(conn, "closed", 0):
+                self._discard(conn)
+                return
+            with self._lock:
+                meta = self._meta.get(id(conn))
+                if meta is not None:
+                    meta[1] = time.monotonic()
+            self._pool.putconn(conn)
+            if getattr(conn, "closed", 0):  # closed by the pool (broken transaction state)
+                with self._lock:
+                    self._meta.pop(id(conn), None)
+        except Exception:
+            _db_log.debug("PgPool release failed", exc_info=True)
+        finally:
+            self._slots.release()
+
+    def connection(self) -> CompatConnection:
+        return CompatConnection(self.acquire(), is_pg=True, release=self.release, url=self.url)
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            return {
+                "minconn": self.minconn,
+                "maxconn": self.maxconn,
+                "open": len(self._meta),
+                "checkouts": self.checkouts,
+                "connections_opened": self.connections_opened,
+                "discarded": self.discarded,
+                "overflow_opened": self.overflow_opened,
+            }
+
+    def closeall(self) -> None:
+        try:
+            self._pool.closeall()
+        except Exception:
+            _db_log.debug("PgPool.closeall() failed", exc_info=True)
+        with self._lock:
+            self._meta.clear()
+
+
+_pg_pools: dict[str, PgPool] = {}
+_pg_pools_lock = threading.Lock()
+
+
+def _get_pg_pool(url: str) -> PgPool:
+    """
+    The process-wide pool for ``url``. After fork() the inherited sockets belong
+    to the parent, so the child drops (without closing) and builds its own.
+    """
+    with _pg_pools_lock:
+        pool = _pg_pools.get(url)
+        if pool is not None and pool.pid != os.getpid():
+            pool = None
+        if pool is None:
+            pool = PgPool(url)
+            _pg_pools[url] = pool
+        return pool
+
+
+def db_pool_stats() -> dict[str, dict[str, Any]]:
+    """Pool counters for this process, keyed by (redacted) database URL."""
+    with _pg_pools_lock:
+        pools = [(u, p) for u, p in _pg_pools.items() if p.pid == os.getpid()]
+    return {re.sub(r"//[^@/]*@", "//***@", u): p.stats() for u, p in pools}
+
+
+def close_db_pools() -> None:
+    """Close every pooled connection owned by this process (shutdown / tests)."""
+    with _pg_pools_lock:
+        pools = list(_pg_pools.values())
+        _pg_pools.clear()
+    for p in pools:
+        if p.pid == os.getpid():
+            p.closeall()
+
+
 def get_conn() -> CompatConnection:
     """
     Primary DB access point.
@@ -684,6 +1388,10 @@ def get_conn() -> CompatConnection:
         compatibility layer can smooth over any remaining SQLite-isms during the
         migration window (qmark placeholders, INSERT OR IGNORE, a few PRAGMAs).
 
+    Postgres connections come from a per-process PgPool (DB_POOL_ENABLED=0 to
+    connect per call). Callers keep the same contract: use the connection as a
+    context manager or call close(); close() returns it to the pool.
+
     Dev escape hatch:
       - If ALLOW_SQLITE_DEV=1 is set, SQLite can be used for legacy local workflows.
         This is not supported for production.
@@ -697,6 +1405,9 @@ def get_conn() -> CompatConnection:
                 "Install psycopg2-binary (or psycopg2) to enable Postgres."
             )
 
+        if _pool_enabled():
+            return _get_pg_pool(url).connection()
+
         conn = psycopg2.connect(  # type: ignore[call-arg]
             url,
             cursor_factory=psycopg2.extras.DictCursor,
@@ -713,7 +1424,7 @@ def get_conn() -> CompatConnection:
         except Exception:
             pass
 
-        return CompatConnection(conn, is_pg=True)
+        return CompatConnection(conn, is_pg=True, url=url)
 
     if not ALLOW_SQLITE_DEV:
         raise RuntimeError(
@@ -1130,6 +1841,187 @@ def enqueue_probe_email(email_id: int, email: str, domain: str, force: bool = Fa
         return
 
 
+# ---------------------------------------------------------------------------
+# emails_latest (maintained "latest verification per email" table)
+# ---------------------------------------------------------------------------
+
+# Must match the ordering v_emails_latest has always used to pick a row.
+_LATEST_VR_ORDER = "COALESCE(verified_at, checked_at) DESC NULLS FIRST, id DESC"
+
+_EMAILS_LATEST_EXPECTED_SQL = f"""
+    SELECT tenant_id, email_id, id AS verification_result_id
+    FROM (
+      SELECT
+        tenant_id,
+        email_id,
+        id,
+        ROW_NUMBER() OVER (
+          PARTITION BY tenant_id, email_id ORDER BY {_LATEST_VR_ORDER}
+        ) AS rn
+      FROM verification_results
+      {{where}}
+    ) AS ranked
+    WHERE rn = 1
+"""
+
+
+# "cur" (the row emails_latest points at) sorts before "nxt" in _LATEST_VR_ORDER.
+_LATEST_VR_AHEAD = """
+    (COALESCE(cur.verified_at, cur.checked_at) IS NULL
+       AND COALESCE(nxt.verified_at, nxt.checked_at) IS NOT NULL)
+    OR (COALESCE(cur.verified_at, cur.checked_at) IS NULL
+       AND COALESCE(nxt.verified_at, nxt.checked_at) IS NULL AND cur.id > nxt.id)
+    OR COALESCE(cur.verified_at, cur.checked_at) > COALESCE(nxt.verified_at, nxt.checked_at)
+    OR (COALESCE(cur.verified_at, cur.checked_at) = COALESCE(nxt.verified_at, nxt.checked_at)
+       AND cur.id > nxt.id)
+"""
+
+
+def refresh_email_latest(conn: Any, email_id: int, *, tenant_id: str) -> bool:
+    """
+    Re-point emails_latest for one email at its latest verification result.
+
+    Called from upsert_verification_result(); cost is one indexed lookup on
+    verification_results(tenant_id, email_id) plus one upsert. The upsert is a
+    single statement whose DO UPDATE only moves the pointer forward in the
+    canonical ordering, so two concurrent refreshes cannot leave it on a row the
+    other one superseded. Returns False if the emails_latest table does not
+    exist (older schemas / SQLite dev).
+    """
+    if not table_exists(conn, "emails_latest"):
+        return False
+
+    cur = conn.execute(
+        f"""
+        INSERT INTO emails_latest (tenant_id, email_id, verification_result_id, updated_at)
+        SELECT tenant_id, email_id, id, ?
+        FROM verification_results
+        WHERE tenant_id = ? AND email_id = ?
+        ORDER BY {_LATEST_VR_ORDER}
+        LIMIT 1
+        ON CONFLICT (tenant_id, email_id) DO UPDATE SET
+          verification_result_id = excluded.verification_result_id,
+          updated_at = excluded.updated_at
+        WHERE emails_latest.verification_result_id <> excluded.verification_result_id
+          AND NOT EXISTS (
+            SELECT 1
+            FROM verification_results AS cur, verification_results AS nxt
+            WHERE cur.id = emails_latest.verification_result_id
+              AND nxt.id = excluded.verification_result_id
+              AND ({_LATEST_VR_AHEAD})
+          )
+        """,
+        (_now_iso_z(), tenant_id, int(email_id)),
+    )
+    if int(getattr(cur, "rowcount", 0) or 0) == 0:
+        # Nothing inserted/updated: either the pointer is already current, or the
+        # email has no results left, in which case the pointer must go.
+        conn.execute(
+            """
+            DELETE FROM emails_latest
+            WHERE tenant_id = ? AND email_id = ?
+              AND NOT EXISTS (
+                SELECT 1 FROM verification_results
+                WHERE tenant_id = ? AND email_id = ?
+              )
+            """,
+            (tenant_id, int(email_id), tenant_id, int(email_id)),
+        )
+    return True
+
+
+def refresh_emails_latest_for(conn: Any, pairs: Iterable[tuple[str, int]]) -> int:
+    """
+    Re-point emails_latest for each (tenant_id, email_id) in ``pairs``.
+
+    Call after deleting a subset of an email's verification_results: the FK
+    cascade drops the pointer with the deleted row even when older results
+    remain. Returns the number of distinct emails refreshed.
+    """
+    seen = {(str(t), int(e)) for t, e in pairs if e is not None}
+    for tenant, email_id in sorted(seen):
+        refresh_email_latest(conn, email_id, tenant_id=tenant)
+    return len(seen)
+
+
+def rebuild_emails_latest(conn: Any, *, tenant_id: str | None = None) -> int:
+    """
+    Recompute emails_latest from verification_results (all tenants, or one).
+
+    Runs in the caller's transaction; returns the number of rows written.
+    """
+    where, params = ("WHERE tenant_id = ?", (tenant_id,)) if tenant_id else ("", ())
+    conn.execute(f"DELETE FROM emails_latest {where}", params)
+    cur = conn.execute(
+        "INSERT INTO emails_latest (tenant_id, email_id, verification_result_id, updated_at) "
+        "SELECT tenant_id, email_id, verification_result_id, ? "
+        f"FROM ({_EMAILS_LATEST_EXPECTED_SQL.format(where=where)}) AS expected",
+        (_now_iso_z(), *params),
+    )
+    return max(int(getattr(cur, "rowcount", 0) or 0), 0)
+
+
+def check_emails_latest(
+    conn: Any, *, tenant_id: str | None = None, sample_size: int = 20
+) -> dict[str, Any]:
+    """
+    Compare emails_latest with what v_emails_latest used to compute on the fly.
+
+    Returns counts of missing rows (email has results but no pointer), stale
+    rows (pointer at a non-latest result) and extra rows (pointer but no
+    results), plus up to ``sample_size`` examples of each.
+    """
+    where, params = ("WHERE tenant_id = ?", (tenant_id,)) if tenant_id else ("", ())
+    el_where = "WHERE el.tenant_id = ?" if tenant_id else ""
+    expected = _EMAILS_LATEST_EXPECTED_SQL.format(where=where)
+
+    report: dict[str, Any] = {"missing": 0, "stale": 0, "extra": 0, "samples": []}
+
+    def _note(kind: str, tenant: Any, email: Any, have: Any, want: Any) -> None:
+        report[kind] += 1
+        if len(report["samples"]) < sample_size:
+            report["samples"].append(
+                {
+                    "kind": kind,
+                    "tenant_id": tenant,
+                    "email_id": email,
+                    "verification_result_id": have,
+                    "expected_verification_result_id": want,
+                }
+            )
+
+    for r in stream_query(
+        conn,
+        f"""
+        SELECT x.tenant_id, x.email_id, el.verification_result_id, x.verification_result_id
+        FROM ({expected}) AS x
+        LEFT JOIN emails_latest AS el
+          ON el.tenant_id = x.tenant_id AND el.email_id = x.email_id
+        WHERE el.verification_result_id IS NULL
+           OR el.verification_result_id <> x.verification_result_id
+        """,
+        params,
+    ):
+        _note("missing" if r[2] is None else "stale", r[0], r[1], r[2], r[3])
+
+    for r in stream_query(
+        conn,
+        f"""
+        SELECT el.tenant_id, el.email_id, el.verification_result_id
+        FROM emails_latest AS el
+        LEFT JOIN ({expected}) AS x
+          ON x.tenant_id = el.tenant_id AND x.email_id = el.email_id
+        {el_where}
+        {"AND" if el_where else "WHERE"} x.email_id IS NULL
+        """,
+        params + params,
+    ):
+        _note("extra", r[0], r[1], r[2], None)
+
+    report["ok"] = not (report["missing"] or report["stale"] or report["extra"])
+    return report
+
+
 # ---------------------------------------------------------------------------
 # Core write paths (tenant-aware + schema-aware)
 # ---------------------------------------------------------------------------
@@ -1360,6 +2252,8 @@ def upsert_verification_result(
                     f"INSERT INTO verification_results ({cols_sql}) VALUES ({ph})",
                     tuple(insert_vals),
                 )
+                if "tenant_id" in ver_cols:
+                    refresh_email_latest(conn, int(email_id), tenant_id=t)
             return
 
         # Legacy fallback: update emails columns if they exist (older schemas)
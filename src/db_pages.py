@@ -6,6 +6,8 @@ from collections.abc import Iterable
 from datetime import UTC, datetime
 from typing import Any
 
+from src import page_store
+
 
 def _env_tenant_id() -> str:
     return os.environ.get("TENANT_ID") or os.environ.get("TENANT") or "dev"
@@ -126,17 +128,22 @@ def _build_insert_payload(
     *,
     cols: set[str],
     url: str,
-    html_text: str,
+    html_text: str | None,
     effective_tenant: str | None,
     company_id: int | None,
     status_col: str | None,
     status_code: int | None,
     content_type: str | None,
     now: str,
+    html_sha256: str | None = None,
 ) -> tuple[list[str], list[Any]]:
     insert_cols: list[str] = ["source_url", "html"]
     insert_vals: list[Any] = [url, html_text]
 
+    if html_sha256 is not None:
+        insert_cols.append("html_sha256")
+        insert_vals.append(html_sha256)
+
     if "tenant_id" in cols and effective_tenant is not None:
         insert_cols.append("tenant_id")
         insert_vals.append(effective_tenant)
@@ -165,16 +172,21 @@ def _update_existing_source(
     *,
     cols: set[str],
     existing_id: Any,
-    html_text: str,
+    html_text: str | None,
     company_id: int | None,
     status_col: str | None,
     status_code: int | None,
     content_type: str | None,
     now: str,
+    html_sha256: str | None = None,
 ) -> None:
     set_parts: list[str] = ["html = ?"]
     vals: list[Any] = [html_text]
 
+    if html_sha256 is not None:
+        set_parts.append("html_sha256 = ?")
+        vals.append(html_sha256)
+
     if "company_id" in cols and company_id is not None:
         set_parts.append("company_id = ?")
         vals.append(company_id)
@@ -221,6 +233,9 @@ def save_pages(
       * Stay robust to schema drift (extra/optional columns).
       * Avoid uncontrolled duplication even when the table does not have a
         UNIQUE constraint on source_url by performing a manual upsert.
+      * When the schema has the page store (page_blobs + sources.html_sha256),
+        write the body once per distinct content as a compressed blob and
+        point the row at it instead of storing html inline.
 
     Returns a best-effort count of pages processed (inserted or updated).
     """
@@ -232,6 +247,9 @@ def save_pages(
     has_tenant_id = "tenant_id" in cols
     status_col = _status_column(cols)
     effective_tenant = _effective_tenant(has_tenant_id, tenant_id)
+    use_store = "html_sha256" in cols and page_store.store_enabled(conn)
+    inline = not use_store or page_store.keep_inline()
+    known_blobs: set[str] = set()
 
     now = datetime.now(UTC).replace(microsecond=0).isoformat()
     written = 0
@@ -245,6 +263,9 @@ def save_pages(
         if html_text is None:
             continue
 
+        sha = page_store.put_blob(conn, html_text, known=known_blobs) if use_store else None
+        stored_html = html_text if inline else None
+
         status_code = _page_status_code(page) if status_col else None
         content_type = _page_content_type(page)
 
@@ -261,12 +282,13 @@ def save_pages(
                 conn,
                 cols=cols,
                 existing_id=existing_id,
-                html_text=html_text,
+                html_text=stored_html,
                 company_id=company_id,
                 status_col=status_col,
                 status_code=status_code,
                 content_type=content_type,
                 now=now,
+                html_sha256=sha,
             )
             written += 1
             continue
@@ -274,13 +296,14 @@ def save_pages(
         insert_cols, insert_vals = _build_insert_payload(
             cols=cols,
             url=url,
-            html_text=html_text,
+            html_text=stored_html,
             effective_tenant=effective_tenant,
             company_id=company_id,
             status_col=status_col,
             status_code=status_code,
             content_type=content_type,
             now=now,
+            html_sha256=sha,
         )
         _insert_new_source(conn, insert_cols=insert_cols, insert_vals=insert_vals)
         written += 1
@@ -136,6 +136,68 @@ def is_email_suppressed(
     return cur.fetchone() is not None
 
 
+class SuppressionSet:
+    """
+    A tenant's active suppressions, loaded once for bulk membership checks.
+
+    Same semantics as is_email_suppressed(): an address matches on email,
+    email_hash or its domain, whichever columns the schema has.
+    """
+
+    __slots__ = ("emails", "email_hashes", "domains")
+
+    def __init__(
+        self,
+        emails: set[str] | None = None,
+        email_hashes: set[str] | None = None,
+        domains: set[str] | None = None,
+    ) -> None:
+        self.emails = emails or set()
+        self.email_hashes = email_hashes or set()
+        self.domains = domains or set()
+
+    def __len__(self) -> int:
+        return len(self.emails) + len(self.email_hashes) + len(self.domains)
+
+    def is_suppressed(self, email: str) -> bool:
+        normalized = _normalize_email(email)
+        _, _, domain = normalized.partition("@")
+        if domain and _normalize_domain(domain) in self.domains:
+            return True
+        if normalized in self.emails:
+            return True
+        return bool(self.email_hashes) and hash_email(normalized) in self.email_hashes
+
+    __contains__ = is_suppressed
+
+
+def load_suppression_set(conn: Any, *, tenant_id: str | None = None) -> SuppressionSet:
+    """
+    Load every active suppression row for the tenant in a single query.
+
+    Used by bulk callers (exports) in place of one is_email_suppressed() query
+    per address.
+    """
+    t = tenant_id or _env_tenant_id()
+    cols = _suppression_columns(conn)
+    keys = [c for c in ("email", "email_hash", "domain") if c in cols]
+    out = SuppressionSet()
+    if not keys:
+        return out
+
+    where = "tenant_id = ?" if "tenant_id" in cols else "1 = 1"
+    params: tuple[Any, ...] = (t,) if "tenant_id" in cols else ()
+    sql = f"SELECT {', '.join(keys)} FROM suppression WHERE {where}{_active_clause(cols)}"
+
+    targets = {"email": out.emails, "email_hash": out.email_hashes, "domain": out.domains}
+    for row in conn.execute(sql, params).fetchall() or []:
+        for i, key in enumerate(keys):
+            value = row[i]
+            if value:
+                targets[key].add(str(value))
+    return out
+
+
 def is_domain_suppressed(
     conn: Any,
     domain: str,
@@ -18,8 +18,12 @@ Key decisions:
 
 This module layers on top of:
   - src.export.policy.ExportPolicy (O10)
-  - src.db_suppression.is_email_suppressed (R19/O11)
+  - src.db_suppression.load_suppression_set (R19/O11)
   - v_emails_latest DB view (R18 wiring)
+
+Suppression is applied as a set operation: the tenant's active suppressions
+are loaded once and candidates are checked in memory, while candidate rows
+are streamed in fixed-size batches (server-side cursor on Postgres).
 """
 
 from __future__ import annotations
@@ -32,7 +36,8 @@ from pathlib import Path
 
 import yaml
 
-from src.db_suppression import is_email_suppressed
+from src.db import stream_query
+from src.db_suppression import load_suppression_set
 from src.export.policy import ExportPolicy
 
 
@@ -50,7 +55,9 @@ class ExportLead:
     verified_at: str | None  # ISO 8601 string from DB
 
 
-def iter_candidate_rows(conn: sqlite3.Connection) -> Iterable[sqlite3.Row]:
+def iter_candidate_rows(
+    conn: sqlite3.Connection, *, batch_size: int | None = None
+) -> Iterable[sqlite3.Row]:
     """
     Raw candidate rows from v_emails_latest, with the columns we need for export.
 
@@ -60,9 +67,12 @@ def iter_candidate_rows(conn: sqlite3.Connection) -> Iterable[sqlite3.Row]:
       - company_name, company_domain
       - source_url (coalesced email/person/source URL)
       - icp_score, verify_status, verified_at
+
+    Rows are streamed in batches of ``batch_size`` (DB_STREAM_BATCH by default).
     """
     conn.row_factory = sqlite3.Row
-    cur = conn.execute(
+    yield from stream_query(
+        conn,
         """
         SELECT
             email,
@@ -83,9 +93,9 @@ def iter_candidate_rows(conn: sqlite3.Connection) -> Iterable[sqlite3.Row]:
             last_name,
             first_name,
             email
-        """
+        """,
+        batch_size=batch_size,
     )
-    yield from cur
 
 
 def _load_export_policy(policy_name: str) -> ExportPolicy:
@@ -174,6 +184,9 @@ def _load_export_policy(policy_name: str) -> ExportPolicy:
 def iter_exportable_leads(
     conn: sqlite3.Connection,
     policy_name: str = "default",
+    *,
+    tenant_id: str | None = None,
+    batch_size: int | None = None,
 ) -> Iterable[ExportLead]:
     """
     Yield ExportLead objects that pass:
@@ -183,16 +196,20 @@ def iter_exportable_leads(
 
     The ExportPolicy instance is loaded from docs/icp-schema.yaml via
     _load_export_policy(policy_name).
+
+    Suppressions for the tenant are loaded once up front, so the cost is one
+    query plus the streamed candidate rows rather than a query per lead.
     """
     policy = _load_export_policy(policy_name)
+    suppressed = load_suppression_set(conn, tenant_id=tenant_id)
 
-    for row in iter_candidate_rows(conn):
+    for row in iter_candidate_rows(conn, batch_size=batch_size):
         email = row["email"]
         if not email:
             continue
 
         # 1) Hard suppression (global + CRM)
-        if is_email_suppressed(conn, email):
+        if email in suppressed:
             continue
 
         # 2) Export policy gates (verify_status + icp_score + role rules, etc.).
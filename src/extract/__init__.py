@@ -2,6 +2,7 @@
 from __future__ import annotations
 
 from .candidates import Candidate, extract_candidates
+from .parsed_page import ParsedPage
 
 """
 R11: Candidate extractor slice.
@@ -12,10 +13,11 @@ This package exposes the pure HTML → candidate extractor for pulling
 Public API:
 - extract_candidates(html: str, source_url: str, official_domain: str | None) -> list[Candidate]
 - Candidate: dataclass describing a single extracted candidate.
+- ParsedPage: lazily parsed page (soup/text/headings/anchors) shared across extractors.
 
 Implementation lives in .candidates; this __init__ re-exports the stable API.
 """
 
-__all__ = ["Candidate", "extract_candidates"]
+__all__ = ["Candidate", "ParsedPage", "extract_candidates"]
 
 __version__ = "0.1.0"
@@ -0,0 +1,270 @@
+# src/extract/ai_cache.py
+"""
+Persistent cache for AI (chat completion) responses.
+
+The refiner and the direct HTML extractor in ai_candidates.py send the same
+prompts again whenever a company is re-run over unchanged pages. Responses
+are cached on local disk (SQLite, WAL) keyed by a SHA-256 over
+(model, response_format, messages), so a repeated prompt costs neither the
+round-trip nor the tokens.
+
+  - Entries expire after AI_CACHE_TTL_SEC.
+  - Total stored bytes are bounded by AI_CACHE_MAX_BYTES; least recently
+    used entries are evicted first.
+  - Only responses that parse as a JSON object are stored (see
+    ai_candidates._call_refiner), so a malformed reply is retried next time.
+  - Each entry remembers the tokens its original call used, so hits report
+    tokens saved. Per-process counters are in AIResponseCache.stats; the
+    current thread's last lookup is available via last_lookup() for per-call
+    metrics.
+
+Point AI_CACHE_DB at a shared path so every worker on a host reuses entries.
+
+Env:
+  AI_CACHE_ENABLED     "0" disables the cache (default on)
+  AI_CACHE_DB          SQLite path (default data/ai_cache.db)
+  AI_CACHE_TTL_SEC     entry lifetime (default 30 days)
+  AI_CACHE_MAX_BYTES   stored-bytes budget (default 128 MiB)
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any
+
+AI_CACHE_ENABLED = os.getenv("AI_CACHE_ENABLED", "1").strip().lower() not in {"0", "false", "no"}
+AI_CACHE_DB = os.getenv("AI_CACHE_DB", "data/ai_cache.db")
+AI_CACHE_TTL_SEC = float(os.getenv("AI_CACHE_TTL_SEC", str(30 * 86400)))
+AI_CACHE_MAX_BYTES = int(os.getenv("AI_CACHE_MAX_BYTES", str(128 * 1024 * 1024)))
+
+# Fraction of the budget kept after an eviction pass (avoids evicting on every put)
+_EVICT_TARGET_RATIO = 0.9
+# accessed_at is only rewritten when older than this (cuts write traffic on hot keys)
+_TOUCH_GRANULARITY_SEC = 60.0
+
+
+def cache_key(model: str, messages: list[dict[str, Any]], *, response_format: str = "") -> str:
+    """Stable key for one completion request."""
+    blob = json.dumps(
+        {"model": model, "response_format": response_format, "messages": messages},
+        ensure_ascii=False,
+        sort_keys=True,
+        separators=(",", ":"),
+    )
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+# --------------------------------------------------------------------------------------
+# Stats
+# --------------------------------------------------------------------------------------
+
+
+@dataclass
+class AICacheStats:
+    hits: int = 0
+    misses: int = 0  # includes expired entries
+    expired: int = 0
+    stores: int = 0
+    evictions: int = 0
+    tokens_saved: int = 0  # tokens the original calls used, summed over hits
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = dataclasses.asdict(self)
+        lookups = self.hits + self.misses
+        out["hit_ratio"] = (self.hits / lookups) if lookups else 0.0
+        return out
+
+
+@dataclass(frozen=True)
+class Lookup:
+    """Outcome of the calling thread's most recent get()."""
+
+    hit: bool = False
+    tokens_saved: int = 0
+
+
+_local = threading.local()
+
+
+def last_lookup() -> Lookup:
+    return getattr(_local, "lookup", None) or Lookup()
+
+
+def reset_last_lookup() -> None:
+    _local.lookup = Lookup()
+
+
+# --------------------------------------------------------------------------------------
+# Storage
+# --------------------------------------------------------------------------------------
+
+
+class AIResponseCache:
+    """SQLite-backed response cache with TTL and LRU-by-bytes eviction."""
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        *,
+        ttl_s: float | None = None,
+        max_bytes: int | None = None,
+    ):
+        self.db_path = db_path or AI_CACHE_DB
+        self.ttl_s = AI_CACHE_TTL_SEC if ttl_s is None else float(ttl_s)
+        self.max_bytes = AI_CACHE_MAX_BYTES if max_bytes is None else int(max_bytes)
+        self.stats = AICacheStats()
+        self._lock = threading.RLock()
+        if self.db_path != ":memory:":
+            parent = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(parent, exist_ok=True)
+        self._cx = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
+        self._cx.execute("PRAGMA journal_mode=WAL;")
+        self._cx.execute("PRAGMA synchronous=NORMAL;")
+        self._ensure_schema()
+
+    def _ensure_schema(self) -> None:
+        self._cx.execute(
+            """
+            CREATE TABLE IF NOT EXISTS ai_responses (
+              key TEXT PRIMARY KEY,
+              model TEXT NOT NULL,
+              content TEXT NOT NULL,
+              total_tokens INTEGER NOT NULL DEFAULT 0,
+              size INTEGER NOT NULL DEFAULT 0,
+              created_at REAL NOT NULL,
+              expires_at REAL NOT NULL,
+              accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._cx.execute(
+            "CREATE INDEX IF NOT EXISTS idx_ai_responses_accessed ON ai_responses(accessed_at)"
+        )
+        self._cx.commit()
+
+    def get(self, key: str) -> str | None:
+        now = time.time()
+        with self._lock:
+            row = self._cx.execute(
+                "SELECT content, total_tokens, expires_at, accessed_at "
+                "FROM ai_responses WHERE key=?",
+                (key,),
+            ).fetchone()
+            if row is not None and float(row[2]) <= now:
+                self._cx.execute("DELETE FROM ai_responses WHERE key=?", (key,))
+                self._cx.commit()
+                self.stats.expired += 1
+                row = None
+            if row is None:
+                self.stats.misses += 1
+                _local.lookup = Lookup()
+                return None
+            if now - float(row[3]) >= _TOUCH_GRANULARITY_SEC:
+                self._cx.execute("UPDATE ai_responses SET accessed_at=? WHERE key=?", (now, key))
+                self._cx.commit()
+            tokens = int(row[1] or 0)
+            self.stats.hits += 1
+            self.stats.tokens_saved += tokens
+        _local.lookup = Lookup(hit=True, tokens_saved=tokens)
+        return str(row[0])
+
+    def put(self, key: str, content: str, *, model: str, total_tokens: int = 0) -> None:
+        now = time.time()
+        size = len(content.encode("utf-8"))
+        with self._lock:
+            self._cx.execute(
+                """
+                INSERT INTO ai_responses (
+                  key, model, content, total_tokens, size, created_at, expires_at, accessed_at
+                )
+                VALUES (?,?,?,?,?,?,?,?)
+                ON CONFLICT (key) DO UPDATE SET
+                  model=excluded.model,
+                  content=excluded.content,
+                  total_tokens=excluded.total_tokens,
+                  size=excluded.size,
+                  created_at=excluded.created_at,
+                  expires_at=excluded.expires_at,
+                  accessed_at=excluded.accessed_at
+                """,
+                (key, model, content, int(total_tokens), size, now, now + self.ttl_s, now),
+            )
+            self.stats.stores += 1
+            if self.max_bytes > 0:
+                self._evict_over_budget()
+            self._cx.commit()
+
+    def _evict_over_budget(self) -> None:
+        total = int(
+            self._cx.execute("SELECT COALESCE(SUM(size), 0) FROM ai_responses").fetchone()[0]
+        )
+        if total <= self.max_bytes:
+            return
+        self._cx.execute("DELETE FROM ai_responses WHERE expires_at <= ?", (time.time(),))
+        total = int(
+            self._cx.execute("SELECT COALESCE(SUM(size), 0) FROM ai_responses").fetchone()[0]
+        )
+        target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        victims: list[str] = []
+        for key, size in self._cx.execute(
+            "SELECT key, size FROM ai_responses ORDER BY accessed_at ASC"
+        ):
+            if total <= target:
+                break
+            victims.append(str(key))
+            total -= int(size or 0)
+        if victims:
+            self._cx.executemany("DELETE FROM ai_responses WHERE key=?", [(v,) for v in victims])
+            self.stats.evictions += len(victims)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cx.execute("DELETE FROM ai_responses")
+            self._cx.commit()
+
+    def close(self) -> None:
+        try:
+            self._cx.close()
+        except Exception:
+            pass
+
+
+# --------------------------------------------------------------------------------------
+# Module-level default
+# --------------------------------------------------------------------------------------
+
+_default_cache: AIResponseCache | None = None
+_default_lock = threading.Lock()
+
+
+def default() -> AIResponseCache | None:
+    """Process-wide cache, or None when AI_CACHE_ENABLED=0 / the DB cannot be opened."""
+    global _default_cache
+    if not AI_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                try:
+                    _default_cache = AIResponseCache()
+                except (OSError, sqlite3.Error):
+                    return None
+    return _default_cache
+
+
+def set_default(cache: AIResponseCache | None) -> None:
+    """Install (or with None, drop) the process-wide cache; used by tests."""
+    global _default_cache
+    _default_cache = cache
+
+
+def stats() -> dict[str, Any]:
+    cache = _default_cache
+    return cache.stats.as_dict() if cache is not None else AICacheStats().as_dict()
@@ -16,12 +16,17 @@ import importlib
 import json
 import logging
 import os
+import random
 import re
+import threading
+import time
 from collections.abc import Sequence
 from typing import Any
 
 from src.config import settings
+from src.extract import ai_cache
 from src.extract.candidates import Candidate
+from src.extract.parsed_page import ParsedPage
 
 try:
     # New-style OpenAI client (openai>=1.0)
@@ -59,6 +64,15 @@ AI_PEOPLE_ENABLED: bool = bool(OPENAI_API_KEY) and bool(
 
 _HAS_NEW_OPENAI = OpenAI is not None
 
+# Retries for rate-limited (HTTP 429) completions: exponential backoff with
+# jitter, honouring Retry-After when the provider sends it.
+AI_RETRY_MAX = int(os.getenv("AI_RETRY_MAX", "3"))
+AI_RETRY_BASE_SEC = float(os.getenv("AI_RETRY_BASE_SEC", "1.0"))
+AI_RETRY_MAX_SEC = float(os.getenv("AI_RETRY_MAX_SEC", "30"))
+
+# Tokens the calling thread's last _call_refiner() spent (0 on a cache hit).
+_usage_local = threading.local()
+
 # =============================================================================
 # ROLE EMAIL DETECTION (used only for prompt context / candidate fields)
 # =============================================================================
@@ -291,21 +305,118 @@ def _make_messages(company_name: str, domain: str, payload: dict[str, Any]) -> l
     ]
 
 
-def _call_refiner(client, messages: list[dict[str, str]]) -> str:
+def _usage_tokens(completion: Any) -> int:
+    usage = getattr(completion, "usage", None)
+    if usage is None and isinstance(completion, dict):
+        usage = completion.get("usage")
+    if usage is None:
+        return 0
+    total = usage.get("total_tokens") if isinstance(usage, dict) else usage.total_tokens
+    try:
+        return int(total or 0)
+    except (TypeError, ValueError):
+        return 0
+
+
+def _is_rate_limited(exc: BaseException) -> bool:
+    if type(exc).__name__ == "RateLimitError":
+        return True
+    status = getattr(exc, "status_code", None)
+    if status is None:
+        status = getattr(getattr(exc, "response", None), "status_code", None)
+    return status == 429
+
+
+def _retry_delay(exc: BaseException, attempt: int) -> float:
+    headers = getattr(getattr(exc, "response", None), "headers", None)
+    try:
+        retry_after = float(headers.get("retry-after")) if headers else None
+    except (TypeError, ValueError):
+        retry_after = None
+    if retry_after is not None and retry_after >= 0:
+        return min(retry_after, AI_RETRY_MAX_SEC)
+    delay = AI_RETRY_BASE_SEC * (2**attempt)
+    return min(delay + random.uniform(0, delay / 2), AI_RETRY_MAX_SEC)
+
+
+def _create_completion(client, messages: list[dict[str, str]]) -> tuple[str, int]:
     if _HAS_NEW_OPENAI:
         completion = client.chat.completions.create(
             model=OPENAI_MODEL,
             response_format={"type": "json_object"},
             messages=messages,
         )
-        return completion.choices[0].message.content or "{}"
+        return completion.choices[0].message.content or "{}", _usage_tokens(completion)
 
     completion = client.ChatCompletion.create(  # type: ignore[attr-defined]
         model=OPENAI_MODEL,
         response_format={"type": "json_object"},
         messages=messages,
     )
-    return completion["choices"][0]["message"]["content"] or "{}"  # type: ignore[index]
+    content = completion["choices"][0]["message"]["content"] or "{}"  # type: ignore[index]
+    return content, _usage_tokens(completion)
+
+
+def _call_model(client, messages: list[dict[str, str]]) -> tuple[str, int]:
+    """One chat completion, retried on 429; returns (content, total_tokens)."""
+    attempt = 0
+    while True:
+        try:
+            return _create_completion(client, messages)
+        except Exception as exc:
+            if attempt >= AI_RETRY_MAX or not _is_rate_limited(exc):
+                raise
+            delay = _retry_delay(exc, attempt)
+            attempt += 1
+            log.warning("AI call rate-limited; retry %d/%d in %.1fs", attempt, AI_RETRY_MAX, delay)
+            time.sleep(delay)
+
+
+def _is_json_object(content: str) -> bool:
+    try:
+        return isinstance(json.loads(content), dict)
+    except ValueError:
+        return False
+
+
+def last_call_tokens() -> int:
+    """Tokens the calling thread's most recent model call used (0 on a cache hit)."""
+    return int(getattr(_usage_local, "tokens", 0) or 0)
+
+
+def reset_last_call_tokens() -> None:
+    _usage_local.tokens = 0
+
+
+def _call_refiner(client, messages: list[dict[str, str]]) -> str:
+    """
+    Chat completion through the persistent response cache (src.extract.ai_cache):
+    a prompt already answered for the same model is served from disk.
+    """
+    ai_cache.reset_last_lookup()
+    reset_last_call_tokens()
+    cache = ai_cache.default()
+    if cache is None:
+        content, _usage_local.tokens = _call_model(client, messages)
+        return content
+
+    key = ai_cache.cache_key(OPENAI_MODEL, messages, response_format="json_object")
+    try:
+        hit = cache.get(key)
+    except Exception:
+        log.debug("AI cache lookup failed", exc_info=True)
+        hit = None
+    if hit is not None:
+        return hit
+
+    content, tokens = _call_model(client, messages)
+    _usage_local.tokens = tokens
+    if _is_json_object(content):
+        try:
+            cache.put(key, content, model=OPENAI_MODEL, total_tokens=tokens)
+        except Exception:
+            log.debug("AI cache store failed", exc_info=True)
+    return content
 
 
 def _parse_people_list(data: dict[str, Any]) -> list[dict[str, Any]] | None:
@@ -621,7 +732,7 @@ def _extract_full_page_fallback_part(soup) -> str | None:
     return f"[Full page text]\n{all_text}"
 
 
-def _extract_text_for_ai(html: str) -> str:
+def _extract_text_for_ai(html: str | ParsedPage) -> str:
     """
     Extract a compact, structured text representation from HTML for the AI.
 
@@ -635,15 +746,17 @@ def _extract_text_for_ai(html: str) -> str:
 
     A typical team page goes from ~50-200KB of raw HTML down to ~2-8KB of
     structured text, reducing token cost by 10-20x.
+
+    Accepts a ParsedPage to reuse its tree (cleanup runs on a private copy).
     """
     try:
-        from bs4 import BeautifulSoup, Comment  # type: ignore[import]
+        from bs4 import Comment  # type: ignore[import]
 
-        soup = BeautifulSoup(html, "html.parser")
+        soup = ParsedPage.of(html).copy_soup()
         # Stash Comment on soup so _cleanup_soup can reference it without re-importing.
         soup.Comment = Comment  # type: ignore[attr-defined]
     except ImportError:
-        return _strip_html_regex(html)
+        return _strip_html_regex(html if isinstance(html, str) else html.html)
 
     _cleanup_soup(soup)
 
@@ -672,7 +785,7 @@ def _extract_text_for_ai(html: str) -> str:
 
 def extract_people_from_html(
     *,
-    html: str,
+    html: str | ParsedPage,
     source_url: str,
     company_name: str,
     domain: str,
@@ -29,10 +29,16 @@ NOTE (batch_test.ps1 compatibility):
 from __future__ import annotations
 
 import logging
+import os
 import re
-from collections.abc import Sequence
+import threading
+import time
+from collections.abc import Callable, Sequence
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any
+from typing import Any, TypeVar
+
+from src.extract import ai_cache
 
 log = logging.getLogger(__name__)
 
@@ -88,7 +94,11 @@ except ImportError:  # pragma: no cover
 
 # Import the actual AI refiner
 try:
-    from src.extract.ai_candidates import AI_PEOPLE_ENABLED
+    from src.extract.ai_candidates import (
+        AI_PEOPLE_ENABLED,
+        last_call_tokens,
+        reset_last_call_tokens,
+    )
     from src.extract.ai_candidates import (
         extract_ai_candidates as _raw_extract_ai_candidates,
     )
@@ -99,6 +109,13 @@ except ImportError:  # pragma: no cover
     AI_PEOPLE_ENABLED = False  # type: ignore
     _raw_extract_ai_candidates = None  # type: ignore
 
+    def last_call_tokens() -> int:  # type: ignore[misc]
+        return 0
+
+    def reset_last_call_tokens() -> None:  # type: ignore[misc]
+        return None
+
+
 # Import Candidate type (for typing only)
 try:
     from src.extract.candidates import Candidate
@@ -203,6 +220,8 @@ class AIRefinementMetrics:
 
     fallback_used: bool = False
     fallback_tier: str | None = None  # Which fallback tier was used
+    ai_cache_hit: bool = False  # response served from src.extract.ai_cache
+    ai_tokens_saved: int = 0
     quality_rejections: int = 0
     ai_error: str | None = None
 
@@ -225,6 +244,8 @@ class AIRefinementMetrics:
             "fallback_tier": self.fallback_tier,
             "quality_rejections": self.quality_rejections,
             "ai_error": self.ai_error,
+            "ai_cache_hit": self.ai_cache_hit,
+            "ai_tokens_saved": self.ai_tokens_saved,
         }
 
 
@@ -675,11 +696,269 @@ def _count_quality_candidates(candidates: list[Any]) -> int:
     return count
 
 
+# ---------------------------------------------------------------------------
+# Concurrent AI executor
+# ---------------------------------------------------------------------------
+#
+# Per-page model calls run on a process-wide thread pool whose size is the
+# in-flight cap (AI_MAX_IN_FLIGHT), so concurrent companies in one worker
+# share it. Each tenant has a token budget per window (AI_TENANT_TOKEN_BUDGET,
+# 0 = unlimited), counted in Redis so every worker (and every forked RQ work
+# horse) draws on the same budget; calls already in flight when the budget
+# runs out still complete, so a window can overshoot by at most
+# AI_MAX_IN_FLIGHT calls per worker. Rate-limit (429) retries happen in
+# ai_candidates._call_model.
+
+AI_MAX_IN_FLIGHT = max(1, int(os.getenv("AI_MAX_IN_FLIGHT", "8")))
+AI_TENANT_TOKEN_BUDGET = int(os.getenv("AI_TENANT_TOKEN_BUDGET", "0"))
+AI_TENANT_BUDGET_WINDOW_SEC = float(os.getenv("AI_TENANT_BUDGET_WINDOW_SEC", "3600"))
+# "0" keeps budget counters in this process only (single-worker dev runs)
+AI_TENANT_BUDGET_REDIS = os.getenv("AI_TENANT_BUDGET_REDIS", "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+}
+_BUDGET_REDIS_PREFIX = "aibudget:v1:"
+_BUDGET_REDIS_RETRY_SEC = 30.0
+# "0" sends all of a company's candidates in a single refiner call
+AI_REFINE_PER_PAGE = os.getenv("AI_REFINE_PER_PAGE", "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+}
+
+T = TypeVar("T")
+
+
+class AIBudgetExceeded(RuntimeError):
+    """The tenant spent its AI token budget for the current window."""
+
+
+class TokenBudget:
+    """
+    Token spend per tenant over fixed windows.
+
+    Counters live in Redis ({prefix}{tenant}:{window index}, INCRBY with an
+    EXPIRE of two windows) so the budget holds across workers and across the
+    per-job processes RQ forks. Without Redis, or while it is unreachable, the
+    counters fall back to this process.
+    """
+
+    def __init__(
+        self,
+        limit: int | None = None,
+        *,
+        window_s: float | None = None,
+        clock: Callable[[], float] = time.time,
+        redis: Any = None,
+        use_redis: bool | None = None,
+    ):
+        self.limit = AI_TENANT_TOKEN_BUDGET if limit is None else int(limit)
+        self.window_s = AI_TENANT_BUDGET_WINDOW_SEC if window_s is None else float(window_s)
+        self.use_redis = AI_TENANT_BUDGET_REDIS if use_redis is None else bool(use_redis)
+        self._clock = clock
+        self._redis = redis
+        self._redis_down_until = 0.0
+        self._spent: dict[str, tuple[int, int]] = {}  # tenant -> (window index, tokens)
+        self._lock = threading.Lock()
+
+    def _window(self) -> int:
+        return int(self._clock() // self.window_s) if self.window_s > 0 else 0
+
+    def _redis_client(self) -> Any:
+        # Unlimited budgets never need the shared counters
+        if self.limit <= 0 or not self.use_redis:
+            return None
+        if time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                from src.queueing.redis_conn import get_redis
+
+                self._redis = get_redis()
+            except Exception:
+                self._redis_failed()
+                return None
+        return self._redis
+
+    def _redis_failed(self) -> None:
+        self._redis_down_until = time.monotonic() + _BUDGET_REDIS_RETRY_SEC
+        log.debug("AI token budget: redis unavailable; counting locally", exc_info=True)
+
+    def _key(self, tenant_id: str, window: int) -> str:
+        return f"{_BUDGET_REDIS_PREFIX}{tenant_id}:{window}"
+
+    def _local_spent(self, tenant_id: str, window: int) -> int:
+        with self._lock:
+            at, tokens = self._spent.get(tenant_id, (-1, 0))
+            return tokens if at == window else 0
+
+    def spent(self, tenant_id: str) -> int:
+        window = self._window()
+        client = self._redis_client()
+        if client is not None:
+            try:
+                return int(client.get(self._key(tenant_id, window)) or 0)
+            except Exception:
+                self._redis_failed()
+        return self._local_spent(tenant_id, window)
+
+    def check(self, tenant_id: str) -> None:
+        if self.limit > 0 and self.spent(tenant_id) >= self.limit:
+            raise AIBudgetExceeded(
+                f"AI token budget exhausted for tenant {tenant_id!r} ({self.limit} per "
+                f"{self.window_s:.0f}s)"
+            )
+
+    def charge(self, tenant_id: str, tokens: int) -> None:
+        if tokens <= 0:
+            return
+        now = self._window()
+        client = self._redis_client()
+        if client is not None:
+            key = self._key(tenant_id, now)
+            try:
+                pipe = client.pipeline()
+                pipe.incrby(key, int(tokens))
+                pipe.expire(key, max(1, int(self.window_s * 2)))
+                pipe.execute()
+                return
+            except Exception:
+                self._redis_failed()
+        with self._lock:
+            window, spent = self._spent.get(tenant_id, (now, 0))
+            self._spent[tenant_id] = (now, (spent if window == now else 0) + int(tokens))
+
+
+@dataclass
+class AICallOutcome:
+    """Result of one executor task; exactly one of value/error is meaningful."""
+
+    value: Any = None
+    error: BaseException | None = None
+    cache_hit: bool = False
+    tokens_used: int = 0
+    tokens_saved: int = 0
+
+
+class AIExtractionExecutor:
+    """
+    Bounded pool for AI calls. run_all() returns outcomes in input order,
+    whatever order the calls finish in, so merges stay deterministic.
+    """
+
+    def __init__(self, max_in_flight: int | None = None, *, budget: TokenBudget | None = None):
+        self.max_in_flight = max(1, int(max_in_flight or AI_MAX_IN_FLIGHT))
+        self.budget = budget if budget is not None else TokenBudget()
+        self._pool = ThreadPoolExecutor(
+            max_workers=self.max_in_flight, thread_name_prefix="ai-extract"
+        )
+
+    def _run_one(self, fn: Callable[[], Any], tenant_id: str) -> AICallOutcome:
+        ai_cache.reset_last_lookup()
+        reset_last_call_tokens()
+        try:
+            self.budget.check(tenant_id)
+            value = fn()
+        except Exception as exc:
+            self.budget.charge(tenant_id, last_call_tokens())
+            return AICallOutcome(error=exc, tokens_used=last_call_tokens())
+        lookup = ai_cache.last_lookup()
+        used = last_call_tokens()
+        self.budget.charge(tenant_id, used)
+        return AICallOutcome(
+            value=value, cache_hit=lookup.hit, tokens_used=used, tokens_saved=lookup.tokens_saved
+        )
+
+    def run_all(self, calls: Sequence[Callable[[], Any]], *, tenant_id: str) -> list[AICallOutcome]:
+        if len(calls) <= 1:
+            # No pool hop for the common single-call case
+            return [self._run_one(fn, tenant_id) for fn in calls]
+        futures = [self._pool.submit(self._run_one, fn, tenant_id) for fn in calls]
+        return [f.result() for f in futures]
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True)
+
+
+_default_executor: AIExtractionExecutor | None = None
+_default_executor_lock = threading.Lock()
+
+
+def default_executor() -> AIExtractionExecutor:
+    global _default_executor
+    if _default_executor is None:
+        with _default_executor_lock:
+            if _default_executor is None:
+                _default_executor = AIExtractionExecutor()
+    return _default_executor
+
+
+def set_default_executor(executor: AIExtractionExecutor | None) -> None:
+    """Install (or with None, drop) the process-wide executor; used by tests."""
+    global _default_executor
+    _default_executor = executor
+
+
+def _current_tenant_id() -> str:
+    try:
+        from rq import get_current_job
+
+        job = get_current_job()
+    except Exception:
+        job = None
+    if job is not None:
+        tenant = (job.meta or {}).get("tenant_id")
+        if tenant:
+            return str(tenant)
+    return (os.getenv("TENANT_ID") or "").strip() or "dev"
+
+
+def _group_by_page(candidates: Sequence[Any]) -> list[list[Any]]:
+    """Candidates grouped by source_url, pages in first-seen order."""
+    groups: dict[str, list[Any]] = {}
+    for cand in candidates:
+        groups.setdefault(_get_candidate_source_url(cand) or "", []).append(cand)
+    return list(groups.values())
+
+
+def _refine_concurrently(
+    *, company_name: str, domain: str, candidates: list[Any], tenant_id: str
+) -> tuple[list[Any], AICallOutcome]:
+    """
+    Run the refiner once per page (or once in total with AI_REFINE_PER_PAGE=0)
+    and concatenate results in page order. The first failed page's error is
+    raised; pages that succeeded are already in the response cache for the retry.
+    """
+    groups = _group_by_page(candidates) if AI_REFINE_PER_PAGE else [candidates]
+    calls = [
+        (
+            lambda g=group: _raw_extract_ai_candidates(
+                company_name=company_name, domain=domain, raw_candidates=g
+            )
+        )
+        for group in groups
+    ]
+    outcomes = default_executor().run_all(calls, tenant_id=tenant_id)
+
+    summary = AICallOutcome(cache_hit=bool(outcomes))
+    refined: list[Any] = []
+    for outcome in outcomes:
+        summary.tokens_used += outcome.tokens_used
+        summary.tokens_saved += outcome.tokens_saved
+        summary.cache_hit = summary.cache_hit and outcome.cache_hit
+        if outcome.error is not None:
+            raise outcome.error
+        refined.extend(outcome.value or [])
+    return refined, summary
+
+
 def refine_candidates_with_ai(
     *,
     company_name: str,
     domain: str,
     raw_candidates: Sequence[Any],
+    tenant_id: str | None = None,
 ) -> tuple[list[Any], AIRefinementMetrics]:
     """
     Refine candidates using AI with proper metrics tracking and strict contract enforcement.
@@ -700,6 +979,10 @@ def refine_candidates_with_ai(
       - Removes locale duplicates
       - Caps at _AI_MAX_CANDIDATES
 
+    The refiner runs once per source page, concurrently on the shared executor
+    (see AIExtractionExecutor), charged to ``tenant_id`` (default: the RQ job's
+    tenant_id meta, else TENANT_ID). Any failed page fails the whole refinement.
+
     Returns:
         (refined_candidates, metrics)
     """
@@ -782,13 +1065,16 @@ def refine_candidates_with_ai(
         )
 
         metrics.ai_called = True
-        refined = _raw_extract_ai_candidates(
+        refined, usage = _refine_concurrently(
             company_name=company_name,
             domain=domain,
-            raw_candidates=filtered_candidates,
+            candidates=filtered_candidates,
+            tenant_id=tenant_id or _current_tenant_id(),
         )
 
         metrics.ai_call_succeeded = True
+        metrics.ai_cache_hit = usage.cache_hit
+        metrics.ai_tokens_saved = usage.tokens_saved
 
         refined_list: list[Any]
         if refined is None:
@@ -884,6 +1170,9 @@ def update_result_from_metrics(
             result.fallback_tier = metrics.fallback_tier
         if hasattr(result, "ai_error"):
             result.ai_error = metrics.ai_error
+        if hasattr(result, "ai_cache_hit"):
+            result.ai_cache_hit = metrics.ai_cache_hit
+            result.ai_tokens_saved = metrics.ai_tokens_saved
 
         # Keep this field strictly "AI-approved count" (not fallback count).
         if hasattr(result, "ai_approved_people"):
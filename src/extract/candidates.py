@@ -33,6 +33,7 @@ from src.extract.quality_gates import (
     validate_title,
 )
 
+from .parsed_page import ParsedPage
 from .stopwords import NAME_STOPWORDS
 
 log = logging.getLogger(__name__)
@@ -1114,7 +1115,7 @@ def _load_optional_helpers() -> tuple[
 def _should_run_people_cards_page(
     *,
     source_url: str,
-    html: str,
+    page: ParsedPage,
     effective_domain: str | None,
     extract_people_cards: Callable[..., Any] | None,
     is_blocked_source_url: Callable[[str], Any] | None,
@@ -1139,7 +1140,7 @@ def _should_run_people_cards_page(
         try:
             verdict = classify_page_for_people_extraction(  # type: ignore[misc]
                 url,
-                html,
+                page,
                 min_score=4,  # Lower threshold: partial signals are OK since crawler pre-filters
             )
             # classify_page_for_people_extraction returns a PageClassification
@@ -1160,7 +1161,7 @@ def _should_run_people_cards_page(
         except Exception:
             pass
 
-    head = (html or "")[:60_000].lower()
+    head = page.head_lower
     people_signals = (
         "leadership team",
         "executive team",
@@ -1269,7 +1270,7 @@ def _merge_people_cards_into_map(
 
 
 def extract_candidates(
-    html: str,
+    html: str | ParsedPage,
     company_domain: str | None = None,
     *,
     deobfuscate: bool = False,
@@ -1279,6 +1280,9 @@ def extract_candidates(
     """
     Extract broad (email, optional name, context) candidates from a single HTML page.
 
+    ``html`` may be a raw string or a ParsedPage; the parsed tree is shared
+    with the people-cards pass so each page is parsed once.
+
     We:
       - Parse the DOM with BeautifulSoup.
       - Find emails via attributes + text (optionally deobfuscated).
@@ -1300,6 +1304,8 @@ def extract_candidates(
     if source_url is None:
         source_url = "https://example.com/unknown"
 
+    page = ParsedPage.of(html, url=source_url)
+
     effective_domain = official_domain or company_domain
     (
         is_blocked_source_url,
@@ -1308,7 +1314,7 @@ def extract_candidates(
         extract_people_cards,
     ) = _load_optional_helpers()
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = page.soup
 
     # Per-page dedup: avoid blasting the AI with dozens of identical rows.
     by_key: dict[tuple[str | None, str, bool], Candidate] = {}
@@ -1332,7 +1338,7 @@ def extract_candidates(
 
     run_cards, cards_reason = _should_run_people_cards_page(
         source_url=source_url,
-        html=html,
+        page=page,
         effective_domain=effective_domain,
         extract_people_cards=extract_people_cards,
         is_blocked_source_url=is_blocked_source_url,
@@ -1343,7 +1349,7 @@ def extract_candidates(
     if run_cards and extract_people_cards is not None:
         try:
             card_candidates = extract_people_cards(  # type: ignore[misc]
-                html=html,
+                html=page,
                 source_url=source_url,
                 official_domain=effective_domain,
             )
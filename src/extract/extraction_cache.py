@@ -0,0 +1,227 @@
+# src/extract/extraction_cache.py
+"""
+Per-page extraction cache for incremental re-extraction.
+
+extract_candidates_for_company() used to re-run HTML extraction (and the AI
+refiner) over every stored page of a company on every run. Most pages are
+byte-identical between weekly re-crawls, so the final per-page candidate set
+is cached in ``page_extractions`` keyed by:
+
+  content_sha256     SHA-256 of the page HTML (same as page_blobs.sha256)
+  extractor_version  EXTRACTOR_VERSION + a fingerprint of the extractor
+                     modules' source + the extraction mode ("ai" / "html")
+  scope              the company the page was extracted for (extraction_scope):
+                     its normalized domain, plus its name in AI mode
+
+Any edit to the extractor code, or switching AI refinement on/off, therefore
+misses the cache instead of serving stale candidates. Extraction filters
+emails and people by company domain (and the AI refiner is told the company
+name), so the same page body crawled for another company is extracted afresh.
+
+Env:
+  EXTRACTION_CACHE_ENABLED   "0" disables lookups and writes (default on)
+  EXTRACTION_CACHE_VERSION   overrides EXTRACTOR_VERSION (forces a full re-run)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+from collections.abc import Iterable, Mapping, Sequence
+from dataclasses import asdict, dataclass, field, fields
+from functools import lru_cache
+from pathlib import Path
+from typing import Any
+
+from src.db import table_exists
+from src.extract.candidates import Candidate
+
+log = logging.getLogger(__name__)
+
+# Bump when extraction semantics change in a way the code fingerprint misses
+# (e.g. behaviour driven by data files or the AI prompt/model).
+EXTRACTOR_VERSION = "r11.1"
+
+_FINGERPRINT_MODULES = (
+    "candidates.py",
+    "parsed_page.py",
+    "people_cards.py",
+    "page_classifier.py",
+    "quality_gates.py",
+    "source_filters.py",
+    "ai_candidates.py",
+    "ai_candidates_wrapper.py",
+)
+
+_CANDIDATE_FIELDS = frozenset(f.name for f in fields(Candidate))
+
+
+def cache_enabled() -> bool:
+    return os.getenv("EXTRACTION_CACHE_ENABLED", "1").strip() not in {"0", "false", "no"}
+
+
+@lru_cache(maxsize=1)
+def _code_fingerprint() -> str:
+    h = hashlib.sha256()
+    base = Path(__file__).resolve().parent
+    for name in _FINGERPRINT_MODULES:
+        try:
+            h.update((base / name).read_bytes())
+        except OSError:
+            h.update(name.encode())
+    return h.hexdigest()[:12]
+
+
+def extractor_version(mode: str) -> str:
+    base = (os.getenv("EXTRACTION_CACHE_VERSION") or "").strip() or EXTRACTOR_VERSION
+    return f"{base}+{_code_fingerprint()}:{mode}"
+
+
+def extraction_scope(domain: str | None, company_name: str | None = None) -> str:
+    """Cache scope for one company: "acme.com", or "acme.com|acme inc" in AI mode."""
+    dom = (domain or "").strip().lower().rstrip(".")
+    if dom.startswith("www."):
+        dom = dom[4:]
+    if company_name is None:
+        return dom
+    return f"{dom}|{' '.join(company_name.split()).casefold()}"
+
+
+# ---------------------------------------------------------------------------
+# Storage
+# ---------------------------------------------------------------------------
+
+
+def _ensure_table(conn: Any) -> None:
+    """
+    Safety fallback for databases that predate page_extractions
+    (db/schema.sql defines it).
+    """
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS page_extractions (
+          content_sha256 TEXT NOT NULL,
+          extractor_version TEXT NOT NULL,
+          scope TEXT NOT NULL,
+          candidates_json TEXT NOT NULL,
+          created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+          PRIMARY KEY (content_sha256, extractor_version, scope)
+        )
+        """
+    )
+
+
+@dataclass
+class PageCandidates:
+    """Final candidates one page contributed: role emails and (refined) people."""
+
+    role: list[Candidate] = field(default_factory=list)
+    people: list[Candidate] = field(default_factory=list)
+
+
+def _dump(cands: Sequence[Any]) -> list[dict[str, Any]]:
+    out: list[dict[str, Any]] = []
+    for c in cands:
+        if isinstance(c, Candidate):
+            out.append(asdict(c))
+        else:
+            out.append({k: getattr(c, k, None) for k in _CANDIDATE_FIELDS})
+    return out
+
+
+def _load(items: Sequence[dict[str, Any]], source_url: str) -> list[Candidate]:
+    out: list[Candidate] = []
+    for item in items:
+        data = {k: v for k, v in item.items() if k in _CANDIDATE_FIELDS}
+        # The entry may come from the same body at another URL; cite this page
+        data["source_url"] = source_url
+        data["is_role_address_guess"] = bool(data.get("is_role_address_guess"))
+        out.append(Candidate(**data))
+    return out
+
+
+def _encode(page: PageCandidates) -> str:
+    return json.dumps(
+        {"role": _dump(page.role), "people": _dump(page.people)},
+        separators=(",", ":"),
+        default=str,
+    )
+
+
+def _decode(raw: str, source_url: str) -> PageCandidates:
+    data = json.loads(raw or "{}")
+    return PageCandidates(
+        role=_load(data.get("role") or [], source_url),
+        people=_load(data.get("people") or [], source_url),
+    )
+
+
+def load_many(
+    conn: Any,
+    pages: Mapping[str, str],
+    version: str,
+    *,
+    scope: str,
+    batch_size: int = 500,
+) -> dict[str, PageCandidates]:
+    """
+    Cached candidates for ``pages`` ({source_url: content_sha256}) under
+    ``version`` and ``scope``. Returns {source_url: PageCandidates} for hits
+    only; an empty hit means the page is known to yield nothing.
+    """
+    if not pages or not cache_enabled() or not table_exists(conn, "page_extractions"):
+        return {}
+    by_hash: dict[str, list[str]] = {}
+    for url, sha in pages.items():
+        by_hash.setdefault(sha, []).append(url)
+    hashes = list(by_hash)
+
+    rows: list[Any] = []
+    try:
+        for i in range(0, len(hashes), batch_size):
+            chunk = hashes[i : i + batch_size]
+            placeholders = ", ".join("?" for _ in chunk)
+            rows.extend(
+                conn.execute(
+                    "SELECT content_sha256, candidates_json FROM page_extractions "
+                    "WHERE extractor_version = ? AND scope = ? "
+                    f"AND content_sha256 IN ({placeholders})",
+                    [version, scope, *chunk],
+                ).fetchall()
+            )
+    except Exception:
+        log.debug("extraction_cache: lookup failed; treating as miss", exc_info=True)
+        return {}
+
+    out: dict[str, PageCandidates] = {}
+    for sha, raw in rows:
+        for url in by_hash.get(str(sha), []):
+            try:
+                out[url] = _decode(raw, url)
+            except Exception:
+                log.debug("extraction_cache: bad entry for %s", sha, exc_info=True)
+    return out
+
+
+def store_many(
+    conn: Any, entries: Iterable[tuple[str, PageCandidates]], version: str, *, scope: str
+) -> int:
+    """Upsert (content_sha256, PageCandidates) pairs under ``version``/``scope``; caller commits."""
+    if not cache_enabled():
+        return 0
+    rows = [(sha, version, scope, _encode(page)) for sha, page in entries if sha]
+    if not rows:
+        return 0
+    _ensure_table(conn)
+    for row in rows:
+        conn.execute(
+            "INSERT INTO page_extractions "
+            "(content_sha256, extractor_version, scope, candidates_json) "
+            "VALUES (?, ?, ?, ?) "
+            "ON CONFLICT (content_sha256, extractor_version, scope) "
+            "DO UPDATE SET candidates_json = excluded.candidates_json",
+            row,
+        )
+    return len(rows)
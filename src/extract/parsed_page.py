@@ -0,0 +1,176 @@
+# src/extract/parsed_page.py
+"""
+ParsedPage — one parsed DOM per fetched page, shared by every extractor.
+
+Before this, a single page's HTML was parsed with BeautifulSoup up to three
+times (candidates → people_cards → AI text) and regex-scanned again by the
+source classifier. A ParsedPage wraps the raw HTML and builds each view
+lazily, at most once:
+
+  - soup        BeautifulSoup tree (shared; treat as read-only)
+  - text        visible text (script/style/noscript/template skipped)
+  - title       <title> text
+  - headings    ((tag, text), ...) for h1..h6, document order
+  - anchors     ((href, text), ...) for <a href>
+  - head_lower  lowercased first 60 KB of raw HTML (cheap substring signals)
+  - memo(key, fn)  per-page cache for derived results (e.g. classifier scores)
+
+Parser selection:
+  EXTRACT_HTML_PARSER=html.parser (default) | lxml
+  lxml is noticeably faster on large pages; if it is not installed we fall
+  back to the stdlib parser. The two parsers can disagree on malformed HTML,
+  so the default stays on html.parser for output parity.
+
+Extractors accept either a raw HTML string or a ParsedPage; use
+ParsedPage.of(html_or_page, url=...) to normalize at the entry point.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from collections.abc import Callable
+from functools import cached_property
+from typing import Any, TypeVar
+
+from bs4 import BeautifulSoup, Comment
+
+try:  # optional fast parser
+    import lxml  # noqa: F401
+
+    _HAS_LXML = True
+except ImportError:  # pragma: no cover
+    _HAS_LXML = False
+
+T = TypeVar("T")
+
+_HEAD_CHARS = 60_000
+_INVISIBLE_TAGS = frozenset({"script", "style", "noscript", "template"})
+_HEADING_TAGS = ("h1", "h2", "h3", "h4", "h5", "h6")
+
+
+def _default_parser() -> str:
+    name = (os.getenv("EXTRACT_HTML_PARSER") or "html.parser").strip().lower()
+    return resolve_parser(name)
+
+
+def resolve_parser(name: str | None) -> str:
+    """Map a requested parser name to one bs4 can actually use here."""
+    n = (name or "").strip().lower()
+    if n == "lxml" and _HAS_LXML:
+        return "lxml"
+    return "html.parser"
+
+
+def _decode(html: str | bytes | None) -> str:
+    if html is None:
+        return ""
+    if isinstance(html, bytes):
+        return html.decode("utf-8", "ignore")
+    return str(html)
+
+
+class ParsedPage:
+    """Lazily parsed view of one HTML page (see module docstring)."""
+
+    def __init__(
+        self,
+        html: str | bytes | None,
+        *,
+        url: str | None = None,
+        parser: str | None = None,
+    ) -> None:
+        self.html: str = _decode(html)
+        self.url: str | None = url
+        self.parser: str = resolve_parser(parser) if parser else _default_parser()
+        self._memo: dict[str, Any] = {}
+
+    @classmethod
+    def of(
+        cls,
+        html: str | bytes | ParsedPage | None,
+        *,
+        url: str | None = None,
+    ) -> ParsedPage:
+        """Return ``html`` unchanged if it is already a ParsedPage, else wrap it."""
+        if isinstance(html, ParsedPage):
+            if url and not html.url:
+                html.url = url
+            return html
+        return cls(html, url=url)
+
+    def __bool__(self) -> bool:
+        return bool(self.html)
+
+    def __repr__(self) -> str:
+        return f"ParsedPage(url={self.url!r}, chars={len(self.html)}, parser={self.parser!r})"
+
+    # -- lazily built views ----------------------------------------------
+
+    @cached_property
+    def soup(self) -> BeautifulSoup:
+        return BeautifulSoup(self.html, self.parser)
+
+    @cached_property
+    def head_lower(self) -> str:
+        return self.html[:_HEAD_CHARS].lower()
+
+    @cached_property
+    def title(self) -> str:
+        t = self.soup.title
+        return t.get_text(" ", strip=True) if t is not None else ""
+
+    @cached_property
+    def text(self) -> str:
+        parts: list[str] = []
+        for s in self.soup.find_all(string=True):
+            if isinstance(s, Comment):
+                continue
+            parent = s.parent
+            if parent is not None and parent.name in _INVISIBLE_TAGS:
+                continue
+            t = s.strip()
+            if t:
+                parts.append(t)
+        return "\n".join(parts)
+
+    @cached_property
+    def headings(self) -> tuple[tuple[str, str], ...]:
+        out: list[tuple[str, str]] = []
+        for h in self.soup.find_all(_HEADING_TAGS):
+            t = h.get_text(" ", strip=True)
+            if t:
+                out.append((h.name, t))
+        return tuple(out)
+
+    @cached_property
+    def anchors(self) -> tuple[tuple[str, str], ...]:
+        out: list[tuple[str, str]] = []
+        for a in self.soup.find_all("a", href=True):
+            href = str(a.get("href") or "").strip()
+            if href:
+                out.append((href, a.get_text(" ", strip=True)))
+        return tuple(out)
+
+    # -- helpers -------------------------------------------------------------
+
+    def memo(self, key: str, fn: Callable[[], T]) -> T:
+        """Compute ``fn()`` once per page under ``key`` and reuse it afterwards."""
+        if key not in self._memo:
+            self._memo[key] = fn()
+        return self._memo[key]
+
+    def copy_soup(self) -> BeautifulSoup:
+        """
+        A private tree for consumers that mutate it (decompose, etc.).
+
+        Copies the shared ``soup`` when it has already been built (no
+        re-tokenization); otherwise parses once without caching, since the
+        caller is about to modify it anyway.
+        """
+        if "soup" in self.__dict__:
+            return copy.copy(self.soup)
+        return BeautifulSoup(self.html, self.parser)
+
+
+__all__ = ["ParsedPage", "resolve_parser"]
@@ -38,12 +38,15 @@ from urllib.parse import urlparse
 try:
     from bs4 import BeautifulSoup, NavigableString, Tag
 
+    from src.extract.parsed_page import ParsedPage
+
     _HAS_BS4 = True
 except ImportError:
     _HAS_BS4 = False
     BeautifulSoup = None  # type: ignore
     Tag = None  # type: ignore
     NavigableString = None  # type: ignore
+    ParsedPage = None  # type: ignore
 
 # Import quality gates for validation
 try:
@@ -1637,12 +1640,12 @@ def _merge_candidates(
         dst.append(c)
 
 
-def _classifier_allows_people_cards(html: str, source_url: str) -> bool:
+def _classifier_allows_people_cards(page: ParsedPage, source_url: str) -> bool:
     if _HAS_SOURCE_FILTERS and classify_page_for_people_extraction is not None:
         try:
             verdict = classify_page_for_people_extraction(
                 source_url,
-                html,
+                page,
                 min_score=_PEOPLE_CARDS_CLASSIFY_MIN_SCORE,
             )
             if not getattr(verdict, "ok", False):
@@ -1650,7 +1653,7 @@ def _classifier_allows_people_cards(html: str, source_url: str) -> bool:
                 # people-section signals even though the classifier scored low.
                 # This covers root-page-only startups whose URL and headings
                 # are product-focused but the page body has a team section.
-                head = (html or "")[:60_000].lower()
+                head = page.head_lower
                 _body_people_signals = (
                     "leadership team",
                     "executive team",
@@ -1721,7 +1724,7 @@ def _extract_whole_page_secondary(soup: Any, source_url: str) -> list[list[Candi
 
 
 def extract_people_cards(
-    html: str,
+    html: str | ParsedPage,
     source_url: str,
     official_domain: str | None = None,
 ) -> list[Candidate]:
@@ -1734,7 +1737,7 @@ def extract_people_cards(
       - Fallback: legacy URL allow/block list if source_filters is unavailable.
 
     Args:
-        html: Raw HTML content
+        html: Raw HTML content, or a ParsedPage whose tree is reused
         source_url: URL the HTML was fetched from
         official_domain: The company's official domain (currently unused here)
 
@@ -1748,12 +1751,13 @@ def extract_people_cards(
     if not html or not source_url:
         return []
 
-    if not _classifier_allows_people_cards(html, source_url):
+    page = ParsedPage.of(html, url=source_url)
+    if not _classifier_allows_people_cards(page, source_url):
         return []
 
     _ = official_domain  # intentionally unused (reserved for future heuristics)
 
-    soup = BeautifulSoup(html, "html.parser")
+    soup = page.soup
     candidates: list[Candidate] = []
     seen_names: set[str] = set()
 
@@ -29,6 +29,8 @@ import re
 from dataclasses import dataclass
 from urllib.parse import urlparse
 
+from src.extract.parsed_page import ParsedPage
+
 log = logging.getLogger(__name__)
 
 
@@ -382,6 +384,18 @@ def _score_html_signals(text: str, reasons: list[str]) -> int:
     return score
 
 
+def _page_html_signals(page: ParsedPage) -> tuple[int, tuple[str, ...]]:
+    """HTML signal score for a ParsedPage, computed once per page (min_score-independent)."""
+
+    def _compute() -> tuple[int, tuple[str, ...]]:
+        reasons: list[str] = []
+        text = _html_text_snippet(page.html)
+        score = _score_html_signals(text, reasons) if text else 0
+        return score, tuple(reasons)
+
+    return page.memo("source_filters.html_signals", _compute)
+
+
 def _score_url_signals(url: str, path: str, reasons: list[str]) -> tuple[int, bool]:
     score = 0
     blocked = False
@@ -486,7 +500,7 @@ class PageClassification:
 
 def classify_page_for_people_extraction(
     url: str,
-    html: str | bytes | None = None,
+    html: str | bytes | ParsedPage | None = None,
     *,
     min_score: int = 8,
 ) -> PageClassification:
@@ -495,7 +509,9 @@ def classify_page_for_people_extraction(
 
     Inputs:
       - url: required (used for block/allow signals)
-      - html: optional; if present, adds strong disambiguation
+      - html: optional; if present, adds strong disambiguation. A ParsedPage
+        caches its HTML score, so repeat calls with other min_score values
+        do not rescan the page.
       - min_score: threshold for ok=True
 
     Scoring model (simple, explainable):
@@ -524,9 +540,14 @@ def classify_page_for_people_extraction(
     url_score, blocked = _score_url_signals(url, path, reasons)
     score += url_score
 
-    text = _html_text_snippet(html)
-    if text:
-        score += _score_html_signals(text, reasons)
+    if isinstance(html, ParsedPage):
+        html_score, html_reasons = _page_html_signals(html)
+        score += html_score
+        reasons.extend(html_reasons)
+    else:
+        text = _html_text_snippet(html)
+        if text:
+            score += _score_html_signals(text, reasons)
 
     ok = score >= min_score and not blocked
     reasons.append("ok" if ok else "not_ok")
@@ -7,14 +7,19 @@ Crawler-facing API:
 
 Other public entry points (advanced/internal use):
   - FetcherClient, FetchResult, RobotsDisallowed
-  - robots helpers: get_crawl_delay, is_allowed
-  - throttle helpers: wait_for_turn, after_response, penalize, mark_ok
-  - cache: Cache, CacheEntry, default_cache()
+  - robots helpers: get_crawl_delay, is_allowed, prefetch_robots
+  - throttle helpers: wait_for_turn, wait_for_turn_async, reserve_slot, after_response,
+    penalize, mark_ok
+  - cache: Cache, CacheEntry, CacheStats, SqliteBackend, RedisBackend, default_cache()
 """
 
 from .cache import (
     Cache,
+    CacheBackend,
     CacheEntry,
+    CacheStats,
+    RedisBackend,
+    SqliteBackend,
 )
 from .cache import (
     default as default_cache,
@@ -36,13 +41,18 @@ from .robots import (
     get_crawl_delay,
     is_allowed,
 )
+from .robots import (
+    prefetch as prefetch_robots,
+)
 from .throttle import (
     after_response,
     mark_ok,
     next_allowed_at,
     penalize,
+    reserve_slot,
     waf_strikes,
     wait_for_turn,
+    wait_for_turn_async,
 )
 from .throttle import (
     clear as clear_throttle,
@@ -63,8 +73,11 @@ __all__ = [
     "get_crawl_delay",
     "is_allowed",
     "clear_robots_cache",
+    "prefetch_robots",
     # throttle
     "wait_for_turn",
+    "wait_for_turn_async",
+    "reserve_slot",
     "after_response",
     "penalize",
     "mark_ok",
@@ -73,7 +86,11 @@ __all__ = [
     "clear_throttle",
     # cache
     "Cache",
+    "CacheBackend",
     "CacheEntry",
+    "CacheStats",
+    "SqliteBackend",
+    "RedisBackend",
     "default_cache",
 ]
 
@@ -1,14 +1,47 @@
 # src/fetch/cache.py
+"""
+HTTP response cache (ETag / Last-Modified / max-age) for the fetcher.
+
+Cache is the policy layer: TTLs, which bodies may be stored, conditional
+headers, and hit/miss counters. Storage sits behind a small CacheBackend
+protocol with two implementations:
+
+  - SqliteBackend  (default) file-backed or ":memory:" SQLite, zlib-compressed
+                   bodies, LRU eviction by total body bytes. Commits are batched
+                   only for ":memory:"; a file commits every write so no worker
+                   holds the write lock between responses.
+                   Point FETCH_CACHE_DB at a shared file so every worker on a
+                   host reuses the same entries.
+  - RedisBackend   content-addressed bodies (sha256) shared by all workers,
+                   per-URL metadata hashes, LRU eviction by total body bytes.
+
+FETCH_CACHE_BACKEND=sqlite|redis selects the backend used by default().
+"""
+
 from __future__ import annotations
 
+import atexit
+import dataclasses
+import hashlib
 import os
 import sqlite3
+import threading
 import time
+import zlib
 from collections.abc import Iterable, Mapping
 from dataclasses import dataclass
 from email.utils import parsedate_to_datetime
+from typing import Any, Protocol
 from urllib.parse import urlsplit
 
+try:
+    import redis as _redis_lib
+
+    _HAS_REDIS = True
+except ImportError:  # pragma: no cover
+    _redis_lib = None  # type: ignore[assignment]
+    _HAS_REDIS = False
+
 # --------------------------------------------------------------------------------------
 # Configuration (env-overridable)
 # --------------------------------------------------------------------------------------
@@ -25,6 +58,35 @@ FETCH_CACHE_BODY_TYPES = os.getenv(
     "text/;application/xhtml+xml;application/xml",
 ).split(";")
 
+# Storage backend for default(): "sqlite" (FETCH_CACHE_DB) or "redis"
+FETCH_CACHE_BACKEND = os.getenv("FETCH_CACHE_BACKEND", "sqlite").strip().lower()
+# Upper bound on stored (compressed) body bytes; least-recently-used entries are evicted
+FETCH_CACHE_MAX_BYTES = int(os.getenv("FETCH_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+# zlib-compress stored bodies
+FETCH_CACHE_COMPRESS = os.getenv("FETCH_CACHE_COMPRESS", "1").strip().lower() in {
+    "1",
+    "true",
+    "yes",
+    "on",
+}
+# SQLite: run the size-bound eviction (and, for ":memory:", commit) after this many
+# writes or this many seconds, whichever comes first
+FETCH_CACHE_COMMIT_EVERY = int(os.getenv("FETCH_CACHE_COMMIT_EVERY", "64"))
+FETCH_CACHE_COMMIT_INTERVAL_SEC = float(os.getenv("FETCH_CACHE_COMMIT_INTERVAL_SEC", "2.0"))
+# Redis: key prefix and connection URL (falls back to RQ_REDIS_URL / REDIS_URL)
+FETCH_CACHE_REDIS_PREFIX = os.getenv("FETCH_CACHE_REDIS_PREFIX", "fetchcache")
+FETCH_CACHE_REDIS_URL = (
+    os.getenv("FETCH_CACHE_REDIS_URL")
+    or os.getenv("RQ_REDIS_URL")
+    or os.getenv("REDIS_URL")
+    or "redis://127.0.0.1:6379/0"
+)
+
+# Don't rewrite accessed_at (an LRU write) more often than this per entry
+_TOUCH_GRANULARITY_SEC = 60.0
+# After exceeding the size bound, evict down to this fraction of it
+_EVICT_TARGET_RATIO = 0.9
+
 # --------------------------------------------------------------------------------------
 # Model
 # --------------------------------------------------------------------------------------
@@ -174,13 +236,116 @@ def _dict_get_any(headers: Mapping[str, str], keys: Iterable[str]) -> str | None
 
 
 # --------------------------------------------------------------------------------------
-# Cache
+# Body encoding
 # --------------------------------------------------------------------------------------
 
+_ENC_ZLIB = "zlib"
 
-class Cache:
-    def __init__(self, db_path: str | None = None):
+
+def _pack_body(body: bytes | None) -> tuple[bytes | None, str | None]:
+    """Return (stored_bytes, encoding). Compresses only when it actually helps."""
+    if body is None:
+        return None, None
+    if FETCH_CACHE_COMPRESS and len(body) >= 256:
+        packed = zlib.compress(body, 6)
+        if len(packed) < len(body):
+            return packed, _ENC_ZLIB
+    return body, None
+
+
+def _unpack_body(blob: bytes | None, encoding: str | None) -> bytes | None:
+    if blob is None:
+        return None
+    blob = bytes(blob)
+    if encoding == _ENC_ZLIB:
+        try:
+            return zlib.decompress(blob)
+        except zlib.error:
+            return None
+    return blob
+
+
+# --------------------------------------------------------------------------------------
+# Stats
+# --------------------------------------------------------------------------------------
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0  # fresh entry served
+    stale: int = 0  # entry present but expired (caller revalidates)
+    misses: int = 0  # no entry
+    stores: int = 0  # store_200 calls
+    revalidated: int = 0  # store_304 calls that refreshed an entry
+    evictions: int = 0  # entries dropped by the size bound
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = dataclasses.asdict(self)
+        lookups = self.hits + self.stale + self.misses
+        out["hit_ratio"] = (self.hits / lookups) if lookups else 0.0
+        return out
+
+
+# --------------------------------------------------------------------------------------
+# Backends
+# --------------------------------------------------------------------------------------
+
+
+class CacheBackend(Protocol):
+    """Storage for CacheEntry rows keyed by (scheme, host, path)."""
+
+    evictions: int
+
+    def load(self, scheme: str, host: str, path: str) -> CacheEntry | None: ...
+
+    def save(self, entry: CacheEntry) -> None: ...
+
+    def refresh(
+        self,
+        entry: CacheEntry,
+    ) -> None: ...  # metadata-only update (etag/last_modified/fetched_at/expires_at)
+
+    def delete(self, scheme: str, host: str, path: str) -> None: ...
+
+    def clear(self) -> None: ...
+
+    def flush(self) -> None: ...
+
+    def close(self) -> None: ...
+
+
+class SqliteBackend:
+    """
+    SQLite storage. A file-backed database may be shared by several processes, so
+    every write is committed straight away and the write lock is never held between
+    responses. A private ":memory:" database batches commits (FETCH_CACHE_COMMIT_EVERY
+    writes or FETCH_CACHE_COMMIT_INTERVAL_SEC seconds); call flush() to force one.
+    The total stored body size is kept under max_bytes by evicting the least recently
+    accessed rows on that same cadence.
+    """
+
+    def __init__(
+        self,
+        db_path: str | None = None,
+        *,
+        max_bytes: int | None = None,
+        commit_every: int | None = None,
+        commit_interval_s: float | None = None,
+    ):
         self.db_path = db_path or FETCH_CACHE_DB
+        self.max_bytes = FETCH_CACHE_MAX_BYTES if max_bytes is None else int(max_bytes)
+        self.commit_every = max(
+            1, FETCH_CACHE_COMMIT_EVERY if commit_every is None else int(commit_every)
+        )
+        self.commit_interval_s = (
+            FETCH_CACHE_COMMIT_INTERVAL_SEC if commit_interval_s is None else commit_interval_s
+        )
+        self.evictions = 0
+        # Only a private in-memory database may keep a transaction open across writes.
+        self._batch_commits = self.db_path == ":memory:"
+        self._lock = threading.RLock()
+        self._pending = 0
+        self._last_commit = time.monotonic()
         self._cx = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30.0)
         self._cx.execute("PRAGMA journal_mode=WAL;")
         self._cx.execute("PRAGMA synchronous=NORMAL;")
@@ -202,32 +367,87 @@ class Cache:
               body BLOB,
               fetched_at REAL NOT NULL,
               expires_at REAL,
+              body_encoding TEXT,
+              size INTEGER NOT NULL DEFAULT 0,
+              accessed_at REAL,
               PRIMARY KEY (scheme, host, path)
             )
             """
         )
+        # Older cache files predate compression/LRU columns.
+        cols = {r[1] for r in self._cx.execute("PRAGMA table_info(http_cache)").fetchall()}
+        for name, ddl in (
+            ("body_encoding", "TEXT"),
+            ("size", "INTEGER NOT NULL DEFAULT 0"),
+            ("accessed_at", "REAL"),
+        ):
+            if name not in cols:
+                self._cx.execute(f"ALTER TABLE http_cache ADD COLUMN {name} {ddl}")
+        self._cx.execute(
+            "CREATE INDEX IF NOT EXISTS idx_http_cache_accessed ON http_cache(accessed_at)"
+        )
         self._cx.commit()
 
-    # ---- public API ------------------------------------------------------------------
-
-    def get(self, url: str) -> tuple[CacheEntry | None, bool]:
-        """
-        Return (entry, is_fresh). If no entry, (None, False).
-        """
-        scheme, host, path = _normalize_url(url)
-        row = self._cx.execute(
-            (
-                "SELECT scheme,host,path,etag,last_modified,status,content_type,body,"
-                "fetched_at,expires_at "
-                "FROM http_cache "
-                "WHERE scheme=? AND host=? AND path=?"
-            ),
-            (scheme, host, path),
-        ).fetchone()
-
-        if not row:
-            return None, False
-        entry = CacheEntry(
+    # ---- batching / eviction ---------------------------------------------------------
+
+    def _wrote(self) -> None:
+        self._pending += 1
+        if (
+            self._pending >= self.commit_every
+            or (time.monotonic() - self._last_commit) >= self.commit_interval_s
+        ):
+            self._commit()
+        elif not self._batch_commits:
+            # Short transaction: release the write lock; eviction waits for the batch.
+            self._cx.commit()
+
+    def _commit(self) -> None:
+        if self.max_bytes > 0:
+            self._evict_over_budget()
+        self._cx.commit()
+        self._pending = 0
+        self._last_commit = time.monotonic()
+
+    def _evict_over_budget(self) -> None:
+        total = int(self._cx.execute("SELECT COALESCE(SUM(size), 0) FROM http_cache").fetchone()[0])
+        if total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        victims: list[int] = []
+        for rowid, size in self._cx.execute(
+            "SELECT rowid, size FROM http_cache ORDER BY COALESCE(accessed_at, fetched_at) ASC"
+        ):
+            if total <= target:
+                break
+            victims.append(int(rowid))
+            total -= int(size or 0)
+        if victims:
+            self._cx.executemany("DELETE FROM http_cache WHERE rowid=?", [(v,) for v in victims])
+            self.evictions += len(victims)
+
+    # ---- CacheBackend ----------------------------------------------------------------
+
+    def load(self, scheme: str, host: str, path: str) -> CacheEntry | None:
+        with self._lock:
+            row = self._cx.execute(
+                (
+                    "SELECT scheme,host,path,etag,last_modified,status,content_type,body,"
+                    "fetched_at,expires_at,body_encoding,accessed_at "
+                    "FROM http_cache "
+                    "WHERE scheme=? AND host=? AND path=?"
+                ),
+                (scheme, host, path),
+            ).fetchone()
+            if not row:
+                return None
+            now = _now()
+            if row[11] is None or now - float(row[11]) >= _TOUCH_GRANULARITY_SEC:
+                self._cx.execute(
+                    "UPDATE http_cache SET accessed_at=? WHERE scheme=? AND host=? AND path=?",
+                    (now, scheme, host, path),
+                )
+                self._wrote()
+        return CacheEntry(
             scheme=row[0],
             host=row[1],
             path=row[2],
@@ -235,17 +455,386 @@ class Cache:
             last_modified=row[4],
             status=int(row[5]),
             content_type=row[6],
-            body=row[7],
+            body=_unpack_body(row[7], row[10]),
             fetched_at=float(row[8]),
             expires_at=None if row[9] is None else float(row[9]),
         )
-        return entry, entry.fresh
+
+    def save(self, entry: CacheEntry) -> None:
+        blob, enc = _pack_body(entry.body)
+        with self._lock:
+            self._cx.execute(
+                """
+                INSERT INTO http_cache (
+                    scheme, host, path,
+                    etag, last_modified, status,
+                    content_type, body, fetched_at, expires_at,
+                    body_encoding, size, accessed_at
+                )
+                VALUES (?,?,?,?,?,?,?,?,?,?,?,?,?)
+                ON CONFLICT (scheme, host, path) DO UPDATE SET
+                    etag=excluded.etag,
+                    last_modified=excluded.last_modified,
+                    status=excluded.status,
+                    content_type=excluded.content_type,
+                    body=excluded.body,
+                    fetched_at=excluded.fetched_at,
+                    expires_at=excluded.expires_at,
+                    body_encoding=excluded.body_encoding,
+                    size=excluded.size,
+                    accessed_at=excluded.accessed_at
+                """,
+                (
+                    entry.scheme,
+                    entry.host,
+                    entry.path,
+                    entry.etag,
+                    entry.last_modified,
+                    int(entry.status),
+                    entry.content_type,
+                    blob,
+                    float(entry.fetched_at),
+                    None if entry.expires_at is None else float(entry.expires_at),
+                    enc,
+                    len(blob) if blob is not None else 0,
+                    float(entry.fetched_at),
+                ),
+            )
+            self._wrote()
+
+    def refresh(self, entry: CacheEntry) -> None:
+        with self._lock:
+            self._cx.execute(
+                """
+                UPDATE http_cache
+                   SET etag=?,
+                       last_modified=?,
+                       fetched_at=?,
+                       expires_at=?,
+                       accessed_at=?
+                 WHERE scheme=? AND host=? AND path=?
+                """,
+                (
+                    entry.etag,
+                    entry.last_modified,
+                    float(entry.fetched_at),
+                    None if entry.expires_at is None else float(entry.expires_at),
+                    float(entry.fetched_at),
+                    entry.scheme,
+                    entry.host,
+                    entry.path,
+                ),
+            )
+            self._wrote()
+
+    def delete(self, scheme: str, host: str, path: str) -> None:
+        with self._lock:
+            self._cx.execute(
+                "DELETE FROM http_cache WHERE scheme=? AND host=? AND path=?",
+                (scheme, host, path),
+            )
+            self._commit()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._cx.execute("DELETE FROM http_cache")
+            self._commit()
+
+    def flush(self) -> None:
+        with self._lock:
+            if self._pending:
+                self._commit()
+
+    def close(self) -> None:
+        try:
+            self.flush()
+        except Exception:
+            pass
+        try:
+            self._cx.close()
+        except Exception:
+            pass
+
+
+# Body refcounts and the byte total only change inside these scripts, so
+# workers saving or evicting entries that share a body cannot interleave.
+_REDIS_UNREF_FN = """
+local function unref(refs, bytes, bprefix, ref)
+  if not ref or ref == '' then return end
+  local digest = string.match(ref, ':(.*)$') or ref
+  if redis.call('HINCRBY', refs, digest, -1) > 0 then return end
+  redis.call('HDEL', refs, digest)
+  local bkey = bprefix .. digest
+  local n = redis.call('STRLEN', bkey)
+  if n > 0 then
+    redis.call('DEL', bkey)
+    redis.call('DECRBY', bytes, n)
+  end
+end
+"""
+
+# KEYS: meta, refs, lru, bytes
+# ARGV: body key prefix, digest ('' = no body), blob, lru score, field/value pairs...
+# Returns the total stored body bytes.
+_REDIS_SAVE_LUA = (
+    _REDIS_UNREF_FN
+    + """
+local old = redis.call('HGET', KEYS[1], 'body_ref')
+if ARGV[2] ~= '' then
+  if redis.call('SET', ARGV[1] .. ARGV[2], ARGV[3], 'NX') then
+    redis.call('INCRBY', KEYS[4], string.len(ARGV[3]))
+  end
+  redis.call('HINCRBY', KEYS[2], ARGV[2], 1)
+end
+redis.call('DEL', KEYS[1])
+redis.call('HSET', KEYS[1], unpack(ARGV, 5))
+redis.call('ZADD', KEYS[3], ARGV[4], KEYS[1])
+unref(KEYS[2], KEYS[4], ARGV[1], old)
+return tonumber(redis.call('GET', KEYS[4]) or '0')
+"""
+)
+
+# KEYS: meta, refs, lru, bytes    ARGV: body key prefix
+_REDIS_DELETE_LUA = (
+    _REDIS_UNREF_FN
+    + """
+local ref = redis.call('HGET', KEYS[1], 'body_ref')
+redis.call('DEL', KEYS[1])
+redis.call('ZREM', KEYS[3], KEYS[1])
+unref(KEYS[2], KEYS[4], ARGV[1], ref)
+return 1
+"""
+)
+
+# KEYS: refs, lru, bytes    ARGV: body key prefix, max entries to pop
+# Returns {entries evicted, remaining body bytes}.
+_REDIS_EVICT_LUA = (
+    _REDIS_UNREF_FN
+    + """
+local popped = redis.call('ZPOPMIN', KEYS[2], tonumber(ARGV[2]))
+local n = 0
+for i = 1, #popped, 2 do
+  local mkey = popped[i]
+  local ref = redis.call('HGET', mkey, 'body_ref')
+  redis.call('DEL', mkey)
+  unref(KEYS[1], KEYS[3], ARGV[1], ref)
+  n = n + 1
+end
+return {n, tonumber(redis.call('GET', KEYS[3]) or '0')}
+"""
+)
+
+
+class RedisBackend:
+    """
+    Redis storage shared by every worker.
+
+    Keys (under ``prefix``):
+      m:<sha1(url)>   hash with entry metadata + body digest
+      b:<sha256>      compressed body, content-addressed (identical pages share it)
+      r               hash body digest -> number of entries referencing it
+      lru             zset url-key -> last access time
+      bytes           total stored body bytes (drives LRU eviction)
+    """
+
+    def __init__(
+        self,
+        client: Any = None,
+        *,
+        prefix: str | None = None,
+        max_bytes: int | None = None,
+    ):
+        if client is None:
+            if not _HAS_REDIS:
+                raise RuntimeError("redis package not installed; cannot use RedisBackend")
+            client = _redis_lib.Redis.from_url(FETCH_CACHE_REDIS_URL)
+        self.r = client
+        self.prefix = prefix or FETCH_CACHE_REDIS_PREFIX
+        self.max_bytes = FETCH_CACHE_MAX_BYTES if max_bytes is None else int(max_bytes)
+        self.evictions = 0
+        self._save_script = self.r.register_script(_REDIS_SAVE_LUA)
+        self._delete_script = self.r.register_script(_REDIS_DELETE_LUA)
+        self._evict_script = self.r.register_script(_REDIS_EVICT_LUA)
+
+    # ---- keys ------------------------------------------------------------------------
+
+    def _meta_key(self, scheme: str, host: str, path: str) -> str:
+        digest = hashlib.sha1(f"{scheme}://{host}{path}".encode()).hexdigest()
+        return f"{self.prefix}:m:{digest}"
+
+    def _body_key(self, digest: str) -> str:
+        return f"{self.prefix}:b:{digest}"
+
+    @property
+    def _refs_key(self) -> str:
+        return f"{self.prefix}:r"
+
+    @property
+    def _lru_key(self) -> str:
+        return f"{self.prefix}:lru"
+
+    @property
+    def _bytes_key(self) -> str:
+        return f"{self.prefix}:bytes"
+
+    # ---- body refcounting (atomic, see _REDIS_*_LUA) ---------------------------------
+
+    @property
+    def _body_prefix(self) -> str:
+        return f"{self.prefix}:b:"
+
+    def _evict_over_budget(self, total: int) -> None:
+        if self.max_bytes <= 0 or total <= self.max_bytes:
+            return
+        target = int(self.max_bytes * _EVICT_TARGET_RATIO)
+        while total > target:
+            n, total = self._evict_script(
+                keys=[self._refs_key, self._lru_key, self._bytes_key],
+                args=[self._body_prefix, 16],
+            )
+            self.evictions += int(n)
+            if not n:
+                return
+
+    # ---- CacheBackend ----------------------------------------------------------------
+
+    def load(self, scheme: str, host: str, path: str) -> CacheEntry | None:
+        mkey = self._meta_key(scheme, host, path)
+        raw = self.r.hgetall(mkey)
+        if not raw:
+            return None
+        meta = {_s(k): _s(v) for k, v in raw.items()}
+        body: bytes | None = None
+        ref = meta.get("body_ref")
+        if ref:
+            enc, _, digest = ref.partition(":")
+            body = _unpack_body(self.r.get(self._body_key(digest)), enc or None)
+        self.r.zadd(self._lru_key, {mkey: _now()})
+        return CacheEntry(
+            scheme=scheme,
+            host=host,
+            path=path,
+            etag=meta.get("etag") or None,
+            last_modified=meta.get("last_modified") or None,
+            status=int(meta.get("status") or 0),
+            content_type=meta.get("content_type") or None,
+            body=body,
+            fetched_at=float(meta.get("fetched_at") or 0.0),
+            expires_at=float(meta["expires_at"]) if meta.get("expires_at") else None,
+        )
+
+    def save(self, entry: CacheEntry) -> None:
+        mkey = self._meta_key(entry.scheme, entry.host, entry.path)
+        blob, enc = _pack_body(entry.body)
+        digest = hashlib.sha256(blob).hexdigest() if blob is not None else ""
+        fields = {
+            "etag": entry.etag or "",
+            "last_modified": entry.last_modified or "",
+            "status": int(entry.status),
+            "content_type": entry.content_type or "",
+            "fetched_at": float(entry.fetched_at),
+            "expires_at": "" if entry.expires_at is None else float(entry.expires_at),
+            "body_ref": f"{enc or ''}:{digest}" if digest else "",
+        }
+        total = self._save_script(
+            keys=[mkey, self._refs_key, self._lru_key, self._bytes_key],
+            args=[
+                self._body_prefix,
+                digest,
+                blob or b"",
+                float(entry.fetched_at),
+                *(x for kv in fields.items() for x in kv),
+            ],
+        )
+        self._evict_over_budget(int(total or 0))
+
+    def refresh(self, entry: CacheEntry) -> None:
+        mkey = self._meta_key(entry.scheme, entry.host, entry.path)
+        if not self.r.exists(mkey):
+            return
+        self.r.hset(
+            mkey,
+            mapping={
+                "etag": entry.etag or "",
+                "last_modified": entry.last_modified or "",
+                "fetched_at": float(entry.fetched_at),
+                "expires_at": "" if entry.expires_at is None else float(entry.expires_at),
+            },
+        )
+        self.r.zadd(self._lru_key, {mkey: float(entry.fetched_at)})
+
+    def delete(self, scheme: str, host: str, path: str) -> None:
+        mkey = self._meta_key(scheme, host, path)
+        self._delete_script(
+            keys=[mkey, self._refs_key, self._lru_key, self._bytes_key],
+            args=[self._body_prefix],
+        )
+
+    def clear(self) -> None:
+        keys = list(self.r.scan_iter(match=f"{self.prefix}:*", count=500))
+        for i in range(0, len(keys), 500):
+            self.r.delete(*keys[i : i + 500])
+
+    def flush(self) -> None:
+        return None
+
+    def close(self) -> None:
+        return None
+
+
+def _s(v: Any) -> str | None:
+    if v is None:
+        return None
+    if isinstance(v, bytes):
+        return v.decode("utf-8", "replace")
+    return str(v)
+
+
+# --------------------------------------------------------------------------------------
+# Cache
+# --------------------------------------------------------------------------------------
+
+
+class Cache:
+    """
+    Policy layer over a CacheBackend. ``Cache(db_path)`` keeps the historical
+    SQLite behaviour; pass ``backend=`` to use another store.
+    """
+
+    def __init__(self, db_path: str | None = None, *, backend: CacheBackend | None = None):
+        self.backend: CacheBackend = backend if backend is not None else SqliteBackend(db_path)
+        self.db_path = getattr(self.backend, "db_path", None)
+        self._stats = CacheStats()
+
+    # ---- stats -----------------------------------------------------------------------
+
+    @property
+    def stats(self) -> CacheStats:
+        self._stats.evictions = int(getattr(self.backend, "evictions", 0))
+        return self._stats
+
+    # ---- public API ------------------------------------------------------------------
+
+    def get(self, url: str) -> tuple[CacheEntry | None, bool]:
+        """
+        Return (entry, is_fresh). If no entry, (None, False).
+        """
+        entry = self.backend.load(*_normalize_url(url))
+        if entry is None:
+            self._stats.misses += 1
+            return None, False
+        fresh = entry.fresh
+        if fresh:
+            self._stats.hits += 1
+        else:
+            self._stats.stale += 1
+        return entry, fresh
 
     def conditionals(self, url: str) -> Mapping[str, str]:
         """
         Return conditional headers (If-None-Match / If-Modified-Since) if we have them.
         """
-        entry, _ = self.get(url)
+        entry = self.backend.load(*_normalize_url(url))
         if not entry:
             return {}
         headers = {}
@@ -280,39 +869,20 @@ class Cache:
         # If 'no-store', expires_at will be None: store metadata only for completeness.
         body_to_store = body if _allowed_body(ct, body) and expires_at is not None else None
 
-        self._cx.execute(
-            """
-            INSERT INTO http_cache (
-                scheme, host, path,
-                etag, last_modified, status,
-                content_type, body, fetched_at, expires_at
-            )
-            VALUES (?,?,?,?,?,?,?,?,?,?)
-            ON CONFLICT (scheme, host, path) DO UPDATE SET
-                etag=excluded.etag,
-                last_modified=excluded.last_modified,
-                status=excluded.status,
-                content_type=excluded.content_type,
-                body=excluded.body,
-                fetched_at=excluded.fetched_at,
-                expires_at=excluded.expires_at
-            """,
-            (
-                scheme,
-                host,
-                path,
-                etag,
-                last_mod,
-                int(status),
-                ct,
-                body_to_store,
-                float(now),
-                None if expires_at is None else float(expires_at),
-            ),
+        entry = CacheEntry(
+            scheme=scheme,
+            host=host,
+            path=path,
+            etag=etag,
+            last_modified=last_mod,
+            status=int(status),
+            content_type=ct,
+            body=body_to_store,
+            fetched_at=float(now),
+            expires_at=None if expires_at is None else float(expires_at),
         )
-        self._cx.commit()
-        entry, _ = self.get(url)
-        assert entry is not None
+        self.backend.save(entry)
+        self._stats.stores += 1
         return entry
 
     def store_304(
@@ -327,7 +897,7 @@ class Cache:
         """
         if now is None:
             now = _now()
-        existing, _ = self.get(url)
+        existing = self.backend.load(*_normalize_url(url))
         if not existing:
             # No prior entity (shouldn't happen), do nothing.
             return None
@@ -342,44 +912,30 @@ class Cache:
             # If 304 + no-store, keep old expiry (but it's weird). Fallback to default TTL.
             expires_at = now + FETCH_CACHE_TTL_SEC
 
-        self._cx.execute(
-            """
-            UPDATE http_cache
-               SET etag=?,
-                   last_modified=?,
-                   fetched_at=?,
-                   expires_at=?
-             WHERE scheme=? AND host=? AND path=?
-            """,
-            (
-                etag,
-                last_mod,
-                float(now),
-                float(expires_at),
-                existing.scheme,
-                existing.host,
-                existing.path,
-            ),
+        entry = dataclasses.replace(
+            existing,
+            etag=etag,
+            last_modified=last_mod,
+            fetched_at=float(now),
+            expires_at=float(expires_at),
         )
-        self._cx.commit()
-        entry, _ = self.get(url)
+        self.backend.refresh(entry)
+        self._stats.revalidated += 1
         return entry
 
     def purge(self, url: str) -> None:
-        scheme, host, path = _normalize_url(url)
-        self._cx.execute(
-            "DELETE FROM http_cache WHERE scheme=? AND host=? AND path=?",
-            (scheme, host, path),
-        )
-        self._cx.commit()
+        self.backend.delete(*_normalize_url(url))
 
     def clear_all(self) -> None:
-        self._cx.execute("DELETE FROM http_cache")
-        self._cx.commit()
+        self.backend.clear()
+
+    def flush(self) -> None:
+        """Commit any batched writes (SQLite) so other processes can see them."""
+        self.backend.flush()
 
     def close(self) -> None:
         try:
-            self._cx.close()
+            self.backend.close()
         except Exception:
             pass
 
@@ -391,10 +947,17 @@ class Cache:
 _default_cache: Cache | None = None
 
 
+def _make_default_backend() -> CacheBackend:
+    if FETCH_CACHE_BACKEND == "redis":
+        return RedisBackend()
+    return SqliteBackend(FETCH_CACHE_DB)
+
+
 def default() -> Cache:
     global _default_cache
     if _default_cache is None:
-        _default_cache = Cache()
+        _default_cache = Cache(backend=_make_default_backend())
+        atexit.register(_default_cache.flush)
     return _default_cache
 
 
@@ -429,3 +992,11 @@ def purge(url: str) -> None:
 
 def clear_all() -> None:
     default().clear_all()
+
+
+def flush() -> None:
+    default().flush()
+
+
+def stats() -> dict[str, Any]:
+    return default().stats.as_dict()
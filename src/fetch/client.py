@@ -220,9 +220,8 @@ class FetcherClient:
             status = int(resp.status_code)
 
             if status == 304:
-                self.cache.store_304(url, resp.headers)
+                fresh_entry = self.cache.store_304(url, resp.headers)
                 throttle.after_response(host, 304)
-                fresh_entry, _ = self.cache.get(url)
                 body = _cap_body(fresh_entry.body if (fresh_entry and fresh_entry.body) else None)
                 content_type = (
                     fresh_entry.content_type if fresh_entry else resp.headers.get("Content-Type")
@@ -8,6 +8,13 @@ This module:
   - Respects Crawl-delay.
   - Provides explainability for blocked URLs (Task A).
 
+Caching:
+  - In-process memo of resolved policies (host → _Policy).
+  - Optional shared Redis layer (ROBOTS_CACHE_BACKEND=redis) holding the parsed
+    groups, fetch status and wall-clock expiry per host, so workers, the API and
+    scripts fetch each robots.txt once. Fetches are single-flight across the
+    fleet via a per-host Redis lock; prefetch(hosts) warms both layers.
+
 Status handling:
   - 200 → parse and enforce rules; cache for ROBOTS_TTL_SECONDS
   - 404/401/403 → treat as no robots (allow_all); cache for ROBOTS_TTL_SECONDS
@@ -16,9 +23,14 @@ Status handling:
 
 from __future__ import annotations
 
+import json
 import logging
+import os
 import threading
 import time
+import uuid
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from typing import Any
 
@@ -26,6 +38,14 @@ import httpx
 
 from src.config import FETCH_USER_AGENT
 
+try:  # optional: shared robots cache across workers
+    import redis as _redis_lib
+
+    _HAS_REDIS = True
+except Exception:  # pragma: no cover
+    _redis_lib = None  # type: ignore[assignment]
+    _HAS_REDIS = False
+
 log = logging.getLogger(__name__)
 
 # --------------------------------------------------------------------------------------
@@ -39,6 +59,19 @@ ROBOTS_DEFAULT_DELAY_SECONDS: float = 1.25  # polite default when no crawl-delay
 
 _ROBOTS_SCHEME = "https"
 
+# Shared (fleet-wide) layer behind the in-process memo: "memory" (off) or "redis"
+ROBOTS_CACHE_BACKEND = os.getenv("ROBOTS_CACHE_BACKEND", "memory").strip().lower()
+ROBOTS_CACHE_REDIS_PREFIX = os.getenv("ROBOTS_CACHE_REDIS_PREFIX", "robots")
+ROBOTS_CACHE_REDIS_URL = (
+    os.getenv("ROBOTS_CACHE_REDIS_URL")
+    or os.getenv("RQ_REDIS_URL")
+    or os.getenv("REDIS_URL")
+    or "redis://127.0.0.1:6379/0"
+)
+# How long a worker waits for another worker's in-flight fetch of the same host
+ROBOTS_LOCK_WAIT_SECONDS: float = float(os.getenv("ROBOTS_LOCK_WAIT_SECONDS", "12.0"))
+ROBOTS_PREFETCH_WORKERS = int(os.getenv("ROBOTS_PREFETCH_WORKERS", "16"))
+
 # --------------------------------------------------------------------------------------
 # Data structures
 # --------------------------------------------------------------------------------------
@@ -321,8 +354,7 @@ def _evaluate_rules(path: str, rules: list[_Rule]) -> tuple[bool, _Rule | None]:
     return best_rule.allow, best_rule
 
 
-def _build_policy_from_text(text: str) -> _Policy:
-    parsed = _parse_robots(text)
+def _policy_from_parsed(parsed: _ParsedRobots) -> _Policy:
     grp = _best_group_for_ua(parsed, FETCH_USER_AGENT)
     if grp is None:
         return _Policy(
@@ -343,77 +375,265 @@ def _build_policy_from_text(text: str) -> _Policy:
     )
 
 
-def _fetch_and_resolve(host: str) -> _Policy:
+def _build_policy_from_text(text: str) -> _Policy:
+    return _policy_from_parsed(_parse_robots(text))
+
+
+@dataclass
+class _Fetched:
     """
-    Fetch https://{host}/robots.txt and return a resolved policy for our UA.
+    UA-independent outcome of one robots.txt fetch; what the shared layer stores.
+
+    kind is "parsed" (200; groups hold the file) or the final "allow_all"/"deny_all".
     """
+
+    kind: str
+    robots_url: str
+    reason: str
+    status_code: int | None = None
+    groups: list[_Group] = field(default_factory=list)
+    # wall-clock, comparable across processes
+    fetched_at: float = 0.0
+    expires_at: float = 0.0
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "kind": self.kind,
+                "robots_url": self.robots_url,
+                "reason": self.reason,
+                "status_code": self.status_code,
+                "groups": [
+                    {
+                        "uas": g.uas,
+                        "rules": [[r.allow, r.path] for r in g.rules],
+                        "crawl_delay": g.crawl_delay,
+                    }
+                    for g in self.groups
+                ],
+                "fetched_at": self.fetched_at,
+                "expires_at": self.expires_at,
+            }
+        )
+
+    @classmethod
+    def from_json(cls, raw: str | bytes) -> _Fetched:
+        d = json.loads(raw)
+        return cls(
+            kind=d["kind"],
+            robots_url=d.get("robots_url") or "",
+            reason=d.get("reason") or "",
+            status_code=d.get("status_code"),
+            groups=[
+                _Group(
+                    uas=list(g.get("uas") or []),
+                    rules=[_Rule(bool(a), str(p)) for a, p in g.get("rules") or []],
+                    crawl_delay=g.get("crawl_delay"),
+                )
+                for g in d.get("groups") or []
+            ],
+            fetched_at=float(d.get("fetched_at") or 0.0),
+            expires_at=float(d.get("expires_at") or 0.0),
+        )
+
+
+def _to_policy(fetched: _Fetched) -> _Policy:
+    """Resolve a fetch outcome for our UA; monotonic expiry from the wall-clock one."""
+    if fetched.kind == "parsed":
+        pol = _policy_from_parsed(_ParsedRobots(groups=fetched.groups))
+        pol.reason = "ok"
+    else:
+        pol = _Policy(kind=fetched.kind, crawl_delay=ROBOTS_DEFAULT_DELAY_SECONDS)
+        pol.reason = fetched.reason
+    pol.status_code = fetched.status_code
+    pol.robots_url = fetched.robots_url
+    now = _now()
+    pol.fetched_at = now
+    pol.expires_at = now + max(0.0, fetched.expires_at - time.time())
+    return pol
+
+
+# One pooled client for every robots fetch in the process
+_CLIENT: httpx.Client | None = None
+_CLIENT_LOCK = threading.Lock()
+
+
+def _http_client() -> httpx.Client:
+    global _CLIENT
+    if _CLIENT is None:
+        with _CLIENT_LOCK:
+            if _CLIENT is None:
+                _CLIENT = httpx.Client(timeout=ROBOTS_TIMEOUT_SECONDS, follow_redirects=True)
+    return _CLIENT
+
+
+def _fetch(host: str) -> _Fetched:
+    """Fetch https://{host}/robots.txt (no caching)."""
     url = f"{_ROBOTS_SCHEME}://{host}/robots.txt"
     try:
-        with httpx.Client(
-            timeout=ROBOTS_TIMEOUT_SECONDS,
-            follow_redirects=True,
-            headers={"User-Agent": FETCH_USER_AGENT},
-        ) as client:
-            resp = client.get(url)
+        resp = _http_client().get(url, headers={"User-Agent": FETCH_USER_AGENT})
     except (httpx.RequestError, httpx.TimeoutException):
-        now = _now()
-        pol = _Policy(
+        now = time.time()
+        return _Fetched(
             kind="deny_all",
-            crawl_delay=ROBOTS_DEFAULT_DELAY_SECONDS,
-            reason="timeout",
-            status_code=None,
             robots_url=url,
+            reason="timeout",
             fetched_at=now,
             expires_at=now + ROBOTS_DENY_TTL_SECONDS,
         )
-        return pol
 
     status = resp.status_code
-    now = _now()
+    now = time.time()
 
     if status == 200:
-        pol = _build_policy_from_text(resp.text or "")
-        pol.status_code = 200
-        pol.reason = "ok"
-        pol.fetched_at = now
-        pol.expires_at = now + ROBOTS_TTL_SECONDS
-        pol.robots_url = url
-        return pol
-
-    if status in (401, 403, 404):
-        pol = _Policy(
-            kind="allow_all",
-            crawl_delay=ROBOTS_DEFAULT_DELAY_SECONDS,
-            reason=f"{status}-treat-as-no-robots",
-            status_code=status,
+        return _Fetched(
+            kind="parsed",
             robots_url=url,
+            reason="ok",
+            status_code=200,
+            groups=_parse_robots(resp.text or "").groups,
             fetched_at=now,
             expires_at=now + ROBOTS_TTL_SECONDS,
         )
-        return pol
 
-    if status >= 500:
-        pol = _Policy(
-            kind="deny_all",
-            crawl_delay=ROBOTS_DEFAULT_DELAY_SECONDS,
-            reason=f"{status}-server-error",
-            status_code=status,
-            robots_url=url,
-            fetched_at=now,
-            expires_at=now + ROBOTS_DENY_TTL_SECONDS,
-        )
-        return pol
-
-    pol = _Policy(
-        kind="allow_all",
-        crawl_delay=ROBOTS_DEFAULT_DELAY_SECONDS,
-        reason=f"{status}-treated-as-allow",
-        status_code=status,
+    if status in (401, 403, 404):
+        kind, reason, ttl = "allow_all", f"{status}-treat-as-no-robots", ROBOTS_TTL_SECONDS
+    elif status >= 500:
+        kind, reason, ttl = "deny_all", f"{status}-server-error", ROBOTS_DENY_TTL_SECONDS
+    else:
+        kind, reason, ttl = "allow_all", f"{status}-treated-as-allow", ROBOTS_TTL_SECONDS
+    return _Fetched(
+        kind=kind,
         robots_url=url,
+        reason=reason,
+        status_code=status,
         fetched_at=now,
-        expires_at=now + ROBOTS_TTL_SECONDS,
+        expires_at=now + ttl,
     )
-    return pol
+
+
+def _fetch_and_resolve(host: str) -> _Policy:
+    """
+    Fetch https://{host}/robots.txt and return a resolved policy for our UA.
+    """
+    return _to_policy(_fetch(host))
+
+
+# --------------------------------------------------------------------------------------
+# Shared layer (Redis)
+# --------------------------------------------------------------------------------------
+
+# KEYS: lock; ARGV: token. Delete the lock only if we still own it.
+_UNLOCK_LUA = """
+if redis.call('GET', KEYS[1]) == ARGV[1] then
+  return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+class RedisRobotsStore:
+    """
+    Fleet-wide robots cache.
+
+    Keys (under ``prefix``):
+      h:<host>      JSON _Fetched, expiring with the entry
+      lock:<host>   single-flight fetch lock (token, PX)
+    """
+
+    def __init__(self, client: Any = None, *, prefix: str | None = None):
+        if client is None:
+            if not _HAS_REDIS:
+                raise RuntimeError("redis package not installed; cannot use RedisRobotsStore")
+            client = _redis_lib.Redis.from_url(ROBOTS_CACHE_REDIS_URL)
+        self.r = client
+        self.prefix = prefix or ROBOTS_CACHE_REDIS_PREFIX
+
+    def get(self, host: str) -> _Fetched | None:
+        raw = self.r.get(f"{self.prefix}:h:{host}")
+        if raw is None:
+            return None
+        fetched = _Fetched.from_json(raw)
+        return fetched if fetched.expires_at > time.time() else None
+
+    def put(self, host: str, fetched: _Fetched) -> None:
+        ttl_ms = int((fetched.expires_at - time.time()) * 1000)
+        if ttl_ms > 0:
+            self.r.set(f"{self.prefix}:h:{host}", fetched.to_json(), px=ttl_ms)
+
+    def lock(self, host: str) -> str | None:
+        token = uuid.uuid4().hex
+        ttl_ms = int((ROBOTS_TIMEOUT_SECONDS + 5.0) * 1000)
+        if self.r.set(f"{self.prefix}:lock:{host}", token, nx=True, px=ttl_ms):
+            return token
+        return None
+
+    def unlock(self, host: str, token: str) -> None:
+        self.r.eval(_UNLOCK_LUA, 1, f"{self.prefix}:lock:{host}", token)
+
+
+_STORE: RedisRobotsStore | None = None
+_STORE_INIT = False
+
+
+def set_shared_store(store: RedisRobotsStore | None) -> None:
+    """Install (or remove with None) the shared layer; overrides ROBOTS_CACHE_BACKEND."""
+    global _STORE, _STORE_INIT
+    _STORE, _STORE_INIT = store, True
+
+
+def _shared_store() -> RedisRobotsStore | None:
+    global _STORE, _STORE_INIT
+    if not _STORE_INIT:
+        with _GLOBAL_LOCK:
+            if not _STORE_INIT:
+                if ROBOTS_CACHE_BACKEND == "redis":
+                    try:
+                        _STORE = RedisRobotsStore()
+                    except Exception:
+                        log.warning("robots: shared cache unavailable", exc_info=True)
+                _STORE_INIT = True
+    return _STORE
+
+
+def _fetch_single_flight(host: str, store: RedisRobotsStore, *, force: bool) -> _Fetched:
+    """
+    Return a fresh shared entry, or fetch it while holding the host's lock.
+    Workers that lose the lock wait for the winner's entry (bounded), then
+    fall back to fetching themselves.
+    """
+    deadline = time.monotonic() + ROBOTS_LOCK_WAIT_SECONDS
+    while True:
+        if not force:
+            hit = store.get(host)
+            if hit is not None:
+                return hit
+        token = store.lock(host)
+        if token is not None:
+            try:
+                fetched = _fetch(host)
+                store.put(host, fetched)
+                return fetched
+            finally:
+                store.unlock(host, token)
+        if time.monotonic() >= deadline:
+            log.info("robots: gave up waiting for in-flight fetch", extra={"host": host})
+            return _fetch(host)
+        # someone else is fetching it; their result satisfies a forced refresh too
+        force = False
+        time.sleep(0.05)
+
+
+def _resolve(host: str, *, force_refresh: bool) -> _Policy:
+    store = _shared_store()
+    if store is None:
+        return _fetch_and_resolve(host)
+    try:
+        fetched = _fetch_single_flight(host, store, force=force_refresh)
+    except Exception:
+        log.debug("robots: shared cache error; fetching directly", exc_info=True)
+        return _fetch_and_resolve(host)
+    return _to_policy(fetched)
 
 
 def _get_policy(host: str, *, force_refresh: bool = False) -> _Policy:
@@ -432,7 +652,7 @@ def _get_policy(host: str, *, force_refresh: bool = False) -> _Policy:
             if _now() < cached.expires_at:
                 return cached
 
-        pol = _fetch_and_resolve(host)
+        pol = _resolve(host, force_refresh=force_refresh)
         _MEMO[host] = pol
         return pol
 
@@ -538,12 +758,28 @@ def get_crawl_delay(host: str) -> float:
 
 
 def clear_cache() -> None:
-    """Clear the in-memory robots cache (useful for testing)."""
+    """Clear the in-memory robots cache (useful for testing). The shared layer is kept."""
     with _GLOBAL_LOCK:
         _MEMO.clear()
         _LOCKS.clear()
 
 
+def prefetch(hosts: Iterable[str], *, max_workers: int | None = None) -> dict[str, str]:
+    """
+    Warm the robots cache for many hosts in parallel (e.g. all domains at run start).
+
+    Returns host -> policy kind. With the shared layer enabled this fills Redis for
+    every worker; hosts already cached cost no fetch.
+    """
+    uniq = list(dict.fromkeys(h.strip().lower() for h in hosts if h and h.strip()))
+    if not uniq:
+        return {}
+    workers = max(1, min(len(uniq), max_workers or ROBOTS_PREFETCH_WORKERS))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="robots") as pool:
+        kinds = list(pool.map(lambda h: _get_policy(h).kind, uniq))
+    return dict(zip(uniq, kinds, strict=True))
+
+
 def force_refresh(host: str) -> None:
     """Force a re-fetch of robots.txt for the given host."""
     _get_policy(host, force_refresh=True)
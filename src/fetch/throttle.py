@@ -1,13 +1,41 @@
 # src/fetch/throttle.py
+"""
+Per-host politeness throttling for the fetcher.
+
+State per host: the next time it may be hit and the consecutive WAF strike
+count. It lives in this process by default; THROTTLE_BACKEND=redis moves it to
+Redis (RedisThrottleBackend) so every crawl worker sharing a host also shares
+its crawl-delay gaps and WAF backoff. The API is the same either way.
+
+  wait_for_turn(host)   block until the host is eligible (with the shared
+                        backend this claims the turn, so workers never share one)
+  wait_for_turn_async   the same for asyncio callers (the concurrent crawler)
+  reserve_slot(host)    non-blocking: claim a turn, get the delay until it
+  after_response(...)   schedule the next gap / WAF cool-off from a status
+"""
+
 from __future__ import annotations
 
+import asyncio
+import logging
 import os
 import threading
 import time
 from dataclasses import dataclass
+from typing import Any
 
 from . import robots
 
+try:  # optional: shared throttle state across workers
+    import redis as _redis_lib
+
+    _HAS_REDIS = True
+except Exception:  # pragma: no cover
+    _redis_lib = None  # type: ignore[assignment]
+    _HAS_REDIS = False
+
+log = logging.getLogger(__name__)
+
 # --------------------------------------------------------------------------------------
 # Configuration (env-overridable)
 # --------------------------------------------------------------------------------------
@@ -18,6 +46,17 @@ BASE_BACKOFF_S = float(os.getenv("THROTTLE_BASE_BACKOFF_SECONDS", "3.0"))
 MAX_BACKOFF_S = float(os.getenv("THROTTLE_MAX_BACKOFF_SECONDS", "60.0"))
 # Safety minimum per-host gap if robots has no Crawl-delay
 DEFAULT_MIN_GAP_S = float(os.getenv("THROTTLE_DEFAULT_MIN_GAP_SECONDS", "1.0"))
+# Where per-host state lives: "memory" (this process) or "redis" (all workers)
+THROTTLE_BACKEND = os.getenv("THROTTLE_BACKEND", "memory").strip().lower()
+THROTTLE_REDIS_PREFIX = os.getenv("THROTTLE_REDIS_PREFIX", "throttle")
+THROTTLE_REDIS_URL = (
+    os.getenv("THROTTLE_REDIS_URL")
+    or os.getenv("RQ_REDIS_URL")
+    or os.getenv("REDIS_URL")
+    or "redis://127.0.0.1:6379/0"
+)
+# Shared state for a host is dropped this long after its last scheduled turn
+THROTTLE_IDLE_TTL_S = float(os.getenv("THROTTLE_IDLE_TTL_SECONDS", "3600"))
 
 # --------------------------------------------------------------------------------------
 # State
@@ -64,17 +103,186 @@ def _state(host: str) -> _HostState:
     return st
 
 
+# --------------------------------------------------------------------------------------
+# Shared (cross-worker) backend
+# --------------------------------------------------------------------------------------
+
+# KEYS: host hash {next (epoch ms, server clock), strikes}
+# ARGV: op, amount_ms, max_backoff_ms, idle_ttl_ms
+#   ok       strikes = 0;  next = max(next, now + amount)
+#   gap      next = max(next, now + amount)
+#   penalize strikes += 1; next = max(next, now) + min(max, amount * 2^strikes)
+#   reserve  slot = max(next, now); next = slot + amount
+#   peek     no change
+# Returns {now_ms, next_ms, strikes, result_ms}: result is the scheduled delay,
+# or for reserve the wait until the caller's slot. ok/gap measure the crawl-delay
+# from the response and never stack on a turn another worker already reserved.
+_THROTTLE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local op = ARGV[1]
+local amount = tonumber(ARGV[2])
+local state = redis.call('HMGET', KEYS[1], 'next', 'strikes')
+local nxt = tonumber(state[1]) or 0
+local strikes = tonumber(state[2]) or 0
+local result = 0
+
+if op == 'peek' then
+  return {now, nxt, strikes, 0}
+end
+local base = math.max(nxt, now)
+if op == 'ok' then
+  strikes = 0
+  result = amount
+  nxt = math.max(nxt, now + amount)
+elseif op == 'gap' then
+  result = amount
+  nxt = math.max(nxt, now + amount)
+elseif op == 'penalize' then
+  strikes = strikes + 1
+  result = math.min(tonumber(ARGV[3]), amount * 2 ^ strikes)
+  nxt = base + result
+elseif op == 'reserve' then
+  result = base - now
+  nxt = base + amount
+end
+redis.call('HSET', KEYS[1], 'next', nxt, 'strikes', strikes)
+redis.call('PEXPIRE', KEYS[1], nxt - now + tonumber(ARGV[4]))
+return {now, nxt, strikes, result}
+"""
+
+
+class RedisThrottleBackend:
+    """
+    Per-host throttle state in Redis, shared by every crawl worker.
+
+    One hash per host ({prefix}:{host}) holds the next-allowed timestamp (server
+    clock, ms) and the consecutive WAF strike count. Every update is one atomic
+    script call, so concurrent workers never lose a strike or a scheduled gap.
+    """
+
+    def __init__(self, client: Any = None, *, prefix: str | None = None):
+        if client is None:
+            if not _HAS_REDIS:
+                raise RuntimeError("redis package not installed; cannot use RedisThrottleBackend")
+            client = _redis_lib.Redis.from_url(THROTTLE_REDIS_URL)
+        self.r = client
+        self.prefix = prefix or THROTTLE_REDIS_PREFIX
+        self._script = self.r.register_script(_THROTTLE_LUA)
+
+    def call(self, host: str, op: str, amount_s: float = 0.0) -> tuple[float, int, float]:
+        """Run one op; returns (seconds until next allowed, strikes, result seconds)."""
+        now_ms, next_ms, strikes, result_ms = self._script(
+            keys=[f"{self.prefix}:{host}"],
+            args=[
+                op,
+                int(round(amount_s * 1000)),
+                int(round(MAX_BACKOFF_S * 1000)),
+                int(THROTTLE_IDLE_TTL_S * 1000),
+            ],
+        )
+        remaining = max(0.0, (float(next_ms) - float(now_ms)) / 1000.0)
+        return remaining, int(strikes), float(result_ms) / 1000.0
+
+    def clear(self, host: str | None = None) -> None:
+        if host is not None:
+            self.r.delete(f"{self.prefix}:{host}")
+            return
+        for key in self.r.scan_iter(match=f"{self.prefix}:*", count=500):
+            self.r.delete(key)
+
+
+_SHARED: RedisThrottleBackend | None = None
+_SHARED_INIT = False
+
+
+def set_shared_backend(backend: RedisThrottleBackend | None) -> None:
+    """Install (or remove with None) the shared backend; overrides THROTTLE_BACKEND."""
+    global _SHARED, _SHARED_INIT
+    _SHARED, _SHARED_INIT = backend, True
+
+
+def _shared() -> RedisThrottleBackend | None:
+    global _SHARED, _SHARED_INIT
+    if not _SHARED_INIT:
+        with _GLOBAL_LOCK:
+            if not _SHARED_INIT:
+                if THROTTLE_BACKEND == "redis":
+                    try:
+                        _SHARED = RedisThrottleBackend()
+                    except Exception:
+                        log.warning("throttle: shared backend unavailable", exc_info=True)
+                _SHARED_INIT = True
+    return _SHARED
+
+
+def _shared_call(host: str, op: str, amount_s: float = 0.0) -> tuple[float, int, float] | None:
+    """Run op on the shared backend; None when it is off or unreachable (use local state)."""
+    backend = _shared()
+    if backend is None:
+        return None
+    try:
+        return backend.call(host, op, amount_s)
+    except Exception:
+        log.debug("throttle: shared backend error; using local state", exc_info=True)
+        return None
+
+
+def _local_update(host: str, op: str, amount_s: float) -> float:
+    """
+    The in-process counterpart of _THROTTLE_LUA (monotonic clock). Unlike the
+    shared script, "ok"/"gap" keep the historical stacking: the crawl-delay is
+    added on top of any pending window (e.g. a WAF cool-off), because the local
+    wait_for_turn() does not claim its turn up front.
+    """
+    with _host_lock(host):
+        st = _state(host)
+        now = _now()
+        # Never move next_allowed backwards
+        base = max(st.next_allowed_at, now)
+        if op == "reserve":
+            st.next_allowed_at = base + amount_s
+            return base - now
+        if op == "penalize":
+            st.waf_strikes += 1
+            amount_s = min(MAX_BACKOFF_S, amount_s * (2**st.waf_strikes))
+            st.next_allowed_at = base + amount_s
+            return amount_s
+        if op == "ok":
+            st.waf_strikes = 0  # reset consecutive WAF counters
+        st.next_allowed_at = base + amount_s
+        return amount_s
+
+
+def _update(host: str, op: str, amount_s: float) -> float:
+    shared = _shared_call(host, op, amount_s)
+    if shared is not None:
+        return shared[2]
+    return _local_update(host, op, amount_s)
+
+
 # --------------------------------------------------------------------------------------
 # Core API
 # --------------------------------------------------------------------------------------
 
 
-def wait_for_turn(host: str) -> float:
+def wait_for_turn(host: str, crawl_delay_s: float | None = None) -> float:
     """
     Block (sleep) until this host is eligible to be hit.
     Returns the number of seconds slept (0 if no wait).
+
+    With the shared backend the turn is claimed atomically (the reserve op), so
+    workers racing for the same host get slots one crawl-delay apart instead of
+    all waking at the same next-allowed time.
     """
     host = host.strip().lower()
+    if _shared() is not None:
+        shared = _shared_call(host, "reserve", _resolved_crawl_delay(host, crawl_delay_s))
+        if shared is not None:
+            dt = shared[2]
+            if dt > 0:
+                _sleep(dt)
+            return dt
     with _host_lock(host):
         st = _state(host)
         now = _now()
@@ -87,6 +295,26 @@ def wait_for_turn(host: str) -> float:
         return 0.0
 
 
+async def wait_for_turn_async(host: str, crawl_delay_s: float | None = None) -> float:
+    """
+    Awaitable wait_for_turn() for asyncio crawlers; returns the seconds waited.
+
+    With the shared backend the turn is claimed through reserve_slot(), so crawl
+    workers on different machines get slots one crawl-delay apart. Redis and
+    robots lookups run in a thread so the event loop is never blocked.
+    """
+    host = host.strip().lower()
+    if _shared() is not None:
+        dt = await asyncio.to_thread(reserve_slot, host, crawl_delay_s)
+    else:
+        with _host_lock(host):
+            dt = _state(host).next_allowed_at - _now()
+    if dt <= 0:
+        return 0.0
+    await asyncio.sleep(dt)
+    return dt
+
+
 def _resolved_crawl_delay(host: str, override: float | None) -> float:
     if override is not None:
         try:
@@ -101,6 +329,18 @@ def _resolved_crawl_delay(host: str, override: float | None) -> float:
         return DEFAULT_MIN_GAP_S
 
 
+def reserve_slot(host: str, crawl_delay_s: float | None = None) -> float:
+    """
+    Non-blocking: claim the caller's next turn on host and return the seconds
+    until it (0.0 means go now). The host's next turn moves one crawl-delay past
+    the claimed slot, so concurrent callers get distinct, spaced slots.
+
+    For async crawlers that schedule requests instead of sleeping in wait_for_turn().
+    """
+    host = host.strip().lower()
+    return _update(host, "reserve", _resolved_crawl_delay(host, crawl_delay_s))
+
+
 def mark_ok(host: str, crawl_delay_s: float | None = None) -> float:
     """
     Record a successful (2xx/304) response and schedule the next allowed time.
@@ -108,13 +348,8 @@ def mark_ok(host: str, crawl_delay_s: float | None = None) -> float:
     """
     host = host.strip().lower()
     delay = _resolved_crawl_delay(host, crawl_delay_s)
-    with _host_lock(host):
-        st = _state(host)
-        st.waf_strikes = 0  # reset consecutive WAF counters
-        now = _now()
-        # Never move next_allowed backwards; success sets gap = crawl-delay
-        st.next_allowed_at = max(st.next_allowed_at, now) + delay
-        return delay
+    # Success resets WAF strikes and sets gap = crawl-delay
+    return _update(host, "ok", delay)
 
 
 def penalize(host: str) -> float:
@@ -126,15 +361,7 @@ def penalize(host: str) -> float:
       This yields first backoff of 2 * BASE (e.g., 6s for base=3s).
     """
     host = host.strip().lower()
-    with _host_lock(host):
-        st = _state(host)
-        st.waf_strikes += 1
-        backoff = BASE_BACKOFF_S * (2**st.waf_strikes)
-        if backoff > MAX_BACKOFF_S:
-            backoff = MAX_BACKOFF_S
-        now = _now()
-        st.next_allowed_at = max(st.next_allowed_at, now) + backoff
-        return backoff
+    return _update(host, "penalize", BASE_BACKOFF_S)
 
 
 def after_response(host: str, status: int, crawl_delay_s: float | None = None) -> float:
@@ -150,11 +377,7 @@ def after_response(host: str, status: int, crawl_delay_s: float | None = None) -
     # Still apply at least the crawl-delay gap, but don't count as success (no reset of strikes).
     host = host.strip().lower()
     delay = _resolved_crawl_delay(host, crawl_delay_s)
-    with _host_lock(host):
-        st = _state(host)
-        now = _now()
-        st.next_allowed_at = max(st.next_allowed_at, now) + delay
-    return delay
+    return _update(host, "gap", delay)
 
 
 # --------------------------------------------------------------------------------------
@@ -165,6 +388,9 @@ def after_response(host: str, status: int, crawl_delay_s: float | None = None) -
 def next_allowed_at(host: str) -> float:
     """Return the monotonic timestamp when this host is next eligible."""
     host = host.strip().lower()
+    shared = _shared_call(host, "peek")
+    if shared is not None:
+        return _now() + shared[0]
     with _host_lock(host):
         return _state(host).next_allowed_at
 
@@ -172,12 +398,21 @@ def next_allowed_at(host: str) -> float:
 def waf_strikes(host: str) -> int:
     """Return current consecutive WAF strike count."""
     host = host.strip().lower()
+    shared = _shared_call(host, "peek")
+    if shared is not None:
+        return shared[1]
     with _host_lock(host):
         return _state(host).waf_strikes
 
 
 def clear(host: str | None = None) -> None:
-    """Clear throttling state (all hosts or a single host)."""
+    """Clear throttling state (all hosts or a single host), including the shared backend."""
+    backend = _shared()
+    if backend is not None:
+        try:
+            backend.clear(host.strip().lower() if host is not None else None)
+        except Exception:
+            log.debug("throttle: shared clear failed", exc_info=True)
     if host is None:
         with _GLOBAL_LOCK:
             _MEMO.clear()
@@ -111,8 +111,8 @@ def _write_jsonl(rows: Iterable[dict[str, object]], out_path: Path | None) -> No
 def _persist(rows: Iterable[dict[str, object]], batch_size: int) -> int:
     persist_rows, upsert_row = _load_persist_adapter()
     if persist_rows is not None:
-        # Delegate to bulk persist API
-        return int(persist_rows(rows))  # type: ignore[call-arg]
+        # Delegate to bulk persist API (batch_size rows per set-based chunk)
+        return int(persist_rows(rows, chunk_size=batch_size))  # type: ignore[call-arg]
     if upsert_row is not None:
         # Stream per-row upserts
         n = 0
@@ -165,7 +165,7 @@ def main(argv: list[str] | None = None) -> None:
         "--batch-size",
         type=int,
         default=500,
-        help="Batch size for per-row upserts when bulk API is unavailable (default: 500).",
+        help="Rows per bulk-ingest chunk (or per-row upsert batch) (default: 500).",
     )
     args = p.parse_args(argv)
 
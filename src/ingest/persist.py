@@ -30,7 +30,7 @@ from __future__ import annotations
 import json
 import logging
 import os
-from collections.abc import Iterable
+from collections.abc import Iterable, Sequence
 from contextlib import contextmanager
 from datetime import datetime
 from typing import Any
@@ -168,6 +168,11 @@ def _table_columns(con: Any, table: str) -> set[str]:
     """
     Get column names for a table (works with SQLite and PostgreSQL).
     """
+    from src.db import cached_schema
+
+    snap = cached_schema(con)
+    if snap is not None:
+        return set(snap.column_names(table))
     if _is_postgresql():
         # PostgreSQL: use information_schema
         try:
@@ -630,16 +635,13 @@ def _enqueue_probe_email(
 # ---------------------------------------------------------------------------
 
 
-def _insert_person(con: Any, company_id: int, normalized: dict[str, Any]) -> None:
+def _person_payload(
+    people_cols: set[str], company_id: int, normalized: dict[str, Any]
+) -> dict[str, Any]:
     """
-    Insert a person row. Honors new R13/R14 fields if present in schema.
-    Never drops provenance: source_url is passed through as provided.
-
-    Works with both SQLite and PostgreSQL.
+    Column -> value for one people row, limited to columns present in the schema.
+    Includes inline ICP scoring (R14) when configured.
     """
-    people_cols = _table_columns(con, "people")
-    is_pg = _is_postgresql()
-
     desired: dict[str, Any] = {
         "company_id": company_id,
         "first_name": normalized.get("first_name") or "",
@@ -674,6 +676,19 @@ def _insert_person(con: Any, company_id: int, normalized: dict[str, Any]) -> Non
         except Exception as e:  # best-effort; do not break ingest on scoring errors
             logger.warning("ICP scoring failed during insert; continuing without score: %s", e)
 
+    return payload
+
+
+def _insert_person(con: Any, company_id: int, normalized: dict[str, Any]) -> None:
+    """
+    Insert a person row. Honors new R13/R14 fields if present in schema.
+    Never drops provenance: source_url is passed through as provided.
+
+    Works with both SQLite and PostgreSQL.
+    """
+    payload = _person_payload(_table_columns(con, "people"), company_id, normalized)
+    is_pg = _is_postgresql()
+
     cols = list(payload.keys())
     if not cols:
         con.execute("INSERT INTO people DEFAULT VALUES")
@@ -761,43 +776,304 @@ def upsert_row(raw: dict[str, Any]) -> None:
     persist_best_effort(normalized)
 
 
-def persist_rows(rows: Iterable[dict[str, Any]]) -> int:
+def _persist_rows_each(con: Any, rows: Iterable[dict[str, Any]]) -> int:
+    """Row-at-a-time persist (pre-bulk path); kept for INGEST_BULK=0 and odd schemas."""
+    n = 0
+    for raw in rows:
+        if not isinstance(raw, dict):
+            continue
+        normalized, _errs = normalize_row(raw)
+
+        # Ensure user_supplied_domain survives normalization for enqueue
+        _inject_user_supplied_from_raw(normalized, raw)
+
+        company = (normalized.get("company") or "").strip() or None
+        domain = (normalized.get("domain") or "").strip() or None
+        name_norm, norm_key = _extract_company_norm_fields(normalized)
+
+        company_id = _upsert_company(con, company, domain, name_norm, norm_key)
+
+        # Insert person BEFORE attempting to enqueue
+        _insert_person(con, company_id, normalized)
+        n += 1
+
+        # Best-effort enqueue after DB write
+        normalized_hint = _compute_normalized_hint(normalized)
+        _enqueue_domain_resolution(con, company_id, (company or ""), normalized_hint)
+
+        # R15: enqueue MX resolver for concrete non-freemail domains
+        if domain:
+            _enqueue_mx_resolution(company_id, domain, force=False)
+
+        # NOTE (R16): As above, this file doesn't create emails; call
+        # _enqueue_probe_email(...) at the point where an email row is created.
+
+    con.commit()
+    return n
+
+
+def persist_rows(rows: Iterable[dict[str, Any]], *, chunk_size: int | None = None) -> int:
     """
     Normalize and persist an iterable of raw rows.
     Returns the number of rows persisted.
 
+    Uses the set-based bulk path (see "Bulk ingest" below) unless INGEST_BULK=0
+    or the companies table lacks name/domain columns.
+
     Works with both SQLite and PostgreSQL.
     """
-    n = 0
     with _get_connection() as con:
-        for raw in rows:
-            if not isinstance(raw, dict):
-                continue
-            normalized, _errs = normalize_row(raw)
+        if not INGEST_BULK_ENABLED or not {"name", "domain"} <= _table_columns(con, "companies"):
+            return _persist_rows_each(con, rows)
+        return _persist_rows_bulk(con, rows, chunk_size=chunk_size or INGEST_BULK_CHUNK)
 
-            # Ensure user_supplied_domain survives normalization for enqueue
-            _inject_user_supplied_from_raw(normalized, raw)
 
-            company = (normalized.get("company") or "").strip() or None
-            domain = (normalized.get("domain") or "").strip() or None
-            name_norm, norm_key = _extract_company_norm_fields(normalized)
+# ---------------------------------------------------------------------------
+# Bulk ingest (set-based)
+# ---------------------------------------------------------------------------
+#
+# Per chunk of INGEST_BULK_CHUNK rows:
+#   1) normalize the chunk
+#   2) COPY its company keys into a temp staging table, then insert missing
+#      companies and fill empty fields with a handful of set-based statements
+#      (same keying as _upsert_company: domain, else exact name)
+#   3) COPY the people rows
+#   4) commit, then enqueue follow-ups in one pipelined batch
+#      (src.queueing.fanout), one domain-resolution job per company and one
+#      MX job per (company, domain) instead of one of each per row
+#
+# Follow-up jobs go straight to RQ; the src.ingest.enqueue shim used by the
+# per-row path is not called.
+
+INGEST_BULK_ENABLED = os.getenv("INGEST_BULK", "1").strip().lower() not in {"0", "false", "no"}
+INGEST_BULK_CHUNK = max(1, int(os.getenv("INGEST_BULK_CHUNK", "1000")))
+# Companies per resolve_company_domains job (one resolve_many batch each)
+INGEST_RESOLVE_BATCH = max(1, int(os.getenv("INGEST_RESOLVE_BATCH", "50")))
+
+_STAGE_TABLE = "ingest_company_stage"
+_STAGE_COLS = ("seq", "name", "domain", "name_norm", "norm_key")
+
+
+def _copy_value(v: Any) -> Any:
+    """
+    JSON-encode list/dict values: COPY's CSV writer would store their Python repr
+    and SQLite's executemany rejects them.
+    """
+    if isinstance(v, (dict, list, tuple)):
+        return json.dumps(v, ensure_ascii=False)
+    return v
+
+
+def _copy_rows(con: Any, table: str, columns: Sequence[str], rows: list[Sequence[Any]]) -> None:
+    if not rows:
+        return
+    rows = [[_copy_value(v) for v in row] for row in rows]
+    copy_rows = getattr(con, "copy_rows", None)
+    if copy_rows is not None:
+        copy_rows(table, columns, rows)  # CompatConnection: COPY on Postgres
+        return
+    phs = ",".join("?" for _ in columns)
+    con.executemany(f"INSERT INTO {table} ({','.join(columns)}) VALUES ({phs})", rows)
 
-            company_id = _upsert_company(con, company, domain, name_norm, norm_key)
 
-            # Insert person BEFORE attempting to enqueue
-            _insert_person(con, company_id, normalized)
-            n += 1
+def _bulk_resolve_companies(
+    con: Any, staged: list[tuple[Any, ...]], *, cols: set[str]
+) -> tuple[dict[str, int], dict[str, int]]:
+    """
+    Upsert the staged (seq, name, domain, name_norm, norm_key) rows.
+    Returns ({domain: company_id}, {name: company_id}); name keys only cover
+    rows without a domain.
+    """
+    st = _STAGE_TABLE
+    con.execute(f"DELETE FROM {st}")
+    _copy_rows(con, st, _STAGE_COLS, staged)
+
+    extra = [f for f in ("name_norm", "norm_key") if f in cols]
+    ins_cols = ",".join(["name", "domain", *extra])
+    sel_cols = ",".join(f"s.{c}" for c in ["name", "domain", *extra])
+
+    # New companies: the first staged row for each unknown key is inserted.
+    con.execute(
+        f"""
+        INSERT INTO companies ({ins_cols})
+        SELECT {sel_cols} FROM {st} s
+         WHERE s.domain IS NOT NULL
+           AND s.seq = (SELECT MIN(s2.seq) FROM {st} s2 WHERE s2.domain = s.domain)
+           AND NOT EXISTS (SELECT 1 FROM companies c WHERE c.domain = s.domain)
+        """
+    )
+    con.execute(
+        f"""
+        INSERT INTO companies ({ins_cols})
+        SELECT {sel_cols} FROM {st} s
+         WHERE s.domain IS NULL AND s.name IS NOT NULL
+           AND s.seq = (
+             SELECT MIN(s2.seq) FROM {st} s2 WHERE s2.domain IS NULL AND s2.name = s.name
+           )
+           AND NOT EXISTS (SELECT 1 FROM companies c WHERE c.name = s.name)
+        """
+    )
 
-            # Best-effort enqueue after DB write
-            normalized_hint = _compute_normalized_hint(normalized)
-            _enqueue_domain_resolution(con, company_id, (company or ""), normalized_hint)
+    # Fill empty fields from the first staged row that has a value
+    # (matches _company_fill_if_empty applied row by row).
+    keyed = (
+        ("domain", "s.domain = companies.domain", "s.domain IS NOT NULL", ["name", *extra]),
+        ("name", "s.domain IS NULL AND s.name = companies.name", "s.domain IS NULL", extra),
+    )
+    for key, match, scope, fields in keyed:
+        for f in fields:
+            con.execute(
+                f"""
+                UPDATE companies SET {f} = (
+                  SELECT s.{f} FROM {st} s
+                   WHERE {match} AND COALESCE(s.{f}, '') <> ''
+                   ORDER BY s.seq LIMIT 1
+                )
+                 WHERE COALESCE({f}, '') = ''
+                   AND {key} IN (
+                     SELECT s.{key} FROM {st} s WHERE {scope} AND COALESCE(s.{f}, '') <> ''
+                   )
+                """
+            )
 
-            # R15: enqueue MX resolver for concrete non-freemail domains
-            if domain:
-                _enqueue_mx_resolution(company_id, domain, force=False)
+    by_domain = {
+        str(r[1]): int(r[0])
+        for r in con.execute(
+            f"SELECT MIN(c.id), c.domain FROM companies c "
+            f"WHERE c.domain IN (SELECT domain FROM {st} WHERE domain IS NOT NULL) "
+            f"GROUP BY c.domain"
+        ).fetchall()
+    }
+    by_name = {
+        str(r[1]): int(r[0])
+        for r in con.execute(
+            f"SELECT MIN(c.id), c.name FROM companies c "
+            f"WHERE c.name IN (SELECT name FROM {st} WHERE domain IS NULL AND name IS NOT NULL) "
+            f"GROUP BY c.name"
+        ).fetchall()
+    }
+    return by_domain, by_name
 
-            # NOTE (R16): As above, this file doesn't create emails; call
-            # _enqueue_probe_email(...) at the point where an email row is created.
 
-        con.commit()
-        return n
+def _enqueue_followups_bulk(
+    domain_jobs: dict[int, tuple[str, str | None]], mx_jobs: dict[tuple[int, str], None]
+) -> None:
+    """
+    Best-effort pipelined enqueue of R08 domain + R15 MX jobs; never raises.
+    Domain resolution goes out as resolve_company_domains jobs of
+    INGEST_RESOLVE_BATCH companies, so each job's probes are batched.
+    """
+    if not domain_jobs and not mx_jobs:
+        return
+    try:
+        from src.queueing.fanout import JobSpec, enqueue_bulk
+        from src.queueing.redis_conn import get_redis  # type: ignore
+    except Exception:
+        return  # environment without RQ/Redis installed
+
+    companies = [
+        {"company_id": cid, "company_name": name, "user_hint": hint}
+        for cid, (name, hint) in domain_jobs.items()
+    ]
+    step = INGEST_RESOLVE_BATCH
+    specs = [
+        JobSpec(
+            queue="default",
+            func="src.queueing.tasks.resolve_company_domains",
+            kwargs={"companies": companies[i : i + step]},
+            job_timeout=30 + 5 * len(companies[i : i + step]),
+        )
+        for i in range(0, len(companies), step)
+    ]
+    specs.extend(
+        JobSpec(
+            queue="mx",
+            func="src.queueing.tasks.task_resolve_mx",
+            kwargs={"company_id": cid, "domain": dom, "force": False},
+            job_timeout=10,
+        )
+        for cid, dom in mx_jobs
+    )
+    try:
+        enqueue_bulk(specs, connection=get_redis())
+    except (ConnectionError, TimeoutError, OSError) as e:
+        logger.warning("Queue degraded (bulk follow-ups not enqueued): %s", e)
+    except Exception as e:
+        logger.warning("Queue degraded (bulk follow-ups unexpected): %s", e)
+
+
+def _persist_chunk(
+    con: Any, chunk: list[dict[str, Any]], *, cols: set[str], people_cols: set[str]
+) -> int:
+    rows: list[tuple[dict[str, Any], str | None, str | None]] = []
+    staged: list[tuple[Any, ...]] = []
+    for raw in chunk:
+        normalized, _errs = normalize_row(raw)
+        _inject_user_supplied_from_raw(normalized, raw)
+        company = (normalized.get("company") or "").strip() or None
+        domain = (normalized.get("domain") or "").strip() or None
+        name_norm, norm_key = _extract_company_norm_fields(normalized)
+        if company or domain:
+            staged.append((len(rows), company, domain, name_norm, norm_key))
+        rows.append((normalized, company, domain))
+
+    by_domain, by_name = _bulk_resolve_companies(con, staged, cols=cols)
+
+    payloads: list[dict[str, Any]] = []
+    domain_jobs: dict[int, tuple[str, str | None]] = {}
+    mx_jobs: dict[tuple[int, str], None] = {}
+    for normalized, company, domain in rows:
+        if domain:
+            company_id = by_domain[domain]
+        elif company:
+            company_id = by_name[company]
+        else:
+            # Neither key (ingest normally rejects these): one blank company each
+            name_norm, norm_key = _extract_company_norm_fields(normalized)
+            company_id = _upsert_company(con, None, None, name_norm, norm_key)
+        payloads.append(_person_payload(people_cols, company_id, normalized))
+
+        domain_jobs.setdefault(company_id, (company or "", _compute_normalized_hint(normalized)))
+        canon = norm_domain(domain) if domain else None
+        if canon and not _is_freemail(canon):
+            mx_jobs.setdefault((company_id, canon), None)
+
+    columns = list(dict.fromkeys(c for p in payloads for c in p))
+    if columns:
+        _copy_rows(con, "people", columns, [[p.get(c) for c in columns] for p in payloads])
+    else:
+        for _ in payloads:
+            con.execute("INSERT INTO people DEFAULT VALUES")
+    con.commit()
+
+    # DB first, then queue (best-effort)
+    _enqueue_followups_bulk(domain_jobs, mx_jobs)
+    return len(payloads)
+
+
+def _persist_rows_bulk(con: Any, rows: Iterable[dict[str, Any]], *, chunk_size: int) -> int:
+    cols = _table_columns(con, "companies")
+    people_cols = _table_columns(con, "people")
+    con.execute(
+        f"CREATE TEMP TABLE IF NOT EXISTS {_STAGE_TABLE} ("
+        "seq INTEGER, name TEXT, domain TEXT, name_norm TEXT, norm_key TEXT)"
+    )
+    n = 0
+    try:
+        chunk: list[dict[str, Any]] = []
+        for raw in rows:
+            if not isinstance(raw, dict):
+                continue
+            chunk.append(raw)
+            if len(chunk) >= chunk_size:
+                n += _persist_chunk(con, chunk, cols=cols, people_cols=people_cols)
+                chunk = []
+        if chunk:
+            n += _persist_chunk(con, chunk, cols=cols, people_cols=people_cols)
+    finally:
+        try:
+            con.execute(f"DROP TABLE IF EXISTS {_STAGE_TABLE}")
+            con.commit()
+        except Exception:
+            logger.debug("Dropping %s failed", _STAGE_TABLE, exc_info=True)
+    return n
@@ -10,6 +10,10 @@ Design:
   1) Load optional rules from docs/title_map.yaml (if present).
   2) Apply deterministic rule-based heuristics as a fallback/default.
 
+TitleClassifier compiles the YAML rules once (reloading when the file's mtime
+changes) into a single Aho-Corasick automaton and memoizes results in a
+bounded LRU; canonicalize()/canonicalize_many() use a process-wide instance.
+
 Notes:
   - Input should already be R13-normalized display text (e.g., "VP, Sales & Marketing").
   - We do not persist anything here; callers should write outputs to:
@@ -18,8 +22,13 @@ Notes:
 
 from __future__ import annotations
 
+import os
 import re
-from collections.abc import Iterable
+import sys
+import threading
+import time
+from collections import OrderedDict, deque
+from collections.abc import Iterable, Sequence
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -63,6 +72,9 @@ ROLE_FAMILIES = {
 # ----------------------------------
 
 
+_DEFAULT_MAP_PATH = Path(__file__).resolve().parents[2] / "docs" / "title_map.yaml"
+
+
 @dataclass(frozen=True)
 class MapEntry:
     match: str  # substring or regex (lowercased)
@@ -156,7 +168,7 @@ def _load_yaml_rules(path: Path | None) -> list[MapEntry]:
         seniority: "VP"
     """
     if path is None:
-        path = Path(__file__).resolve().parents[2] / "docs" / "title_map.yaml"
+        path = _DEFAULT_MAP_PATH
     if not path.exists() or yaml is None:
         return []
 
@@ -181,47 +193,110 @@ def _load_yaml_rules(path: Path | None) -> list[MapEntry]:
 
 
 # ----------------------------------
-# Core logic
+# Aho-Corasick matcher for YAML rules
 # ----------------------------------
 
-
-def _detect_seniority_ladder(text: str) -> str | None:
-    # Order matters: detect higher seniorities first
-    # Explicit C-suite tokens (include CEO and General Counsel)
-    if (
-        re.search(r"\bchief\b", text)
-        or re.search(r"\bceo\b", text)
-        or re.search(r"\bcfo\b", text)
-        or re.search(r"\bcoo\b", text)
-        or re.search(r"\bcto\b", text)
-        or re.search(r"\bcmo\b", text)
-        or re.search(r"\bcio\b", text)
-        or re.search(r"\bciso\b", text)
-        or re.search(r"\bpresident\b", text)
-        or re.search(r"\bgeneral counsel\b", text)
-        or re.search(r"\bgc\b", text)
-    ):
-        return "C"
-    if re.search(r"\b(svp|evp|senior vice president|executive vice president)\b", text):
-        return "VP"
-    if re.search(r"\b(vice president|vp)\b", text):
-        return "VP"
-    if re.search(r"\b(director|head of|head,)\b", text):
-        return "Director"
-    if re.search(r"\b(manager|mgr)\b", text):
-        return "Manager"
-    # Senior IC cues (leave as IC)
-    if re.search(r"\b(principal|staff|lead|architect)\b", text):
-        return "IC"
-    return None
+_NO_MATCH = sys.maxsize
 
 
-def _detect_role_family(text: str) -> str | None:
+class _AhoCorasick:
     """
-    Lightweight, data-driven family detection to keep cyclomatic complexity low.
-    The first matching pattern wins.
+    Multi-pattern substring matcher over lowercased text.
+
+    first_match() returns the lowest pattern index that occurs anywhere in the
+    text, i.e. the same rule a "first rule whose match is a substring wins" scan
+    would pick, in one pass over the text instead of one pass per rule.
     """
-    patterns: list[tuple[str, str]] = [
+
+    def __init__(self, patterns: Sequence[str]):
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._best: list[int] = [_NO_MATCH]
+
+        for idx, pat in enumerate(patterns):
+            if not pat:
+                continue
+            state = 0
+            for ch in pat:
+                nxt = self._goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(self._goto)
+                    self._goto.append({})
+                    self._fail.append(0)
+                    self._best.append(_NO_MATCH)
+                    self._goto[state][ch] = nxt
+                state = nxt
+            self._best[state] = min(self._best[state], idx)
+
+        # BFS: fail links point at the longest proper suffix that is also a prefix;
+        # _best folds in every pattern that ends at a suffix of the state.
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                f = self._fail[state]
+                while f and ch not in self._goto[f]:
+                    f = self._fail[f]
+                target = self._goto[f].get(ch, 0) if state else 0
+                self._fail[nxt] = target
+                self._best[nxt] = min(self._best[nxt], self._best[target])
+
+    def first_match(self, text: str) -> int | None:
+        goto, fail, best_at = self._goto, self._fail, self._best
+        best = _NO_MATCH
+        state = 0
+        for ch in text:
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            if best_at[state] < best:
+                best = best_at[state]
+                if best == 0:
+                    break
+        return None if best == _NO_MATCH else best
+
+
+# ----------------------------------
+# Core logic
+# ----------------------------------
+
+_DEFAULT_RESULT = ("General Management", "IC")
+
+# Special exact cases, checked before any rule
+_EXACT: dict[str, tuple[str, str]] = {
+    "ceo": ("Executive", "C"),
+    "cto": ("Engineering", "C"),
+    "cfo": ("Finance", "C"),
+    "coo": ("Operations", "C"),
+    "cio": ("IT", "C"),
+    "cmo": ("Marketing", "C"),
+    "cro": ("Sales", "C"),
+    "chro": ("HR", "C"),
+    "ciso": ("Security", "C"),
+    "general counsel": ("Legal", "C"),
+    "product manager": ("Product", "IC"),
+}
+
+# Order matters: higher seniorities first
+_SENIORITY_RULES: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile(pat), level)
+    for pat, level in (
+        # Explicit C-suite tokens (include CEO and General Counsel)
+        (r"\b(chief|ceo|cfo|coo|cto|cmo|cio|ciso|president|general counsel|gc)\b", "C"),
+        (r"\b(svp|evp|senior vice president|executive vice president)\b", "VP"),
+        (r"\b(vice president|vp)\b", "VP"),
+        (r"\b(director|head of|head,)\b", "Director"),
+        (r"\b(manager|mgr)\b", "Manager"),
+        # Senior IC cues (leave as IC)
+        (r"\b(principal|staff|lead|architect)\b", "IC"),
+    )
+)
+
+# The first matching pattern wins
+_ROLE_FAMILY_RULES: tuple[tuple[re.Pattern[str], str], ...] = tuple(
+    (re.compile(pat), family)
+    for pat, family in (
         # Executive/founder first
         (r"\b(founder|co[- ]?founder)\b", "Founder"),
         (r"\b(ceo|president)\b", "Executive"),
@@ -251,13 +326,174 @@ def _detect_role_family(text: str) -> str | None:
         (r"\b(design|ux|ui|user experience)\b", "Design"),
         # General management catch-all
         (r"\b(general manager|gm)\b", "General Management"),
-    ]
-    for pat, family in patterns:
-        if re.search(pat, text):
+    )
+)
+
+
+def _detect_seniority_ladder(text: str) -> str | None:
+    for rx, level in _SENIORITY_RULES:
+        if rx.search(text):
+            return level
+    return None
+
+
+def _detect_role_family(text: str) -> str | None:
+    for rx, family in _ROLE_FAMILY_RULES:
+        if rx.search(text):
             return family
     return None
 
 
+@dataclass(frozen=True)
+class _CompiledRules:
+    rules: tuple[MapEntry, ...]
+    matcher: _AhoCorasick
+    mtime_ns: int | None
+    generation: int
+
+
+class TitleClassifier:
+    """
+    Compiled title canonicalizer.
+
+    - Loads docs/title_map.yaml once and re-reads it only when its mtime changes
+      (checked at most every ``reload_check_s`` seconds).
+    - Matches all YAML rules in one pass with an Aho-Corasick automaton.
+    - Memoizes results per lowercased title in a bounded LRU (cleared on reload).
+    """
+
+    def __init__(
+        self,
+        path: Path | None = None,
+        *,
+        cache_size: int = 4096,
+        reload_check_s: float = 2.0,
+    ) -> None:
+        self.path = path or _DEFAULT_MAP_PATH
+        self.cache_size = max(0, int(cache_size))
+        self.reload_check_s = float(reload_check_s)
+        self.reloads = 0
+        self._lock = threading.Lock()
+        self._reload_lock = threading.Lock()  # one compile per change, off the cache lock
+        self._cache: OrderedDict[str, tuple[str, str]] = OrderedDict()
+        self._checked_at = 0.0
+        self._compiled = self._compile(generation=0)
+
+    def _compile(self, *, generation: int) -> _CompiledRules:
+        try:
+            mtime_ns: int | None = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        rules = tuple(r for r in _load_yaml_rules(self.path) if r.match)
+        matcher = _AhoCorasick([r.match for r in rules])
+        self.reloads += 1
+        return _CompiledRules(rules, matcher, mtime_ns, generation)
+
+    def _current(self) -> _CompiledRules:
+        compiled = self._compiled
+        now = time.monotonic()
+        if now - self._checked_at < self.reload_check_s:
+            return compiled
+        self._checked_at = now
+        try:
+            mtime_ns: int | None = self.path.stat().st_mtime_ns
+        except OSError:
+            mtime_ns = None
+        if mtime_ns == compiled.mtime_ns:
+            return compiled
+
+        with self._reload_lock:
+            # Another thread may have reloaded while this one waited for the lock.
+            current = self._compiled
+            if current.generation != compiled.generation or current.mtime_ns == mtime_ns:
+                return current
+            fresh = self._compile(generation=compiled.generation + 1)
+            with self._lock:
+                self._compiled = fresh
+                self._cache.clear()
+        return fresh
+
+    def _classify(self, t: str, compiled: _CompiledRules) -> tuple[str, str]:
+        if t in _EXACT:
+            return _EXACT[t]
+
+        # 1) YAML exact/substring rules (first match wins)
+        idx = compiled.matcher.first_match(t)
+        if idx is not None:
+            entry = compiled.rules[idx]
+            role = entry.role_family or "General Management"
+            seniority = entry.seniority or (_detect_seniority_ladder(t) or "IC")
+            return (role, seniority)
+
+        # 2) Heuristic detection
+        role = _detect_role_family(t) or "General Management"
+        seniority = _detect_seniority_ladder(t) or "IC"
+
+        # If role is Founder but we didn't detect seniority, upgrade to C
+        if role == "Founder" and seniority == "IC":
+            seniority = "C"
+
+        return (role, seniority)
+
+    def _lookup(self, t: str, compiled: _CompiledRules) -> tuple[str, str]:
+        with self._lock:
+            hit = self._cache.get(t)
+            if hit is not None:
+                self._cache.move_to_end(t)
+                return hit
+
+        result = self._classify(t, compiled)
+        if self.cache_size:
+            with self._lock:
+                # Drop results computed against rules that were replaced meanwhile
+                if self._compiled.generation == compiled.generation:
+                    self._cache[t] = result
+                    if len(self._cache) > self.cache_size:
+                        self._cache.popitem(last=False)
+        return result
+
+    def canonicalize(self, title_norm: str | None) -> tuple[str, str]:
+        """Return (role_family, seniority); see module-level canonicalize()."""
+        if not title_norm:
+            return _DEFAULT_RESULT
+        return self._lookup(title_norm.strip().lower(), self._current())
+
+    def canonicalize_many(self, titles: Iterable[str | None]) -> list[tuple[str, str]]:
+        """canonicalize() for a batch; duplicate titles are classified once."""
+        compiled = self._current()
+        seen: dict[str, tuple[str, str]] = {}
+        out: list[tuple[str, str]] = []
+        for title in titles:
+            if not title:
+                out.append(_DEFAULT_RESULT)
+                continue
+            t = title.strip().lower()
+            if t not in seen:
+                seen[t] = self._lookup(t, compiled)
+            out.append(seen[t])
+        return out
+
+    def cache_info(self) -> dict[str, int]:
+        return {"size": len(self._cache), "maxsize": self.cache_size, "reloads": self.reloads}
+
+
+_classifier: TitleClassifier | None = None
+_classifier_lock = threading.Lock()
+
+
+def get_classifier() -> TitleClassifier:
+    """Process-wide TitleClassifier over docs/title_map.yaml."""
+    global _classifier
+    if _classifier is None:
+        with _classifier_lock:
+            if _classifier is None:
+                _classifier = TitleClassifier(
+                    cache_size=int(os.getenv("TITLE_NORM_CACHE_SIZE", "4096")),
+                    reload_check_s=float(os.getenv("TITLE_NORM_RELOAD_CHECK_SEC", "2.0")),
+                )
+    return _classifier
+
+
 def canonicalize(title_norm: str | None) -> tuple[str, str]:
     """
     Return (role_family, seniority) for a given display-normalized title.
@@ -265,41 +501,9 @@ def canonicalize(title_norm: str | None) -> tuple[str, str]:
       - role_family defaults to "General Management" if nothing fits.
       - seniority defaults to "IC".
     """
-    if not title_norm:
-        return ("General Management", "IC")
-
-    t = title_norm.strip().lower()
-
-    # Special exact cases first
-    exact: dict[str, tuple[str, str]] = {
-        "ceo": ("Executive", "C"),
-        "cto": ("Engineering", "C"),
-        "cfo": ("Finance", "C"),
-        "coo": ("Operations", "C"),
-        "cio": ("IT", "C"),
-        "cmo": ("Marketing", "C"),
-        "cro": ("Sales", "C"),
-        "chro": ("HR", "C"),
-        "ciso": ("Security", "C"),
-        "general counsel": ("Legal", "C"),
-        "product manager": ("Product", "IC"),
-    }
-    if t in exact:
-        return exact[t]
-
-    # 1) YAML exact/substring rules (first match wins)
-    for entry in _load_yaml_rules(None) or []:
-        if entry.match and entry.match in t:
-            role = entry.role_family or "General Management"
-            seniority = entry.seniority or (_detect_seniority_ladder(t) or "IC")
-            return (role, seniority)
-
-    # 2) Heuristic detection
-    role = _detect_role_family(t) or "General Management"
-    seniority = _detect_seniority_ladder(t) or "IC"
+    return get_classifier().canonicalize(title_norm)
 
-    # If role is Founder but we didn't detect seniority, upgrade to C
-    if role == "Founder" and seniority == "IC":
-        seniority = "C"
 
-    return (role, seniority)
+def canonicalize_many(titles: Iterable[str | None]) -> list[tuple[str, str]]:
+    """Batch canonicalize(); results are in input order."""
+    return get_classifier().canonicalize_many(titles)
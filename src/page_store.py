@@ -0,0 +1,308 @@
+# src/page_store.py
+"""
+Content-addressed store for crawled page HTML.
+
+Page bodies are kept once per distinct content in ``page_blobs``, compressed
+and keyed by the SHA-256 of the raw HTML; ``sources`` rows point at them via
+``sources.html_sha256`` and leave ``sources.html`` NULL. Re-crawls of
+unchanged pages and identical boilerplate pages across runs/tenants then cost
+one blob, not one copy per row.
+
+Codecs: zstd when the optional ``zstandard`` package is installed, gzip
+otherwise ("raw" is used when compression does not help). The codec is stored
+per blob, so mixed stores read back fine.
+
+Readers select the compressed body and get a StoredBlob that decompresses only
+when its text is asked for (see as_html()); schemas that predate the store
+(no html_sha256 column / page_blobs table) keep using sources.html.
+
+Env:
+  PAGE_STORE_CODEC         zstd | gzip | raw (default: zstd if available)
+  PAGE_STORE_LEVEL         compression level (default 6 gzip / 10 zstd)
+  PAGE_STORE_KEEP_INLINE   "1" also keeps sources.html populated (rollout)
+"""
+
+from __future__ import annotations
+
+import gzip
+import hashlib
+import os
+from dataclasses import dataclass
+from typing import Any
+
+from src.db import column_exists, table_exists
+
+try:  # optional dependency
+    import zstandard as _zstd
+
+    _HAS_ZSTD = True
+except Exception:  # pragma: no cover - depends on environment
+    _zstd = None  # type: ignore[assignment]
+    _HAS_ZSTD = False
+
+CODEC_ZSTD = "zstd"
+CODEC_GZIP = "gzip"
+CODEC_RAW = "raw"
+
+
+def _codec() -> str:
+    want = (os.getenv("PAGE_STORE_CODEC") or "").strip().lower()
+    if want == CODEC_ZSTD and _HAS_ZSTD:
+        return CODEC_ZSTD
+    if want in {CODEC_GZIP, CODEC_RAW}:
+        return want
+    return CODEC_ZSTD if _HAS_ZSTD else CODEC_GZIP
+
+
+def _level(codec: str) -> int:
+    raw = os.getenv("PAGE_STORE_LEVEL")
+    if raw:
+        try:
+            return int(raw)
+        except ValueError:
+            pass
+    return 10 if codec == CODEC_ZSTD else 6
+
+
+def keep_inline() -> bool:
+    return os.getenv("PAGE_STORE_KEEP_INLINE", "0").strip() in {"1", "true", "yes"}
+
+
+# ---------------------------------------------------------------------------
+# Encoding
+# ---------------------------------------------------------------------------
+
+
+def html_sha256(html: str) -> str:
+    return hashlib.sha256(html.encode("utf-8", "ignore")).hexdigest()
+
+
+def compress(data: bytes, codec: str | None = None) -> tuple[str, bytes]:
+    """Compress ``data``; returns (codec, body). Falls back to raw if it would grow."""
+    codec = codec or _codec()
+    if codec == CODEC_ZSTD:
+        if not _HAS_ZSTD:
+            raise RuntimeError("zstandard is not installed")
+        body = _zstd.ZstdCompressor(level=_level(codec)).compress(data)
+    elif codec == CODEC_GZIP:
+        body = gzip.compress(data, compresslevel=_level(codec), mtime=0)
+    else:
+        return CODEC_RAW, data
+    if len(body) >= len(data):
+        return CODEC_RAW, data
+    return codec, body
+
+
+def decompress(codec: str, body: bytes) -> bytes:
+    if codec == CODEC_ZSTD:
+        if not _HAS_ZSTD:
+            raise RuntimeError("page blob is zstd-compressed but zstandard is not installed")
+        return _zstd.ZstdDecompressor().decompress(body)
+    if codec == CODEC_GZIP:
+        return gzip.decompress(body)
+    if codec == CODEC_RAW:
+        return body
+    raise ValueError(f"unknown page blob codec: {codec!r}")
+
+
+@dataclass(frozen=True, slots=True)
+class StoredBlob:
+    """Compressed page body as read from page_blobs; decompressed on demand."""
+
+    codec: str
+    body: bytes
+    sha256: str | None = None
+
+    def text(self) -> str:
+        return decompress(self.codec, self.body).decode("utf-8", "ignore")
+
+
+def as_html(value: Any) -> Any:
+    """Materialize a value produced by row_html(); str/bytes/None pass through."""
+    if isinstance(value, StoredBlob):
+        return value.text()
+    return value
+
+
+def content_sha256(value: Any) -> str | None:
+    """
+    Content hash of a value produced by row_html(), matching page_blobs.sha256.
+    StoredBlobs carry it already, so this never decompresses them.
+    """
+    if value is None:
+        return None
+    if isinstance(value, StoredBlob):
+        return value.sha256 or html_sha256(value.text())
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return html_sha256(bytes(value).decode("utf-8", "ignore"))
+    return html_sha256(str(value))
+
+
+# ---------------------------------------------------------------------------
+# Schema detection
+# ---------------------------------------------------------------------------
+
+
+def store_enabled(conn: Any) -> bool:
+    """True when the schema has page_blobs and sources.html_sha256."""
+    return table_exists(conn, "page_blobs") and column_exists(conn, "sources", "html_sha256")
+
+
+def html_select(conn: Any, alias: str = "s") -> tuple[str, str]:
+    """
+    SQL fragments for reading page HTML from ``sources AS {alias}``.
+
+    Returns (select_sql, join_sql). select_sql always yields four columns
+    (html, html_codec, html_body, html_sha256) to feed row_html(); join_sql
+    is appended after the FROM clause and is empty on schemas without the store.
+    """
+    if not store_enabled(conn):
+        return (
+            f"{alias}.html AS html, NULL AS html_codec, NULL AS html_body, NULL AS html_sha256",
+            "",
+        )
+    return (
+        f"{alias}.html AS html, pb.codec AS html_codec, pb.body AS html_body, "
+        "pb.sha256 AS html_sha256",
+        f" LEFT JOIN page_blobs AS pb ON pb.sha256 = {alias}.html_sha256",
+    )
+
+
+def row_html(html: Any, codec: Any, body: Any, sha256: Any = None, *, lazy: bool = True) -> Any:
+    """
+    HTML for one row of html_select() columns. Inline html wins when present;
+    otherwise a StoredBlob (or its text when lazy=False).
+    """
+    if html is not None or body is None:
+        return html
+    blob = StoredBlob(str(codec), bytes(body), str(sha256) if sha256 else None)
+    return blob if lazy else blob.text()
+
+
+# ---------------------------------------------------------------------------
+# Writes / reads
+# ---------------------------------------------------------------------------
+
+
+def put_blob(conn: Any, html: str, *, known: set[str] | None = None) -> str:
+    """
+    Store ``html`` if its content is not stored yet; returns its SHA-256.
+    ``known`` is an optional per-batch set of hashes already written, which
+    saves the INSERT round-trip for repeated content.
+    """
+    sha = html_sha256(html)
+    if known is not None and sha in known:
+        return sha
+    raw = html.encode("utf-8", "ignore")
+    codec, body = compress(raw)
+    conn.execute(
+        "INSERT OR IGNORE INTO page_blobs (sha256, codec, raw_size, stored_size, body) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (sha, codec, len(raw), len(body), body),
+    )
+    if known is not None:
+        known.add(sha)
+    return sha
+
+
+def get_html(conn: Any, sha256: str) -> str | None:
+    row = conn.execute("SELECT codec, body FROM page_blobs WHERE sha256 = ?", (sha256,)).fetchone()
+    if not row or row[1] is None:
+        return None
+    return StoredBlob(str(row[0]), bytes(row[1])).text()
+
+
+def gc_unreferenced(conn: Any, *, dry_run: bool = False, batch_size: int = 500) -> int:
+    """
+    Delete page_blobs no sources row references. Returns the number of blobs
+    removed (or that would be removed with dry_run).
+
+    Best run outside crawl windows: a writer that re-points a row at an
+    existing blob inside an uncommitted transaction is not visible here.
+    Readers treat a missing blob as a page without HTML.
+    """
+    rows = conn.execute(
+        "SELECT pb.sha256 FROM page_blobs AS pb "
+        "WHERE NOT EXISTS (SELECT 1 FROM sources AS s WHERE s.html_sha256 = pb.sha256)"
+    ).fetchall()
+    shas = [str(r[0]) for r in rows]
+    if dry_run:
+        return len(shas)
+    deleted = 0
+    for i in range(0, len(shas), batch_size):
+        chunk = shas[i : i + batch_size]
+        placeholders = ", ".join("?" for _ in chunk)
+        # Re-check at delete time: rows committed since the scan keep their blob.
+        cur = conn.execute(
+            f"DELETE FROM page_blobs WHERE sha256 IN ({placeholders}) "
+            "AND NOT EXISTS (SELECT 1 FROM sources AS s WHERE s.html_sha256 = page_blobs.sha256)",
+            chunk,
+        )
+        deleted += max(0, int(getattr(cur, "rowcount", 0) or 0))
+    return deleted
+
+
+def backfill(conn: Any, *, batch_size: int = 200, limit: int | None = None) -> int:
+    """
+    Move inline sources.html into page_blobs (html_sha256 set, html NULLed
+    unless PAGE_STORE_KEEP_INLINE). Commits per batch; returns rows moved.
+    """
+    moved = 0
+    keep = keep_inline()
+    known: set[str] = set()
+    last_id: Any = 0
+    while limit is None or moved < limit:
+        n = batch_size if limit is None else min(batch_size, limit - moved)
+        rows = conn.execute(
+            "SELECT id, html FROM sources "
+            "WHERE html IS NOT NULL AND html_sha256 IS NULL AND id > ? "
+            "ORDER BY id LIMIT ?",
+            (last_id, n),
+        ).fetchall()
+        if not rows:
+            break
+        for source_id, html in rows:
+            sha = put_blob(conn, _text(html), known=known)
+            if keep:
+                conn.execute("UPDATE sources SET html_sha256 = ? WHERE id = ?", (sha, source_id))
+            else:
+                conn.execute(
+                    "UPDATE sources SET html_sha256 = ?, html = NULL WHERE id = ?",
+                    (sha, source_id),
+                )
+            last_id = source_id
+        moved += len(rows)
+        conn.commit()
+    return moved
+
+
+def _text(html: Any) -> str:
+    if isinstance(html, (bytes, bytearray, memoryview)):
+        return bytes(html).decode("utf-8", "ignore")
+    return str(html)
+
+
+def stats(conn: Any) -> dict[str, int]:
+    row = conn.execute(
+        "SELECT COUNT(*), COALESCE(SUM(raw_size), 0), COALESCE(SUM(stored_size), 0) FROM page_blobs"
+    ).fetchone()
+    return {"blobs": int(row[0]), "raw_bytes": int(row[1]), "stored_bytes": int(row[2])}
+
+
+__all__ = [
+    "StoredBlob",
+    "as_html",
+    "backfill",
+    "compress",
+    "content_sha256",
+    "decompress",
+    "gc_unreferenced",
+    "get_html",
+    "html_select",
+    "html_sha256",
+    "keep_inline",
+    "put_blob",
+    "row_html",
+    "stats",
+    "store_enabled",
+]
@@ -0,0 +1,175 @@
+# src/queueing/fanout.py
+"""
+Bulk RQ fan-out.
+
+Enqueueing jobs one ``Queue.enqueue`` call at a time costs several Redis
+round-trips per job. ``enqueue_bulk`` takes a list of JobSpec records and
+writes them in pipelined MULTI/EXEC batches (one round-trip per chunk):
+
+  - jobs without dependencies go through ``Queue.prepare_data`` +
+    ``Queue.enqueue_many(pipeline=...)``
+  - jobs that depend on another spec in the same batch are saved as DEFERRED
+    and registered as dependents in the same transaction as their parent, so a
+    worker can never finish the parent before the dependency is recorded
+
+Job ids are assigned up front (JobSpec.job_id), which lets callers wire
+``depends_on`` between specs and report job ids before anything is sent.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import uuid
+from collections import defaultdict
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass, field
+from typing import Any
+
+from rq import Queue
+from rq.job import Job, JobStatus
+
+log = logging.getLogger(__name__)
+
+# Max jobs per pipelined transaction
+RQ_ENQUEUE_CHUNK = max(1, int(os.getenv("RQ_ENQUEUE_CHUNK", "500")))
+
+
+def _new_job_id() -> str:
+    return str(uuid.uuid4())
+
+
+@dataclass
+class JobSpec:
+    """One job to enqueue; mirrors the ``Queue.enqueue`` arguments we use."""
+
+    queue: str
+    func: Callable[..., Any] | str
+    kwargs: dict[str, Any] = field(default_factory=dict)
+    meta: dict[str, Any] | None = None
+    job_timeout: int | None = None
+    # job_id of another JobSpec in the same enqueue_bulk() call
+    depends_on: str | None = None
+    job_id: str = field(default_factory=_new_job_id)
+
+
+def _group_families(specs: Sequence[JobSpec]) -> list[list[JobSpec]]:
+    """
+    Group specs so every dependent lands with its (transitive) parent, preserving
+    input order. Raises ValueError for dependencies outside the batch.
+    """
+    root_of: dict[str, str] = {}
+    families: dict[str, list[JobSpec]] = {}
+    for spec in specs:
+        if spec.depends_on is None:
+            root = spec.job_id
+        elif spec.depends_on in root_of:
+            root = root_of[spec.depends_on]
+        else:
+            raise ValueError(
+                f"JobSpec {spec.job_id} depends on {spec.depends_on!r}, "
+                "which is not an earlier spec in this batch"
+            )
+        root_of[spec.job_id] = root
+        families.setdefault(root, []).append(spec)
+    return list(families.values())
+
+
+def _chunks(families: Iterable[list[JobSpec]], size: int) -> Iterable[list[JobSpec]]:
+    chunk: list[JobSpec] = []
+    for fam in families:
+        if chunk and len(chunk) + len(fam) > size:
+            yield chunk
+            chunk = []
+        chunk.extend(fam)
+    if chunk:
+        yield chunk
+
+
+def enqueue_bulk(
+    specs: Sequence[JobSpec],
+    *,
+    connection: Any,
+    chunk_size: int | None = None,
+    failed: list[JobSpec] | None = None,
+) -> list[Job]:
+    """
+    Enqueue ``specs`` in pipelined batches and return the jobs in input order.
+
+    A chunk is a single MULTI/EXEC transaction. By default a Redis error aborts
+    the call with earlier chunks already enqueued. When ``failed`` is given,
+    the specs of a failing chunk are appended to it instead and the remaining
+    chunks are still sent; the returned list then omits the failed specs.
+    """
+    if not specs:
+        return []
+
+    size = max(1, chunk_size or RQ_ENQUEUE_CHUNK)
+    queues: dict[str, Queue] = {}
+    jobs: dict[str, Job] = {}
+
+    def _queue(name: str) -> Queue:
+        if name not in queues:
+            queues[name] = Queue(name=name, connection=connection)
+        return queues[name]
+
+    for chunk in _chunks(_group_families(specs), size):
+        if failed is None:
+            _enqueue_chunk(chunk, connection, queue_for=_queue, jobs=jobs)
+            continue
+        try:
+            _enqueue_chunk(chunk, connection, queue_for=_queue, jobs=jobs)
+        except Exception:
+            log.exception("enqueue_bulk: chunk of %d jobs failed", len(chunk))
+            for spec in chunk:
+                jobs.pop(spec.job_id, None)
+            failed.extend(chunk)
+
+    return [jobs[s.job_id] for s in specs if s.job_id in jobs]
+
+
+def _enqueue_chunk(
+    chunk: list[JobSpec],
+    connection: Any,
+    *,
+    queue_for: Callable[[str], Queue],
+    jobs: dict[str, Job],
+) -> None:
+    """Write one chunk in a single MULTI/EXEC transaction, recording the jobs."""
+    with connection.pipeline() as pipe:
+        ready: dict[str, list[Any]] = defaultdict(list)
+        for spec in chunk:
+            if spec.depends_on is None:
+                ready[spec.queue].append(
+                    queue_for(spec.queue).prepare_data(
+                        spec.func,
+                        kwargs=spec.kwargs,
+                        timeout=spec.job_timeout,
+                        meta=spec.meta,
+                        job_id=spec.job_id,
+                    )
+                )
+        for name, datas in ready.items():
+            for job in queue_for(name).enqueue_many(datas, pipeline=pipe):
+                jobs[job.id] = job
+
+        for spec in chunk:
+            if spec.depends_on is None:
+                continue
+            job = queue_for(spec.queue).create_job(
+                spec.func,
+                kwargs=spec.kwargs,
+                timeout=spec.job_timeout,
+                meta=spec.meta,
+                job_id=spec.job_id,
+                depends_on=[spec.depends_on],
+                status=JobStatus.DEFERRED,
+            )
+            job.save(pipeline=pipe)
+            job.register_dependency(pipeline=pipe)
+            jobs[job.id] = job
+
+        pipe.execute()
+
+
+__all__ = ["JobSpec", "enqueue_bulk", "RQ_ENQUEUE_CHUNK"]
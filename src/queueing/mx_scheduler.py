@@ -0,0 +1,463 @@
+# src/queueing/mx_scheduler.py
+"""
+MX-aware verification scheduler.
+
+Probe jobs (task_probe_email / verify_email_task) for domains that share an
+MX host (Google / Microsoft front thousands of domains) all compete for the
+same per-MX limits in rate_limit.py. Enqueueing them straight onto RQ means
+workers keep picking up jobs that throttle immediately and re-queue.
+
+Instead, pending probe work is parked in a per-MX delay queue in Redis:
+
+  mxq:hosts          ZSET  mx -> epoch ms when that host next has due work
+  mxq:jobs:{mx}      ZSET  job_id -> epoch ms when the job becomes due
+  mxq:payload        HASH  job_id -> JSON JobSpec
+  mxq:inflight:{mx}  ZSET  job_id -> expiry ms; dispatched, not yet started
+  mxq:inflight       ZSET  the same tokens across every host (global cap)
+  mxq:claimed        ZSET  "mx job_id" -> expiry ms; popped, not yet on RQ
+
+A dispatcher (started by src.queueing.worker; safe to run in every worker
+since the pop is one Lua call) moves due jobs onto RQ at each host's allowed
+rate: up to the host's free concurrency slots and the tokens in a per-host
+dispatch bucket refilled at PER_MX_RPS_DEFAULT. A slot counts as taken while
+a live MX_LEASES lease holds it *or* a dispatched job has not started yet
+(in-flight token, cleared by mark_started() once the job takes its lease), so
+successive ticks do not keep releasing work for the same free slots. Work
+that cannot go yet stays parked; nothing is failed or retried blindly.
+
+Popped jobs move atomically into mxq:claimed and their payload is only
+deleted after enqueue_bulk() succeeds. If a dispatcher dies in between, the
+claim expires and the next tick re-parks the job.
+
+Env:
+  MX_SCHEDULER_ENABLED          "0" disables parking (direct RQ / enqueue_in)
+  MX_SCHEDULER_INTERVAL_SEC     dispatcher tick (default 0.5)
+  MX_SCHEDULER_MAX_HOSTS        hosts examined per tick (default 200)
+  MX_SCHEDULER_HINT_TTL_SEC     domain -> MX hint lifetime (default 3600)
+  MX_SCHEDULER_INFLIGHT_TTL_SEC how long a dispatched job holds its slot
+                                before it starts (default 60)
+  MX_SCHEDULER_CLAIM_TTL_SEC    claim lifetime before re-parking (default 60)
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from collections.abc import Callable, Iterable, Sequence
+from dataclasses import dataclass
+from typing import Any
+
+from redis import Redis
+
+from src.config import load_settings
+from src.queueing.fanout import JobSpec, enqueue_bulk
+from src.queueing.rate_limit import GLOBAL_LEASES, MX_LEASES
+
+log = logging.getLogger(__name__)
+_cfg = load_settings()
+
+MXQ_HOSTS = "mxq:hosts"
+MXQ_JOBS = "mxq:jobs:{mx}"
+MXQ_PAYLOAD = "mxq:payload"
+MXQ_BUCKET = "mxq:tb:{mx}"
+MXQ_MX_OF = "mxq:mx_of:{domain}"
+MXQ_INFLIGHT = "mxq:inflight:{mx}"
+MXQ_INFLIGHT_ALL = "mxq:inflight"
+MXQ_CLAIMED = "mxq:claimed"
+
+
+def scheduler_enabled() -> bool:
+    return os.getenv("MX_SCHEDULER_ENABLED", "1").strip() not in {"0", "false", "no"}
+
+
+def _interval_s() -> float:
+    return max(0.05, float(os.getenv("MX_SCHEDULER_INTERVAL_SEC", "0.5")))
+
+
+def _inflight_ms() -> int:
+    return int(max(1.0, float(os.getenv("MX_SCHEDULER_INFLIGHT_TTL_SEC", "60"))) * 1000)
+
+
+def _claim_ms() -> int:
+    return int(max(1.0, float(os.getenv("MX_SCHEDULER_CLAIM_TTL_SEC", "60"))) * 1000)
+
+
+def _norm_mx(mx: str) -> str:
+    return (mx or "").strip().rstrip(".").lower()
+
+
+# KEYS: hosts, jobs, payload, bucket, mx_leases, inflight, inflight_all, claimed
+# ARGV: mx, rate_per_s, burst, mx_limit, max_n, recheck_ms, inflight_ms, claim_ms
+# Pops up to max_n due jobs the host can take right now, marks them in flight
+# and claimed, and reschedules the host at its next due time. Payloads stay
+# in the hash until confirm. Returns the popped JSON payloads.
+DISPATCH_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local mx = ARGV[1]
+local rate = tonumber(ARGV[2])
+local burst = tonumber(ARGV[3])
+local limit = tonumber(ARGV[4])
+local n = math.min(tonumber(ARGV[5]), redis.call('ZCOUNT', KEYS[2], '-inf', now))
+local not_before = 0
+
+redis.call('ZREMRANGEBYSCORE', KEYS[6], '-inf', now)
+if n > 0 and limit > 0 then
+  local busy = redis.call('ZCOUNT', KEYS[5], '(' .. now, '+inf') + redis.call('ZCARD', KEYS[6])
+  local free = limit - busy
+  if free < n then
+    n = math.max(0, free)
+    not_before = now + tonumber(ARGV[6])
+  end
+end
+
+local have = 0
+if n > 0 and rate > 0 then
+  local state = redis.call('HMGET', KEYS[4], 'tokens', 'ts')
+  have = tonumber(state[1]) or burst
+  local ts = tonumber(state[2]) or now
+  have = math.min(burst, have + math.max(0, now - ts) * rate / 1000)
+  if have < n then n = math.floor(have) end
+end
+
+local out = {}
+if n > 0 then
+  local inflight_until = now + tonumber(ARGV[7])
+  local claim_until = now + tonumber(ARGV[8])
+  local ids = redis.call('ZRANGEBYSCORE', KEYS[2], '-inf', now, 'LIMIT', 0, n)
+  for _, id in ipairs(ids) do
+    redis.call('ZREM', KEYS[2], id)
+    local payload = redis.call('HGET', KEYS[3], id)
+    if payload then
+      redis.call('ZADD', KEYS[6], inflight_until, id)
+      redis.call('ZADD', KEYS[7], inflight_until, id)
+      redis.call('ZADD', KEYS[8], claim_until, mx .. ' ' .. id)
+      out[#out + 1] = payload
+    end
+  end
+  redis.call('PEXPIRE', KEYS[6], tonumber(ARGV[7]) * 2)
+  if rate > 0 then
+    have = have - #ids
+    redis.call('HSET', KEYS[4], 'tokens', tostring(have), 'ts', now)
+    redis.call('PEXPIRE', KEYS[4], math.ceil(burst * 1000 / rate) + 1000)
+  end
+end
+if rate > 0 and have < 1 then
+  not_before = math.max(not_before, now + math.ceil((1 - have) * 1000 / rate))
+end
+
+local head = redis.call('ZRANGE', KEYS[2], 0, 0, 'WITHSCORES')
+if head[2] then
+  redis.call('ZADD', KEYS[1], math.max(tonumber(head[2]), not_before), mx)
+else
+  redis.call('ZREM', KEYS[1], mx)
+end
+return out
+"""
+
+# KEYS: claimed, hosts, payload, inflight_all
+# ARGV: jobs key prefix, max claims, inflight key prefix
+# Re-parks jobs whose claim expired (dispatcher died before enqueue/confirm)
+# and frees the in-flight slots they were holding.
+RECOVER_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local stale = redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now, 'LIMIT', 0, tonumber(ARGV[2]))
+local n = 0
+for _, member in ipairs(stale) do
+  redis.call('ZREM', KEYS[1], member)
+  local sep = string.find(member, ' ', 1, true)
+  if sep then
+    local mx = string.sub(member, 1, sep - 1)
+    local id = string.sub(member, sep + 1)
+    redis.call('ZREM', ARGV[3] .. mx, id)
+    redis.call('ZREM', KEYS[4], id)
+    if redis.call('HEXISTS', KEYS[3], id) == 1 then
+      redis.call('ZADD', ARGV[1] .. mx, now, id)
+      redis.call('ZADD', KEYS[2], 'LT', now, mx)
+      n = n + 1
+    end
+  end
+end
+return n
+"""
+
+
+def _func_name(func: Callable[..., Any] | str) -> str:
+    if isinstance(func, str):
+        return func
+    return f"{func.__module__}.{func.__qualname__}"
+
+
+def _encode(spec: JobSpec) -> str:
+    return json.dumps(
+        {
+            "queue": spec.queue,
+            "func": _func_name(spec.func),
+            "kwargs": spec.kwargs,
+            "meta": spec.meta,
+            "job_timeout": spec.job_timeout,
+            "job_id": spec.job_id,
+        },
+        default=str,
+    )
+
+
+def _decode(raw: bytes | str) -> JobSpec:
+    return JobSpec(**json.loads(raw))
+
+
+def _server_ms(redis: Redis) -> int:
+    sec, usec = redis.time()
+    return int(sec) * 1000 + int(usec) // 1000
+
+
+# ---------------------------------------------------------------------------
+# Parking
+# ---------------------------------------------------------------------------
+
+
+def park_many(redis: Redis, items: Iterable[tuple[str, JobSpec]], *, delay_s: float = 0.0) -> int:
+    """
+    Park (mx_host, JobSpec) pairs in their per-MX delay queues, due after
+    ``delay_s``. One MULTI/EXEC round-trip for the whole batch.
+    """
+    items = list(items)
+    if not items:
+        return 0
+    ready = _server_ms(redis) + int(max(0.0, delay_s) * 1000)
+    with redis.pipeline() as p:
+        for mx, spec in items:
+            mx = _norm_mx(mx)
+            p.hset(MXQ_PAYLOAD, spec.job_id, _encode(spec))
+            p.zadd(MXQ_JOBS.format(mx=mx), {spec.job_id: ready})
+            # LT: never push a host's due time later than work it already has
+            p.zadd(MXQ_HOSTS, {mx: ready}, lt=True)
+        p.execute()
+    return len(items)
+
+
+def park(redis: Redis, mx_host: str, spec: JobSpec, *, delay_s: float = 0.0) -> str:
+    """Park one job for ``mx_host``; returns the job id it will run under."""
+    park_many(redis, [(mx_host, spec)], delay_s=delay_s)
+    return spec.job_id
+
+
+def mx_for_domain(
+    redis: Redis, domain: str, *, resolver: Callable[[str], tuple[str, int]] | None = None
+) -> str:
+    """
+    MX host used to group a domain's probes. Cached in Redis so fan-out does
+    one DNS lookup per domain; falls back to the domain itself.
+    """
+    dom = (domain or "").strip().lower()
+    key = MXQ_MX_OF.format(domain=dom)
+    try:
+        hit = redis.get(key)
+        if hit:
+            return hit.decode() if isinstance(hit, bytes) else str(hit)
+    except Exception:
+        pass
+
+    if resolver is None:
+        from src.queueing.tasks import lookup_mx  # local import (tasks imports us)
+
+        resolver = lookup_mx
+    try:
+        mx = _norm_mx(resolver(dom)[0]) or dom
+    except Exception:
+        mx = dom
+    try:
+        redis.set(key, mx, ex=int(os.getenv("MX_SCHEDULER_HINT_TTL_SEC", "3600")))
+    except Exception:
+        pass
+    return mx
+
+
+def schedule_probe_jobs(
+    redis: Redis,
+    specs: Sequence[JobSpec],
+    *,
+    domain_of: Callable[[JobSpec], str],
+    resolver: Callable[[str], tuple[str, int]] | None = None,
+) -> int:
+    """
+    Group probe JobSpecs by resolved MX host and park them for dispatch.
+    With the scheduler disabled they go straight to RQ via enqueue_bulk().
+    """
+    if not scheduler_enabled():
+        return len(enqueue_bulk(specs, connection=redis))
+    mx_of: dict[str, str] = {}
+    items: list[tuple[str, JobSpec]] = []
+    for spec in specs:
+        dom = domain_of(spec)
+        if dom not in mx_of:
+            mx_of[dom] = mx_for_domain(redis, dom, resolver=resolver)
+        items.append((mx_of[dom], spec))
+    return park_many(redis, items)
+
+
+# ---------------------------------------------------------------------------
+# Dispatch
+# ---------------------------------------------------------------------------
+
+
+@dataclass
+class DispatchStats:
+    hosts: int = 0
+    dispatched: int = 0
+
+
+def recover_claims(redis: Redis, *, limit: int = 500) -> int:
+    """Re-park jobs a dispatcher claimed but never confirmed (it died mid-dispatch)."""
+    script = redis.register_script(RECOVER_LUA)
+    n = int(
+        script(
+            keys=[MXQ_CLAIMED, MXQ_HOSTS, MXQ_PAYLOAD, MXQ_INFLIGHT_ALL],
+            args=[MXQ_JOBS.format(mx=""), limit, MXQ_INFLIGHT.format(mx="")],
+        )
+    )
+    if n:
+        log.warning("mx_scheduler: re-parked %d jobs from expired claims", n)
+    return n
+
+
+def _confirm(redis: Redis, popped: Sequence[tuple[str, JobSpec]]) -> None:
+    """Jobs are on RQ: drop their claims and parked payloads."""
+    with redis.pipeline(transaction=False) as p:
+        p.zrem(MXQ_CLAIMED, *(f"{mx} {spec.job_id}" for mx, spec in popped))
+        p.hdel(MXQ_PAYLOAD, *(spec.job_id for _, spec in popped))
+        p.execute()
+
+
+def _unclaim(redis: Redis, popped: Sequence[tuple[str, JobSpec]]) -> None:
+    """Enqueue failed: give back the in-flight slots and re-park the jobs."""
+    with redis.pipeline(transaction=False) as p:
+        p.zrem(MXQ_CLAIMED, *(f"{mx} {spec.job_id}" for mx, spec in popped))
+        p.zrem(MXQ_INFLIGHT_ALL, *(spec.job_id for _, spec in popped))
+        for mx, spec in popped:
+            p.zrem(MXQ_INFLIGHT.format(mx=mx), spec.job_id)
+        p.execute()
+    park_many(redis, popped, delay_s=_interval_s())
+
+
+def mark_started(redis: Redis, mx_host: str, job_id: str | None) -> None:
+    """
+    Clear a dispatched job's in-flight token once it has asked for its lease;
+    from then on the lease (or the re-park) accounts for the slot.
+    """
+    if not job_id:
+        return
+    try:
+        with redis.pipeline(transaction=False) as p:
+            p.zrem(MXQ_INFLIGHT.format(mx=_norm_mx(mx_host)), job_id)
+            p.zrem(MXQ_INFLIGHT_ALL, job_id)
+            p.execute()
+    except Exception:
+        log.debug("mx_scheduler: mark_started failed", exc_info=True)
+
+
+def dispatch_due(redis: Redis, *, max_hosts: int | None = None) -> DispatchStats:
+    """
+    One dispatcher tick: move due parked jobs onto RQ, respecting each host's
+    free concurrency slots and rate, and the global concurrency cap.
+    """
+    stats = DispatchStats()
+    recover_claims(redis)
+    now = _server_ms(redis)
+    n_hosts = max_hosts or int(os.getenv("MX_SCHEDULER_MAX_HOSTS", "200"))
+    hosts = redis.zrangebyscore(MXQ_HOSTS, "-inf", now, start=0, num=n_hosts)
+    if not hosts:
+        return stats
+
+    rate_cfg = _cfg.rate
+    budget = 1 << 30
+    if rate_cfg.global_max_concurrency > 0:
+        redis.zremrangebyscore(MXQ_INFLIGHT_ALL, "-inf", now)
+        live = int(redis.zcount(GLOBAL_LEASES, f"({now}", "+inf"))
+        live += int(redis.zcard(MXQ_INFLIGHT_ALL))
+        budget = max(0, rate_cfg.global_max_concurrency - live)
+
+    script = redis.register_script(DISPATCH_LUA)
+    recheck_ms = int(_interval_s() * 1000)
+    rps = float(rate_cfg.per_mx_rps_default)
+    popped_by_mx: list[tuple[str, JobSpec]] = []
+    for raw in hosts:
+        if budget <= 0:
+            break
+        mx = raw.decode() if isinstance(raw, bytes) else str(raw)
+        popped = script(
+            keys=[
+                MXQ_HOSTS,
+                MXQ_JOBS.format(mx=mx),
+                MXQ_PAYLOAD,
+                MXQ_BUCKET.format(mx=mx),
+                MX_LEASES.format(mx=mx),
+                MXQ_INFLIGHT.format(mx=mx),
+                MXQ_INFLIGHT_ALL,
+                MXQ_CLAIMED,
+            ],
+            args=[
+                mx,
+                rps,
+                max(1.0, rps),
+                rate_cfg.per_mx_max_concurrency_default,
+                budget,
+                recheck_ms,
+                _inflight_ms(),
+                _claim_ms(),
+            ],
+        )
+        stats.hosts += 1
+        budget -= len(popped)
+        popped_by_mx.extend((mx, _decode(p)) for p in popped)
+
+    if popped_by_mx:
+        # Chunks commit independently: only the specs of failed chunks go back to
+        # the parking lot, the rest are already on RQ and must not be sent twice.
+        failed: list[JobSpec] = []
+        try:
+            enqueue_bulk([s for _, s in popped_by_mx], connection=redis, failed=failed)
+        except Exception:
+            log.exception("mx_scheduler: enqueue failed; re-parking %d jobs", len(popped_by_mx))
+            _unclaim(redis, popped_by_mx)
+            return stats
+        failed_ids = {spec.job_id for spec in failed}
+        sent = [(mx, spec) for mx, spec in popped_by_mx if spec.job_id not in failed_ids]
+        if failed_ids:
+            log.warning("mx_scheduler: enqueue failed; re-parking %d jobs", len(failed_ids))
+            _unclaim(redis, [(mx, spec) for mx, spec in popped_by_mx if spec.job_id in failed_ids])
+        if sent:
+            _confirm(redis, sent)
+        stats.dispatched = len(sent)
+    return stats
+
+
+def pending_count(redis: Redis, mx_host: str | None = None) -> int:
+    if mx_host is not None:
+        return int(redis.zcard(MXQ_JOBS.format(mx=_norm_mx(mx_host))))
+    return int(redis.hlen(MXQ_PAYLOAD))
+
+
+def run_dispatcher(redis: Redis, stop: threading.Event) -> None:
+    """Dispatch loop; ticks every MX_SCHEDULER_INTERVAL_SEC until ``stop`` is set."""
+    while not stop.is_set():
+        try:
+            dispatch_due(redis)
+        except Exception:
+            log.exception("mx_scheduler: dispatch tick failed")
+        stop.wait(_interval_s())
+
+
+def start_dispatcher(redis: Redis) -> threading.Event | None:
+    """Start run_dispatcher() in a daemon thread; returns its stop event."""
+    if not scheduler_enabled():
+        return None
+    stop = threading.Event()
+    t = threading.Thread(
+        target=run_dispatcher, args=(redis, stop), name="mx-scheduler", daemon=True
+    )
+    t.start()
+    return stop
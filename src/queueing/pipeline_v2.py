@@ -31,11 +31,13 @@ import json
 import logging
 import os
 import time
-from collections.abc import Callable
 from datetime import UTC, datetime, timedelta
 from typing import Any
 
-from rq import Queue
+from src.fetch import robots
+from src.queueing.fanout import JobSpec, enqueue_bulk
+from src.queueing.mx_scheduler import schedule_probe_jobs
+from src.resolve import mx
 
 log = logging.getLogger(__name__)
 
@@ -52,6 +54,11 @@ DEFAULT_DISCOVERY_QUEUE = "crawl"
 DEFAULT_VERIFY_QUEUE = "verify"
 DEFAULT_GENERATE_QUEUE = "generate"
 DEFAULT_JOB_TIMEOUT = 1800  # 30 minutes
+# Per-person time budget for a coordinated company generation job
+COORDINATED_SECONDS_PER_PERSON = 120
+# Fan-out planning writes progress every N domains or S seconds, whichever comes first
+PROGRESS_EVERY_DOMAINS = 10
+PROGRESS_EVERY_S = 5.0
 
 
 # ---------------------------------------------------------------------------
@@ -390,6 +397,11 @@ def _get_redis():
 
 def _has_table(con, table: str) -> bool:
     """Check if table exists (best-effort)."""
+    from src.db import cached_schema
+
+    snap = cached_schema(con)
+    if snap is not None:
+        return table in snap.tables
     try:
         con.execute(f"SELECT 1 FROM {table} LIMIT 1")
         return True
@@ -402,9 +414,14 @@ def _table_cols(con, table: str) -> set[str]:
     Column discovery.
 
 
-    Primary path: Postgres information_schema.
+    Primary path: Postgres schema registry (src.db), then information_schema.
     Dev fallback: SQLite PRAGMA (if compat/dev uses SQLite).
     """
+    from src.db import cached_schema
+
+    snap = cached_schema(con)
+    if snap is not None:
+        return set(snap.column_names(table))
     try:
         cur = con.execute(
             """
@@ -822,19 +839,6 @@ def _load_people_for_company(
     return []
 
 
-def _enqueue(
-    q: Queue,
-    func: Callable[..., Any],
-    *,
-    depends_on: Any | None = None,
-    **kwargs: Any,
-):
-    """Enqueue with optional depends_on without passing depends_on=None."""
-    if depends_on is not None:
-        return q.enqueue(func, depends_on=depends_on, **kwargs)
-    return q.enqueue(func, **kwargs)
-
-
 def _maybe_mark_run_complete_from_job() -> None:
     """
     Check if the current job is the terminal stage for a pipeline run and,
@@ -876,6 +880,15 @@ def _maybe_mark_run_complete_from_job() -> None:
 # ---------------------------------------------------------------------------
 
 
+def _company_coordinator_enabled() -> bool:
+    """Coordinated per-company generation needs sequential verification (the default)."""
+    on = {"1", "true", "yes"}
+    return (
+        os.getenv("COMPANY_VERIFY_COORDINATOR", "1").strip().lower() in on
+        and os.getenv("SEQUENTIAL_VERIFICATION", "1").strip().lower() in on
+    )
+
+
 def task_generate_company_emails(  # noqa: C901
     *,
     tenant_id: str,
@@ -891,6 +904,11 @@ def task_generate_company_emails(  # noqa: C901
 
     Enqueues per-person generation jobs:
         task_generate_emails(person_id, first, last, domain)
+
+    or, with sequential verification and COMPANY_VERIFY_COORDINATOR on (the
+    default) and more than one person, a single coordinated job that shares the
+    confirmed pattern across people:
+        task_generate_company_people_emails(company_id, domain, people)
     """
     from rq import get_current_job
 
@@ -905,6 +923,7 @@ def task_generate_company_emails(  # noqa: C901
                 "domain": dom,
                 "people_found": 0,
                 "people_enqueued": 0,
+                "jobs_enqueued": 0,
                 "queue": generate_queue,
             }
 
@@ -952,57 +971,99 @@ def task_generate_company_emails(  # noqa: C901
             )
 
         people = _load_people_for_company(con, tenant_id=tenant_id, company_id=company_id)
-        redis = _get_redis()
-        q = Queue(name=generate_queue, connection=redis)
 
         # IMPORTANT: signature is task_generate_emails(person_id, first, last, domain)
-        from src.queueing.tasks import task_generate_emails
+        from src.queueing.tasks import task_generate_company_people_emails, task_generate_emails
 
-        enqueued = 0
-        for person_id, first, last in people:
-            try:
-                q.enqueue(
-                    task_generate_emails,
-                    person_id=person_id,
-                    first=first,
-                    last=last,
-                    domain=dom,
-                    job_timeout=job_timeout,
-                    meta={
-                        "run_id": run_id,
-                        "tenant_id": tenant_id,
-                        "domain": dom,
+        shared_meta = {
+            "run_id": run_id,
+            "tenant_id": tenant_id,
+            "domain": dom,
+            "company_id": company_id,
+            "ai_enabled": meta.get("ai_enabled", True),
+            "skip_verified": meta.get("skip_verified", True),
+            "skip_catch_all": meta.get("skip_catch_all", False),
+            # Pass pre-resolved catch-all status so all people
+            # on this domain use the same value.
+            "domain_catch_all_status": domain_catch_all_status,
+        }
+
+        coordinated = len(people) > 1 and _company_coordinator_enabled()
+        if coordinated:
+            specs = [
+                JobSpec(
+                    queue=generate_queue,
+                    func=task_generate_company_people_emails,
+                    kwargs={
                         "company_id": company_id,
-                        "person_id": person_id,
-                        "stage": "generate_person_emails",
-                        "ai_enabled": meta.get("ai_enabled", True),
-                        "skip_verified": meta.get("skip_verified", True),
-                        "skip_catch_all": meta.get("skip_catch_all", False),
-                        # Pass pre-resolved catch-all status so all people
-                        # on this domain use the same value.
-                        "domain_catch_all_status": domain_catch_all_status,
+                        "domain": dom,
+                        "people": [list(p) for p in people],
                     },
+                    job_timeout=max(job_timeout, COORDINATED_SECONDS_PER_PERSON * len(people)),
+                    meta={**shared_meta, "stage": "generate_company_people_emails"},
                 )
-                enqueued += 1
-            except Exception:
-                log.debug(
-                    "task_generate_company_emails: failed to enqueue person generation",
-                    exc_info=True,
-                    extra={
-                        "run_id": run_id,
-                        "tenant_id": tenant_id,
-                        "company_id": company_id,
+            ]
+        else:
+            specs = [
+                JobSpec(
+                    queue=generate_queue,
+                    func=task_generate_emails,
+                    kwargs={"person_id": person_id, "first": first, "last": last, "domain": dom},
+                    job_timeout=job_timeout,
+                    meta={
+                        **shared_meta,
                         "person_id": person_id,
-                        "domain": dom,
+                        "stage": "generate_person_emails",
                     },
                 )
+                for person_id, first, last in people
+            ]
+
+        # Chunks commit independently: retry only the specs of failed chunks (once),
+        # the rest are already on RQ and must not be sent twice.
+        failed: list[JobSpec] = []
+        try:
+            enqueue_bulk(specs, connection=_get_redis(), failed=failed)
+            if failed:
+                retry, failed = failed, []
+                enqueue_bulk(retry, connection=_get_redis(), failed=failed)
+        except Exception:
+            failed = list(specs)
+            log.warning(
+                "task_generate_company_emails: failed to enqueue person generation",
+                exc_info=True,
+                extra={
+                    "run_id": run_id,
+                    "tenant_id": tenant_id,
+                    "company_id": company_id,
+                    "domain": dom,
+                    "people": len(specs),
+                },
+            )
+        if failed and len(failed) < len(specs):
+            log.warning(
+                "task_generate_company_emails: %d of %d generation jobs not enqueued",
+                len(failed),
+                len(specs),
+                extra={"run_id": run_id, "tenant_id": tenant_id, "company_id": company_id},
+            )
+
+        # One coordinated job can cover the whole company: count jobs and people apart
+        failed_ids = {spec.job_id for spec in failed}
+        sent = [spec for spec in specs if spec.job_id not in failed_ids]
+        people_enqueued = (len(people) if sent else 0) if coordinated else len(sent)
 
         return {
             "ok": True,
             "company_id": company_id,
             "domain": dom,
             "people_found": len(people),
-            "people_enqueued": enqueued,
+            "people_enqueued": people_enqueued,
+            "jobs_enqueued": len(sent),
+            "jobs_failed": len(failed),
+            "failed_person_ids": [
+                (spec.meta or {}).get("person_id") for spec in failed if not coordinated
+            ],
             "queue": generate_queue,
         }
 
@@ -1081,27 +1142,24 @@ def verify_company_emails(  # noqa: C901
 
         cur = con.execute(sql, tuple(params))
 
-        redis = _get_redis()
-        q = Queue(name=verify_queue, connection=redis)
-
+        specs: list[JobSpec] = []
         for row in cur.fetchall() or []:
-            try:
-                email_addr = (row[1] or "").strip()
-                if not email_addr:
-                    continue
-
-                person_id = None
-                if has_person and len(row) >= 3:
-                    try:
-                        person_id = int(row[2]) if row[2] is not None else None
-                    except Exception:
-                        person_id = None
+            email_addr = (row[1] or "").strip()
+            if not email_addr:
+                continue
 
-                q.enqueue(
-                    verify_email_task,
-                    email=email_addr,
-                    company_id=company_id,
-                    person_id=person_id,
+            person_id = None
+            if has_person and len(row) >= 3:
+                try:
+                    person_id = int(row[2]) if row[2] is not None else None
+                except Exception:
+                    person_id = None
+
+            specs.append(
+                JobSpec(
+                    queue=verify_queue,
+                    func=verify_email_task,
+                    kwargs={"email": email_addr, "company_id": company_id, "person_id": person_id},
                     meta={
                         "run_id": run_id,
                         "tenant_id": tenant_id,
@@ -1110,9 +1168,22 @@ def verify_company_emails(  # noqa: C901
                         "only_with_source_url": only_with_source_url,
                     },
                 )
-                enqueued += 1
-            except Exception:
-                pass
+            )
+
+        try:
+            # Parked per MX host; the worker-side dispatcher releases them at
+            # each host's rate instead of letting them throttle on arrival.
+            enqueued = schedule_probe_jobs(
+                _get_redis(),
+                specs,
+                domain_of=lambda s: str(s.kwargs["email"]).rsplit("@", 1)[-1],
+            )
+        except Exception:
+            log.warning(
+                "verify_company_emails: failed to enqueue verification jobs",
+                exc_info=True,
+                extra={"run_id": run_id, "company_id": company_id, "emails": len(specs)},
+            )
 
         return {
             "ok": True,
@@ -1290,7 +1361,7 @@ def _cleanup_stale_company_data(
     return deleted
 
 
-def _enqueue_domain_jobs(
+def _domain_job_specs(
     con,
     *,
     domain: str,
@@ -1303,12 +1374,12 @@ def _enqueue_domain_jobs(
     run_verify: bool,
     max_probes: int,
     total_companies: int,
-    discovery_q: Queue,
-    generate_q: Queue,
-    verify_q: Queue,
     job_timeout: int,
-) -> dict[str, Any]:
-    """Enqueue autodiscovery/generate/verify jobs for a single domain.
+) -> tuple[dict[str, Any], list[JobSpec]]:
+    """Build the autodiscovery/generate/verify job specs for a single domain.
+
+    Returns (job_info, specs). Job ids are assigned up front so job_info can be
+    recorded before the caller enqueues every domain's specs in one bulk call.
 
     KEY DESIGN DECISION: when generate runs in sequential mode (the default),
     each per-person task_generate_emails job already does inline SMTP probing.
@@ -1320,8 +1391,9 @@ def _enqueue_domain_jobs(
     WITHOUT generate (i.e. verify-only mode).
     """
     job_info: dict[str, Any] = {"domain": domain, "company_id": company_id, "jobs": []}
-    autod_job = None
-    gen_job = None
+    specs: list[JobSpec] = []
+    autod_spec: JobSpec | None = None
+    gen_spec: JobSpec | None = None
 
     force_discovery = options.get("force_discovery", False)
 
@@ -1355,73 +1427,73 @@ def _enqueue_domain_jobs(
 
     # 1) Autodiscovery
     if run_autodiscovery:
-        try:
-            from src.queueing.tasks import autodiscover_company
-
-            autod_job = discovery_q.enqueue(
-                autodiscover_company,
-                company_id=company_id,
-                job_timeout=job_timeout,
-                meta={
-                    "run_id": run_id,
-                    "tenant_id": tenant_id,
-                    "domain": domain,
-                    "company_id": company_id,
-                    "stage": "autodiscovery",
-                    "total_companies": total_companies,
-                    "ai_enabled": options.get("ai_enabled", True),
-                    "force_discovery": options.get("force_discovery", False),
-                    "timeout_per_company_s": options.get("timeout_per_company_s", 300),
-                    "skip_verified": options.get("skip_verified", True),
-                    "skip_catch_all": options.get("skip_catch_all", False),
-                    **_completion_meta("autodiscovery"),
-                },
-            )
-            job_info["jobs"].append(
-                {
-                    "stage": "autodiscovery",
-                    "job_id": autod_job.id,
-                    "queue": options["discovery_queue"],
-                }
-            )
-        except Exception as exc:
-            log.warning("Failed to enqueue autodiscovery for %s: %s", domain, exc)
+        from src.queueing.tasks import autodiscover_company
+
+        autod_spec = JobSpec(
+            queue=options["discovery_queue"],
+            func=autodiscover_company,
+            kwargs={"company_id": company_id},
+            job_timeout=job_timeout,
+            meta={
+                "run_id": run_id,
+                "tenant_id": tenant_id,
+                "domain": domain,
+                "company_id": company_id,
+                "stage": "autodiscovery",
+                "total_companies": total_companies,
+                "ai_enabled": options.get("ai_enabled", True),
+                "force_discovery": options.get("force_discovery", False),
+                "timeout_per_company_s": options.get("timeout_per_company_s", 300),
+                "skip_verified": options.get("skip_verified", True),
+                "skip_catch_all": options.get("skip_catch_all", False),
+                **_completion_meta("autodiscovery"),
+            },
+        )
+        specs.append(autod_spec)
+        job_info["jobs"].append(
+            {
+                "stage": "autodiscovery",
+                "job_id": autod_spec.job_id,
+                "queue": options["discovery_queue"],
+            }
+        )
 
     # 2) Generation (company fanout)
     if run_generate:
-        try:
-            gen_job = _enqueue(
-                generate_q,
-                task_generate_company_emails,
-                depends_on=autod_job,
-                tenant_id=tenant_id,
-                run_id=run_id,
-                company_id=company_id,
-                domain=domain,
-                generate_queue=options["generate_queue"],
-                job_timeout=job_timeout,
-                meta={
-                    "run_id": run_id,
-                    "tenant_id": tenant_id,
-                    "domain": domain,
-                    "company_id": company_id,
-                    "stage": "generate_company_fanout",
-                    "ai_enabled": options.get("ai_enabled", True),
-                    "skip_verified": options.get("skip_verified", True),
-                    "skip_catch_all": options.get("skip_catch_all", False),
-                    **_completion_meta("generate"),
-                },
-            )
-            job_info["jobs"].append(
-                {
-                    "stage": "generate",
-                    "job_id": gen_job.id,
-                    "queue": options["generate_queue"],
-                    "depends_on": getattr(autod_job, "id", None),
-                }
-            )
-        except Exception as exc:
-            log.warning("Failed to enqueue generate fanout for %s: %s", domain, exc)
+        gen_spec = JobSpec(
+            queue=options["generate_queue"],
+            func=task_generate_company_emails,
+            kwargs={
+                "tenant_id": tenant_id,
+                "run_id": run_id,
+                "company_id": company_id,
+                "domain": domain,
+                "generate_queue": options["generate_queue"],
+                "job_timeout": job_timeout,
+            },
+            job_timeout=job_timeout,
+            depends_on=autod_spec.job_id if autod_spec is not None else None,
+            meta={
+                "run_id": run_id,
+                "tenant_id": tenant_id,
+                "domain": domain,
+                "company_id": company_id,
+                "stage": "generate_company_fanout",
+                "ai_enabled": options.get("ai_enabled", True),
+                "skip_verified": options.get("skip_verified", True),
+                "skip_catch_all": options.get("skip_catch_all", False),
+                **_completion_meta("generate"),
+            },
+        )
+        specs.append(gen_spec)
+        job_info["jobs"].append(
+            {
+                "stage": "generate",
+                "job_id": gen_spec.job_id,
+                "queue": options["generate_queue"],
+                "depends_on": gen_spec.depends_on,
+            }
+        )
 
     # 3) Verification — ONLY when verify is selected WITHOUT generate.
     #    When generate+verify is selected, the sequential generator inside
@@ -1429,43 +1501,43 @@ def _enqueue_domain_jobs(
     #    Enqueueing a separate verify sweep would race with the per-person
     #    jobs and produce duplicate/unknown results.
     if run_verify and not skip_verify_sweep:
-        depends = gen_job if (run_generate and gen_job is not None) else autod_job
-        try:
-            vjob = _enqueue(
-                verify_q,
-                verify_company_emails,
-                depends_on=depends,
-                company_id=company_id,
-                tenant_id=tenant_id,
-                run_id=run_id,
-                verify_queue=options["verify_queue"],
-                only_with_source_url=False,
-                force=force_discovery,
-                job_timeout=job_timeout,
-                meta={
-                    "run_id": run_id,
-                    "tenant_id": tenant_id,
-                    "domain": domain,
-                    "company_id": company_id,
-                    "stage": "verify_company_sweep",
-                    "only_with_source_url": False,
-                    "max_probes_per_person_env": max_probes,
-                    **_completion_meta("verify"),
-                },
-            )
-            job_info["jobs"].append(
-                {
-                    "stage": "verify",
-                    "job_id": vjob.id,
-                    "queue": options["verify_queue"],
-                    "depends_on": getattr(depends, "id", None),
-                    "only_with_source_url": False,
-                }
-            )
-        except Exception as exc:
-            log.warning("Failed to enqueue verify sweep for %s: %s", domain, exc)
+        depends = gen_spec if gen_spec is not None else autod_spec
+        vspec = JobSpec(
+            queue=options["verify_queue"],
+            func=verify_company_emails,
+            kwargs={
+                "company_id": company_id,
+                "tenant_id": tenant_id,
+                "run_id": run_id,
+                "verify_queue": options["verify_queue"],
+                "only_with_source_url": False,
+                "force": force_discovery,
+            },
+            job_timeout=job_timeout,
+            depends_on=depends.job_id if depends is not None else None,
+            meta={
+                "run_id": run_id,
+                "tenant_id": tenant_id,
+                "domain": domain,
+                "company_id": company_id,
+                "stage": "verify_company_sweep",
+                "only_with_source_url": False,
+                "max_probes_per_person_env": max_probes,
+                **_completion_meta("verify"),
+            },
+        )
+        specs.append(vspec)
+        job_info["jobs"].append(
+            {
+                "stage": "verify",
+                "job_id": vspec.job_id,
+                "queue": options["verify_queue"],
+                "depends_on": vspec.depends_on,
+                "only_with_source_url": False,
+            }
+        )
 
-    return job_info
+    return job_info, specs
 
 
 def _write_user_supplied_resolution(
@@ -1708,16 +1780,15 @@ def pipeline_start_v2(*, run_id: str, tenant_id: str) -> dict[str, Any]:
             progress=progress,
         )
 
-        redis = _get_redis()
-        discovery_q = Queue(name=options["discovery_queue"], connection=redis)
-        generate_q = Queue(name=options["generate_queue"], connection=redis)
-        verify_q = Queue(name=options["verify_queue"], connection=redis)
-
         total_companies = len(domains)
         job_timeout = options["job_timeout"]
-        enqueued: list[dict[str, Any]] = []
+        planned: list[tuple[str, int, dict[str, Any]]] = []
+        specs: list[JobSpec] = []
+        progress["phase"] = "planning"
+        progress["metrics"]["companies_planned"] = 0
+        last_progress_write = time.monotonic()
 
-        for i, d in enumerate(domains):
+        for d in domains:
             dom = str(d or "").strip().lower()
             if not dom:
                 continue
@@ -1737,7 +1808,7 @@ def pipeline_start_v2(*, run_id: str, tenant_id: str) -> dict[str, Any]:
                 tenant_id=tenant_id,
             )
 
-            job_info = _enqueue_domain_jobs(
+            job_info, domain_specs = _domain_job_specs(
                 con,
                 domain=dom,
                 tenant_id=tenant_id,
@@ -1749,13 +1820,71 @@ def pipeline_start_v2(*, run_id: str, tenant_id: str) -> dict[str, Any]:
                 run_verify=run_verify,
                 max_probes=max_probes,
                 total_companies=total_companies,
-                discovery_q=discovery_q,
-                generate_q=generate_q,
-                verify_q=verify_q,
                 job_timeout=job_timeout,
             )
-            enqueued.append(job_info)
+            planned.append((dom, company_id, job_info))
+            specs.extend(domain_specs)
+
+            # Throttled progress: planning touches the DB per domain and can take a while.
+            progress["metrics"]["companies_planned"] = len(planned)
+            now_mono = time.monotonic()
+            if (
+                len(planned) % PROGRESS_EVERY_DOMAINS == 0
+                or now_mono - last_progress_write >= PROGRESS_EVERY_S
+            ):
+                _update_run_row(con, tenant_id=tenant_id, run_id=run_id, progress=progress)
+                last_progress_write = now_mono
+
+        # Warm the shared robots cache for every domain in parallel, ahead of the crawls.
+        if run_autodiscovery and planned and robots.ROBOTS_CACHE_BACKEND == "redis":
+            specs.insert(
+                0,
+                JobSpec(
+                    queue=options["discovery_queue"],
+                    func=robots.prefetch,
+                    kwargs={"hosts": [dom for dom, _, _ in planned]},
+                    meta={"tenant_id": tenant_id, "stage": "robots_prefetch"},
+                    job_timeout=job_timeout,
+                ),
+            )
 
+        # Same for MX: one concurrent batch fills the shared domain cache before generation.
+        if run_generate and planned and mx.MX_CACHE_ENABLED:
+            specs.insert(
+                0,
+                JobSpec(
+                    queue=options["generate_queue"],
+                    func=mx.prefetch,
+                    kwargs={"domains": [dom for dom, _, _ in planned]},
+                    meta={"tenant_id": tenant_id, "stage": "mx_prefetch"},
+                    job_timeout=job_timeout,
+                ),
+            )
+
+        # One pipelined fan-out for the whole run (a few round-trips, not ~3 per domain).
+        # A failing chunk is recorded and the remaining chunks are still sent.
+        failed_specs: list[JobSpec] = []
+        enqueue_bulk(specs, connection=_get_redis(), failed=failed_specs)
+        failed_ids = {spec.job_id for spec in failed_specs}
+
+        enqueued: list[dict[str, Any]] = []
+        failed_jobs: list[dict[str, Any]] = []
+        for dom, company_id, job_info in planned:
+            lost = [j for j in job_info["jobs"] if j["job_id"] in failed_ids]
+            if lost:
+                failed_jobs.extend({**j, "domain": dom, "company_id": company_id} for j in lost)
+                progress["domains"].append(
+                    {
+                        "domain": dom,
+                        "company_id": company_id,
+                        "state": "enqueue_failed",
+                        "jobs": [j for j in job_info["jobs"] if j["job_id"] not in failed_ids],
+                        "failed_jobs": lost,
+                    }
+                )
+                progress["metrics"]["companies_failed"] += 1
+                continue
+            enqueued.append(job_info)
             _update_progress_for_domain(
                 progress,
                 job_info=job_info,
@@ -1764,14 +1893,22 @@ def pipeline_start_v2(*, run_id: str, tenant_id: str) -> dict[str, Any]:
                 enqueued_count=len(enqueued),
             )
 
-            if i % 10 == 0 or i == len(domains) - 1:
-                _update_run_row(con, tenant_id=tenant_id, run_id=run_id, progress=progress)
-
         elapsed = time.time() - start_time
         progress["phase"] = "fanout_complete"
         progress["fanout_time_s"] = round(elapsed, 2)
         progress["metrics"]["companies_enqueued"] = len(enqueued)
         progress["metrics"]["max_probes_per_person_env"] = max_probes
+        if failed_specs:
+            progress["metrics"]["fanout_failed_jobs"] = len(failed_specs)
+            progress["fanout_failed"] = failed_jobs + [
+                {
+                    "job_id": spec.job_id,
+                    "queue": spec.queue,
+                    "stage": (spec.meta or {}).get("stage"),
+                }
+                for spec in failed_specs
+                if spec.job_id not in {j["job_id"] for j in failed_jobs}
+            ]
 
         _update_run_row(con, tenant_id=tenant_id, run_id=run_id, progress=progress)
 
@@ -1797,6 +1934,7 @@ def pipeline_start_v2(*, run_id: str, tenant_id: str) -> dict[str, Any]:
             "hard_24h_limit_applied": limit_info["hard_24h_applied"],
             "hard_24h_limit_method": limit_info["used_24h_method"],
             "enqueued": enqueued,
+            "fanout_failed": progress.get("fanout_failed", []),
             "fanout_time_s": round(elapsed, 2),
             "max_probes_per_person_env": max_probes,
         }
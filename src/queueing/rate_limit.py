@@ -1,88 +1,250 @@
 # src/queueing/rate_limit.py
+"""
+SMTP/DNS probe throttling.
+
+One Lua script (ACQUIRE_LUA) atomically checks every limit a probe needs:
+
+  - concurrency semaphores (global, per-MX) are sorted sets of *leases*:
+    member = lease token, score = expiry (ms). Expired leases are pruned on
+    every acquire, so a crashed worker's slot frees itself after the lease TTL
+    instead of pinning a shared counter.
+  - rates (global, per-MX) are token buckets refilled continuously from
+    Redis server time; no tumbling window edge bursts.
+
+Either everything is granted (one lease token is added to each semaphore and
+one token taken from each bucket) or nothing is, together with a retry-after
+hint in seconds for the limit that failed. For a token bucket the hint is
+exact. For a full semaphore the earliest lease expiry is only an upper bound
+(holders usually release long before), so the hint is a short poll interval
+(RATE_SEM_RETRY_MS) and the expiry is reported as retry_after_max_s.
+
+Long lease holders (an SmtpSession probing many addresses) call renew_lease()
+so their slot does not silently expire while still in use.
+"""
+
 import os
 import random
+import threading
 import time
+import uuid
+import weakref
+from collections.abc import Sequence
 from contextlib import contextmanager
+from dataclasses import dataclass
 
 from redis import Redis
-from redis.exceptions import WatchError
 
 # ---- Keys / constants ----
-GLOBAL_SEM = "sem:global"
-MX_SEM = "sem:mx:{mx}"
-SEM_TTL = 120  # seconds; prevents deadlocks if a worker dies mid-lease
+GLOBAL_LEASES = "lease:global"
+MX_LEASES = "lease:mx:{mx}"
+GLOBAL_BUCKET = "tb:global"
+MX_BUCKET = "tb:mx:{mx}"
 
-RPS_KEY_GLOBAL = "rps:global:{sec}"
-RPS_KEY_MX = "rps:mx:{mx}:{sec}"
+# Lease length; a slot held by a dead worker frees itself after this long.
+SEM_TTL = int(os.getenv("RATE_LEASE_TTL_SEC", "120"))
+
+# Retry hint for a full semaphore: poll again after about this long
+SEM_RETRY_MS = int(os.getenv("RATE_SEM_RETRY_MS", "250"))
 
 # Configurable default via env
 PER_MX_MAX_CONCURRENCY_DEFAULT = int(os.getenv("PER_MX_MAX_CONCURRENCY_DEFAULT", "3"))
 
 
-# ---- Time helper ----
-def _now_sec() -> int:
-    return int(time.time())
+# KEYS: ns lease zsets, then nb bucket hashes
+# ARGV: token, lease_ms, ns, nb, ns limits, nb (rate_per_s, burst) pairs
+# Returns {1, 0, 0} on success, {0, index_of_failed_limit, retry_after_ms} otherwise.
+ACQUIRE_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local token = ARGV[1]
+local lease_ms = tonumber(ARGV[2])
+local ns = tonumber(ARGV[3])
+local nb = tonumber(ARGV[4])
 
+for i = 1, ns do
+  local limit = tonumber(ARGV[4 + i])
+  redis.call('ZREMRANGEBYSCORE', KEYS[i], '-inf', now)
+  if redis.call('ZCARD', KEYS[i]) >= limit then
+    local first = redis.call('ZRANGE', KEYS[i], 0, 0, 'WITHSCORES')
+    local wait = lease_ms
+    if first[2] then wait = tonumber(first[2]) - now end
+    return {0, i, math.max(1, math.ceil(wait))}
+  end
+end
 
-# ---- Semaphore primitives ----
-def try_acquire(redis: Redis, key: str, limit: int) -> bool:
-    """
-    Attempt to acquire a semaphore slot under `key`.
-    Uses WATCH/MULTI to ensure we don't exceed `limit`.
-    """
-    while True:
-        with redis.pipeline() as p:
-            try:
-                p.watch(key)
-                cur_raw = p.get(key)
-                cur = int(cur_raw) if cur_raw is not None else 0
-                if cur >= limit:
-                    p.unwatch()
-                    return False
-                p.multi()
-                p.incr(key, 1)
-                p.expire(key, SEM_TTL)
-                p.execute()
-                return True
-            except WatchError:  # race; retry
-                continue
-
-
-def release(redis: Redis, key: str):
+local tokens = {}
+for j = 1, nb do
+  local rate = tonumber(ARGV[4 + ns + 2 * j - 1])
+  local burst = tonumber(ARGV[4 + ns + 2 * j])
+  local state = redis.call('HMGET', KEYS[ns + j], 'tokens', 'ts')
+  local have = tonumber(state[1]) or burst
+  local ts = tonumber(state[2]) or now
+  have = math.min(burst, have + math.max(0, now - ts) * rate / 1000)
+  if have < 1 then
+    return {0, ns + j, math.max(1, math.ceil((1 - have) * 1000 / rate))}
+  end
+  tokens[j] = have
+end
+
+for i = 1, ns do
+  redis.call('ZADD', KEYS[i], now + lease_ms, token)
+  redis.call('PEXPIRE', KEYS[i], lease_ms * 2)
+end
+for j = 1, nb do
+  local rate = tonumber(ARGV[4 + ns + 2 * j - 1])
+  local burst = tonumber(ARGV[4 + ns + 2 * j])
+  redis.call('HSET', KEYS[ns + j], 'tokens', tostring(tokens[j] - 1), 'ts', now)
+  redis.call('PEXPIRE', KEYS[ns + j], math.ceil(burst * 1000 / rate) + 1000)
+end
+return {1, 0, 0}
+"""
+
+# KEYS: lease zsets; ARGV: token, lease_ms. Extends the lease where it is still held.
+RENEW_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) * 1000 + math.floor(tonumber(t[2]) / 1000)
+local held = 0
+for i = 1, #KEYS do
+  held = held + redis.call('ZADD', KEYS[i], 'XX', 'CH', now + tonumber(ARGV[2]), ARGV[1])
+  redis.call('PEXPIRE', KEYS[i], tonumber(ARGV[2]) * 2)
+end
+return held
+"""
+
+
+# Registered Script objects per client, so acquire()/renew_lease() don't build
+# one (and hash the Lua source) on every call.
+_scripts: "weakref.WeakKeyDictionary[Redis, dict[str, object]]" = weakref.WeakKeyDictionary()
+_scripts_lock = threading.Lock()
+
+
+def _script(redis: Redis, lua: str):
+    """redis.register_script(lua), cached per client."""
+    with _scripts_lock:
+        try:
+            per_client = _scripts.setdefault(redis, {})
+        except TypeError:  # client that cannot be weakly referenced
+            return redis.register_script(lua)
+        script = per_client.get(lua)
+        if script is None:
+            script = per_client[lua] = redis.register_script(lua)
+    return script
+
+
+@dataclass(frozen=True)
+class Lease:
+    """Slots held in one or more lease sets under a single token."""
+
+    token: str
+    keys: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class ThrottleResult:
+    ok: bool
+    lease: Lease | None = None
+    # Seconds until the failing limit is worth asking again
+    retry_after_s: float = 0.0
+    # Seconds until the failing limit admits another caller at the latest
+    retry_after_max_s: float = 0.0
+    reason: str | None = None
+
+    def __bool__(self) -> bool:
+        return self.ok
+
+
+def acquire(
+    redis: Redis,
+    *,
+    semaphores: Sequence[tuple[str, int, str]] = (),
+    buckets: Sequence[tuple[str, float, float, str]] = (),
+    lease_s: float | None = None,
+) -> ThrottleResult:
     """
-    Best-effort release that never goes negative.
-    CAS loop: read -> compute -> write/delete.
+    Atomically take one slot from each semaphore and one token from each bucket.
+
+    semaphores: (key, limit, reason) -- limit <= 0 disables that semaphore
+    buckets:    (key, rate_per_s, burst, reason) -- rate <= 0 disables that bucket
     """
-    while True:
-        with redis.pipeline() as p:
-            try:
-                p.watch(key)
-                cur = int(p.get(key) or 0)
-                new_val = max(cur - 1, 0)
-                p.multi()
-                if new_val == 0:
-                    p.delete(key)
-                else:
-                    # set exact value and refresh TTL
-                    p.set(key, new_val)
-                    p.expire(key, SEM_TTL)
-                p.execute()
-                return
-            except WatchError:
-                continue
-            except Exception:
-                # don't let release crash the worker
-                return
-
-
-# ---- Simple RPS window (1s tumbling window) ----
-def can_consume_rps(redis: Redis, key: str, limit: int) -> bool:
-    now = _now_sec()
-    window_key = f"{key.format(sec=now)}"
-    cnt = redis.incr(window_key, 1)
-    if cnt == 1:
-        redis.expire(window_key, 2)  # 1s window + slack
-    return cnt <= limit
+    sems = [s for s in semaphores if int(s[1]) > 0]
+    bkts = [b for b in buckets if float(b[1]) > 0]
+    if not sems and not bkts:
+        return ThrottleResult(ok=True, lease=Lease(uuid.uuid4().hex, ()))
+
+    token = uuid.uuid4().hex
+    lease_ms = int(float(lease_s if lease_s is not None else SEM_TTL) * 1000)
+    keys = [s[0] for s in sems] + [b[0] for b in bkts]
+    argv: list[object] = [token, lease_ms, len(sems), len(bkts)]
+    argv += [int(s[1]) for s in sems]
+    for b in bkts:
+        argv += [float(b[1]), max(1.0, float(b[2]))]
+
+    ok, idx, wait_ms = _script(redis, ACQUIRE_LUA)(keys=keys, args=argv)
+    if int(ok) == 1:
+        return ThrottleResult(ok=True, lease=Lease(token, tuple(s[0] for s in sems)))
+
+    reasons = [s[2] for s in sems] + [b[3] for b in bkts]
+    max_wait_s = int(wait_ms) / 1000.0
+    wait_s = max_wait_s
+    if int(idx) <= len(sems):
+        # Full semaphore: a slot frees as soon as any holder releases, so poll
+        # (with jitter, to keep workers out of lockstep) instead of waiting
+        # for the oldest lease to expire.
+        wait_s = min(max_wait_s, SEM_RETRY_MS / 1000.0 * random.uniform(0.5, 1.0))
+    return ThrottleResult(
+        ok=False,
+        retry_after_s=wait_s,
+        retry_after_max_s=max_wait_s,
+        reason=reasons[int(idx) - 1],
+    )
+
+
+def release_lease(redis: Redis, lease: Lease | None) -> None:
+    """Give the lease's slots back (best-effort; expiry covers failures)."""
+    if lease is None or not lease.keys:
+        return
+    try:
+        with redis.pipeline(transaction=False) as p:
+            for key in lease.keys:
+                p.zrem(key, lease.token)
+            p.execute()
+    except Exception:
+        # don't let release crash the worker
+        return
+
+
+def renew_lease(redis: Redis, lease: Lease, *, lease_s: float | None = None) -> bool:
+    """Extend a lease held for longer than SEM_TTL. False if it already expired."""
+    if not lease.keys:
+        return True
+    lease_ms = int(float(lease_s if lease_s is not None else SEM_TTL) * 1000)
+    held = _script(redis, RENEW_LUA)(keys=list(lease.keys), args=[lease.token, lease_ms])
+    return int(held) == len(lease.keys)
+
+
+def acquire_probe_slots(
+    redis: Redis,
+    mx: str,
+    *,
+    global_limit: int,
+    mx_limit: int,
+    global_rps: float = 0,
+    mx_rps: float = 0,
+    lease_s: float | None = None,
+) -> ThrottleResult:
+    """Global + per-MX concurrency and rate limits for one probe, in one round-trip."""
+    return acquire(
+        redis,
+        semaphores=(
+            (GLOBAL_LEASES, global_limit, "global concurrency cap reached"),
+            (MX_LEASES.format(mx=mx), mx_limit, "per-MX concurrency cap reached"),
+        ),
+        buckets=(
+            (GLOBAL_BUCKET, global_rps, global_rps, "global RPS throttle"),
+            (MX_BUCKET.format(mx=mx), mx_rps, mx_rps, "MX RPS throttle"),
+        ),
+        lease_s=lease_s,
+    )
 
 
 # ---- Backoff helpers ----
@@ -117,24 +279,26 @@ def per_mx_slot(
     max_concurrency: int | None = None,
     acquire_timeout_s: float = 10.0,
     poll_ms: int = 50,
+    lease_s: float | None = None,
 ):
     """
-    Acquire a per-MX semaphore slot. Blocks until acquired or timeout.
-    Counter key: MX_SEM.format(mx=mx_host)
+    Acquire a per-MX lease (MX_LEASES). Blocks until acquired or timeout,
+    sleeping for the limiter's retry-after hint (capped at poll_ms).
     """
     limit = int(max_concurrency or PER_MX_MAX_CONCURRENCY_DEFAULT)
-    key = MX_SEM.format(mx=mx_host)
+    sem = ((MX_LEASES.format(mx=mx_host), limit, "per-MX concurrency cap reached"),)
     deadline = time.monotonic() + acquire_timeout_s
 
     # Acquire loop
     while True:
-        if try_acquire(redis, key, limit):
+        res = acquire(redis, semaphores=sem, lease_s=lease_s)
+        if res.ok:
             break
         if time.monotonic() > deadline:
             raise TimeoutError(f"per_mx_slot acquire timed out for {mx_host}")
-        time.sleep(poll_ms / 1000.0)
+        time.sleep(min(res.retry_after_s, poll_ms / 1000.0))
 
     try:
-        yield
+        yield res.lease
     finally:
-        release(redis, key)
+        release_lease(redis, res.lease)
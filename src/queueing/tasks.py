@@ -1,16 +1,19 @@
 # src/queueing/tasks.py
 from __future__ import annotations
 
+import functools
 import json
 import logging
 import os
+import random
+import smtplib
 import socket
 import subprocess
 import sys
 import time
 from collections.abc import Sequence
 from contextlib import closing
-from datetime import datetime
+from datetime import datetime, timedelta
 from pathlib import Path
 from typing import Any
 from urllib.parse import urlparse
@@ -26,6 +29,7 @@ from tenacity import (
     wait_random_exponential,
 )
 
+from src import page_store
 from src.autodiscovery_result import AutodiscoveryResult
 from src.config import (
     SMTP_COMMAND_TIMEOUT,
@@ -34,8 +38,9 @@ from src.config import (
     SMTP_MAIL_FROM,
     load_settings,
 )
-from src.crawl.runner import crawl_domain
+from src.crawl.runner import crawl_domain, crawl_domains
 from src.db import (
+    cached_schema,
     get_conn,
     upsert_generated_email,
     upsert_verification_result,
@@ -43,9 +48,12 @@ from src.db import (
 )
 from src.db_pages import save_pages
 from src.exceptions import PermanentSMTPError, TemporarySMTPError
+from src.extract import extraction_cache
 from src.extract.candidates import ROLE_ALIASES
 from src.extract.candidates import Candidate as ExtractCandidate
 from src.extract.candidates import extract_candidates as extract_html_candidates
+from src.extract.parsed_page import ParsedPage
+from src.page_store import StoredBlob
 
 # Task A: Robots explainability imports
 try:
@@ -85,12 +93,14 @@ except Exception:  # pragma: no cover
 # O26: role/placeholder handling
 from src.emails.classify import is_role_or_placeholder_email
 from src.generate.patterns import (
-    PATTERNS as CANON_PATTERNS,  # keys of canonical patterns (e.g., "first.last")
-)
-from src.generate.patterns import (
+    PATTERN_PRIORITY,
+    build_localpart,
     generate_candidate_emails_for_person,  # O26 canonical generator
     infer_domain_pattern,  # O01 canonical inference
 )
+from src.generate.patterns import (
+    PATTERNS as CANON_PATTERNS,  # keys of canonical patterns (e.g., "first.last")
+)
 from src.ingest.normalize import (
     normalize_row,  # R13 lightweight full-row normalization
     normalize_split_parts,  # O09 normalization for generation (ASCII locals)
@@ -98,20 +108,23 @@ from src.ingest.normalize import (
 from src.ingest.persist import (
     upsert_row as persist_upsert_row,  # R13: persist normalized rows
 )
+from src.queueing import mx_scheduler
+from src.queueing.fanout import JobSpec
 from src.queueing.rate_limit import (
-    GLOBAL_SEM,
-    MX_SEM,
-    RPS_KEY_GLOBAL,
-    RPS_KEY_MX,
-    can_consume_rps,
-    release,
-    try_acquire,
+    SEM_TTL,
+    Lease,
+    ThrottleResult,
+    acquire_probe_slots,
+    per_mx_slot,
+    release_lease,
+    renew_lease,
 )
 from src.queueing.redis_conn import get_redis
-from src.resolve.domain import resolve
+from src.resolve.domain import Decision, resolve_many
 from src.resolve.mx import resolve_mx as _resolve_mx  # R15
+from src.verify import result_cache as verify_cache
 from src.verify.catchall import check_catchall_for_domain  # R17 domain-level catch-all
-from src.verify.smtp import probe_rcpt  # R16 SMTP probe core
+from src.verify.smtp import SmtpSession, probe_rcpt  # R16 SMTP probe core
 from src.verify.status import (
     VerificationSignals,
     classify,  # R18 classifier
@@ -380,7 +393,52 @@ def resolve_company_domain(
     # Prefer explicit user_hint; otherwise fall back to user_supplied_domain.
     hint = user_hint or user_supplied_domain
 
-    dec = resolve(company_name, hint)
+    dec = resolve_many([(company_name, hint)])[0]
+    return record_domain_decision(company_id, company_name, hint, dec)
+
+
+def resolve_company_domains(companies: Sequence[dict[str, Any]], **_: Any) -> list[dict]:
+    """
+    RQ task: batch form of resolve_company_domain for bulk imports.
+
+    ``companies`` holds resolve_company_domain keyword dicts (company_id,
+    company_name, user_hint / user_supplied_domain). All candidates go through
+    one resolve_many() call, so DNS and HTTP probes are shared across the batch;
+    each decision is then persisted on its own. Returns one result per company,
+    in order; a company whose persistence fails gets {"company_id", "error"}.
+    """
+    items = [
+        (
+            int(c["company_id"]),
+            str(c.get("company_name") or ""),
+            c.get("user_hint") or c.get("user_supplied_domain"),
+        )
+        for c in companies
+    ]
+    decisions = resolve_many((name, hint) for _cid, name, hint in items)
+
+    out: list[dict] = []
+    for (cid, name, hint), dec in zip(items, decisions, strict=True):
+        try:
+            out.append(record_domain_decision(cid, name, hint, dec))
+        except Exception as exc:
+            log.exception("resolve_company_domains: persist failed", extra={"company_id": cid})
+            out.append({"company_id": cid, "error": type(exc).__name__})
+    return out
+
+
+def record_domain_decision(
+    company_id: int,
+    company_name: str,
+    hint: str | None,
+    dec: Decision,
+) -> dict:
+    """
+    Persist a resolver Decision for one company and enqueue its crawl.
+
+    Shared by resolve_company_domain and bulk callers that resolve many
+    companies at once with src.resolve.domain.resolve_many().
+    """
     log.info(
         "resolve_domain company_id=%s name=%r hint=%r chosen=%r method=%s confidence=%s",
         company_id,
@@ -542,7 +600,6 @@ def verify_email_task(  # noqa: C901
 
     domain = email.split("@")[-1].lower()
     mx_host, _pref = lookup_mx(domain)
-    mx_key = MX_SEM.format(mx=mx_host)
 
     start = time.perf_counter()
     attempt = 1
@@ -550,8 +607,8 @@ def verify_email_task(  # noqa: C901
     status: str = "unknown"
     reason: str | None = "unstarted"
 
-    got_global = False
-    got_mx = False
+    lease: Lease | None = None
+    deferred_job_id: str | None = None
 
     try:
         # ---- Force the self-test's one failed job ASAP (before throttling paths) ----
@@ -566,14 +623,43 @@ def verify_email_task(  # noqa: C901
         if raise_temp_env and willfail_addr:
             raise TemporarySMTPError("R06 selftest (env): simulated temp failure")
 
-        # ---- Acquire concurrency semaphores ----
-        got_global = try_acquire(redis, GLOBAL_SEM, _cfg.rate.global_max_concurrency)
-        if not got_global:
-            raise TemporarySMTPError("global concurrency cap reached")
+        # ---- Global verification cache (any tenant/run); no throttles on a hit ----
+        cached = verify_cache.lookup(email)
+        if cached is not None:
+            status, reason = cached.verify_status, cached.verify_reason
+            mx_host = cached.mx_host or mx_host
+            log.info(
+                "verification served from cache",
+                extra={"email": email, "status": status, "mx": mx_host},
+            )
+            return {
+                "email": email,
+                "verify_status": status,
+                "reason": reason,
+                "mx_host": mx_host,
+                "cached": True,
+            }
 
-        got_mx = try_acquire(redis, mx_key, _cfg.rate.per_mx_max_concurrency_default)
-        if not got_mx:
-            raise TemporarySMTPError("per-MX concurrency cap reached")
+        # ---- Concurrency leases + RPS token buckets (one atomic call) ----
+        throttle = _wait_for_probe_slots(redis, mx_host)
+        if not throttle.ok:
+            deferred_job_id = _defer_current_job(throttle.retry_after_s, mx_host=mx_host)
+            if deferred_job_id is None:
+                raise TemporarySMTPError(
+                    f"{throttle.reason} (retry after {throttle.retry_after_s:.1f}s)"
+                )
+            log.info(
+                "throttled, verification parked",
+                extra={"email": email, "mx": mx_host, "reason": throttle.reason},
+            )
+            return {
+                "email": email,
+                "verify_status": "deferred",
+                "reason": throttle.reason,
+                "mx_host": mx_host,
+                "deferred_job_id": deferred_job_id,
+            }
+        lease = throttle.lease
 
         # Record/advance job attempt counter
         if job:
@@ -581,32 +667,13 @@ def verify_email_task(  # noqa: C901
             job.meta["attempt"] = attempt
             job.save_meta()
 
-        # 1-second RPS buckets
-        sec = int(time.time())
-        key_global_rps = RPS_KEY_GLOBAL.format(sec=sec)
-        key_mx_rps = RPS_KEY_MX.format(mx=mx_host, sec=sec)
-
-        # Optional RPS smoothing (global)
-        if _cfg.rate.global_rps and not can_consume_rps(
-            redis,
-            key_global_rps,
-            int(_cfg.rate.global_rps),
-        ):
-            raise TemporarySMTPError("global RPS throttle")
-
-        # Optional RPS smoothing (per MX)
-        if _cfg.rate.per_mx_rps_default and not can_consume_rps(
-            redis,
-            key_mx_rps,
-            int(_cfg.rate.per_mx_rps_default),
-        ):
-            raise TemporarySMTPError("MX RPS throttle")
-
         # ---- Probe (Tenacity handles retries on TemporarySMTPError) ----
         verify_status, probe_reason = smtp_probe(
             email,
             _cfg.smtp_identity.helo_domain,
         )
+        # Stub / self-test outcome: never written to the global cache, which
+        # only holds real R16 classifications (task_probe_email)
         status, reason = verify_status, probe_reason
 
         latency_ms = int((time.perf_counter() - start) * 1000)
@@ -687,7 +754,7 @@ def verify_email_task(  # noqa: C901
         # Idempotent UPSERT on every outcome (success, temp/perm error, crash)
         try:
             resolved_email_id = email_id
-            if resolved_email_id is None:
+            if resolved_email_id is None and deferred_job_id is None:
                 con_db = None
                 try:
                     con_db = _conn()
@@ -753,7 +820,9 @@ def verify_email_task(  # noqa: C901
 
             ts_iso = datetime.utcnow().strftime("%Y-%m-%dT%H:%M:%SZ")
 
-            if resolved_email_id is None:
+            if deferred_job_id is not None:
+                pass  # parked jobs run again later; nothing to record yet
+            elif resolved_email_id is None:
                 log.warning(
                     "skip upsert_verification_result: missing email_id",
                     extra={
@@ -791,16 +860,7 @@ def verify_email_task(  # noqa: C901
             redis2 = None  # type: ignore[assignment]
 
         if redis2 is not None:
-            if got_mx:
-                try:
-                    release(redis2, MX_SEM.format(mx=mx_host))
-                except Exception:
-                    pass
-            if got_global:
-                try:
-                    release(redis2, GLOBAL_SEM)
-                except Exception:
-                    pass
+            release_lease(redis2, lease)
 
 
 # -------------------------------#
@@ -847,58 +907,24 @@ def task_resolve_mx(company_id: int, domain: str, force: bool = False) -> dict:
         redis_ok = False
 
     start = _time.perf_counter()
-    got_global = False
-    got_key = False
-    sem_key = MX_SEM.format(mx=dom)  # per-domain key pre-MX to avoid herd
+    lease: Lease | None = None
 
     try:
         # --------------------------
         # Optional throttling (R06)
         # --------------------------
         if redis_ok:
-            # Concurrency caps
-            got_global = try_acquire(redis, GLOBAL_SEM, _cfg.rate.global_max_concurrency)
-            if not got_global:
-                return {
-                    "ok": False,
-                    "error": "global concurrency cap reached",
-                    "company_id": company_id,
-                    "domain": dom,
-                }
-
-            got_key = try_acquire(redis, sem_key, _cfg.rate.per_mx_max_concurrency_default)
-            if not got_key:
-                return {
-                    "ok": False,
-                    "error": "per-MX concurrency cap reached",
-                    "company_id": company_id,
-                    "domain": dom,
-                }
-
-            # RPS smoothing (optional)
-            sec = int(_time.time())
-            key_global_rps = RPS_KEY_GLOBAL.format(sec=sec)
-            key_dom_rps = RPS_KEY_MX.format(mx=dom, sec=sec)
-
-            if _cfg.rate.global_rps and not can_consume_rps(
-                redis, key_global_rps, int(_cfg.rate.global_rps)
-            ):
-                return {
-                    "ok": False,
-                    "error": "global RPS throttle",
-                    "company_id": company_id,
-                    "domain": dom,
-                }
-
-            if _cfg.rate.per_mx_rps_default and not can_consume_rps(
-                redis, key_dom_rps, int(_cfg.rate.per_mx_rps_default)
-            ):
+            # Per-domain key pre-MX to avoid herd
+            throttle = _wait_for_probe_slots(redis, dom)
+            if not throttle.ok:
                 return {
                     "ok": False,
-                    "error": "MX RPS throttle",
+                    "error": throttle.reason,
+                    "retry_after_s": throttle.retry_after_s,
                     "company_id": company_id,
                     "domain": dom,
                 }
+            lease = throttle.lease
 
         # --------------------------
         # Resolve & persist (R15)
@@ -948,10 +974,7 @@ def task_resolve_mx(company_id: int, domain: str, force: bool = False) -> dict:
     finally:
         # Only release if we actually acquired and Redis was usable
         if redis_ok:
-            if got_key:
-                release(redis, sem_key)
-            if got_global:
-                release(redis, GLOBAL_SEM)
+            release_lease(redis, lease)
 
 
 # -------------------------------
@@ -1133,90 +1156,111 @@ def _throttle_error_result(
     }
 
 
+def _wait_for_probe_slots(redis: Redis, mx: str) -> ThrottleResult:
+    """
+    Take global + per-MX concurrency leases and RPS tokens in one atomic call.
+
+    Short waits are absorbed in-process using the limiter's retry-after hint,
+    up to PROBE_THROTTLE_MAX_WAIT_SEC in total; longer ones are returned to the
+    caller (ok=False, retry_after_s set). The first attempt also clears the MX
+    scheduler's in-flight token for the current job.
+    """
+    budget = max(0.0, float(os.getenv("PROBE_THROTTLE_MAX_WAIT_SEC", "5.0")))
+    deadline = time.monotonic() + budget
+    started = False
+    while True:
+        res = acquire_probe_slots(
+            redis,
+            mx,
+            global_limit=_cfg.rate.global_max_concurrency,
+            mx_limit=_cfg.rate.per_mx_max_concurrency_default,
+            global_rps=_cfg.rate.global_rps,
+            mx_rps=_cfg.rate.per_mx_rps_default,
+        )
+        if not started:
+            # A lease (or our own waiting / re-park) now accounts for this job,
+            # so drop the scheduler's in-flight token for it.
+            job = get_current_job()
+            mx_scheduler.mark_started(redis, mx, job.id if job is not None else None)
+            started = True
+        if res.ok:
+            return res
+        remaining = deadline - time.monotonic()
+        if res.retry_after_s > remaining:
+            return res
+        time.sleep(res.retry_after_s)
+
+
+def _defer_current_job(delay_s: float, *, mx_host: str | None = None) -> str | None:
+    """
+    Re-schedule the current RQ job after ``delay_s``.
+
+    Used when a probe is throttled for longer than we are willing to wait
+    in-process, so the email is retried instead of dropped. With the MX
+    scheduler enabled the job is parked in ``mx_host``'s delay queue (and
+    dispatched at that host's rate); otherwise it goes through RQ's enqueue_in.
+    """
+    try:
+        job = get_current_job()
+        if job is None:
+            return None
+        if mx_host and not job.args and mx_scheduler.scheduler_enabled():
+            spec = JobSpec(
+                queue=job.origin,
+                func=job.func_name,
+                kwargs=dict(job.kwargs),
+                meta=dict(job.meta or {}),
+                job_timeout=job.timeout,
+            )
+            return mx_scheduler.park(job.connection, mx_host, spec, delay_s=delay_s)
+        q = Queue(job.origin, connection=job.connection)
+        retry = q.enqueue_in(
+            timedelta(seconds=max(1.0, delay_s)),
+            job.func_name,
+            args=job.args,
+            kwargs=job.kwargs,
+            job_timeout=job.timeout,
+            meta=dict(job.meta or {}),
+        )
+        return retry.id
+    except Exception:
+        log.debug("failed to defer throttled job", exc_info=True)
+        return None
+
+
 def _acquire_throttles(
     *,
     redis_ok: bool,
     redis: Redis | None,
     mx_host: str,
-    mx_key: str,
     dom: str,
     email_id: int,
     email_str: str,
     start: float,
-) -> tuple[bool, bool, dict[str, Any] | None]:
+) -> tuple[Lease | None, dict[str, Any] | None]:
     """
-    Acquire global + per-MX concurrency and RPS slots.
-
+    Acquire global + per-MX concurrency leases and RPS tokens.
 
-
-
-    Returns (got_global, got_mx, error_payload). error_payload is None on success.
+    Returns (lease, error_payload). error_payload is None on success; when
+    throttled it carries the limiter's retry_after_s hint.
     """
-    got_global = False
-    got_mx = False
-
     if not redis_ok or redis is None:
-        return got_global, got_mx, None
-
-    got_global = try_acquire(redis, GLOBAL_SEM, _cfg.rate.global_max_concurrency)
-    if not got_global:
-        err = _throttle_error_result(
-            error="global concurrency cap reached",
-            mx_host=mx_host,
-            dom=dom,
-            email_id=email_id,
-            email_str=email_str,
-            start=start,
-        )
-        return got_global, got_mx, err
-
-    got_mx = try_acquire(redis, mx_key, _cfg.rate.per_mx_max_concurrency_default)
-    if not got_mx:
-        err = _throttle_error_result(
-            error="per-MX concurrency cap reached",
-            mx_host=mx_host,
-            dom=dom,
-            email_id=email_id,
-            email_str=email_str,
-            start=start,
-        )
-        return got_global, got_mx, err
-
-    sec = int(time.time())
-    key_global_rps = RPS_KEY_GLOBAL.format(sec=sec)
-    key_mx_rps = RPS_KEY_MX.format(mx=mx_host, sec=sec)
-
-    if _cfg.rate.global_rps and not can_consume_rps(
-        redis,
-        key_global_rps,
-        int(_cfg.rate.global_rps),
-    ):
-        err = _throttle_error_result(
-            error="global RPS throttle",
-            mx_host=mx_host,
-            dom=dom,
-            email_id=email_id,
-            email_str=email_str,
-            start=start,
-        )
-        return got_global, got_mx, err
+        return None, None
 
-    if _cfg.rate.per_mx_rps_default and not can_consume_rps(
-        redis,
-        key_mx_rps,
-        int(_cfg.rate.per_mx_rps_default),
-    ):
-        err = _throttle_error_result(
-            error="MX RPS throttle",
-            mx_host=mx_host,
-            dom=dom,
-            email_id=email_id,
-            email_str=email_str,
-            start=start,
-        )
-        return got_global, got_mx, err
+    res = _wait_for_probe_slots(redis, mx_host)
+    if res.ok:
+        return res.lease, None
 
-    return got_global, got_mx, None
+    err = _throttle_error_result(
+        error=res.reason or "throttled",
+        mx_host=mx_host,
+        dom=dom,
+        email_id=email_id,
+        email_str=email_str,
+        start=start,
+    )
+    err["retry_after_s"] = res.retry_after_s
+    return None, err
 
 
 def _maybe_run_fallback(email_str: str, category: str) -> tuple[str | None, Any | None]:
@@ -1517,6 +1561,7 @@ def _persist_probe_result_r18(  # noqa: C901
     fallback_status: str | None,
     fallback_raw: Any,
     tcp25_ok: bool | None = None,
+    cache_result: bool = True,
 ) -> tuple[str | None, str | None, str | None, str | None, int | None]:
     """
     R18: Best-effort classification + persistence of a verification attempt.
@@ -1529,6 +1574,8 @@ def _persist_probe_result_r18(  # noqa: C901
       - Skip *active* catch-all probing when tcp25_ok is False to avoid long hangs.
       - Persist email/domain when columns exist.
       - Use src.db.get_conn() for consistency with the rest of the app.
+      - With cache_result, also record the outcome in the global verification
+        cache (src.verify.result_cache) for other tenants/runs.
     """
     dom = (domain or "").strip().lower()
     try:
@@ -1570,6 +1617,15 @@ def _persist_probe_result_r18(  # noqa: C901
         )
 
         verify_status, verify_reason = classify(signals, now=datetime.utcnow())
+        if cache_result:
+            verify_cache.store(
+                email,
+                verify_status=verify_status,
+                verify_reason=verify_reason,
+                mx_host=mx_host,
+                catch_all_status=catch_all_status,
+                verified_at=ts_iso,
+            )
 
         raw_status = cat_norm or "unknown"
         raw_reason = error or None
@@ -1688,6 +1744,67 @@ def _persist_probe_result_r18(  # noqa: C901
     return verify_status, verify_reason, mx_host, ts_iso, verification_result_id
 
 
+def _serve_from_verify_cache(
+    *,
+    email_id: int,
+    email_str: str,
+    dom: str,
+    start: float,
+) -> dict[str, Any] | None:
+    """
+    Answer a probe from the global verification cache, or None on a miss.
+
+    A hit is persisted for this email row (so the current tenant sees it in
+    verification_results) with the original verified_at; no SMTP traffic.
+    """
+    hit = verify_cache.lookup(email_str)
+    if hit is None:
+        return None
+
+    verified_at = hit.verified_at or _utcnow_iso()
+    email_id_val: int | None = int(email_id) if int(email_id or 0) > 0 else None
+    if email_id_val is not None:
+        try:
+            upsert_verification_result(
+                email_id=email_id_val,
+                domain=dom,
+                email=email_str,
+                verify_status=hit.verify_status,
+                reason=hit.verify_reason,
+                mx_host=hit.mx_host,
+                verified_at=verified_at,
+            )
+        except Exception:
+            log.exception(
+                "R18: upsert_verification_result failed (cache hit)",
+                extra={"email_id": email_id, "email": email_str, "domain": dom},
+            )
+        if hit.verify_status == "invalid":
+            _cleanup_invalid_generated_email(email_id_val, hit.verify_status)
+
+    log.info(
+        "R16: probe served from verification cache",
+        extra={"email_id": email_id, "domain": dom, "verify_status": hit.verify_status},
+    )
+    return {
+        "ok": True,
+        "category": "cached",
+        "code": None,
+        "mx_host": hit.mx_host,
+        "domain": dom,
+        "email_id": int(email_id),
+        "email": email_str,
+        "elapsed_ms": int((time.perf_counter() - start) * 1000),
+        "error": None,
+        "cached": True,
+        "verify_status": hit.verify_status,
+        "verify_reason": hit.verify_reason,
+        "verified_mx": hit.mx_host,
+        "verified_at": verified_at,
+        "catch_all_status": hit.catch_all_status,
+    }
+
+
 def _init_redis_for_probe() -> tuple[Redis | None, bool]:
     """
     Initialize Redis connection for probe tasks and indicate availability.
@@ -1999,6 +2116,15 @@ def _task_probe_email_impl(  # noqa: C901
 
     db_path = os.getenv("DATABASE_PATH") or "data/dev.db"
     start = time.perf_counter()
+
+    # Global verification cache first: no MX lookup, preflight or throttles on a hit
+    if not force:
+        cached_payload = _serve_from_verify_cache(
+            email_id=int(email_id), email_str=email_str, dom=dom, start=start
+        )
+        if cached_payload is not None:
+            return cached_payload
+
     mx_host, behavior_hint = _mx_info(dom, force=bool(force), db_path=db_path)
 
     redis_obj, redis_ok = _init_redis_for_probe()
@@ -2051,30 +2177,33 @@ def _task_probe_email_impl(  # noqa: C901
 
         return payload
 
-    mx_key = MX_SEM.format(mx=mx_host)
-    got_global = False
-    got_mx = False
+    lease: Lease | None = None
 
     try:
-        got_global, got_mx, throttle_error = _acquire_throttles(
+        lease, throttle_error = _acquire_throttles(
             redis_ok=redis_ok,
             redis=redis_obj,
             mx_host=mx_host,
-            mx_key=mx_key,
             dom=dom,
             email_id=int(email_id),
             email_str=email_str,
             start=start,
         )
         if throttle_error is not None:
+            throttle_error["deferred_job_id"] = _defer_current_job(
+                float(throttle_error["retry_after_s"]) + random.uniform(0.0, 1.0),
+                mx_host=mx_host,
+            )
             log.info(
-                "R16: throttled, skipping probe (no result persisted)",
+                "R16: throttled, probe deferred (no result persisted)",
                 extra={
                     "email_id": email_id,
                     "email": email_str,
                     "domain": dom,
                     "mx_host": mx_host,
                     "reason": throttle_error.get("error"),
+                    "retry_after_s": throttle_error.get("retry_after_s"),
+                    "deferred_job_id": throttle_error.get("deferred_job_id"),
                 },
             )
             return throttle_error
@@ -2197,6 +2326,7 @@ def _task_probe_email_impl(  # noqa: C901
                 fallback_status=None,
                 fallback_raw=None,
                 tcp25_ok=tcp25_ok,
+                cache_result=False,
             )
             if v_status is not None:
                 payload["verify_status"] = v_status
@@ -2212,16 +2342,7 @@ def _task_probe_email_impl(  # noqa: C901
         return payload
     finally:
         if redis_ok and redis_obj is not None:
-            if got_mx:
-                try:
-                    release(redis_obj, mx_key)
-                except Exception:
-                    pass
-            if got_global:
-                try:
-                    release(redis_obj, GLOBAL_SEM)
-                except Exception:
-                    pass
+            release_lease(redis_obj, lease)
 
 
 @job("verify", timeout=20)
@@ -2263,6 +2384,9 @@ def _has_table(con: Any, name: str) -> bool:
     Check if a table exists in the database.
     Works with both SQLite (via compat layer emulation) and PostgreSQL.
     """
+    snap = cached_schema(con)
+    if snap is not None:
+        return name in snap.tables
     try:
         # The compat layer emulates sqlite_master queries for Postgres
         cur = con.execute("SELECT name FROM sqlite_master WHERE type='table' AND name = ?", (name,))
@@ -2529,6 +2653,36 @@ def _enqueue_r16_probe(email_id: int | None, email: str, domain: str) -> None:
         log.warning("R16 enqueue failed: %s", e, extra={"email": email, "domain": domain})
 
 
+def _domain_pattern_for(con: Any, dom: str) -> tuple[str | None, float, int]:
+    """
+    Domain-level pattern: the cached domain_patterns row, else inferred from
+    known emails (and cached). Returns (pattern, confidence, samples).
+    """
+    cached_pattern = _load_cached_pattern(con, dom)
+    if cached_pattern in CANON_PATTERNS:
+        return cached_pattern, 0.0, 0
+    examples = _examples_for_domain(con, dom)
+    if examples:
+        inf_result = infer_domain_pattern(examples)
+        if inf_result.pattern in CANON_PATTERNS and inf_result.confidence >= 0.5:
+            _save_inferred_pattern(
+                con, dom, inf_result.pattern, inf_result.confidence, inf_result.sample_count
+            )
+            return inf_result.pattern, inf_result.confidence, inf_result.sample_count
+    return None, 0.0, 0
+
+
+def _ranked_candidates(
+    nf: str, nl: str, dom: str, effective_pattern: str | None, max_probes: int
+) -> list[tuple[str, str]]:
+    """Ranked (email, pattern_key) permutations for a person, capped at max_probes."""
+    ranked = generate_candidate_emails_for_person(nf, nl, dom, effective_pattern)
+    if max_probes > 0:
+        ranked = ranked[:max_probes]
+    # Normalize ranked candidates to (email, pattern_key) tuples.
+    return [(a, "unknown") if isinstance(a, str) else a for a in ranked]
+
+
 def task_generate_emails(  # noqa: C901
     person_id: int,
     first: str,
@@ -2608,38 +2762,9 @@ def task_generate_emails(  # noqa: C901
             "person_id": person_id,
         }
 
-    cached_pattern = _load_cached_pattern(con, dom)
-    examples = _examples_for_domain(con, dom)
-
-    domain_pattern: str | None = None
-    inf_conf: float = 0.0
-    inf_samples: int = 0
-
-    if cached_pattern in CANON_PATTERNS:
-        domain_pattern = cached_pattern
-    elif examples:
-        inf_result = infer_domain_pattern(examples)
-        if inf_result.pattern in CANON_PATTERNS and inf_result.confidence >= 0.5:
-            domain_pattern = inf_result.pattern
-            inf_conf = inf_result.confidence
-            inf_samples = inf_result.sample_count
-            _save_inferred_pattern(con, dom, inf_result.pattern, inf_conf, inf_samples)
-
+    domain_pattern, inf_conf, inf_samples = _domain_pattern_for(con, dom)
     effective_pattern = company_pattern or domain_pattern
-
-    ranked_candidates = generate_candidate_emails_for_person(
-        nf,
-        nl,
-        dom,
-        effective_pattern,
-    )
-
-    if max_probes > 0:
-        ranked_candidates = ranked_candidates[:max_probes]
-
-    # Normalize ranked_candidates to (email, pattern_key) tuples.
-    if ranked_candidates and isinstance(ranked_candidates[0], str):
-        ranked_candidates = [(a, "unknown") for a in ranked_candidates]
+    ranked_candidates = _ranked_candidates(nf, nl, dom, effective_pattern, max_probes)
 
     # ----- SEQUENTIAL VERIFICATION MODE -----
     if sequential_mode:
@@ -3036,10 +3161,6 @@ def _generate_emails_sequential(  # noqa: C901
     """
     db_path = os.getenv("DATABASE_PATH") or "data/dev.db"
 
-    _cleanup_env2 = os.getenv("CLEANUP_INVALID_GENERATED", "1").strip().lower()
-    cleanup_enabled = _cleanup_env2 in ("1", "true", "yes")
-    catch_all_status: str | None = None
-
     # Get MX info once for the domain
     mx_host, behavior_hint = _mx_info(domain, force=False, db_path=db_path)
     if not mx_host:
@@ -3059,6 +3180,79 @@ def _generate_emails_sequential(  # noqa: C901
             "person_id": person_id,
         }
 
+    # One SMTP connection per person: the catch-all probe, every permutation
+    # and the sanity re-probe all share it (holding a single per-MX slot).
+    with _open_smtp_session(mx_host) as session:
+        return _generate_emails_sequential_on_session(
+            con=con,
+            session=session,
+            db_path=db_path,
+            person_id=person_id,
+            domain=domain,
+            mx_host=mx_host,
+            ranked_candidates=ranked_candidates,
+            effective_pattern=effective_pattern,
+            max_probes=max_probes,
+            inf_conf=inf_conf,
+            inf_samples=inf_samples,
+            company_id=company_id,
+        )
+
+
+def _open_smtp_session(mx_host: str) -> SmtpSession:
+    """
+    Build an SmtpSession for mx_host that honours the per-MX concurrency cap.
+
+    When Redis is available the session holds one per-MX lease (per_mx_slot)
+    while connected, in the same lease set task_probe_email uses per probe,
+    and renews it between RCPTs (at a third of the lease TTL) so sessions that
+    outlive RATE_LEASE_TTL_SEC keep counting against the cap.
+    """
+    redis_obj, redis_ok = _init_redis_for_probe()
+    slot = None
+    renew = None
+    if redis_ok and redis_obj is not None:
+        slot = functools.partial(
+            per_mx_slot,
+            mx_host,
+            redis=redis_obj,
+            max_concurrency=_cfg.rate.per_mx_max_concurrency_default,
+        )
+
+        def renew(lease: Lease | None) -> bool:
+            return lease is None or renew_lease(redis_obj, lease)
+
+    return SmtpSession(
+        mx_host,
+        helo_domain=SMTP_HELO_DOMAIN,
+        mail_from=SMTP_MAIL_FROM,
+        connect_timeout=float(SMTP_CONNECT_TIMEOUT),
+        command_timeout=float(SMTP_COMMAND_TIMEOUT),
+        slot=slot,
+        renew_slot=renew,
+        renew_every_s=SEM_TTL / 3.0,
+    )
+
+
+def _generate_emails_sequential_on_session(  # noqa: C901
+    *,
+    con: Any,
+    session: SmtpSession,
+    db_path: str,
+    person_id: int,
+    domain: str,
+    mx_host: str,
+    ranked_candidates: list,
+    effective_pattern: str | None,
+    max_probes: int,
+    inf_conf: float,
+    inf_samples: int,
+    company_id: int | None = None,
+) -> dict:
+    """Body of _generate_emails_sequential once the MX and SMTP session are known."""
+    _cleanup_env2 = os.getenv("CLEANUP_INVALID_GENERATED", "1").strip().lower()
+    cleanup_enabled = _cleanup_env2 in ("1", "true", "yes")
+
     # Get catch-all status for the domain.
     # Prefer the pre-resolved status passed via job meta from
     # task_generate_company_emails — this ensures all people on the
@@ -3083,7 +3277,7 @@ def _generate_emails_sequential(  # noqa: C901
             pre = _smtp_tcp25_preflight_mx(mx_host, timeout_s=3.0, redis=None)
             if bool(pre.get("ok")):
                 _ensure_domain_resolution_row_for_domain(domain, tenant_id=tenant_id)
-                ca_result = check_catchall_for_domain(domain)
+                ca_result = check_catchall_for_domain(domain, session=session)
                 ca_status = (ca_result.status or "").strip().lower()
                 if ca_status in {"catch_all", "not_catch_all"}:
                     catch_all_status = ca_status
@@ -3139,6 +3333,7 @@ def _generate_emails_sequential(  # noqa: C901
             mx_host=mx_host,
             catch_all_status=catch_all_status,
             max_retries=3,
+            session=session,
         )
 
         attempt_result["pattern"] = pattern_key
@@ -3212,6 +3407,7 @@ def _generate_emails_sequential(  # noqa: C901
                         mx_host=mx_host,
                         catch_all_status=None,  # Don't use cached status for sanity check
                         max_retries=1,
+                        session=session,
                     )
                     sanity_code = sanity_result.get("code")
 
@@ -3493,16 +3689,188 @@ def _generate_emails_sequential(  # noqa: C901
     }
 
 
+# ---------------------------------------------
+# Company-level verification coordinator
+# ---------------------------------------------
+#
+# Per-person task_generate_emails jobs each walk their own ranked
+# permutations, so a pattern confirmed for person #1 does not help #2..#N
+# until a later job reads domain_patterns. task_generate_company_people_emails
+# verifies a company's people in one job on one SMTP session instead:
+#   - full ranked permutations until someone's address is confirmed valid
+#   - the confirmed pattern is locked (and cached in domain_patterns)
+#   - everyone after that gets a single RCPT for the locked pattern, with
+#     full permutations only for people whose pattern address misses
+
+
+def _pattern_of_email(nf: str, nl: str, email: str) -> str | None:
+    """Canonical pattern key that renders email's local-part for (nf, nl), if any."""
+    local = (email or "").split("@", 1)[0].lower()
+    for key in PATTERN_PRIORITY:
+        if build_localpart(key, nf, nl) == local:
+            return key
+    return None
+
+
+def task_generate_company_people_emails(  # noqa: C901
+    *,
+    company_id: int,
+    domain: str,
+    people: Sequence[Sequence[Any]],
+) -> dict:
+    """
+    Generate + verify emails for all of a company's people, sharing the
+    confirmed pattern between them. ``people`` is a list of
+    (person_id, first, last). Returns per-person results and probe totals.
+    """
+    con = get_conn()
+    dom = (domain or "").lower().strip()
+    db_path = os.getenv("DATABASE_PATH") or "data/dev.db"
+    try:
+        max_probes = max(0, int(os.getenv("MAX_PROBES_PER_PERSON", "6")))
+    except Exception:
+        max_probes = 6
+
+    out: dict[str, Any] = {
+        "company_id": company_id,
+        "domain": dom,
+        "people": len(people),
+        "locked_pattern": None,
+        "total_probes": 0,
+        "pattern_hits": 0,
+        "fallbacks": 0,
+        "results": [],
+    }
+    try:
+        mx_host = _mx_info(dom, force=False, db_path=db_path)[0] if dom else None
+        if not mx_host:
+            out["status"] = "no_mx"
+            return out
+
+        company_pattern = _load_company_email_pattern(con, company_id)
+        domain_pattern, inf_conf, inf_samples = _domain_pattern_for(con, dom)
+        effective_pattern = company_pattern or domain_pattern
+        locked: str | None = None
+
+        def _run(person_id: int, ranked: list, pattern: str | None, cap: int) -> dict:
+            res = _generate_emails_sequential_on_session(
+                con=con,
+                session=session,
+                db_path=db_path,
+                person_id=person_id,
+                domain=dom,
+                mx_host=mx_host,
+                ranked_candidates=ranked,
+                effective_pattern=pattern,
+                max_probes=cap,
+                inf_conf=inf_conf,
+                inf_samples=inf_samples,
+                company_id=company_id,
+            )
+            out["total_probes"] += int(res.get("verified") or 0)
+            return res
+
+        # One session (and one MX slot) serves every person; the session renews
+        # its lease before each probe and re-acquires it if it lapsed between people.
+        with _open_smtp_session(mx_host) as session:
+            for row in people:
+                person_id, first, last = int(row[0]), str(row[1] or ""), str(row[2] or "")
+                # One person's failure (DB, SMTP protocol, odd name) must not cost the
+                # rest of the company their probes, as it didn't with per-person jobs.
+                try:
+                    nf, nl = normalize_split_parts(first, last)
+                    if not (nf or nl):
+                        out["results"].append({"person_id": person_id, "status": "skipped"})
+                        continue
+
+                    res: dict | None = None
+                    tried: set[str] = set()
+                    local = build_localpart(locked, nf, nl) if locked else None
+                    if local:
+                        email_addr = f"{local}@{dom}"
+                        tried.add(email_addr)
+                        res = _run(person_id, [(email_addr, locked)], locked, 1)
+                        if res.get("status") in ("valid_found", "risky_found"):
+                            out["pattern_hits"] += 1
+                        else:
+                            out["fallbacks"] += 1
+                            res = None
+
+                    if res is None:
+                        ranked = [
+                            c
+                            for c in _ranked_candidates(nf, nl, dom, effective_pattern, max_probes)
+                            if c[0] not in tried
+                        ]
+                        res = _run(person_id, ranked, effective_pattern, max_probes)
+
+                    if locked is None and res.get("status") == "valid_found":
+                        locked = _pattern_of_email(nf, nl, str(res.get("valid_email") or ""))
+                        if locked:
+                            out["locked_pattern"] = locked
+                            effective_pattern = company_pattern or locked
+                            _save_inferred_pattern(con, dom, locked, 1.0, 1)
+                            try:
+                                con.commit()
+                            except Exception:
+                                pass
+                            log.info(
+                                "R12 coordinator: pattern locked",
+                                extra={"company_id": company_id, "domain": dom, "pattern": locked},
+                            )
+
+                    out["results"].append(
+                        {
+                            "person_id": person_id,
+                            "status": res.get("status"),
+                            "valid_email": res.get("valid_email"),
+                            "probes": int(res.get("verified") or 0),
+                        }
+                    )
+                except Exception as exc:
+                    log.exception(
+                        "R12 coordinator: person failed",
+                        extra={"company_id": company_id, "person_id": person_id},
+                    )
+                    out["results"].append(
+                        {"person_id": person_id, "status": "error", "error": type(exc).__name__}
+                    )
+                    try:
+                        con.rollback()
+                    except Exception:
+                        pass
+                    smtp_errors = (smtplib.SMTPException, OSError, TemporarySMTPError)
+                    if session is not None and isinstance(exc, (*smtp_errors, PermanentSMTPError)):
+                        # Start the next person on a fresh connection.
+                        session.close()
+
+        out["status"] = "ok"
+        log.info(
+            "R12 coordinator complete",
+            extra={k: v for k, v in out.items() if k != "results"},
+        )
+        return out
+    finally:
+        try:
+            con.close()
+        except Exception:
+            pass
+
+
 def _verify_permutation_with_retry(
     email_addr: str,
     mx_host: str,
     catch_all_status: str | None,
     max_retries: int = 3,
     retry_delay_base: float = 1.0,
+    session: SmtpSession | None = None,
 ) -> dict:
     """
     Verify a single email permutation with retry logic for temp_fail.
 
+    With ``session``, probes go over that open SMTP connection (retries
+    included) instead of a fresh probe_rcpt() handshake per attempt.
+
 
 
 
@@ -3527,16 +3895,19 @@ def _verify_permutation_with_retry(
         result["retries"] = attempt + 1
 
         try:
-            # Use the core probe function
-            probe_result = probe_rcpt(
-                email_addr,
-                mx_host,
-                helo_domain=SMTP_HELO_DOMAIN,
-                mail_from=SMTP_MAIL_FROM,
-                connect_timeout=float(SMTP_CONNECT_TIMEOUT),
-                command_timeout=float(SMTP_COMMAND_TIMEOUT),
-                behavior_hint=None,
-            )
+            # Use the shared session when given, else the core probe function
+            if session is not None:
+                probe_result = session.rcpt(email_addr)
+            else:
+                probe_result = probe_rcpt(
+                    email_addr,
+                    mx_host,
+                    helo_domain=SMTP_HELO_DOMAIN,
+                    mail_from=SMTP_MAIL_FROM,
+                    connect_timeout=float(SMTP_CONNECT_TIMEOUT),
+                    command_timeout=float(SMTP_COMMAND_TIMEOUT),
+                    behavior_hint=None,
+                )
 
             code = probe_result.get("code")
             error = probe_result.get("error")
@@ -3633,6 +4004,9 @@ def _classify_probe_for_sequential(
 
 
 def _sources_has_company_id(con: Any) -> bool:
+    snap = cached_schema(con)
+    if snap is not None:
+        return "company_id" in snap.column_names("sources")
     try:
         rows = con.execute("PRAGMA table_info(sources)").fetchall()
     except Exception:
@@ -3734,7 +4108,11 @@ def crawl_company_site(company_id: int) -> dict:
         }
 
 
-def autodiscover_company(company_id: int) -> dict:  # noqa: C901
+def autodiscover_company(  # noqa: C901
+    company_id: int,
+    *,
+    crawled: tuple[list[Any], AutodiscoveryResult] | None = None,
+) -> dict:
     """
     Auto-discover a company in one pass:
       - crawl domain (robots-aware; records robots blocks into result if enabled in runner)
@@ -3743,13 +4121,16 @@ def autodiscover_company(company_id: int) -> dict:  # noqa: C901
       - store AutodiscoveryResult in RQ job meta (if running under RQ)
       - return result.to_dict() for queue propagation
 
+    `crawled` is (pages, result) from a batch crawl (see autodiscover_companies);
+    when given, the crawl step is skipped and the rest of the pass runs as usual.
+
 
 
 
     Task E: Full metrics tracking with AutodiscoveryResult.
     """
     con = _conn()
-    result_obj = AutodiscoveryResult(company_id=company_id)
+    result_obj = crawled[1] if crawled is not None else AutodiscoveryResult(company_id=company_id)
 
     job = get_current_job()
     meta = job.meta if job is not None else {}
@@ -3802,6 +4183,8 @@ def autodiscover_company(company_id: int) -> dict:  # noqa: C901
 
         # IMPORTANT: prefer pipeline-provided domain when present.
         dom_meta = (meta.get("domain") or meta.get("company_domain") or "").strip().lower()
+        if crawled is not None:
+            dom_meta = (crawled[1].domain or "").strip().lower()
         dom = dom_meta or (dom_db or "").strip().lower() or (fallback_domain or "").strip().lower()
 
         if not dom:
@@ -3817,18 +4200,18 @@ def autodiscover_company(company_id: int) -> dict:  # noqa: C901
         if "ai_enabled" in meta:
             ai_enabled = _truthy(meta.get("ai_enabled"), default=ai_enabled)
 
-        force_discovery = _truthy(
-            meta.get("force_discovery") or meta.get("force") or meta.get("force_crawl"),
-            default=False,
-        )
+        force_discovery = _force_discovery_from_meta(meta)
 
         result_obj.ai_enabled = bool(ai_enabled)
 
         # Crawl (best-effort force flag).
-        try:
-            pages = crawl_domain(dom, result=result_obj, force=force_discovery)
-        except TypeError:
-            pages = crawl_domain(dom, result=result_obj)
+        if crawled is not None:
+            pages = crawled[0]
+        else:
+            try:
+                pages = crawl_domain(dom, result=result_obj, force=force_discovery)
+            except TypeError:
+                pages = crawl_domain(dom, result=result_obj)
 
         result_obj.pages_fetched = len(pages)
 
@@ -3889,6 +4272,78 @@ def autodiscover_company(company_id: int) -> dict:  # noqa: C901
             pass
 
 
+def _force_discovery_from_meta(meta: dict[str, Any]) -> bool:
+    """Forced re-discovery flag as set by the pipeline (force_discovery / force / force_crawl)."""
+    v = meta.get("force_discovery") or meta.get("force") or meta.get("force_crawl")
+    if isinstance(v, str):
+        return v.strip().lower() in {"1", "true", "t", "yes", "y", "on"}
+    return bool(v)
+
+
+def autodiscover_companies(
+    company_ids: Sequence[int],
+    *,
+    concurrency: int | None = None,
+    force: bool | Sequence[bool] | None = None,
+) -> list[dict]:
+    """
+    Batch form of autodiscover_company for many companies in one worker job.
+
+    All domains are crawled together via crawl_domains() (one event loop, many
+    crawls in flight); persistence and extraction then run per company exactly
+    as autodiscover_company does. Returns one result dict per company id, in order.
+
+    `force` is one flag for the whole batch or one per company id; the job meta
+    force flags autodiscover_company honours apply to every company as well.
+    """
+    job = get_current_job()
+    meta_force = _force_discovery_from_meta(job.meta if job is not None else {})
+    if force is None or isinstance(force, bool):
+        forced = [meta_force or bool(force)] * len(company_ids)
+    else:
+        forced = [meta_force or bool(f) for f in force]
+        if len(forced) != len(company_ids):
+            raise ValueError("force must have one flag per company id")
+
+    con = _conn()
+    domains: list[str] = []
+    results: list[AutodiscoveryResult] = []
+    try:
+        for cid in company_ids:
+            result_obj = AutodiscoveryResult(company_id=int(cid))
+            company = _load_company_name_and_domain(con, int(cid))
+            if company is not None:
+                _name, dom_db, fallback_domain = company
+                result_obj.domain = (dom_db or "").strip().lower() or (
+                    fallback_domain or ""
+                ).strip().lower()
+            domains.append(result_obj.domain or "")
+            results.append(result_obj)
+    finally:
+        try:
+            con.close()
+        except Exception:
+            pass
+
+    crawl_idx = [i for i, d in enumerate(domains) if d]
+    crawled_pages = crawl_domains(
+        [domains[i] for i in crawl_idx],
+        concurrency=concurrency,
+        results=[results[i] for i in crawl_idx],
+        force=[forced[i] for i in crawl_idx],
+    )
+    pages_by_idx = dict(zip(crawl_idx, crawled_pages, strict=True))
+
+    out: list[dict] = []
+    for i, cid in enumerate(company_ids):
+        if i in pages_by_idx:
+            out.append(autodiscover_company(int(cid), crawled=(pages_by_idx[i], results[i])))
+        else:
+            # Missing company / no domain: let the single-company path report the error.
+            out.append(autodiscover_company(int(cid)))
+    return out
+
+
 def _get_company_attrs(con: Any, company_id: int) -> dict[str, Any]:
     """
     Best-effort loader for companies.attrs (JSON); returns {} on any error.
@@ -4038,24 +4493,31 @@ def _load_company_name_and_domain(con: Any, company_id: int) -> tuple[str, str,
     return company_name, dom, fallback
 
 
-def _load_company_sources(con: Any, company_id: int, dom: str) -> list[tuple[str, bytes | str]]:
+def _load_company_sources(
+    con: Any, company_id: int, dom: str
+) -> list[tuple[str, bytes | str | StoredBlob]]:
     """
     Load (source_url, html) rows from sources, scoping by company_id if supported,
     otherwise filtering by domain match against source_url host.
+
+    Pages kept in the page store come back as compressed StoredBlobs and are
+    only decompressed when the extractor reaches them (page_store.as_html).
     """
-    pages_rows: list[tuple[str, bytes | str]] = []
+    pages_rows: list[tuple[str, bytes | str | StoredBlob]] = []
+    html_cols, html_join = page_store.html_select(con, "s")
 
     has_company_id = _sources_has_company_id(con)
     if has_company_id:
         cur_src = con.execute(
-            "SELECT source_url, html FROM sources WHERE company_id = ?", (company_id,)
+            f"SELECT s.source_url, {html_cols} FROM sources AS s{html_join} WHERE s.company_id = ?",
+            (company_id,),
         )
-        return [(r[0], r[1]) for r in cur_src.fetchall()]
+        return [(r[0], page_store.row_html(r[1], r[2], r[3], r[4])) for r in cur_src.fetchall()]
 
-    cur_src = con.execute("SELECT source_url, html FROM sources")
+    cur_src = con.execute(f"SELECT s.source_url, {html_cols} FROM sources AS s{html_join}")
     raw_rows = cur_src.fetchall()
     if not dom:
-        return [(r[0], r[1]) for r in raw_rows]
+        return [(r[0], page_store.row_html(r[1], r[2], r[3], r[4])) for r in raw_rows]
 
     for r in raw_rows:
         src_url = (r[0] or "").strip()
@@ -4063,13 +4525,13 @@ def _load_company_sources(con: Any, company_id: int, dom: str) -> list[tuple[str
         if not host:
             continue
         if host == dom or host.endswith("." + dom):
-            pages_rows.append((src_url, r[1]))
+            pages_rows.append((src_url, page_store.row_html(r[1], r[2], r[3], r[4])))
 
     return pages_rows
 
 
 def _extract_raw_candidates_from_pages(
-    pages_rows: list[tuple[str, bytes | str]],
+    pages_rows: list[tuple[str, bytes | str | StoredBlob]],
     dom: str,
 ) -> list[ExtractCandidate]:
     """
@@ -4090,13 +4552,13 @@ def _extract_raw_candidates_from_pages(
     raw_candidates: list[ExtractCandidate] = []
 
     for src_url, html_raw in pages_rows:
-        if isinstance(html_raw, bytes):
-            try:
-                html_str = html_raw.decode("utf-8", "ignore")
-            except Exception:
-                continue
-        else:
-            html_str = str(html_raw or "")
+        # One ParsedPage per page: the DOM is parsed once and shared by the
+        # candidate, people-cards and classifier passes.
+        try:
+            page = ParsedPage(page_store.as_html(html_raw), url=src_url)
+        except Exception:
+            continue
+        html_str = page.html
 
         # Page classifier gate: skip extraction on pages unlikely to have employees.
         if classify_page_type is not None:
@@ -4115,7 +4577,7 @@ def _extract_raw_candidates_from_pages(
                 pass
 
         try:
-            cands = extract_html_candidates(html_str, source_url=src_url, company_domain=dom)
+            cands = extract_html_candidates(page, source_url=src_url, company_domain=dom)
             raw_candidates.extend(cands)
         except Exception:
             log.debug("extract_candidates failed for %s", src_url, exc_info=True)
@@ -4636,6 +5098,76 @@ def _empty_extract_result(
     }
 
 
+def _partition_cached_pages(
+    con: Any,
+    pages_rows: list[tuple[str, bytes | str | StoredBlob]],
+    cache_version: str,
+    cache_scope: str,
+) -> tuple[
+    dict[str, str],
+    dict[str, extraction_cache.PageCandidates],
+    list[tuple[str, bytes | str | StoredBlob]],
+]:
+    """
+    Split company pages into cache hits and pages that still need extraction.
+
+    Returns (hash_by_url, cached_by_url, fresh_rows). Page-store rows are
+    hashed without decompressing them.
+    """
+    hash_by_url: dict[str, str] = {}
+    for src_url, html_raw in pages_rows:
+        sha = page_store.content_sha256(html_raw)
+        if src_url and sha:
+            hash_by_url[src_url] = sha
+
+    cached_by_url = extraction_cache.load_many(con, hash_by_url, cache_version, scope=cache_scope)
+    fresh_rows = [(u, h) for u, h in pages_rows if u not in cached_by_url]
+    return hash_by_url, cached_by_url, fresh_rows
+
+
+def _store_fresh_page_extractions(
+    con: Any,
+    *,
+    cache_version: str,
+    cache_scope: str,
+    hash_by_url: dict[str, str],
+    fresh_rows: list[tuple[str, bytes | str | StoredBlob]],
+    role_candidates: list[ExtractCandidate],
+    refined_people: list[ExtractCandidate],
+) -> None:
+    """
+    Cache this run's final candidates per freshly extracted page (including
+    pages that yielded nothing). If any candidate cannot be traced back to one
+    of the fresh pages by its source_url, nothing is cached: guessing a page
+    would hand that candidate to whichever company later reuses it.
+    """
+    fresh_urls = [u for u, _ in fresh_rows if u in hash_by_url]
+    if not fresh_urls:
+        return
+    pages = {u: extraction_cache.PageCandidates() for u in fresh_urls}
+
+    for kind, cands in (("role", role_candidates), ("people", refined_people)):
+        for cand in cands:
+            page = pages.get((getattr(cand, "source_url", None) or "").strip())
+            if page is None:
+                log.debug(
+                    "extraction cache: candidate without a fresh source page; not caching",
+                    extra={"source_url": getattr(cand, "source_url", None)},
+                )
+                return
+            getattr(page, kind).append(cand)
+
+    try:
+        extraction_cache.store_many(
+            con,
+            ((hash_by_url[u], p) for u, p in pages.items()),
+            cache_version,
+            scope=cache_scope,
+        )
+    except Exception:
+        log.debug("extraction cache write failed", exc_info=True)
+
+
 def extract_candidates_for_company(  # noqa: C901
     company_id: int, result: AutodiscoveryResult | None = None
 ) -> dict:
@@ -4739,9 +5271,23 @@ def extract_candidates_for_company(  # noqa: C901
         if not pages_rows:
             return _empty_extract_result(company_id=company_id, company_name=company_name, dom=dom)
 
-        raw_candidates = _extract_raw_candidates_from_pages(pages_rows, dom)
-        if not raw_candidates:
-            return _empty_extract_result(company_id=company_id, company_name=company_name, dom=dom)
+        # Incremental re-extraction: pages whose content was already extracted
+        # under this extractor version (and AI mode) reuse their cached
+        # candidates; only new/changed pages go through HTML extraction + AI.
+        cache_version = extraction_cache.extractor_version(
+            "ai" if ai_allowed_for_company else "html"
+        )
+        # Results depend on the company (domain filters; name in the AI prompt)
+        cache_scope = extraction_cache.extraction_scope(
+            dom, company_name if ai_allowed_for_company else None
+        )
+        hash_by_url, cached_by_url, fresh_rows = _partition_cached_pages(
+            con, pages_rows, cache_version, cache_scope
+        )
+        cached_role = [c for p in cached_by_url.values() for c in p.role]
+        cached_people = [c for p in cached_by_url.values() for c in p.people]
+
+        raw_candidates = _extract_raw_candidates_from_pages(fresh_rows, dom) if fresh_rows else []
 
         role_candidates, personish_candidates = _split_role_and_personish_candidates(raw_candidates)
 
@@ -4750,13 +5296,6 @@ def extract_candidates_for_company(  # noqa: C901
             personish_candidates, label="personish"
         )
 
-        if ai_strict:
-            # In strict AI-only mode, do not permit role/placeholder candidates through.
-            role_candidates = []
-
-        if not role_candidates and not personish_candidates:
-            return _empty_extract_result(company_id=company_id, company_name=company_name, dom=dom)
-
         refined_people, ai_attempted = _maybe_refine_people_with_ai(
             company_name=company_name,
             dom=dom,
@@ -4767,10 +5306,29 @@ def extract_candidates_for_company(  # noqa: C901
             result=result,
         )
 
-        candidates_by_email = _merge_candidates_by_email(refined_people, role_candidates)
+        # A failed strict-mode AI call returns no people; do not cache that as
+        # the pages' answer so they are retried next run.
+        if not ai_allowed_for_company or ai_attempted or not personish_candidates:
+            _store_fresh_page_extractions(
+                con,
+                cache_version=cache_version,
+                cache_scope=cache_scope,
+                hash_by_url=hash_by_url,
+                fresh_rows=fresh_rows,
+                role_candidates=role_candidates,
+                refined_people=refined_people,
+            )
+
+        if ai_strict:
+            # In strict AI-only mode, do not permit role/placeholder candidates through.
+            role_candidates = []
+            cached_role = []
+
+        all_people = refined_people + cached_people
+        candidates_by_email = _merge_candidates_by_email(all_people, role_candidates + cached_role)
 
         candidates_no_email: list[ExtractCandidate] = []
-        for cand in refined_people:
+        for cand in all_people:
             email_val = getattr(cand, "email", None)
             if email_val is None or not str(email_val).strip():
                 candidates_no_email.append(cand)
@@ -4778,7 +5336,7 @@ def extract_candidates_for_company(  # noqa: C901
         if not candidates_by_email and not candidates_no_email:
             if ai_allowed_for_company and ai_attempted:
                 _mark_ai_people_extracted(con, company_id)
-                con.commit()
+            con.commit()
             return _empty_extract_result(company_id=company_id, company_name=company_name, dom=dom)
 
         inserted_people, updated_people, inserted_emails, updated_emails = (
@@ -4819,6 +5377,8 @@ def extract_candidates_for_company(  # noqa: C901
             "emails_total": emails_total,
             "blocked_candidates_role": int(blocked_role),
             "blocked_candidates_personish": int(blocked_personish),
+            "pages_extracted": len(fresh_rows),
+            "pages_reused": len(cached_by_url),
         }
     except Exception as exc:
         log.exception(
@@ -4973,10 +5533,13 @@ def _table_cols(con: Any, table: str) -> set[str]:
     """
     Best-effort column discovery.
 
-    Primary path: Postgres information_schema (prod).
+    Primary path: Postgres schema registry (src.db), then information_schema (prod).
     Dev fallback: SQLite PRAGMA (if compat/dev uses SQLite).
     """
     # Postgres
+    snap = cached_schema(con)
+    if snap is not None:
+        return set(snap.column_names(table))
     try:
         cur = con.execute(
             """
@@ -5229,6 +5792,7 @@ def handle_task(envelope: Any) -> Any:
 
     task_map: dict[str, Any] = {
         "resolve_company_domain": resolve_company_domain,
+        "resolve_company_domains": resolve_company_domains,
         "verify_email": verify_email_task,
         "verify_email_task": verify_email_task,
         "task_resolve_mx": base_task_resolve_mx,
@@ -5241,11 +5805,13 @@ def handle_task(envelope: Any) -> Any:
         "send_test_email": task_send_test_email,
         "task_generate_emails": task_generate_emails,
         "generate_emails": task_generate_emails,
+        "task_generate_company_people_emails": task_generate_company_people_emails,
         "upsert_person_task": upsert_person_task,
         "crawl_approved_domains": crawl_approved_domains,
         "crawl_company_site": crawl_company_site,
         "extract_candidates_for_company": extract_candidates_for_company,
         "autodiscover_company": autodiscover_company,
+        "autodiscover_companies": autodiscover_companies,
     }
 
     func = task_map.get(task_name)
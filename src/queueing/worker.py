@@ -12,6 +12,7 @@ from rq import Worker as RQWorker
 from src.config import load_settings
 from src.queueing import tasks as _tasks  # noqa: F401  (ensure task module is imported)
 from src.queueing.dlq import push_to_dlq
+from src.queueing.mx_scheduler import start_dispatcher
 from src.queueing.redis_conn import get_redis
 
 log = logging.getLogger(__name__)
@@ -133,6 +134,10 @@ def run():
         except Exception:
             pass
 
+    # Release probe jobs parked per MX host (see src/queueing/mx_scheduler.py)
+    if start_dispatcher(r) is not None:
+        log.info("MX scheduler dispatcher started")
+
     # Only the forking Worker supports with_scheduler
     if worker_cls is RQWorker:
         w.work(with_scheduler=True)
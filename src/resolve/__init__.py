@@ -9,6 +9,7 @@ from .domain import (
     decide,
     normalize_hint,
     resolve,
+    resolve_many,
 )
 
 # R15 — MX resolver re-exports
@@ -25,7 +26,7 @@ R15:
 
 Public re-exports:
   - Domain resolver symbols (R08): RESOLVER_VERSION, Candidate, Decision,
-    candidates_from_name, decide, normalize_hint, resolve
+    candidates_from_name, decide, normalize_hint, resolve, resolve_many
   - MX resolver symbols (R15): resolve_mx, norm_domain
 """
 
@@ -38,6 +39,7 @@ __all__ = [
     "candidates_from_name",
     "decide",
     "resolve",
+    "resolve_many",
     # R15
     "resolve_mx",
     "norm_domain",
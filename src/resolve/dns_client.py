@@ -0,0 +1,454 @@
+# src/resolve/dns_client.py
+"""
+Shared DNS client: one configured resolver, a process-wide TTL cache and a
+parallel batch API.
+
+The domain resolver (_dns_any), the MX resolver (_mx_lookup_with_dnspython,
+_a_or_aaaa_exists) and the SMTP connector (_resolve_mx_ips) all go through
+this module instead of building their own dns.resolver.Resolver, so answers
+are shared and nobody re-asks a question whose answer is still within its TTL.
+
+  - query(name, rdtype) answers one question (cache first).
+  - resolve_batch([(name, rdtype), ...]) answers many at once: cached answers
+    are returned directly, the rest are issued concurrently on
+    dns.asyncresolver (at most DNS_BATCH_CONCURRENCY in flight), so a host's
+    MX/A/AAAA cost one round-trip time instead of three — and one timeout
+    instead of three when the name server is slow.
+  - has_any_record(host), has_address(host), host_addresses(host) are the
+    helpers the callers above need.
+
+Caching:
+  - Positive answers live for the record TTL, clamped to
+    [DNS_CACHE_MIN_TTL_SEC, DNS_CACHE_MAX_TTL_SEC].
+  - NXDOMAIN / NoAnswer are cached for DNS_NEGATIVE_TTL_SEC.
+  - Timeouts and server failures are not cached.
+
+Metrics: stats() returns cache hits/misses, negative hits, network queries,
+timeouts, errors and mean query latency for this process.
+
+Env:
+  DNS_NAMESERVERS         CSV of upstream resolvers (default: system config)
+  DNS_TIMEOUT_SEC         per-server attempt timeout (default 2.0)
+  DNS_LIFETIME_SEC        total time budget per question (default 4.0)
+  DNS_CACHE_ENABLED       "0" disables the cache (default on)
+  DNS_CACHE_MAX_ENTRIES   LRU bound (default 10000)
+  DNS_CACHE_MIN_TTL_SEC   default 30
+  DNS_CACHE_MAX_TTL_SEC   default 86400
+  DNS_NEGATIVE_TTL_SEC    default 300
+  DNS_BATCH_CONCURRENCY   in-flight queries per batch (default 64)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import dataclasses
+import ipaddress
+import os
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Coroutine, Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any
+
+import dns.asyncresolver
+import dns.exception
+import dns.resolver
+
+DNS_NAMESERVERS = [s.strip() for s in (os.getenv("DNS_NAMESERVERS") or "").split(",") if s.strip()]
+DNS_TIMEOUT_SEC = float(os.getenv("DNS_TIMEOUT_SEC", "2.0"))
+DNS_LIFETIME_SEC = float(os.getenv("DNS_LIFETIME_SEC", "4.0"))
+DNS_CACHE_ENABLED = os.getenv("DNS_CACHE_ENABLED", "1").strip().lower() not in {"0", "false", "no"}
+DNS_CACHE_MAX_ENTRIES = int(os.getenv("DNS_CACHE_MAX_ENTRIES", "10000"))
+DNS_CACHE_MIN_TTL_SEC = int(os.getenv("DNS_CACHE_MIN_TTL_SEC", "30"))
+DNS_CACHE_MAX_TTL_SEC = int(os.getenv("DNS_CACHE_MAX_TTL_SEC", "86400"))
+DNS_NEGATIVE_TTL_SEC = int(os.getenv("DNS_NEGATIVE_TTL_SEC", "300"))
+DNS_BATCH_CONCURRENCY = int(os.getenv("DNS_BATCH_CONCURRENCY", "64"))
+
+# Answer statuses; only "ok", "nxdomain" and "noanswer" are cached
+_CACHEABLE = frozenset({"ok", "nxdomain", "noanswer"})
+
+
+@dataclass(frozen=True)
+class DNSAnswer:
+    """
+    Outcome of one (name, rdtype) question.
+
+    records: MX → ((preference, exchange), ...) with exchange "." kept for
+    Null MX and trailing dots stripped otherwise; A/AAAA → address strings;
+    other types → rdata text.
+    """
+
+    name: str
+    rdtype: str
+    status: str  # "ok" | "nxdomain" | "noanswer" | "timeout" | "error"
+    records: tuple[Any, ...] = ()
+    expires_at: float = 0.0
+    error: str | None = None  # exception class name for non-"ok" answers
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok" and bool(self.records)
+
+    @property
+    def ttl(self) -> int:
+        return max(0, int(self.expires_at - time.time()))
+
+
+# --------------------------------------------------------------------------------------
+# Stats
+# --------------------------------------------------------------------------------------
+
+
+@dataclass
+class DNSStats:
+    cache_hits: int = 0
+    cache_misses: int = 0
+    negative_hits: int = 0  # cache hits on NXDOMAIN / NoAnswer
+    queries: int = 0  # questions sent upstream
+    nxdomain: int = 0
+    noanswer: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    latency_ms_total: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = dataclasses.asdict(self)
+        lookups = self.cache_hits + self.cache_misses
+        out["hit_ratio"] = (self.cache_hits / lookups) if lookups else 0.0
+        out["avg_latency_ms"] = (self.latency_ms_total / self.queries) if self.queries else 0.0
+        return out
+
+
+_stats = DNSStats()
+_stats_lock = threading.Lock()
+
+
+def stats() -> dict[str, Any]:
+    with _stats_lock:
+        return _stats.as_dict()
+
+
+def reset_stats() -> None:
+    global _stats
+    with _stats_lock:
+        _stats = DNSStats()
+
+
+def _bump(**deltas: float) -> None:
+    with _stats_lock:
+        for k, v in deltas.items():
+            setattr(_stats, k, getattr(_stats, k) + v)
+
+
+# --------------------------------------------------------------------------------------
+# Cache
+# --------------------------------------------------------------------------------------
+
+
+class _TTLCache:
+    """Thread-safe LRU of DNSAnswer keyed by (name, rdtype), honouring expires_at."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._data: OrderedDict[tuple[str, str], DNSAnswer] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: tuple[str, str], now: float) -> DNSAnswer | None:
+        with self._lock:
+            ans = self._data.get(key)
+            if ans is None:
+                return None
+            if ans.expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return ans
+
+    def put(self, ans: DNSAnswer) -> None:
+        if self.max_entries <= 0:
+            return
+        key = (ans.name, ans.rdtype)
+        with self._lock:
+            self._data[key] = ans
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_cache = _TTLCache(DNS_CACHE_MAX_ENTRIES)
+
+
+def clear_cache() -> None:
+    _cache.clear()
+
+
+# --------------------------------------------------------------------------------------
+# Resolvers (patch points)
+# --------------------------------------------------------------------------------------
+
+_resolver_lock = threading.Lock()
+_sync_resolver: dns.resolver.Resolver | None = None
+_async_resolver: dns.asyncresolver.Resolver | None = None
+
+
+def _configure(r: Any) -> Any:
+    if DNS_NAMESERVERS:
+        r.nameservers = list(DNS_NAMESERVERS)
+    r.timeout = DNS_TIMEOUT_SEC
+    r.lifetime = DNS_LIFETIME_SEC
+    return r
+
+
+def _build(cls: Any) -> Any:
+    try:
+        r = cls(configure=True)
+    except dns.resolver.NoResolverConfiguration:
+        # No /etc/resolv.conf (minimal containers): only explicit upstreams work
+        r = cls(configure=False)
+    return _configure(r)
+
+
+def get_resolver() -> dns.resolver.Resolver:
+    """Process-wide synchronous resolver configured from the DNS_* env."""
+    global _sync_resolver
+    if _sync_resolver is None:
+        with _resolver_lock:
+            if _sync_resolver is None:
+                _sync_resolver = _build(dns.resolver.Resolver)
+    return _sync_resolver
+
+
+def get_async_resolver() -> dns.asyncresolver.Resolver:
+    """Process-wide asyncio resolver configured from the DNS_* env."""
+    global _async_resolver
+    if _async_resolver is None:
+        with _resolver_lock:
+            if _async_resolver is None:
+                _async_resolver = _build(dns.asyncresolver.Resolver)
+    return _async_resolver
+
+
+def _records_of(answer: Any, rdtype: str) -> tuple[Any, ...]:
+    out: list[Any] = []
+    for r in answer:
+        if rdtype == "MX":
+            exch = r.exchange.to_text()
+            out.append((int(r.preference), "." if exch == "." else exch.rstrip(".")))
+        elif rdtype in ("A", "AAAA"):
+            out.append(r.address)
+        else:
+            out.append(r.to_text())
+    return tuple(out)
+
+
+def _answer_ttl(answer: Any) -> int:
+    try:
+        return int(answer.rrset.ttl)
+    except Exception:
+        return DNS_CACHE_MIN_TTL_SEC
+
+
+def _resolve_sync(name: str, rdtype: str) -> tuple[tuple[Any, ...], int]:
+    """One upstream question; returns (records, ttl) or raises a dnspython error."""
+    ans = get_resolver().resolve(name, rdtype, lifetime=DNS_LIFETIME_SEC)
+    return _records_of(ans, rdtype), _answer_ttl(ans)
+
+
+async def _resolve_async(name: str, rdtype: str) -> tuple[tuple[Any, ...], int]:
+    """Async twin of _resolve_sync (dns.asyncresolver)."""
+    ans = await get_async_resolver().resolve(name, rdtype, lifetime=DNS_LIFETIME_SEC)
+    return _records_of(ans, rdtype), _answer_ttl(ans)
+
+
+# --------------------------------------------------------------------------------------
+# Answer construction
+# --------------------------------------------------------------------------------------
+
+
+def _key(name: str, rdtype: str) -> tuple[str, str]:
+    return (name or "").strip().lower().rstrip("."), rdtype.upper()
+
+
+def _ok_answer(key: tuple[str, str], records: tuple[Any, ...], ttl: int) -> DNSAnswer:
+    ttl = max(DNS_CACHE_MIN_TTL_SEC, min(int(ttl), DNS_CACHE_MAX_TTL_SEC))
+    return DNSAnswer(key[0], key[1], "ok", records, expires_at=time.time() + ttl)
+
+
+def _error_answer(key: tuple[str, str], exc: BaseException) -> DNSAnswer:
+    if isinstance(exc, dns.resolver.NXDOMAIN):
+        status = "nxdomain"
+    elif isinstance(exc, dns.resolver.NoAnswer):
+        status = "noanswer"
+    elif isinstance(exc, dns.exception.Timeout):
+        status = "timeout"
+    else:
+        status = "error"
+    expires = time.time() + DNS_NEGATIVE_TTL_SEC if status in _CACHEABLE else 0.0
+    return DNSAnswer(key[0], key[1], status, (), expires_at=expires, error=type(exc).__name__)
+
+
+def _record(ans: DNSAnswer, latency_ms: float) -> DNSAnswer:
+    """Account for an upstream answer and cache it when cacheable."""
+    counters: dict[str, float] = {"queries": 1, "latency_ms_total": latency_ms}
+    if ans.status == "nxdomain":
+        counters["nxdomain"] = 1
+    elif ans.status == "noanswer":
+        counters["noanswer"] = 1
+    elif ans.status == "timeout":
+        counters["timeouts"] = 1
+    elif ans.status == "error":
+        counters["errors"] = 1
+    _bump(**counters)
+    if DNS_CACHE_ENABLED and ans.status in _CACHEABLE:
+        _cache.put(ans)
+    return ans
+
+
+def _cached(key: tuple[str, str]) -> DNSAnswer | None:
+    if not DNS_CACHE_ENABLED:
+        return None
+    ans = _cache.get(key, time.time())
+    if ans is None:
+        _bump(cache_misses=1)
+        return None
+    _bump(cache_hits=1, negative_hits=0 if ans.status == "ok" else 1)
+    return dataclasses.replace(ans, cached=True)
+
+
+# --------------------------------------------------------------------------------------
+# Public API
+# --------------------------------------------------------------------------------------
+
+
+def query(name: str, rdtype: str = "A") -> DNSAnswer:
+    """Answer one question (cache first); never raises for DNS errors."""
+    key = _key(name, rdtype)
+    hit = _cached(key)
+    if hit is not None:
+        return hit
+    t0 = time.perf_counter()
+    try:
+        records, ttl = _resolve_sync(*key)
+        ans = _ok_answer(key, records, ttl)
+    except Exception as exc:
+        ans = _error_answer(key, exc)
+    return _record(ans, (time.perf_counter() - t0) * 1000)
+
+
+async def _gather(keys: list[tuple[str, str]], limit: int) -> list[DNSAnswer]:
+    sem = asyncio.Semaphore(max(1, limit))
+
+    async def _one(key: tuple[str, str]) -> DNSAnswer:
+        async with sem:
+            t0 = time.perf_counter()
+            try:
+                records, ttl = await _resolve_async(*key)
+                ans = _ok_answer(key, records, ttl)
+            except Exception as exc:
+                ans = _error_answer(key, exc)
+            return _record(ans, (time.perf_counter() - t0) * 1000)
+
+    return list(await asyncio.gather(*(_one(k) for k in keys)))
+
+
+def _run(coro: Coroutine[Any, Any, list[DNSAnswer]]) -> list[DNSAnswer]:
+    """Run a coroutine to completion from sync code, even inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="dns") as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def resolve_batch(
+    questions: Iterable[tuple[str, str]],
+    *,
+    concurrency: int | None = None,
+) -> dict[tuple[str, str], DNSAnswer]:
+    """
+    Answer many (name, rdtype) questions; cache misses are resolved concurrently.
+
+    Keys of the result are normalized (lower-case name without trailing dot,
+    upper-case rdtype); duplicate questions are asked once.
+    """
+    out: dict[tuple[str, str], DNSAnswer] = {}
+    pending: dict[tuple[str, str], None] = {}
+    for name, rdtype in questions:
+        key = _key(name, rdtype)
+        if not key[0] or key in out or key in pending:
+            continue
+        hit = _cached(key)
+        if hit is not None:
+            out[key] = hit
+        else:
+            pending[key] = None
+    if pending:
+        keys = list(pending)
+        answers = _run(_gather(keys, concurrency or DNS_BATCH_CONCURRENCY))
+        out.update(zip(keys, answers, strict=True))
+    return out
+
+
+def record_status_many(hosts: Iterable[str]) -> dict[str, bool | None]:
+    """
+    host → True if it has any MX, A or AAAA record, False if the lookups say it
+    has none (NXDOMAIN / NoAnswer), None when that is unknown because a lookup
+    timed out or errored. All questions run in parallel.
+    """
+    names = list(dict.fromkeys(_key(h, "A")[0] for h in hosts if h))
+    answers = resolve_batch((n, t) for n in names for t in ("MX", "A", "AAAA"))
+    out: dict[str, bool | None] = {}
+    for n in names:
+        got = [answers[(n, t)] for t in ("MX", "A", "AAAA")]
+        if any(a.ok for a in got):
+            out[n] = True
+        elif any(a.status not in _CACHEABLE for a in got):
+            out[n] = None
+        else:
+            out[n] = False
+    return out
+
+
+def has_any_record_many(hosts: Iterable[str]) -> dict[str, bool]:
+    """host → True if it has any MX, A or AAAA record (all questions in parallel)."""
+    return {n: bool(v) for n, v in record_status_many(hosts).items()}
+
+
+def has_any_record(host: str) -> bool:
+    name = _key(host, "A")[0]
+    return bool(name) and has_any_record_many([name]).get(name, False)
+
+
+def host_addresses(host: str, *, prefer_ipv4: bool = True, max_addrs: int = 0) -> list[str]:
+    """
+    A and AAAA addresses of ``host`` (queried in parallel), IPv4 first when
+    prefer_ipv4. An IP literal is returned as-is. max_addrs=0 means no limit.
+    """
+    try:
+        ipaddress.ip_address(host)
+        return [host]
+    except ValueError:
+        pass
+    name = _key(host, "A")[0]
+    if not name:
+        return []
+    answers = resolve_batch([(name, "A"), (name, "AAAA")])
+    order = ("A", "AAAA") if prefer_ipv4 else ("AAAA", "A")
+    ips: list[str] = []
+    for rdtype in order:
+        for ip in answers[(name, rdtype)].records:
+            if ip not in ips:
+                ips.append(ip)
+    return ips[:max_addrs] if max_addrs > 0 else ips
+
+
+def has_address(host: str) -> bool:
+    return bool(host_addresses(host))
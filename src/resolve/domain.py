@@ -1,16 +1,50 @@
+# src/resolve/domain.py
+"""
+Official-domain resolver (R08).
+
+resolve() scores the candidates for one company serially. resolve_many() is
+the batch engine for bulk imports: it builds every company's candidates up
+front, dedupes hosts across companies, DNS-filters them in one concurrent
+batch, then HEAD-probes the survivors concurrently on a single shared
+httpx.AsyncClient. Probes to the same origin server (first A record) are
+capped at RESOLVE_HTTP_PER_HOST, and probe outcomes are kept in a TTL cache
+shared by workers through Redis, so a host probed for one company is reused
+for every other company and run.
+
+  Env:
+    RESOLVE_HTTP_CONCURRENCY     concurrent HEAD probes per batch (default 32)
+    RESOLVE_HTTP_PER_HOST        concurrent probes per origin server (default 2)
+    RESOLVE_PROBE_CACHE_TTL_SEC  lifetime of successful probe outcomes (default 6h)
+    RESOLVE_PROBE_NEG_TTL_SEC    lifetime of failed probes (default 300; 0 = not cached)
+    RESOLVE_PROBE_CACHE_SIZE     in-process entries (default 8192)
+    RESOLVE_PROBE_CACHE_REDIS    "0" skips the Redis layer (default on)
+"""
+
 from __future__ import annotations
 
+import asyncio
+import logging
+import os
 import re
+import threading
+import time
 import unicodedata
-from collections.abc import Iterable
+from collections import OrderedDict
+from collections.abc import Coroutine, Iterable, Mapping
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 from functools import lru_cache
+from typing import Any
 
-import dns.resolver
 import httpx
 import idna
 import tldextract
 
+from src.queueing.redis_conn import get_redis
+from src.resolve import dns_client
+
+log = logging.getLogger(__name__)
+
 __all__ = [
     "RESOLVER_VERSION",
     "Candidate",
@@ -19,6 +53,7 @@ __all__ = [
     "candidates_from_name",
     "decide",
     "resolve",
+    "resolve_many",
 ]
 
 # Bump when resolver logic meaningfully changes
@@ -26,7 +61,19 @@ RESOLVER_VERSION = "r08.5"
 
 # Tight, test-friendly timeouts (kept tiny by design)
 _HTTP_TIMEOUT = httpx.Timeout(3.0)
-_DNS_TIMEOUT = 2.0
+_HTTP_HEADERS = {"User-Agent": f"EmailScraperResolver/{RESOLVER_VERSION}"}
+
+RESOLVE_HTTP_CONCURRENCY = int(os.getenv("RESOLVE_HTTP_CONCURRENCY", "32"))
+RESOLVE_HTTP_PER_HOST = int(os.getenv("RESOLVE_HTTP_PER_HOST", "2"))
+RESOLVE_PROBE_CACHE_TTL_SEC = int(os.getenv("RESOLVE_PROBE_CACHE_TTL_SEC", str(6 * 3600)))
+# Failures are often transient (timeouts, resets, a 5xx during a deploy)
+RESOLVE_PROBE_NEG_TTL_SEC = int(os.getenv("RESOLVE_PROBE_NEG_TTL_SEC", "300"))
+RESOLVE_PROBE_CACHE_SIZE = int(os.getenv("RESOLVE_PROBE_CACHE_SIZE", "8192"))
+RESOLVE_PROBE_CACHE_REDIS = os.getenv("RESOLVE_PROBE_CACHE_REDIS", "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+}
 
 # Public Suffix handling: use bundled list only (no network fetch)
 _EXTRACT = tldextract.TLDExtract(cache_dir=False, suffix_list_urls=None)
@@ -216,26 +263,45 @@ def candidates_from_name(name: str) -> list[Candidate]:
     return out
 
 
-@lru_cache(maxsize=1024)
 def _dns_any(host: str) -> bool:
     """
-    True if the domain has any of MX/A/AAAA. Cached for the process lifetime.
+    True if the domain has any of MX/A/AAAA. The three queries run in parallel
+    through the shared DNS client, whose cache honours record TTLs.
     """
-    r = dns.resolver.Resolver(configure=True)
-    # be explicit on both; some dnspython versions use both fields
-    r.lifetime = _DNS_TIMEOUT
-    r.timeout = _DNS_TIMEOUT
     try:
-        for rtype in ("MX", "A", "AAAA"):
-            try:
-                ans = r.resolve(host, rtype, lifetime=_DNS_TIMEOUT)
-                if ans:
-                    return True
-            except Exception:
-                continue
+        return dns_client.has_any_record(host)
     except Exception:
-        pass
-    return False
+        return False
+
+
+def _redirect_apex(location: str | None) -> str | None:
+    """Registrable domain of a Location header (absolute, protocol-relative or relative)."""
+    if not location:
+        return None
+    loc_host = _strip_scheme_www(location)
+    if not _valid_like_domain(loc_host):
+        return None
+    try:
+        loc_apex = _registrable(_to_punycode(loc_host))
+    except idna.IDNAError:
+        return None
+    return loc_apex if _labels_ok(loc_apex) else None
+
+
+def _head_verdict(status: int, location: str | None) -> tuple[bool, str | None] | None:
+    """
+    (ok, redirect apex) for a HEAD response, or None when the origin refuses
+    HEAD (405) and a tiny GET should decide instead.
+    """
+    # 2xx → OK
+    if 200 <= status < 300:
+        return True, None
+    # 3xx → OK, remember where it points
+    if 300 <= status < 400:
+        return True, _redirect_apex(location)
+    if status == 405:
+        return None
+    return False, None
 
 
 @lru_cache(maxsize=1024)
@@ -245,40 +311,23 @@ def _http_head_ok(host: str) -> tuple[bool, str | None]:
     If 3xx, return the Location host (registrable) as the redirect target.
     If HTTPS fails, retry over HTTP.
     """
-    headers = {"User-Agent": f"EmailScraperResolver/{RESOLVER_VERSION}"}
 
     def _probe(scheme: str) -> tuple[bool, str | None]:
         url = f"{scheme}://{host}"
         try:
             limits = httpx.Limits(max_keepalive_connections=0, max_connections=10)
             with httpx.Client(
-                headers=headers, timeout=_HTTP_TIMEOUT, follow_redirects=False, limits=limits
+                headers=_HTTP_HEADERS, timeout=_HTTP_TIMEOUT, follow_redirects=False, limits=limits
             ) as c:
                 r = c.head(url)
-                # 2xx → OK
-                if 200 <= r.status_code < 300:
-                    return True, None
-                # 3xx → try to parse Location (host may be absolute, protocol-relative, or relative)
-                if 300 <= r.status_code < 400:
-                    loc = r.headers.get("location")
-                    if loc:
-                        loc_host = _strip_scheme_www(loc)
-                        if _valid_like_domain(loc_host):
-                            try:
-                                loc_apex = _registrable(_to_punycode(loc_host))
-                                if _labels_ok(loc_apex):
-                                    return True, loc_apex
-                            except idna.IDNAError:
-                                return True, None
-                    return True, None
+                verdict = _head_verdict(r.status_code, r.headers.get("location"))
+                if verdict is not None:
+                    return verdict
                 # 405 → some origins block HEAD; try a tiny GET
-                if r.status_code == 405:
-                    r = c.get(url, headers={"Range": "bytes=0-0"})
-                    if 200 <= r.status_code < 400:
-                        return True, None
+                r = c.get(url, headers={"Range": "bytes=0-0"})
+                return 200 <= r.status_code < 400, None
         except Exception:
             return False, None
-        return False, None
 
     ok, loc = _probe("https")
     if ok:
@@ -297,10 +346,32 @@ def _score_base(candidate: Candidate) -> int:
     return candidate.base_conf + _tld_bonus_for(candidate.domain)
 
 
-def decide(cands: Iterable[Candidate]) -> Decision:
+def _known_dns(host: str, dns: Mapping[str, bool | None] | None) -> bool:
+    if dns is not None and host in dns:
+        return bool(dns[host])
+    return _dns_any(host)
+
+
+def _known_http(
+    host: str, http: Mapping[str, tuple[bool, str | None]] | None
+) -> tuple[bool, str | None]:
+    if http is not None and host in http:
+        return http[host]
+    return _http_head_ok(host)
+
+
+def decide(
+    cands: Iterable[Candidate],
+    *,
+    dns: Mapping[str, bool | None] | None = None,
+    http: Mapping[str, tuple[bool, str | None]] | None = None,
+) -> Decision:
     """
     Score-and-pick the most plausible official domain from candidates.
     Tie-breakers are deterministic: hint > higher score > .com bias > lexicographic.
+
+    ``dns`` / ``http`` carry outcomes already gathered in bulk (resolve_many);
+    hosts missing from them are checked one by one.
     """
     # Dedup by normalized domain, keep the strongest base_conf per domain
     by_domain: dict[str, Candidate] = {}
@@ -341,10 +412,10 @@ def decide(cands: Iterable[Candidate]) -> Decision:
         c = by_domain[domain]
         score = _score_base(c)
 
-        dns_ok = _dns_any(c.domain)
+        dns_ok = _known_dns(c.domain, dns)
         if dns_ok:
             score += 25
-        http_ok, loc = _http_head_ok(c.domain)
+        http_ok, loc = _known_http(c.domain, http)
         if http_ok:
             score += 25
 
@@ -365,7 +436,7 @@ def decide(cands: Iterable[Candidate]) -> Decision:
 
         # Consider external redirect apex, if it also resolves and is allowed
         if http_ok and loc and loc != c.domain and loc not in _DENY and _labels_ok(loc):
-            if _dns_any(loc):
+            if _known_dns(loc, dns):
                 # Rebase score to the redirected apex' TLD bonus and add a small nudge
                 score -= _tld_bonus_for(c.domain)
                 score += _tld_bonus_for(loc)
@@ -391,13 +462,273 @@ def decide(cands: Iterable[Candidate]) -> Decision:
     )
 
 
-def resolve(company_name: str, user_hint: str | None) -> Decision:
-    """
-    Public API: produce a Decision with a chosen apex domain (punycode) if any.
-    """
+def _company_candidates(company_name: str, user_hint: str | None) -> list[Candidate]:
     items: list[Candidate] = []
     h = normalize_hint(user_hint)
     if h:
         items.append(h)
     items.extend(candidates_from_name(company_name))
-    return decide(items)
+    return items
+
+
+def resolve(company_name: str, user_hint: str | None) -> Decision:
+    """
+    Public API: produce a Decision with a chosen apex domain (punycode) if any.
+    """
+    return decide(_company_candidates(company_name, user_hint))
+
+
+# --------------------------------------------------------------------------------------
+# Probe cache (host -> (ok, redirect apex), shared through Redis)
+# --------------------------------------------------------------------------------------
+
+_REDIS_PREFIX = "httpprobe:v1:"
+_REDIS_RETRY_SEC = 30.0
+
+
+class ProbeCache:
+    """In-process TTL map of HTTP probe outcomes with an optional Redis layer."""
+
+    def __init__(
+        self,
+        *,
+        redis: Any = None,
+        use_redis: bool | None = None,
+        ttl: int | None = None,
+        negative_ttl: int | None = None,
+        max_entries: int | None = None,
+    ):
+        self.use_redis = RESOLVE_PROBE_CACHE_REDIS if use_redis is None else bool(use_redis)
+        self.ttl = RESOLVE_PROBE_CACHE_TTL_SEC if ttl is None else int(ttl)
+        self.negative_ttl = RESOLVE_PROBE_NEG_TTL_SEC if negative_ttl is None else int(negative_ttl)
+        self.max_entries = RESOLVE_PROBE_CACHE_SIZE if max_entries is None else int(max_entries)
+        self._redis = redis
+        self._redis_down_until = 0.0
+        self._data: OrderedDict[str, tuple[float, bool, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _redis_client(self) -> Any:
+        if not self.use_redis or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                self._redis = get_redis()
+            except Exception:
+                self._redis_failed()
+                return None
+        return self._redis
+
+    def _redis_failed(self) -> None:
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_SEC
+        log.debug("probe cache: redis layer unavailable", exc_info=True)
+
+    def _ttl_for(self, ok: bool) -> int:
+        return min(self.ttl, self.negative_ttl) if not ok else self.ttl
+
+    def _local_put(self, host: str, ok: bool, loc: str | None, expires_at: float) -> None:
+        if self.max_entries <= 0:
+            return
+        with self._lock:
+            self._data[host] = (expires_at, ok, loc)
+            self._data.move_to_end(host)
+            while len(self._data) > self.max_entries:
+                self._data.popitem(last=False)
+
+    def get_many(self, hosts: Iterable[str]) -> dict[str, tuple[bool, str | None]]:
+        now = time.time()
+        out: dict[str, tuple[bool, str | None]] = {}
+        pending: list[str] = []
+        with self._lock:
+            for host in hosts:
+                entry = self._data.get(host)
+                if entry is not None and entry[0] > now:
+                    self._data.move_to_end(host)
+                    out[host] = (entry[1], entry[2])
+                else:
+                    self._data.pop(host, None)
+                    pending.append(host)
+
+        client = self._redis_client()
+        if client is None or not pending:
+            return out
+        try:
+            raws = client.mget([_REDIS_PREFIX + h for h in pending])
+        except Exception:
+            self._redis_failed()
+            return out
+        for host, raw in zip(pending, raws, strict=True):
+            if raw is None:
+                continue
+            flag, _, loc = (raw.decode() if isinstance(raw, bytes) else str(raw)).partition("|")
+            out[host] = (flag == "1", loc or None)
+            self._local_put(host, flag == "1", loc or None, now + self._ttl_for(flag == "1"))
+        return out
+
+    def put_many(self, results: Mapping[str, tuple[bool, str | None]]) -> None:
+        now = time.time()
+        keep = {h: (ok, loc, self._ttl_for(ok)) for h, (ok, loc) in results.items()}
+        keep = {h: v for h, v in keep.items() if v[2] > 0}
+        if not keep:
+            return
+        for host, (ok, loc, ttl) in keep.items():
+            self._local_put(host, ok, loc, now + ttl)
+        client = self._redis_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for host, (ok, loc, ttl) in keep.items():
+                pipe.set(_REDIS_PREFIX + host, f"{int(ok)}|{loc or ''}", ex=ttl)
+            pipe.execute()
+        except Exception:
+            self._redis_failed()
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+
+_probe_cache: ProbeCache | None = None
+_probe_cache_lock = threading.Lock()
+
+
+def probe_cache() -> ProbeCache:
+    """Process-wide probe cache used by resolve_many()."""
+    global _probe_cache
+    if _probe_cache is None:
+        with _probe_cache_lock:
+            if _probe_cache is None:
+                _probe_cache = ProbeCache()
+    return _probe_cache
+
+
+def set_probe_cache(cache: ProbeCache | None) -> None:
+    """Install (or with None, reset) the process-wide probe cache; used by tests."""
+    global _probe_cache
+    _probe_cache = cache
+
+
+# --------------------------------------------------------------------------------------
+# Batch engine
+# --------------------------------------------------------------------------------------
+
+
+def _dns_any_many(hosts: list[str]) -> dict[str, bool | None]:
+    """
+    Bulk _dns_any(): every host's MX/A/AAAA questions in one concurrent batch.
+    None marks hosts whose lookups timed out or failed (unknown, not absent).
+    """
+    if not hosts:
+        return {}
+    try:
+        return dns_client.record_status_many(hosts)
+    except Exception:
+        log.debug("bulk DNS filter failed", exc_info=True)
+        return dict.fromkeys(hosts, None)
+
+
+def _origin_keys(hosts: list[str]) -> dict[str, str]:
+    """Host -> first IPv4 address (the origin server), falling back to the host itself."""
+    try:
+        answers = dns_client.resolve_batch([(h, "A") for h in hosts])
+    except Exception:
+        return {h: h for h in hosts}
+    out: dict[str, str] = {}
+    for h in hosts:
+        ans = answers.get((h, "A"))
+        out[h] = str(ans.records[0]) if ans is not None and ans.ok and ans.records else h
+    return out
+
+
+async def _probe_async(
+    client: httpx.AsyncClient, host: str, slot: asyncio.Semaphore
+) -> tuple[bool, str | None]:
+    """Async twin of _http_head_ok() on a shared client."""
+    async with slot:
+        for scheme in ("https", "http"):
+            url = f"{scheme}://{host}"
+            try:
+                r = await client.head(url)
+                verdict = _head_verdict(r.status_code, r.headers.get("location"))
+                if verdict is None:
+                    r = await client.get(url, headers={"Range": "bytes=0-0"})
+                    verdict = (200 <= r.status_code < 400, None)
+            except Exception:
+                verdict = (False, None)
+            if verdict[0]:
+                return verdict
+    return False, None
+
+
+async def _probe_all(hosts: list[str], origins: Mapping[str, str]) -> list[tuple[bool, str | None]]:
+    limit = max(1, RESOLVE_HTTP_CONCURRENCY)
+    limits = httpx.Limits(max_connections=limit, max_keepalive_connections=limit)
+    slots: dict[str, asyncio.Semaphore] = {}
+    for h in hosts:
+        slots.setdefault(origins.get(h, h), asyncio.Semaphore(max(1, RESOLVE_HTTP_PER_HOST)))
+    async with httpx.AsyncClient(
+        headers=_HTTP_HEADERS, timeout=_HTTP_TIMEOUT, follow_redirects=False, limits=limits
+    ) as client:
+        return await asyncio.gather(
+            *(_probe_async(client, h, slots[origins.get(h, h)]) for h in hosts)
+        )
+
+
+def _run(coro: Coroutine[Any, Any, list[tuple[bool, str | None]]]) -> list[tuple[bool, str | None]]:
+    """Run a coroutine to completion from sync code, even inside a running loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="resolve") as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+def _http_head_many(hosts: list[str]) -> dict[str, tuple[bool, str | None]]:
+    """Bulk _http_head_ok(): cached outcomes first, the rest probed concurrently."""
+    if not hosts:
+        return {}
+    cache = probe_cache()
+    out = cache.get_many(hosts)
+    pending = [h for h in hosts if h not in out]
+    if pending:
+        probed = dict(zip(pending, _run(_probe_all(pending, _origin_keys(pending))), strict=True))
+        cache.put_many(probed)
+        out.update(probed)
+    return out
+
+
+def resolve_many(companies: Iterable[tuple[str, str | None]]) -> list[Decision]:
+    """
+    Batch API: one Decision per (company_name, user_hint), in input order.
+
+    Scoring is exactly decide()'s; only the network work is batched. Hosts
+    DNS says have no record (NXDOMAIN / NoAnswer) are not probed over HTTP, as
+    they cannot answer; hosts whose lookups timed out or failed are probed like
+    decide() would. Redirect targets are DNS-checked in a second batch.
+    """
+    jobs = [_company_candidates(name, hint) for name, hint in companies]
+    hosts = sorted(
+        {
+            c.domain
+            for cands in jobs
+            for c in cands
+            if c.domain not in _DENY and _labels_ok(c.domain)
+        }
+    )
+
+    dns = _dns_any_many(hosts)
+    absent = {h for h in hosts if dns.get(h) is False}
+    http: dict[str, tuple[bool, str | None]] = dict.fromkeys(absent, (False, None))
+    http.update(_http_head_many([h for h in hosts if h not in absent]))
+
+    redirects = sorted(
+        {
+            loc
+            for ok, loc in http.values()
+            if ok and loc and loc not in dns and loc not in _DENY and _labels_ok(loc)
+        }
+    )
+    dns.update(_dns_any_many(redirects))
+
+    return [decide(cands, dns=dns, http=http) for cands in jobs]
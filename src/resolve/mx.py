@@ -9,32 +9,72 @@ Tables used:
   - domain_resolutions: MX resolution cache (defined in main schema.sql)
   - mx_probe_stats: Individual probe statistics for behavior analysis
 
+  - mx_cache: domain-keyed MX cache (shared by every company/tenant)
+
 SCHEMA COMPATIBILITY:
   The main schema.sql uses `chosen_domain` column, but this module also supports
   legacy `domain` column for backward compatibility. The _get_domain_column()
   helper detects which column exists and uses it appropriately.
+
+DOMAIN-KEYED CACHE:
+  MX answers depend only on the domain, so resolve_mx_domain() / resolve_mx_many()
+  look them up in layers before touching DNS: an in-process LRU, then Redis
+  (shared by workers), then the mx_cache table. Entries live for the DNS TTL
+  (clamped to [MX_CACHE_MIN_TTL_SEC, ttl_seconds]); an A/AAAA-fallback answer
+  uses the address records' TTL. NXDOMAIN, "no MX and no
+  A/AAAA" and Null MX answers are cached for MX_CACHE_NEGATIVE_TTL_SEC;
+  transient failures (timeouts, SERVFAIL) are never cached. resolve_mx() and
+  get_or_resolve_mx() go through this cache; prefetch() warms it for every
+  domain of a pipeline run in one resolve_mx_many() batch.
+
+  Env:
+    MX_CACHE_ENABLED           "0" disables the domain cache (default on)
+    MX_CACHE_LRU_SIZE          in-process entries (default 4096)
+    MX_CACHE_REDIS             "0" skips the Redis layer (default on)
+    MX_CACHE_MIN_TTL_SEC       floor for DNS TTLs (default 60)
+    MX_CACHE_NEGATIVE_TTL_SEC  lifetime of negative answers (default 3600)
+    MX_RESOLVE_CONCURRENCY     resolve_mx_many() DNS workers (default 16)
 """
 
 from __future__ import annotations
 
 import json
+import logging
+import os
 import socket
 import statistics
+import threading
 import time
 import unicodedata
-from dataclasses import dataclass
+from collections import OrderedDict
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, replace
 from datetime import UTC, datetime
 from typing import Any
 
-from src.db import get_conn
+from src.db import cached_schema, get_conn
+from src.queueing.redis_conn import get_redis
+
+log = logging.getLogger(__name__)
 
 DEFAULT_TTL_SECONDS = 86400  # 24h
 
+MX_CACHE_ENABLED = os.getenv("MX_CACHE_ENABLED", "1").strip().lower() not in {"0", "false", "no"}
+MX_CACHE_LRU_SIZE = int(os.getenv("MX_CACHE_LRU_SIZE", "4096"))
+MX_CACHE_REDIS = os.getenv("MX_CACHE_REDIS", "1").strip().lower() not in {"0", "false", "no"}
+MX_CACHE_MIN_TTL_SEC = int(os.getenv("MX_CACHE_MIN_TTL_SEC", "60"))
+MX_CACHE_NEGATIVE_TTL_SEC = int(os.getenv("MX_CACHE_NEGATIVE_TTL_SEC", "3600"))
+MX_RESOLVE_CONCURRENCY = int(os.getenv("MX_RESOLVE_CONCURRENCY", "16"))
+
 # Exposed for tests to patch
 _DNSPY_AVAILABLE = False
 try:  # pragma: no cover
+    import dns.exception  # type: ignore
     import dns.resolver  # type: ignore
 
+    from src.resolve import dns_client
+
     _DNSPY_AVAILABLE = True
 except Exception:  # pragma: no cover
     _DNSPY_AVAILABLE = False
@@ -84,37 +124,56 @@ def norm_domain(domain: str | None) -> str | None:
 # -----------------------------
 
 
+# TTL of the calling thread's most recent MX (or A/AAAA fallback) answer, set by
+# _mx_lookup_with_dnspython and _a_or_aaaa_exists
+_dns_local = threading.local()
+
+# dns_client answer status → exception a direct dnspython query would raise
+_DNS_ERRORS: dict[str, type[Exception]] = (
+    {
+        "nxdomain": dns.resolver.NXDOMAIN,
+        "noanswer": dns.resolver.NoAnswer,
+        "timeout": dns.exception.Timeout,
+    }
+    if _DNSPY_AVAILABLE
+    else {}
+)
+
+
 def _mx_lookup_with_dnspython(domain: str) -> list[tuple[int, str]]:
     """
     Return list of (preference, host) for MX records.
     - Preserve the special host "." for Null MX (RFC 7505).
     - Otherwise return hostnames WITHOUT trailing dot.
+    - Failures raise the dnspython exception for the outcome (NXDOMAIN,
+      NoAnswer, Timeout, NoNameservers), as a direct query would.
+
+    Served by the shared DNS client (src.resolve.dns_client), so repeat
+    questions within the record TTL cost no round-trip.
     """
     assert _DNSPY_AVAILABLE, "dnspython not available"
-    resolver = dns.resolver.Resolver()  # type: ignore[name-defined]
-    resolver.lifetime = 2.0
-    resolver.timeout = 2.0
-
-    answers = resolver.resolve(domain, "MX")
-    pairs: list[tuple[int, str]] = []
-    for r in answers:
-        pref = int(getattr(r, "preference", 0))
-        exch = getattr(r, "exchange", None)
-        if exch is None:
-            host = ""
-        else:
-            host = str(exch.to_text()).rstrip(".") or ""
-            # Special case: Null MX has exchange "."
-            if host == "" and str(exch) == ".":
-                host = "."
-        pairs.append((pref, host))
-    return pairs
+    ans = dns_client.query(domain, "MX")
+    if ans.status != "ok":
+        raise _DNS_ERRORS.get(ans.status, dns.resolver.NoNameservers)()  # type: ignore[name-defined]
+    _dns_local.ttl = ans.ttl
+    return [(int(pref), str(host)) for pref, host in ans.records]
 
 
 def _a_or_aaaa_exists(domain: str) -> bool:
     """
-    Lightweight A/AAAA presence check via socket.getaddrinfo.
+    Lightweight A/AAAA presence check (both queried in parallel via the shared
+    DNS client); socket.getaddrinfo when dnspython is unavailable. A positive
+    dnspython answer leaves its shortest TTL in _dns_local.ttl.
     """
+    if _DNSPY_AVAILABLE:
+        try:
+            answers = dns_client.resolve_batch([(domain, "A"), (domain, "AAAA")])
+        except Exception:
+            return False
+        found = [a for a in answers.values() if a.ok]
+        if found:
+            _dns_local.ttl = min(a.ttl for a in found)
+        return bool(found)
     try:
         socket.getaddrinfo(domain, None, proto=socket.IPPROTO_TCP)
         return True
@@ -145,8 +204,12 @@ a_aaaa_fallback = _a_aaaa_fallback
 def _table_columns(conn: Any, table: str) -> set[str]:
     """
     Return column names for a table using PRAGMA table_info(...).
-    Works for both SQLite and Postgres via CompatCursor PRAGMA emulation.
+    Works for both SQLite and Postgres via CompatCursor PRAGMA emulation;
+    Postgres connections are served from the shared schema registry.
     """
+    snap = cached_schema(conn)
+    if snap is not None:
+        return set(snap.column_names(table))
     try:
         cur = conn.execute(f"PRAGMA table_info({table})")
         rows = cur.fetchall() or []
@@ -199,15 +262,33 @@ def _clear_domain_column_cache() -> None:
     _domain_column_cache.clear()
 
 
+# Tables already confirmed per database URL, so hot paths skip the check
+_ensured_tables: set[tuple[str, str]] = set()
+
+
+def _already_ensured(conn: Any, table: str) -> bool:
+    url = getattr(conn, "url", None)
+    return bool(url) and (str(url), table) in _ensured_tables
+
+
+def _mark_ensured(conn: Any, table: str) -> None:
+    url = getattr(conn, "url", None)
+    if url:
+        _ensured_tables.add((str(url), table))
+
+
 def _ensure_table(conn: Any) -> None:
     """
     Ensure domain_resolutions table exists if running in an empty DB.
     Note: The main schema.sql already defines this table for PostgreSQL.
     This is a safety fallback for standalone usage.
     """
+    if _already_ensured(conn, "domain_resolutions"):
+        return
     # Check if table exists first
     cols = _table_columns(conn, "domain_resolutions")
     if cols:
+        _mark_ensured(conn, "domain_resolutions")
         return  # Table already exists
 
     # Create minimal table (PostgreSQL-compatible) - uses 'domain' for legacy compat
@@ -239,14 +320,18 @@ def _ensure_table(conn: Any) -> None:
         """
     )
     conn.commit()
+    _mark_ensured(conn, "domain_resolutions")
 
 
 def _ensure_behavior_schema(conn: Any) -> None:
     """
     Ensure mx_probe_stats table exists for behavior tracking.
     """
+    if _already_ensured(conn, "mx_probe_stats"):
+        return
     cols = _table_columns(conn, "mx_probe_stats")
     if cols:
+        _mark_ensured(conn, "mx_probe_stats")
         return  # Table already exists
 
     conn.execute(
@@ -269,6 +354,7 @@ def _ensure_behavior_schema(conn: Any) -> None:
         """
     )
     conn.commit()
+    _mark_ensured(conn, "mx_probe_stats")
 
 
 def _select_row(conn: Any, company_id: int, domain: str) -> dict[str, Any] | None:
@@ -546,7 +632,8 @@ def _upsert_row(
     ).fetchone()
 
     if got:
-        return int(got[0] if isinstance(got, tuple) else got.get("id", got[0]))
+        # sqlite3.Row / DictRow index by position; plain dicts by name
+        return int(got["id"] if isinstance(got, dict) else got[0])
     return 0
 
 
@@ -570,81 +657,420 @@ class MXResult:
 
 
 # -----------------------------
-# Public API
+# Domain-keyed MX cache (LRU → Redis → DB)
 # -----------------------------
 
+# Failures that are facts about the domain (cached); anything else is transient
+_NEGATIVE_FAILURES = frozenset(
+    {"null_mx", "mx_lookup_failed:NXDOMAIN", "mx_lookup_failed:NoAnswer"}
+)
 
-def resolve_mx(
-    company_id: int,
-    domain: str,
-    *,
-    force: bool = False,
-    db_path: str | None = None,  # Deprecated, kept for API compatibility
-    ttl_seconds: int = DEFAULT_TTL_SECONDS,
-) -> MXResult:
-    """
-    Resolve MX for a domain with caching in domain_resolutions.
+_REDIS_PREFIX = "mxc:v1:"
+# After a Redis error the layer is skipped for this long (workers without Redis)
+_REDIS_RETRY_SEC = 30.0
 
-    Behavior:
-      - Try cache if not forced, not failed, and within TTL.
-      - Resolve MX via dnspython (if available), sorted by (pref ASC, host ASC).
-      - **Null MX** (single record with host ".") → failure="null_mx" and *no* A/AAAA fallback.
-      - On MX failure (non-null), try A/AAAA fallback: treat domain as MX with pref 0 if present.
-      - On full failure, record failure string and empty hosts.
-    """
-    d = norm_domain(domain) or ""
-    if not d:
-        return MXResult(
-            row_id=0,
-            company_id=company_id,
-            domain=domain or "",
-            mx_hosts=[],
-            preference_map={},
-            lowest_mx=None,
-            resolved_at=_now_iso(),
-            ttl=ttl_seconds,
-            failure="invalid_domain",
-            cached=False,
+
+@dataclass(frozen=True)
+class MXRecord:
+    """Domain-level MX answer as held by the cache layers."""
+
+    domain: str
+    mx_hosts: tuple[str, ...]
+    preference_map: dict[str, int]
+    lowest_mx: str | None
+    failure: str | None
+    resolved_at: str
+    expires_at: float
+    source: str = "dns"  # "lru" | "redis" | "db" | "dns"
+
+    @property
+    def negative(self) -> bool:
+        return self.failure is not None
+
+    @property
+    def ttl(self) -> int:
+        return max(0, int(self.expires_at - time.time()))
+
+    def to_json(self) -> str:
+        return json.dumps(
+            {
+                "domain": self.domain,
+                "mx_hosts": list(self.mx_hosts),
+                "preference_map": self.preference_map,
+                "lowest_mx": self.lowest_mx,
+                "failure": self.failure,
+                "resolved_at": self.resolved_at,
+                "expires_at": self.expires_at,
+            },
+            ensure_ascii=False,
+            separators=(",", ":"),
         )
 
-    conn = get_conn()
-    _ensure_table(conn)
+    @classmethod
+    def from_json(cls, raw: str | bytes, *, source: str) -> MXRecord:
+        data = json.loads(raw)
+        return cls(
+            domain=str(data["domain"]),
+            mx_hosts=tuple(data.get("mx_hosts") or ()),
+            preference_map=dict(data.get("preference_map") or {}),
+            lowest_mx=data.get("lowest_mx"),
+            failure=data.get("failure"),
+            resolved_at=str(data.get("resolved_at") or ""),
+            expires_at=float(data["expires_at"]),
+            source=source,
+        )
+
+
+def _record_ttl(failure: str | None, dns_ttl: int | None, ttl_seconds: int) -> int:
+    """Cache lifetime for a fresh answer; 0 means do not cache."""
+    if failure is not None:
+        return MX_CACHE_NEGATIVE_TTL_SEC if failure in _NEGATIVE_FAILURES else 0
+    if dns_ttl is None:
+        return int(ttl_seconds)
+    return max(MX_CACHE_MIN_TTL_SEC, min(int(dns_ttl), int(ttl_seconds)))
 
-    now_epoch = _utc_now_epoch()
-    row = _select_row(conn, company_id, d)
 
-    if row and _should_use_cache(row, now_epoch, force):
-        # Deserialize from cached row
+@dataclass
+class MXCacheStats:
+    lru_hits: int = 0
+    redis_hits: int = 0
+    db_hits: int = 0
+    misses: int = 0
+    negative_hits: int = 0  # hits (any layer) on NXDOMAIN / null MX entries
+    dns_lookups: int = 0
+    stores: int = 0
+    redis_errors: int = 0
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = dict(self.__dict__)
+        hits = self.lru_hits + self.redis_hits + self.db_hits
+        out["hit_ratio"] = (hits / (hits + self.misses)) if (hits + self.misses) else 0.0
+        return out
+
+
+def _ensure_mx_cache_table(conn: Any) -> None:
+    """Safety fallback for databases that predate mx_cache (db/schema.sql defines it)."""
+    if _already_ensured(conn, "mx_cache"):
+        return
+    conn.execute(
+        """
+        CREATE TABLE IF NOT EXISTS mx_cache (
+            domain TEXT PRIMARY KEY,
+            mx_hosts TEXT NOT NULL,
+            preference_map TEXT NOT NULL,
+            lowest_mx TEXT,
+            failure TEXT,
+            resolved_at TEXT NOT NULL,
+            expires_at DOUBLE PRECISION NOT NULL
+        )
+        """
+    )
+    _mark_ensured(conn, "mx_cache")
+
+
+class MXCache:
+    """
+    Layered domain → MXRecord cache.
+
+    Lookups go LRU → Redis → mx_cache table; a hit in a lower layer is
+    promoted into the layers above it. put_many() writes every layer.
+    """
+
+    def __init__(
+        self,
+        *,
+        lru_size: int | None = None,
+        redis: Any = None,
+        use_redis: bool | None = None,
+        use_db: bool = True,
+    ):
+        self.lru_size = MX_CACHE_LRU_SIZE if lru_size is None else int(lru_size)
+        self.use_redis = MX_CACHE_REDIS if use_redis is None else bool(use_redis)
+        self.use_db = use_db
+        self.stats = MXCacheStats()
+        self._redis = redis
+        self._redis_down_until = 0.0
+        self._lru: OrderedDict[str, MXRecord] = OrderedDict()
+        self._lock = threading.Lock()
+
+    # ---- layers ----------------------------------------------------------
+
+    def _redis_client(self) -> Any:
+        if not self.use_redis or time.monotonic() < self._redis_down_until:
+            return None
+        if self._redis is None:
+            try:
+                self._redis = get_redis()
+            except Exception:
+                self._redis_failed()
+                return None
+        return self._redis
+
+    def _redis_failed(self) -> None:
+        with self._lock:
+            self.stats.redis_errors += 1
+        self._redis_down_until = time.monotonic() + _REDIS_RETRY_SEC
+        log.debug("mx cache: redis layer unavailable", exc_info=True)
+
+    def _lru_get(self, domain: str, now: float) -> MXRecord | None:
+        with self._lock:
+            rec = self._lru.get(domain)
+            if rec is None:
+                return None
+            if rec.expires_at <= now:
+                del self._lru[domain]
+                return None
+            self._lru.move_to_end(domain)
+            return rec
+
+    def _lru_put(self, rec: MXRecord) -> None:
+        if self.lru_size <= 0:
+            return
+        with self._lock:
+            self._lru[rec.domain] = rec
+            self._lru.move_to_end(rec.domain)
+            while len(self._lru) > self.lru_size:
+                self._lru.popitem(last=False)
+
+    def _redis_get_many(self, domains: list[str], now: float) -> dict[str, MXRecord]:
+        client = self._redis_client()
+        if client is None or not domains:
+            return {}
         try:
-            mx_hosts = json.loads(row.get("mx_hosts") or "[]")
+            raws = client.mget([_REDIS_PREFIX + d for d in domains])
         except Exception:
-            mx_hosts = []
+            self._redis_failed()
+            return {}
+        out: dict[str, MXRecord] = {}
+        for d, raw in zip(domains, raws, strict=True):
+            if raw is None:
+                continue
+            try:
+                rec = MXRecord.from_json(raw, source="redis")
+            except Exception:
+                continue
+            if rec.expires_at > now:
+                out[d] = rec
+        return out
+
+    def _redis_put_many(self, recs: list[MXRecord]) -> None:
+        client = self._redis_client()
+        if client is None or not recs:
+            return
         try:
-            preference_map = json.loads(row.get("preference_map") or "{}")
+            pipe = client.pipeline(transaction=False)
+            for rec in recs:
+                if rec.ttl > 0:
+                    pipe.set(_REDIS_PREFIX + rec.domain, rec.to_json(), ex=rec.ttl)
+            pipe.execute()
         except Exception:
-            preference_map = {}
-        return MXResult(
-            row_id=int(row.get("id") or 0),
-            company_id=int(row.get("company_id") or company_id),
-            domain=row.get("domain") or d,
-            mx_hosts=mx_hosts,
-            preference_map=preference_map,
-            lowest_mx=row.get("lowest_mx"),
-            resolved_at=row.get("resolved_at") or "",
-            ttl=int(row.get("ttl") or ttl_seconds),
-            failure=row.get("failure"),
-            cached=True,
-        )
+            self._redis_failed()
+
+    def _db_get_many(self, domains: list[str], now: float) -> dict[str, MXRecord]:
+        if not self.use_db or not domains:
+            return {}
+        out: dict[str, MXRecord] = {}
+        try:
+            conn = get_conn()
+            try:
+                _ensure_mx_cache_table(conn)
+                placeholders = ",".join("?" for _ in domains)
+                rows = conn.execute(
+                    "SELECT domain, mx_hosts, preference_map, lowest_mx, failure, resolved_at,"
+                    f" expires_at FROM mx_cache WHERE domain IN ({placeholders})"
+                    " AND expires_at > ?",
+                    (*domains, now),
+                ).fetchall()
+            finally:
+                conn.close()
+        except Exception:
+            log.debug("mx cache: db lookup failed", exc_info=True)
+            return {}
+        for row in rows or []:
+            try:
+                out[str(row[0])] = MXRecord(
+                    domain=str(row[0]),
+                    mx_hosts=tuple(json.loads(row[1] or "[]")),
+                    preference_map=dict(json.loads(row[2] or "{}")),
+                    lowest_mx=row[3],
+                    failure=row[4],
+                    resolved_at=str(row[5] or ""),
+                    expires_at=float(row[6]),
+                    source="db",
+                )
+            except Exception:
+                continue
+        return out
+
+    def _db_put_many(self, recs: list[MXRecord]) -> None:
+        if not self.use_db or not recs:
+            return
+        try:
+            conn = get_conn()
+            try:
+                _ensure_mx_cache_table(conn)
+                for rec in recs:
+                    conn.execute(
+                        """
+                        INSERT INTO mx_cache (
+                            domain, mx_hosts, preference_map, lowest_mx, failure,
+                            resolved_at, expires_at
+                        )
+                        VALUES (?,?,?,?,?,?,?)
+                        ON CONFLICT (domain) DO UPDATE SET
+                            mx_hosts = excluded.mx_hosts,
+                            preference_map = excluded.preference_map,
+                            lowest_mx = excluded.lowest_mx,
+                            failure = excluded.failure,
+                            resolved_at = excluded.resolved_at,
+                            expires_at = excluded.expires_at
+                        """,
+                        (
+                            rec.domain,
+                            json.dumps(list(rec.mx_hosts), ensure_ascii=False),
+                            json.dumps(rec.preference_map, ensure_ascii=False),
+                            rec.lowest_mx,
+                            rec.failure,
+                            rec.resolved_at,
+                            float(rec.expires_at),
+                        ),
+                    )
+                conn.commit()
+            finally:
+                conn.close()
+        except Exception:
+            log.debug("mx cache: db store failed", exc_info=True)
+
+    # ---- public ----------------------------------------------------------
+
+    def get_many(self, domains: Iterable[str]) -> dict[str, MXRecord]:
+        """Fresh entries for the given (normalized) domains; misses are absent."""
+        now = time.time()
+        found: dict[str, MXRecord] = {}
+        pending: list[str] = []
+        for d in dict.fromkeys(domains):
+            rec = self._lru_get(d, now)
+            if rec is not None:
+                found[d] = replace(rec, source="lru")
+            else:
+                pending.append(d)
+
+        from_redis = self._redis_get_many(pending, now)
+        pending = [d for d in pending if d not in from_redis]
+        from_db = self._db_get_many(pending, now)
+        if from_db:
+            self._redis_put_many(list(from_db.values()))
+        for rec in (*from_redis.values(), *from_db.values()):
+            self._lru_put(rec)
+            found[rec.domain] = rec
+
+        with self._lock:
+            for rec in found.values():
+                if rec.source == "lru":
+                    self.stats.lru_hits += 1
+                elif rec.source == "redis":
+                    self.stats.redis_hits += 1
+                else:
+                    self.stats.db_hits += 1
+                if rec.negative:
+                    self.stats.negative_hits += 1
+            self.stats.misses += len(pending) - len(from_db)
+        return found
+
+    def get(self, domain: str) -> MXRecord | None:
+        return self.get_many([domain]).get(domain)
+
+    def put_many(self, recs: Iterable[MXRecord]) -> None:
+        """Store cacheable (ttl > 0) entries in every layer."""
+        batch = [r for r in recs if r.expires_at > time.time()]
+        if not batch:
+            return
+        for rec in batch:
+            self._lru_put(rec)
+        self._redis_put_many(batch)
+        self._db_put_many(batch)
+        with self._lock:
+            self.stats.stores += len(batch)
+
+    def put(self, rec: MXRecord) -> None:
+        self.put_many([rec])
+
+    def invalidate(self, domain: str) -> None:
+        with self._lock:
+            self._lru.pop(domain, None)
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(_REDIS_PREFIX + domain)
+            except Exception:
+                self._redis_failed()
+        if self.use_db:
+            try:
+                conn = get_conn()
+                try:
+                    _ensure_mx_cache_table(conn)
+                    conn.execute("DELETE FROM mx_cache WHERE domain = ?", (domain,))
+                    conn.commit()
+                finally:
+                    conn.close()
+            except Exception:
+                log.debug("mx cache: db invalidate failed", exc_info=True)
+
+    def count_dns_lookups(self, n: int) -> None:
+        with self._lock:
+            self.stats.dns_lookups += n
+
+    def clear_local(self) -> None:
+        with self._lock:
+            self._lru.clear()
+
+
+_default_cache: MXCache | None = None
+_default_lock = threading.Lock()
 
-    # Live resolve
+
+def mx_cache() -> MXCache | None:
+    """Process-wide domain MX cache, or None when MX_CACHE_ENABLED=0."""
+    global _default_cache
+    if not MX_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        with _default_lock:
+            if _default_cache is None:
+                _default_cache = MXCache()
+    return _default_cache
+
+
+def set_mx_cache(cache: MXCache | None) -> None:
+    """Install (or with None, drop) the process-wide cache; used by tests."""
+    global _default_cache
+    _default_cache = cache
+
+
+def mx_cache_stats() -> dict[str, Any]:
+    cache = _default_cache
+    return cache.stats.as_dict() if cache is not None else MXCacheStats().as_dict()
+
+
+def _resolve_live(d: str) -> tuple[list[str], dict[str, int], str | None, str | None, int | None]:
+    """
+    Live DNS resolution for a normalized domain.
+
+    Returns (mx_hosts, preference_map, lowest_mx, failure, dns_ttl); dns_ttl is
+    the MX RRset TTL, or for an A/AAAA fallback the address TTL (the
+    MX_CACHE_MIN_TTL_SEC floor when unknown). None only for patched MX lookups.
+    """
     mx_hosts: list[str] = []
     preference_map: dict[str, int] = {}
     lowest_mx: str | None = None
     failure: str | None = None
+    _dns_local.ttl = None
+    dns_ttl: int | None = None
 
     if _DNSPY_AVAILABLE:
         try:
             pairs = mx_lookup(d)
+            dns_ttl = getattr(_dns_local, "ttl", None)
             # Check for Null MX (single record with ".")
             if len(pairs) == 1 and pairs[0][1] == ".":
                 failure = "null_mx"
@@ -656,6 +1082,8 @@ def resolve_mx(
                 pairs = a_aaaa_fallback(d)
                 if pairs:
                     mx_hosts, preference_map, lowest_mx = _serialize_result(pairs)
+                    # Never cache an implicit MX longer than its address records
+                    dns_ttl = getattr(_dns_local, "ttl", None) or MX_CACHE_MIN_TTL_SEC
                 else:
                     failure = f"mx_lookup_failed:{type(e).__name__}"
             except Exception as e2:
@@ -666,36 +1094,210 @@ def resolve_mx(
             pairs = a_aaaa_fallback(d)
             if pairs:
                 mx_hosts, preference_map, lowest_mx = _serialize_result(pairs)
+                dns_ttl = MX_CACHE_MIN_TTL_SEC  # getaddrinfo reports no TTL
             else:
                 failure = "no_dnspython_no_a_aaaa"
         except Exception as e:
             failure = f"fallback_only_failed:{type(e).__name__}"
 
-    row_id = _upsert_row(
-        conn,
-        company_id,
-        d,
-        mx_hosts=mx_hosts,
+    return mx_hosts, preference_map, lowest_mx, failure, dns_ttl
+
+
+def _resolve_record(d: str, ttl_seconds: int) -> MXRecord:
+    mx_hosts, preference_map, lowest_mx, failure, dns_ttl = _resolve_live(d)
+    return MXRecord(
+        domain=d,
+        mx_hosts=tuple(mx_hosts),
         preference_map=preference_map,
         lowest_mx=lowest_mx,
-        ttl=ttl_seconds,
         failure=failure,
+        resolved_at=_now_iso(),
+        expires_at=time.time() + _record_ttl(failure, dns_ttl, ttl_seconds),
+        source="dns",
     )
 
+
+# -----------------------------
+# Public API
+# -----------------------------
+
+
+def resolve_mx(
+    company_id: int,
+    domain: str,
+    *,
+    force: bool = False,
+    db_path: str | None = None,  # Deprecated, kept for API compatibility
+    ttl_seconds: int = DEFAULT_TTL_SECONDS,
+) -> MXResult:
+    """
+    Resolve MX for a domain with caching in domain_resolutions.
+
+    Behavior:
+      - Try cache if not forced, not failed, and within TTL.
+      - Otherwise take the domain-keyed cache entry (resolve_mx_domain), so a
+        domain seen for another company costs no DNS lookup.
+      - Resolve MX via dnspython (if available), sorted by (pref ASC, host ASC).
+      - **Null MX** (single record with host ".") → failure="null_mx" and *no* A/AAAA fallback.
+      - On MX failure (non-null), try A/AAAA fallback: treat domain as MX with pref 0 if present.
+      - On full failure, record failure string and empty hosts.
+    """
+    d = norm_domain(domain) or ""
+    if not d:
+        return MXResult(
+            row_id=0,
+            company_id=company_id,
+            domain=domain or "",
+            mx_hosts=[],
+            preference_map={},
+            lowest_mx=None,
+            resolved_at=_now_iso(),
+            ttl=ttl_seconds,
+            failure="invalid_domain",
+            cached=False,
+        )
+
+    conn = get_conn()
+    try:
+        _ensure_table(conn)
+
+        now_epoch = _utc_now_epoch()
+        row = _select_row(conn, company_id, d)
+
+        if row and _should_use_cache(row, now_epoch, force):
+            # Deserialize from cached row
+            try:
+                mx_hosts = json.loads(row.get("mx_hosts") or "[]")
+            except Exception:
+                mx_hosts = []
+            try:
+                preference_map = json.loads(row.get("preference_map") or "{}")
+            except Exception:
+                preference_map = {}
+            return MXResult(
+                row_id=int(row.get("id") or 0),
+                company_id=int(row.get("company_id") or company_id),
+                domain=row.get("domain") or d,
+                mx_hosts=mx_hosts,
+                preference_map=preference_map,
+                lowest_mx=row.get("lowest_mx"),
+                resolved_at=row.get("resolved_at") or "",
+                ttl=int(row.get("ttl") or ttl_seconds),
+                failure=row.get("failure"),
+                cached=True,
+            )
+
+        # Domain-keyed cache (another company may have resolved it), else live DNS
+        rec = resolve_mx_domain(d, force=force, ttl_seconds=ttl_seconds)
+        assert rec is not None  # d is a valid normalized domain
+        ttl = rec.ttl if rec.ttl > 0 else ttl_seconds
+
+        row_id = _upsert_row(
+            conn,
+            company_id,
+            d,
+            mx_hosts=list(rec.mx_hosts),
+            preference_map=dict(rec.preference_map),
+            lowest_mx=rec.lowest_mx,
+            ttl=ttl,
+            failure=rec.failure,
+        )
+    finally:
+        try:
+            conn.close()
+        except Exception:
+            pass
+
     return MXResult(
         row_id=row_id,
         company_id=company_id,
         domain=d,
-        mx_hosts=mx_hosts,
-        preference_map=preference_map,
-        lowest_mx=lowest_mx,
-        resolved_at=_now_iso(),
-        ttl=ttl_seconds,
-        failure=failure,
-        cached=False,
+        mx_hosts=list(rec.mx_hosts),
+        preference_map=dict(rec.preference_map),
+        lowest_mx=rec.lowest_mx,
+        resolved_at=rec.resolved_at,
+        ttl=ttl,
+        failure=rec.failure,
+        cached=rec.source != "dns",
     )
 
 
+def resolve_mx_domain(
+    domain: str,
+    *,
+    force: bool = False,
+    ttl_seconds: int = DEFAULT_TTL_SECONDS,
+) -> MXRecord | None:
+    """
+    Domain-level MX resolution through the shared cache (no per-company rows).
+
+    Returns None for an empty/invalid domain. With force=True the cache is
+    bypassed for the lookup but still refreshed with the new answer.
+    """
+    d = norm_domain(domain)
+    if not d:
+        return None
+    cache = mx_cache()
+    if cache is not None and not force:
+        rec = cache.get(d)
+        if rec is not None:
+            return rec
+    rec = _resolve_record(d, ttl_seconds)
+    if cache is not None:
+        cache.count_dns_lookups(1)
+        cache.put(rec)
+    return rec
+
+
+def resolve_mx_many(
+    domains: Iterable[str],
+    *,
+    force: bool = False,
+    ttl_seconds: int = DEFAULT_TTL_SECONDS,
+    max_workers: int | None = None,
+) -> dict[str, MXRecord]:
+    """
+    Resolve many domains at once, keyed by normalized domain.
+
+    Cached answers are fetched in one pass per layer (LRU, Redis MGET, one
+    IN (...) query); the remaining domains are resolved concurrently on up to
+    MX_RESOLVE_CONCURRENCY threads and written back in one batch. Invalid
+    domains are omitted.
+    """
+    wanted = list(dict.fromkeys(d for d in (norm_domain(x) for x in domains) if d))
+    if not wanted:
+        return {}
+    cache = mx_cache()
+    found: dict[str, MXRecord] = {}
+    if cache is not None and not force:
+        found = cache.get_many(wanted)
+    pending = [d for d in wanted if d not in found]
+
+    if pending:
+        workers = max(1, min(len(pending), max_workers or MX_RESOLVE_CONCURRENCY))
+        if workers == 1:
+            fresh = [_resolve_record(d, ttl_seconds) for d in pending]
+        else:
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="mx") as pool:
+                fresh = list(pool.map(lambda d: _resolve_record(d, ttl_seconds), pending))
+        if cache is not None:
+            cache.count_dns_lookups(len(fresh))
+            cache.put_many(fresh)
+        found.update((rec.domain, rec) for rec in fresh)
+
+    return {d: found[d] for d in wanted}
+
+
+def prefetch(domains: Iterable[str], *, force: bool = False) -> dict[str, str | None]:
+    """
+    Warm the domain MX cache for many domains (e.g. all domains at run start).
+
+    Returns domain -> lowest MX. The Redis / mx_cache layers make the answers
+    visible to every worker; cached domains cost no DNS lookup.
+    """
+    return {d: rec.lowest_mx for d, rec in resolve_mx_many(domains, force=force).items()}
+
+
 def get_cached_mx(company_id: int, domain: str) -> MXResult | None:
     """
     Return cached MX result if available and not expired.
@@ -877,15 +1479,16 @@ def _percentile(vals: list[int], p: float) -> int:
 
 def _update_latest_resolution_behavior(
     domain: str, behavior: dict | None, *, db_path: str | None = None
-) -> None:
+) -> bool:
     """
     Write a JSON summary into the most-recent domain_resolutions row for this
-    domain, ordered by resolved_at (ties broken by id).
+    domain, ordered by resolved_at (ties broken by id). Returns False when
+    there is no such row (or nothing was written).
 
     Note: db_path parameter is deprecated. Uses get_conn() for PostgreSQL.
     """
     if not behavior:
-        return
+        return False
 
     try:
         payload = json.dumps(behavior, ensure_ascii=False)
@@ -893,7 +1496,7 @@ def _update_latest_resolution_behavior(
 
         cols = _table_columns(conn, "domain_resolutions")
         if "mx_behavior" not in cols or "resolved_at" not in cols:
-            return
+            return False
 
         domain_col = _get_domain_column(conn)
 
@@ -917,9 +1520,11 @@ def _update_latest_resolution_behavior(
                 (payload, int(row_id)),
             )
             conn.commit()
+            return True
     except Exception:
         # best-effort; do not raise
         pass
+    return False
 
 
 # -----------------------------
@@ -972,40 +1577,34 @@ class MXInfo:
 def get_or_resolve_mx(domain: str, *, force: bool = False, db_path: str | None = None) -> MXInfo:
     """
     Lightweight helper used by R16 to get lowest_mx plus a behavior hint.
-    Falls back to bare DNS if your R15 resolver isn't available.
-    Also writes the summarized hint into domain_resolutions.mx_behavior (best-effort).
+    MX comes from the domain-keyed cache (resolve_mx_domain); falls back to
+    bare DNS if that fails. Also writes the summarized hint into
+    domain_resolutions.mx_behavior (best-effort); a domain no company has
+    resolved yet gets a company_id=0 row to carry it.
 
     Note: db_path parameter is deprecated. Uses get_conn() for PostgreSQL.
     """
     d = (domain or "").strip().lower()
-    from importlib import import_module
 
     lowest = None
     try:
-        # Prefer your R15 resolver if present
-        mod = import_module("src.resolve.mx")
-        if hasattr(mod, "resolve_mx"):
-            res = mod.resolve_mx(company_id=0, domain=d, force=force)
-            lowest = getattr(res, "lowest_mx", None) or d
-        else:
-            raise ImportError
+        rec = resolve_mx_domain(d, force=force)
+        lowest = (rec.lowest_mx if rec is not None else None) or d
     except Exception:
         # Bare DNS fallback
         try:
-            import dns.resolver as _dr
-
-            answers = _dr.resolve(d, "MX")
-            pairs = sorted(
-                [(r.exchange.to_text(omit_final_dot=True), r.preference) for r in answers],
-                key=lambda x: x[1],
-            )
-            lowest = pairs[0][0]
+            ans = dns_client.query(d, "MX")
+            lowest = min(ans.records)[1] if ans.ok else d
         except Exception:
             lowest = d
 
     hint = get_mx_behavior_hint(lowest or d)
     try:
-        _update_latest_resolution_behavior(d, hint)
+        if not _update_latest_resolution_behavior(d, hint) and hint and norm_domain(d):
+            # First sighting of the domain: resolve_mx fills the row from the
+            # domain cache (no DNS round-trip), then the hint can be stored
+            resolve_mx(0, d)
+            _update_latest_resolution_behavior(d, hint)
     except Exception:
         pass
     return MXInfo(lowest_mx=lowest, mx_behavior=hint)
@@ -168,7 +168,6 @@ class PostgresSearchBackend:
         self._default_tenant_id = (
             default_tenant_id or os.getenv("TENANT_ID") or "dev"
         ).strip() or "dev"
-        self._cols_cache: dict[str, set[str]] = {}
 
     # ----------------------------
     # Introspection / utilities
@@ -178,8 +177,11 @@ class PostgresSearchBackend:
         t = (table or "").strip()
         if not t:
             return set()
-        if t in self._cols_cache:
-            return self._cols_cache[t]
+        from src.db import cached_schema  # local import to avoid cycles
+
+        snap = cached_schema(self._conn)
+        if snap is not None:
+            return set(snap.column_names(t))
 
         cols: set[str] = set()
         try:
@@ -191,8 +193,6 @@ class PostgresSearchBackend:
                     cols.add(str(r[1]))
         except Exception:
             cols = set()
-
-        self._cols_cache[t] = cols
         return cols
 
     def cache_namespace(self) -> str:
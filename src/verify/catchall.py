@@ -13,7 +13,8 @@ Behavior:
     * Ensures MX is resolved via src.resolve.mx.get_or_resolve_mx().
     * If no MX/host -> status="no_mx" (no SMTP call).
     * Generates a random local-part (_ca_<hex>).
-    * Uses _smtp_probe_random_address(mx_host, domain, localpart) to probe.
+    * Uses _smtp_probe_random_address(mx_host, domain, localpart) to probe
+      (over the caller's SmtpSession when one is passed for the same MX).
     * Classifies the result into:
         - "catch_all"      (2xx)
         - "not_catch_all"  (5xx)
@@ -289,10 +290,16 @@ def _smtp_probe_random_address(
     mx_host: str,
     domain: str,
     localpart: str,
+    *,
+    session: smtp_mod.SmtpSession | None = None,
 ) -> tuple[int | None, bytes | None, float, str | None]:
     """
     Low-level SMTP probe used by R17.
 
+    If ``session`` is given (an open SmtpSession to the same MX), the random
+    address is probed over that connection instead of a fresh one, so the
+    catch-all check and the real permutations share a single handshake.
+
     HARD GUARDRAIL:
       This is a TCP/25 operation. It must be blocked on non-approved hosts.
 
@@ -305,15 +312,19 @@ def _smtp_probe_random_address(
     email = f"{localpart}@{domain}"
     started = time.perf_counter()
     try:
-        res: dict[str, Any] = smtp_mod.probe_rcpt(
-            email,
-            mx_host,
-            helo_domain=SMTP_HELO_DOMAIN,
-            mail_from=SMTP_MAIL_FROM,
-            connect_timeout=SMTP_CONNECT_TIMEOUT,
-            command_timeout=SMTP_COMMAND_TIMEOUT,
-            behavior_hint=None,
-        )
+        res: dict[str, Any]
+        if session is not None:
+            res = session.rcpt(email)
+        else:
+            res = smtp_mod.probe_rcpt(
+                email,
+                mx_host,
+                helo_domain=SMTP_HELO_DOMAIN,
+                mail_from=SMTP_MAIL_FROM,
+                connect_timeout=SMTP_CONNECT_TIMEOUT,
+                command_timeout=SMTP_COMMAND_TIMEOUT,
+                behavior_hint=None,
+            )
         code = res.get("code")
         msg = res.get("message")
         error = res.get("error")
@@ -353,6 +364,7 @@ def check_catchall_for_domain(
     domain: str,
     *,
     force: bool = False,
+    session: smtp_mod.SmtpSession | None = None,
 ) -> CatchallResult:
     """
     Check whether a domain behaves as catch-all via SMTP RCPT probe.
@@ -361,6 +373,8 @@ def check_catchall_for_domain(
       - Reads / writes domain_resolutions.catch_all_* (cached verdict).
       - Respects a 24h TTL (CATCHALL_TTL_SECONDS), unless force=True.
       - Uses R15/O06 MX resolution and this module's SMTP probe helper.
+      - Reuses ``session`` for the random-address probe when it targets the
+        resolved MX host (ignored otherwise).
     """
     dom = (domain or "").strip().lower()
     if not dom or "@" in dom:
@@ -453,11 +467,11 @@ def check_catchall_for_domain(
 
     # Generate random local-part and probe via helper (tests monkeypatch this)
     localpart = f"_ca_{secrets.token_hex(8)}"
-    code, msg_bytes, probe_elapsed_ms, error = _smtp_probe_random_address(
-        mx_host,
-        dom,
-        localpart,
-    )
+    if session is not None and session.mx_host.lower() == str(mx_host).lower():
+        probe = _smtp_probe_random_address(mx_host, dom, localpart, session=session)
+    else:
+        probe = _smtp_probe_random_address(mx_host, dom, localpart)
+    code, msg_bytes, probe_elapsed_ms, error = probe
 
     status = _classify_from_probe(code, error)
 
@@ -0,0 +1,315 @@
+# src/verify/result_cache.py
+"""
+Global (cross-tenant) verification result cache.
+
+verification_results is scoped per tenant and only consulted per email row,
+so the same address is re-probed whenever another tenant or another run
+generates it. This cache remembers the canonical outcome of a probe for any
+address, shared by every worker through Redis, so the probe paths in
+src.queueing.tasks can answer from it before taking SMTP throttles.
+
+Privacy:
+  - Entries are keyed by HMAC-SHA-256 over the normalized address; the
+    address itself is never stored. The key is VERIFY_CACHE_SALT, else one
+    derived from AUTH_HS256_SECRET. A bare SHA-256 could be reversed by
+    hashing a candidate address list, so with neither set the cache is off.
+  - Values hold only verify_status / verify_reason, the MX host, the
+    domain's catch-all state and the verification timestamp — no tenant,
+    email id or person data.
+
+TTLs are per status: a 5xx ("invalid") stays true for a long time, while an
+"unknown_timeout" is worth remembering only briefly. Statuses without a TTL
+(legacy "unknown", "error", ...) are never cached.
+
+Hit-rate metrics: per-process counters in VerificationCache.stats, and
+fleet-wide counters in the Redis hash "vcache:stats" (fleet_stats()).
+
+Env:
+  VERIFY_CACHE_ENABLED                 "0" disables the cache (default on)
+  VERIFY_CACHE_SALT                    HMAC key for address hashes (falls back to a
+                                       key derived from AUTH_HS256_SECRET)
+  VERIFY_CACHE_TTL_VALID_SEC           default 7 days
+  VERIFY_CACHE_TTL_INVALID_SEC         default 30 days
+  VERIFY_CACHE_TTL_RISKY_CATCH_ALL_SEC default 3 days
+  VERIFY_CACHE_TTL_UNKNOWN_TIMEOUT_SEC default 15 minutes
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import hashlib
+import hmac
+import logging
+import os
+import threading
+from dataclasses import dataclass
+from typing import Any
+
+from src.queueing.redis_conn import get_redis
+
+log = logging.getLogger(__name__)
+
+VERIFY_CACHE_ENABLED = os.getenv("VERIFY_CACHE_ENABLED", "1").strip().lower() not in {
+    "0",
+    "false",
+    "no",
+}
+VERIFY_CACHE_SALT = os.getenv("VERIFY_CACHE_SALT", "")
+
+DEFAULT_TTLS: dict[str, int] = {
+    "valid": int(os.getenv("VERIFY_CACHE_TTL_VALID_SEC", str(7 * 86400))),
+    "invalid": int(os.getenv("VERIFY_CACHE_TTL_INVALID_SEC", str(30 * 86400))),
+    "risky_catch_all": int(os.getenv("VERIFY_CACHE_TTL_RISKY_CATCH_ALL_SEC", str(3 * 86400))),
+    "unknown_timeout": int(os.getenv("VERIFY_CACHE_TTL_UNKNOWN_TIMEOUT_SEC", "900")),
+}
+
+_KEY_PREFIX = "vcache:v1:"
+_STATS_KEY = "vcache:stats"
+
+
+def normalize_address(email: str | None) -> str | None:
+    """Lower-cased, trimmed address, or None when it is not user@domain."""
+    addr = (email or "").strip().lower()
+    local, sep, domain = addr.rpartition("@")
+    if not sep or not local or not domain:
+        return None
+    return addr
+
+
+def default_salt() -> str:
+    """HMAC key for address hashes: VERIFY_CACHE_SALT, else derived from AUTH_HS256_SECRET."""
+    if VERIFY_CACHE_SALT:
+        return VERIFY_CACHE_SALT
+    secret = os.getenv("AUTH_HS256_SECRET", "").strip()
+    if not secret:
+        return ""
+    return hmac.new(secret.encode("utf-8"), b"vcache:address-key", hashlib.sha256).hexdigest()
+
+
+def address_hash(email: str | None, *, salt: str | None = None) -> str | None:
+    """
+    Keyed hex digest identifying ``email`` in the cache (None for malformed input).
+    Raises ValueError without a key: an unkeyed hash would expose the address.
+    """
+    key = default_salt() if salt is None else salt
+    if not key:
+        raise ValueError("address_hash requires VERIFY_CACHE_SALT or AUTH_HS256_SECRET")
+    addr = normalize_address(email)
+    if addr is None:
+        return None
+    return hmac.new(key.encode("utf-8"), addr.encode("utf-8"), hashlib.sha256).hexdigest()
+
+
+# --------------------------------------------------------------------------------------
+# Entries / stats
+# --------------------------------------------------------------------------------------
+
+
+@dataclass(frozen=True)
+class CachedVerification:
+    verify_status: str
+    verify_reason: str | None = None
+    mx_host: str | None = None
+    catch_all_status: str | None = None
+    verified_at: str | None = None
+
+
+@dataclass
+class VerifyCacheStats:
+    hits: int = 0
+    misses: int = 0
+    stores: int = 0
+    skipped: int = 0  # puts with a status that has no TTL
+    errors: int = 0  # Redis failures (treated as misses / dropped stores)
+
+    def as_dict(self) -> dict[str, Any]:
+        out: dict[str, Any] = dataclasses.asdict(self)
+        lookups = self.hits + self.misses
+        out["hit_ratio"] = (self.hits / lookups) if lookups else 0.0
+        return out
+
+
+def _decode(val: Any) -> str | None:
+    if val is None:
+        return None
+    if isinstance(val, bytes):
+        val = val.decode("utf-8", "replace")
+    return str(val) or None
+
+
+# --------------------------------------------------------------------------------------
+# Cache
+# --------------------------------------------------------------------------------------
+
+
+class VerificationCache:
+    """Redis-backed address -> CachedVerification map with per-status TTLs."""
+
+    def __init__(
+        self,
+        redis: Any,
+        *,
+        ttls: dict[str, int] | None = None,
+        salt: str | None = None,
+    ):
+        self.redis = redis
+        self.ttls = dict(DEFAULT_TTLS if ttls is None else ttls)
+        self.salt = default_salt() if salt is None else salt
+        if not self.salt:
+            raise ValueError("VerificationCache requires VERIFY_CACHE_SALT or AUTH_HS256_SECRET")
+        self.stats = VerifyCacheStats()
+        self._lock = threading.Lock()
+
+    def _key(self, email: str | None) -> str | None:
+        digest = address_hash(email, salt=self.salt)
+        return None if digest is None else _KEY_PREFIX + digest
+
+    def _count(self, field: str) -> None:
+        with self._lock:
+            setattr(self.stats, field, getattr(self.stats, field) + 1)
+
+    def get(self, email: str | None) -> CachedVerification | None:
+        key = self._key(email)
+        if key is None:
+            return None
+        try:
+            raw = self.redis.hgetall(key)
+            outcome = "hits" if raw else "misses"
+            self.redis.hincrby(_STATS_KEY, outcome, 1)
+        except Exception:
+            log.debug("verification cache lookup failed", exc_info=True)
+            self._count("errors")
+            self._count("misses")
+            return None
+        self._count(outcome)
+        if not raw:
+            return None
+        fields = {_decode(k): _decode(v) for k, v in raw.items()}
+        status = fields.get("verify_status")
+        if not status:
+            return None
+        return CachedVerification(
+            verify_status=status,
+            verify_reason=fields.get("verify_reason"),
+            mx_host=fields.get("mx_host"),
+            catch_all_status=fields.get("catch_all_status"),
+            verified_at=fields.get("verified_at"),
+        )
+
+    def put(
+        self,
+        email: str | None,
+        *,
+        verify_status: str | None,
+        verify_reason: str | None = None,
+        mx_host: str | None = None,
+        catch_all_status: str | None = None,
+        verified_at: str | None = None,
+    ) -> bool:
+        """Store an outcome; returns False when the status is not cacheable."""
+        key = self._key(email)
+        ttl = self.ttls.get((verify_status or "").strip().lower(), 0)
+        if key is None or ttl <= 0:
+            self._count("skipped")
+            return False
+        mapping = {
+            "verify_status": (verify_status or "").strip().lower(),
+            "verify_reason": verify_reason or "",
+            "mx_host": (mx_host or "").strip().lower(),
+            "catch_all_status": catch_all_status or "",
+            "verified_at": verified_at or "",
+        }
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            pipe.delete(key)
+            pipe.hset(key, mapping=mapping)
+            pipe.expire(key, int(ttl))
+            pipe.hincrby(_STATS_KEY, "stores", 1)
+            pipe.execute()
+        except Exception:
+            log.debug("verification cache store failed", exc_info=True)
+            self._count("errors")
+            return False
+        self._count("stores")
+        return True
+
+    def invalidate(self, email: str | None) -> None:
+        key = self._key(email)
+        if key is None:
+            return
+        try:
+            self.redis.delete(key)
+        except Exception:
+            self._count("errors")
+
+    def fleet_stats(self) -> dict[str, Any]:
+        """Counters summed over every worker sharing this Redis."""
+        try:
+            raw = self.redis.hgetall(_STATS_KEY) or {}
+        except Exception:
+            raw = {}
+        counts = {_decode(k): int(_decode(v) or 0) for k, v in raw.items()}
+        hits, misses = counts.get("hits", 0), counts.get("misses", 0)
+        return {
+            "hits": hits,
+            "misses": misses,
+            "stores": counts.get("stores", 0),
+            "hit_ratio": (hits / (hits + misses)) if (hits + misses) else 0.0,
+        }
+
+
+# --------------------------------------------------------------------------------------
+# Module-level default
+# --------------------------------------------------------------------------------------
+
+_default_cache: VerificationCache | None = None
+_default_lock = threading.Lock()
+_warned_no_salt = False
+
+
+def default() -> VerificationCache | None:
+    """
+    Process-wide cache on the queue Redis, or None when disabled / unavailable
+    or when no hashing key is configured (warned once per process).
+    """
+    global _default_cache, _warned_no_salt
+    if not VERIFY_CACHE_ENABLED:
+        return None
+    if _default_cache is None:
+        if not default_salt():
+            if not _warned_no_salt:
+                _warned_no_salt = True
+                log.warning(
+                    "verification cache disabled: set VERIFY_CACHE_SALT (or AUTH_HS256_SECRET)"
+                )
+            return None
+        with _default_lock:
+            if _default_cache is None:
+                try:
+                    _default_cache = VerificationCache(get_redis())
+                except Exception:
+                    return None
+    return _default_cache
+
+
+def set_default(cache: VerificationCache | None) -> None:
+    """Install (or with None, drop) the process-wide cache; used by tests."""
+    global _default_cache
+    _default_cache = cache
+
+
+def lookup(email: str | None) -> CachedVerification | None:
+    cache = default()
+    return cache.get(email) if cache is not None else None
+
+
+def store(email: str | None, **fields: Any) -> bool:
+    cache = default()
+    return cache.put(email, **fields) if cache is not None else False
+
+
+def stats() -> dict[str, Any]:
+    cache = _default_cache
+    out = cache.stats.as_dict() if cache is not None else VerifyCacheStats().as_dict()
+    out["fleet"] = cache.fleet_stats() if cache is not None else {}
+    return out
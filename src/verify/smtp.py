@@ -14,6 +14,8 @@ Public function:
         behavior_hint: dict | None = None,
     ) -> dict
 
+    SmtpSession(mx_host, *, helo_domain, mail_from, ...).rcpt_many([...]) -> list[dict]
+
 Responsibilities:
 - Light email normalization (trim, split, IDNA for domain; preserve local-part case).
 - Require a non-empty MX host.
@@ -24,6 +26,8 @@ Responsibilities:
 - Classify the response into: accept | hard_fail | temp_fail | unknown.
 - Always record behavior stats (O06) via a behavior hook.
 - Return a structured dict suitable for logging and later persistence (R18).
+- SmtpSession reuses one connection (and MAIL transaction) for many RCPTs to
+  the same MX, resetting with RSET between batches; results match probe_rcpt.
 
 Notes:
 - Local-part is case-preserving; domain-part is lowercased and IDNA-encoded.
@@ -39,6 +43,8 @@ import smtplib
 import socket
 import sys
 import time
+from collections.abc import Callable, Sequence
+from contextlib import AbstractContextManager
 from typing import Any
 
 from src.config import (
@@ -48,7 +54,9 @@ from src.config import (
     SMTP_PREFLIGHT_ENABLED,
     SMTP_PREFLIGHT_MAX_ADDRS,
     SMTP_PREFLIGHT_TIMEOUT_SECONDS,
+    SMTP_SESSION_MAX_RCPT_PER_TXN,
 )
+from src.resolve import dns_client
 
 try:  # pragma: no cover
     from src.verify.preflight import (
@@ -353,6 +361,10 @@ def _preflight_port25(mx_host: str) -> tuple[bool, str | None]:
 def _resolve_mx_ips(mx_host: str, *, prefer_ipv4: bool, max_addrs: int) -> list[str]:
     """
     Resolve MX host into a bounded list of IPs we will attempt.
+
+    A and AAAA are queried in parallel through the shared DNS client
+    (src.resolve.dns_client), so every probe to the same MX within the record
+    TTL reuses the answer.
     """
     # For test scenarios with fake domains, return host directly
     mx_lower = mx_host.lower()
@@ -361,26 +373,117 @@ def _resolve_mx_ips(mx_host: str, *, prefer_ipv4: bool, max_addrs: int) -> list[
         return [mx_host]
 
     try:
-        infos = socket.getaddrinfo(mx_host, 25, type=socket.SOCK_STREAM)
-    except OSError:
-        # If DNS fails, return the host directly
-        return [mx_host]
+        ips = dns_client.host_addresses(
+            mx_host, prefer_ipv4=prefer_ipv4, max_addrs=max(1, int(max_addrs))
+        )
+    except Exception:
+        ips = []
+    # If DNS fails, return the host directly
+    return ips or [mx_host]
 
-    # Prefer IPv4 first to match common consumer-network behavior
-    if prefer_ipv4:
-        infos = sorted(infos, key=lambda a: 0 if a[0] == socket.AF_INET else 1)
 
-    ips: list[str] = []
-    seen: set[str] = set()
-    for _family, _socktype, _proto, _canon, sockaddr in infos:
-        ip = sockaddr[0]
-        if ip in seen:
+# --- Connection helpers (shared by probe_rcpt and SmtpSession) ---------------
+
+
+def _connect_smtp(
+    mx_host: str,
+    *,
+    helo_domain: str,
+    c_to: float,
+    cmd_to: float,
+) -> smtplib.SMTP:
+    """
+    Open an SMTP connection to the first reachable IP of mx_host.
+
+    Bounds how many IPs we attempt (prevents N× connect timeout); connecting to
+    an IP explicitly avoids smtplib/socket walking all A/AAAA records.
+    Raises the last connect error if none succeed.
+    """
+    ips = _resolve_mx_ips(
+        mx_host,
+        prefer_ipv4=bool(SMTP_PREFER_IPV4),
+        max_addrs=int(SMTP_MX_MAX_ADDRS),
+    ) or [mx_host]
+
+    last_connect_exc: Exception | None = None
+    for ip in ips:
+        smtp: smtplib.SMTP | None = None
+        try:
+            smtp = smtplib.SMTP(
+                host=ip,
+                port=25,
+                local_hostname=helo_domain,
+                timeout=c_to,
+            )
+            _set_sock_timeout(smtp, cmd_to)
+            return smtp
+        except (TimeoutError, OSError, smtplib.SMTPException) as exc:
+            last_connect_exc = exc
+            try:
+                if smtp is not None:
+                    with socket_timeout_guard(0.5):
+                        smtp.close()
+            except Exception:
+                pass
             continue
-        seen.add(ip)
-        ips.append(ip)
-        if len(ips) >= max_addrs:
-            break
-    return ips
+
+    if last_connect_exc is None:
+        raise TimeoutError("connect_failed")
+    raise last_connect_exc
+
+
+def _set_sock_timeout(smtp: smtplib.SMTP, cmd_to: float) -> None:
+    try:
+        if smtp.sock is not None:
+            smtp.sock.settimeout(cmd_to)
+    except Exception:
+        pass
+
+
+def _greet(smtp: smtplib.SMTP, *, cmd_to: float) -> None:
+    """EHLO (HELO fallback); opportunistic STARTTLS followed by a second EHLO."""
+    try:
+        smtp.ehlo()
+    except smtplib.SMTPHeloError:
+        smtp.helo()
+
+    try:
+        if hasattr(smtp, "has_extn") and smtp.has_extn("starttls"):
+            smtp.starttls()
+            _set_sock_timeout(smtp, cmd_to)
+            smtp.ehlo()
+    except (OSError, smtplib.SMTPException):
+        # STARTTLS failures are treated as non-fatal; proceed in plain.
+        pass
+
+
+def _quit_quietly(smtp: smtplib.SMTP | None) -> None:
+    try:
+        if smtp is not None:
+            with socket_timeout_guard(1.0):
+                smtp.quit()
+    except Exception:
+        pass
+
+
+def _map_smtp_exception(exc: BaseException) -> tuple[int | None, str, str, str]:
+    """
+    Map an exception raised during the SMTP conversation to
+    (code, message, category, error_str).
+    """
+    if isinstance(exc, TimeoutError):
+        return None, "", "temp_fail", f"timeout:{exc}"
+    if isinstance(exc, smtplib.SMTPResponseException):
+        code = int(getattr(exc, "smtp_code", None) or 0) or None
+        msg = _decode_msg(getattr(exc, "smtp_error", b""))
+        return code, msg, _classify(code), f"smtp_response:{code}"
+    if isinstance(exc, smtplib.SMTPServerDisconnected):
+        text = str(exc) or ""
+        kind = "timeout" if "timed out" in text.lower() else "disconnected"
+        return None, "", "temp_fail", f"{kind}:{exc}"
+    if isinstance(exc, smtplib.SMTPException):
+        return None, "", "temp_fail", f"smtp_error:{exc}"
+    return None, "", "temp_fail", f"error:{type(exc).__name__}:{exc}"
 
 
 # --- Public API ---------------------------------------------------------------
@@ -468,66 +571,9 @@ def probe_rcpt(  # noqa: C901
     error_str: str | None = None
     category: str = "unknown"
 
-    # Bound how many IPs we attempt for this MX (prevents NÃ— connect timeout)
-    ips = _resolve_mx_ips(
-        mx_host,
-        prefer_ipv4=bool(SMTP_PREFER_IPV4),
-        max_addrs=int(SMTP_MX_MAX_ADDRS),
-    ) or [mx_host]
-
-    last_connect_exc: Exception | None = None
-
     try:
-        # Try up to N IPs explicitly; connect to IP avoids smtplib/socket walking all A/AAAA.
-        for ip in ips:
-            try:
-                smtp = smtplib.SMTP(
-                    host=ip,
-                    port=25,
-                    local_hostname=helo_domain,
-                    timeout=c_to,
-                )
-                try:
-                    if smtp.sock is not None:
-                        smtp.sock.settimeout(cmd_to)
-                except Exception:
-                    pass
-                last_connect_exc = None
-                break
-            except (TimeoutError, OSError, smtplib.SMTPException) as exc:
-                last_connect_exc = exc
-                try:
-                    if smtp is not None:
-                        with socket_timeout_guard(0.5):
-                            smtp.close()
-                except Exception:
-                    pass
-                smtp = None
-                continue
-
-        if smtp is None:
-            # Re-raise to be handled uniformly below.
-            if last_connect_exc is None:
-                raise TimeoutError("connect_failed")
-            raise last_connect_exc
-
-        try:
-            smtp.ehlo()
-        except smtplib.SMTPHeloError:
-            smtp.helo()
-
-        try:
-            if hasattr(smtp, "has_extn") and smtp.has_extn("starttls"):
-                smtp.starttls()
-                try:
-                    if smtp.sock is not None:
-                        smtp.sock.settimeout(cmd_to)
-                except Exception:
-                    pass
-                smtp.ehlo()
-        except (OSError, smtplib.SMTPException):
-            # STARTTLS failures are treated as non-fatal; proceed in plain.
-            pass
+        smtp = _connect_smtp(mx_host, helo_domain=helo_domain, c_to=c_to, cmd_to=cmd_to)
+        _greet(smtp, cmd_to=cmd_to)
 
         mail_code, mail_resp = smtp.mail(mail_from)
         _ = (mail_code, mail_resp)
@@ -538,42 +584,10 @@ def probe_rcpt(  # noqa: C901
         category = _classify(rcpt_code)
         error_str = None
 
-    except TimeoutError as exc:
-        error_str = f"timeout:{exc}"
-        category = "temp_fail"
-        rcpt_code = None
-        rcpt_msg = ""
-    except smtplib.SMTPResponseException as exc:
-        rcpt_code = int(getattr(exc, "smtp_code", None) or 0) or None
-        rcpt_msg = _decode_msg(getattr(exc, "smtp_error", b""))
-        category = _classify(rcpt_code)
-        error_str = f"smtp_response:{rcpt_code}"
-    except smtplib.SMTPServerDisconnected as exc:
-        msg = str(exc) or ""
-        if "timed out" in msg.lower():
-            error_str = f"timeout:{exc}"
-        else:
-            error_str = f"disconnected:{exc}"
-        category = "temp_fail"
-        rcpt_code = None
-        rcpt_msg = ""
-    except smtplib.SMTPException as exc:
-        error_str = f"smtp_error:{exc}"
-        category = "temp_fail"
-        rcpt_code = None
-        rcpt_msg = ""
     except Exception as exc:
-        error_str = f"error:{type(exc).__name__}:{exc}"
-        category = "temp_fail"
-        rcpt_code = None
-        rcpt_msg = ""
+        rcpt_code, rcpt_msg, category, error_str = _map_smtp_exception(exc)
     finally:
-        try:
-            if smtp is not None:
-                with socket_timeout_guard(1.0):
-                    smtp.quit()
-        except Exception:
-            pass
+        _quit_quietly(smtp)
 
     elapsed_ms = int((time.monotonic() - started) * 1000)
 
@@ -601,6 +615,288 @@ def probe_rcpt(  # noqa: C901
     }
 
 
+# --- Session-oriented prober --------------------------------------------------
+
+
+class SmtpSession:
+    """
+    One SMTP connection to one MX, reused for many RCPT TO probes.
+
+    probe_rcpt() pays for DNS, the port-25 preflight, EHLO, STARTTLS and
+    MAIL FROM on every address. A session does that once: it connects lazily
+    on the first probe, then issues up to ``max_rcpt_per_txn`` RCPTs inside a
+    single MAIL transaction, sending RSET + MAIL FROM between batches.
+
+    Each address still produces exactly one record_behavior() call and a
+    result dict with the same shape as probe_rcpt(). A dropped connection
+    fails the in-flight address (temp_fail) and the next probe reconnects.
+
+    ``slot`` is an optional zero-arg factory returning a context manager
+    (e.g. ``lambda: per_mx_slot(mx, redis=r)``). It is entered when the
+    connection opens and exited when it closes, so a session holds exactly
+    one per-MX concurrency lease for as long as it talks to the server.
+    ``renew_slot`` (called with the slot's ``__enter__`` value) extends that
+    lease before a probe once ``renew_every_s`` has passed; if the lease was
+    already lost, the session drops the connection and reconnects under a
+    fresh slot rather than probing past the per-MX cap.
+
+    Usage:
+
+        with SmtpSession(mx, helo_domain=..., mail_from=...) as sess:
+            results = sess.rcpt_many(["a@x.com", "b@x.com"])
+    """
+
+    def __init__(
+        self,
+        mx_host: str,
+        *,
+        helo_domain: str,
+        mail_from: str,
+        connect_timeout: float = 20.0,
+        command_timeout: float = 20.0,
+        behavior_hint: dict | None = None,
+        max_rcpt_per_txn: int | None = None,
+        slot: Callable[[], AbstractContextManager[Any]] | None = None,
+        renew_slot: Callable[[Any], bool] | None = None,
+        renew_every_s: float = 30.0,
+    ) -> None:
+        if not (mx_host or "").strip():
+            raise ValueError("mx_host_required")
+        self.mx_host = mx_host
+        self.helo_domain = helo_domain
+        self.mail_from = mail_from
+        self._connect_timeout = connect_timeout
+        self._command_timeout = command_timeout
+        self._behavior_hint = behavior_hint
+        self._hint_loaded = behavior_hint is not None
+        self.max_rcpt_per_txn = max(1, int(max_rcpt_per_txn or SMTP_SESSION_MAX_RCPT_PER_TXN))
+        self._slot_factory = slot
+        self._slot: AbstractContextManager[Any] | None = None
+        self._slot_value: Any = None
+        self._renew_slot = renew_slot
+        self._renew_every_s = max(0.0, float(renew_every_s))
+        self._slot_renewed_at = 0.0
+        self._smtp: smtplib.SMTP | None = None
+        self._txn_rcpts: int | None = None  # None = no open MAIL transaction
+        # Counters (useful for logs/tests): connections opened, RCPTs sent, RSETs sent.
+        self.connects = 0
+        self.rcpts = 0
+        self.resets = 0
+
+    # -- context manager -------------------------------------------------
+
+    def __enter__(self) -> SmtpSession:
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> bool:
+        self.close()
+        return False
+
+    @property
+    def connected(self) -> bool:
+        return self._smtp is not None
+
+    # -- public API --------------------------------------------------------
+
+    def rcpt(self, email: str) -> dict:
+        """Probe a single address on this session; same result shape as probe_rcpt()."""
+        return self._probe_one(email)
+
+    def rcpt_many(self, emails: Sequence[str]) -> list[dict]:
+        """
+        Probe several addresses over this session, in order.
+
+        RCPTs share a MAIL transaction up to max_rcpt_per_txn, after which the
+        session sends RSET and opens a new one.
+        """
+        return [self._probe_one(e) for e in emails]
+
+    def reset(self) -> None:
+        """Abort the current MAIL transaction (RSET); the next probe starts a new one."""
+        if self._smtp is None or self._txn_rcpts is None:
+            return
+        try:
+            self._smtp.rset()
+            self.resets += 1
+        except Exception:
+            self._drop()
+        self._txn_rcpts = None
+
+    def close(self) -> None:
+        """QUIT the connection (if any) and release the per-MX slot."""
+        _quit_quietly(self._smtp)
+        self._smtp = None
+        self._txn_rcpts = None
+        self._release_slot()
+
+    # -- internals ---------------------------------------------------------
+
+    def _timeouts(self, domain: str) -> tuple[float, float]:
+        if not self._hint_loaded:
+            self._behavior_hint = _get_hint(self.mx_host, domain)
+            self._hint_loaded = True
+        return _apply_hint_timeouts(
+            self._connect_timeout, self._command_timeout, self._behavior_hint
+        )
+
+    def _keep_slot(self) -> None:
+        """Renew the held lease when due; on loss, drop the connection and its slot."""
+        if self._slot is None or self._renew_slot is None:
+            return
+        if time.monotonic() - self._slot_renewed_at < self._renew_every_s:
+            return
+        try:
+            held = self._renew_slot(self._slot_value)
+        except Exception:
+            return  # Redis hiccup: keep going, the lease may still be valid
+        if held:
+            self._slot_renewed_at = time.monotonic()
+        else:
+            self._drop()
+
+    def _release_slot(self) -> None:
+        self._slot_value = None
+        slot, self._slot = self._slot, None
+        if slot is not None:
+            try:
+                slot.__exit__(None, None, None)
+            except Exception:
+                pass
+
+    def _drop(self) -> None:
+        """Forget a broken connection without a polite QUIT."""
+        smtp, self._smtp = self._smtp, None
+        self._txn_rcpts = None
+        try:
+            if smtp is not None:
+                with socket_timeout_guard(0.5):
+                    smtp.close()
+        except Exception:
+            pass
+        self._release_slot()
+
+    def _open(self, domain: str) -> None:
+        c_to, cmd_to = self._timeouts(domain)
+        if self._slot_factory is not None and self._slot is None:
+            slot = self._slot_factory()
+            self._slot_value = slot.__enter__()
+            self._slot = slot
+            self._slot_renewed_at = time.monotonic()
+        try:
+            smtp = _connect_smtp(
+                self.mx_host, helo_domain=self.helo_domain, c_to=c_to, cmd_to=cmd_to
+            )
+        except BaseException:
+            self._release_slot()
+            raise
+        self._smtp = smtp
+        self.connects += 1
+        _greet(smtp, cmd_to=cmd_to)
+
+    def _ensure_txn(self, domain: str) -> smtplib.SMTP:
+        if self._smtp is None:
+            self._open(domain)
+        smtp = self._smtp
+        if smtp is None:
+            raise smtplib.SMTPServerDisconnected("not connected")
+        if self._txn_rcpts is not None and self._txn_rcpts >= self.max_rcpt_per_txn:
+            smtp.rset()
+            self.resets += 1
+            self._txn_rcpts = None
+        if self._txn_rcpts is None:
+            code, resp = smtp.mail(self.mail_from)
+            if isinstance(code, int) and not 200 <= code < 300:
+                raise smtplib.SMTPSenderRefused(code, resp, self.mail_from)
+            self._txn_rcpts = 0
+        return smtp
+
+    def _probe_one(self, email: str) -> dict:
+        started = time.monotonic()
+        hook = sys.modules[__name__].record_behavior
+
+        try:
+            _local, domain, email_norm = _normalize_email(email)
+        except Exception as exc:
+            elapsed_ms = int((time.monotonic() - started) * 1000)
+            hook(
+                domain="",
+                mx_host=self.mx_host,
+                elapsed_ms=elapsed_ms,
+                category="unknown",
+                code=None,
+                error_kind="invalid_email",
+            )
+            return self._result("unknown", None, "", elapsed_ms, f"invalid_email:{exc}")
+
+        self._keep_slot()
+        if self._smtp is None:
+            # HARD GUARDRAIL + fast-fail preflight, once per (re)connect.
+            assert_smtp_probing_allowed()
+            ok25, pre_err = _preflight_port25(self.mx_host)
+            if not ok25:
+                elapsed_ms = int((time.monotonic() - started) * 1000)
+                hook(
+                    domain=domain,
+                    mx_host=self.mx_host,
+                    elapsed_ms=elapsed_ms,
+                    category="temp_fail",
+                    code=None,
+                    error_kind="port25_unreachable",
+                )
+                err = f"port25_unreachable:{pre_err or ''}".rstrip(":")
+                return self._result("temp_fail", None, "", elapsed_ms, err)
+
+        rcpt_code: int | None = None
+        rcpt_msg = ""
+        error_str: str | None = None
+        try:
+            smtp = self._ensure_txn(domain)
+            code, resp = smtp.rcpt(email_norm)
+            self.rcpts += 1
+            self._txn_rcpts = (self._txn_rcpts or 0) + 1
+            rcpt_code = int(code) if isinstance(code, int) else None
+            rcpt_msg = _decode_msg(resp)
+            category = _classify(rcpt_code)
+        except Exception as exc:
+            rcpt_code, rcpt_msg, category, error_str = _map_smtp_exception(exc)
+            if isinstance(exc, smtplib.SMTPResponseException) and exc.smtp_code != 421:
+                # Server is still talking to us; start a clean transaction next time.
+                self.reset()
+            else:
+                self._drop()
+
+        elapsed_ms = int((time.monotonic() - started) * 1000)
+        err_kind = None if error_str is None else (error_str.split(":", 1)[0] or "error")
+        hook(
+            domain=domain,
+            mx_host=self.mx_host,
+            elapsed_ms=elapsed_ms,
+            category=category,
+            code=rcpt_code,
+            error_kind=err_kind,
+        )
+        return self._result(category, rcpt_code, rcpt_msg, elapsed_ms, error_str)
+
+    def _result(
+        self,
+        category: str,
+        code: int | None,
+        message: str,
+        elapsed_ms: int,
+        error: str | None,
+    ) -> dict:
+        return {
+            "ok": category == "accept" and error is None,
+            "category": category,
+            "code": code,
+            "message": message,
+            "mx_host": self.mx_host,
+            "helo_domain": self.helo_domain,
+            "elapsed_ms": elapsed_ms,
+            "error": error,
+        }
+
+
 # --- Small context helper -----------------------------------------------------
 
 
@@ -623,4 +919,4 @@ class socket_timeout_guard:
         return False
 
 
-__all__ = ["probe_rcpt", "record_behavior", "SmtpProbingDisabledError"]
+__all__ = ["probe_rcpt", "record_behavior", "SmtpSession", "SmtpProbingDisabledError"]
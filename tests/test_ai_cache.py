@@ -0,0 +1,91 @@
+# tests/test_ai_cache.py
+"""
+Persistent AI response cache (src.extract.ai_cache) and its use in
+ai_candidates._call_refiner.
+
+Verifies that:
+  - a repeated (model, prompt) is served from the cache without a model call,
+    and hits report the tokens the original call used
+  - a different model or prompt misses
+  - malformed (non-JSON-object) replies are not cached
+  - entries expire after the TTL and the byte budget evicts LRU entries
+"""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.extract import ai_cache, ai_candidates
+
+
+class _FakeClient:
+    def __init__(self, content: str = '{"people": []}', tokens: int = 120):
+        self.calls = 0
+        self.content = content
+        self.tokens = tokens
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, **kwargs):
+        self.calls += 1
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=SimpleNamespace(content=self.content))],
+            usage=SimpleNamespace(total_tokens=self.tokens),
+        )
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    c = ai_cache.AIResponseCache(":memory:")
+    ai_cache.set_default(c)
+    monkeypatch.setattr(ai_cache, "AI_CACHE_ENABLED", True)
+    monkeypatch.setattr(ai_candidates, "_HAS_NEW_OPENAI", True)
+    yield c
+    ai_cache.set_default(None)
+    c.close()
+
+
+def _messages(text: str) -> list[dict[str, str]]:
+    return [{"role": "system", "content": "sys"}, {"role": "user", "content": text}]
+
+
+def test_repeated_prompt_served_from_cache(cache, monkeypatch):
+    client = _FakeClient()
+    assert ai_candidates._call_refiner(client, _messages("page A")) == '{"people": []}'
+    assert not ai_cache.last_lookup().hit
+
+    assert ai_candidates._call_refiner(client, _messages("page A")) == '{"people": []}'
+    assert client.calls == 1
+    assert ai_cache.last_lookup() == ai_cache.Lookup(hit=True, tokens_saved=120)
+
+    ai_candidates._call_refiner(client, _messages("page B"))
+    monkeypatch.setattr(ai_candidates, "OPENAI_MODEL", "other-model")
+    ai_candidates._call_refiner(client, _messages("page A"))
+    assert client.calls == 3
+
+    st = ai_cache.stats()
+    assert (st["hits"], st["misses"], st["stores"], st["tokens_saved"]) == (1, 3, 3, 120)
+
+
+def test_malformed_reply_not_cached(cache):
+    client = _FakeClient(content="not json")
+    ai_candidates._call_refiner(client, _messages("x"))
+    ai_candidates._call_refiner(client, _messages("x"))
+    assert client.calls == 2
+    assert cache.stats.stores == 0
+
+
+def test_ttl_and_byte_budget():
+    c = ai_cache.AIResponseCache(":memory:", ttl_s=0.05, max_bytes=0)
+    c.put("k", "{}", model="m")
+    assert c.get("k") == "{}"
+    time.sleep(0.08)
+    assert c.get("k") is None and c.stats.expired == 1
+
+    c = ai_cache.AIResponseCache(":memory:", max_bytes=250)
+    for i in range(5):
+        c.put(f"k{i}", "x" * 100, model="m")
+    assert c.stats.evictions >= 3
+    assert c.get("k4") is not None and c.get("k0") is None
@@ -0,0 +1,166 @@
+# tests/test_ai_executor.py
+"""
+Concurrent AI extraction (ai_candidates_wrapper.AIExtractionExecutor) and
+rate-limit retries in ai_candidates._call_model.
+
+Verifies that:
+  - run_all() returns outcomes in input order and never exceeds the in-flight cap
+  - a tenant over its token budget is refused until the window rolls over
+  - the budget is shared through Redis by separate executors (worker processes)
+  - refine_candidates_with_ai refines each page separately and merges in page order
+  - 429 responses are retried with backoff; other errors are not
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.extract import ai_candidates
+from src.extract import ai_candidates_wrapper as wrapper
+from src.extract.candidates import Candidate
+
+
+@pytest.fixture
+def executor():
+    ex = wrapper.AIExtractionExecutor(3, budget=wrapper.TokenBudget(0))
+    wrapper.set_default_executor(ex)
+    yield ex
+    wrapper.set_default_executor(None)
+    ex.shutdown()
+
+
+def test_run_all_keeps_order_and_caps_in_flight(executor):
+    lock = threading.Lock()
+    state = {"now": 0, "peak": 0}
+
+    def _call(i):
+        def _fn():
+            with lock:
+                state["now"] += 1
+                state["peak"] = max(state["peak"], state["now"])
+            time.sleep(0.02 * (8 - i))
+            with lock:
+                state["now"] -= 1
+            return i
+
+        return _fn
+
+    outcomes = executor.run_all([_call(i) for i in range(8)], tenant_id="t1")
+    assert [o.value for o in outcomes] == list(range(8))
+    assert 1 < state["peak"] <= 3
+
+
+def test_tenant_budget_window():
+    clock = {"t": 0.0}
+    budget = wrapper.TokenBudget(100, window_s=60, clock=lambda: clock["t"], use_redis=False)
+    ex = wrapper.AIExtractionExecutor(2, budget=budget)
+    try:
+        budget.charge("t1", 150)
+        out = ex.run_all([lambda: "x"], tenant_id="t1")
+        assert isinstance(out[0].error, wrapper.AIBudgetExceeded)
+        assert ex.run_all([lambda: "y"], tenant_id="t2")[0].value == "y"
+
+        clock["t"] = 61.0
+        assert ex.run_all([lambda: "z"], tenant_id="t1")[0].value == "z"
+    finally:
+        ex.shutdown()
+
+
+def test_tenant_budget_shared_across_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    clock = {"t": 0.0}
+
+    def _worker():
+        budget = wrapper.TokenBudget(
+            100, window_s=60, clock=lambda: clock["t"], redis=fakeredis.FakeRedis(server=server)
+        )
+        return wrapper.AIExtractionExecutor(1, budget=budget)
+
+    first, second = _worker(), _worker()
+    try:
+        first.budget.charge("t1", 60)
+        assert second.run_all([lambda: "ok"], tenant_id="t1")[0].value == "ok"
+        second.budget.charge("t1", 60)
+        out = first.run_all([lambda: "x"], tenant_id="t1")
+        assert isinstance(out[0].error, wrapper.AIBudgetExceeded)
+        assert first.budget._spent == {}  # nothing counted process-locally
+
+        ttl = fakeredis.FakeRedis(server=server).ttl(first.budget._key("t1", 0))
+        assert 0 < ttl <= 120
+        clock["t"] = 61.0
+        assert second.run_all([lambda: "z"], tenant_id="t1")[0].value == "z"
+    finally:
+        first.shutdown()
+        second.shutdown()
+
+
+def test_refine_runs_per_page_in_page_order(executor, monkeypatch):
+    pages: list[str] = []
+
+    def _fake_refiner(*, company_name, domain, raw_candidates):
+        url = raw_candidates[0].source_url
+        assert all(c.source_url == url for c in raw_candidates)
+        pages.append(url)
+        time.sleep(0.05 if url.endswith("/a") else 0.0)
+        return list(raw_candidates)
+
+    monkeypatch.setattr(wrapper, "_raw_extract_ai_candidates", _fake_refiner)
+    monkeypatch.setattr(wrapper, "AI_PEOPLE_ENABLED", True)
+    monkeypatch.setattr(wrapper, "_HAS_AI_EXTRACTOR", True)
+
+    cands = [
+        Candidate(email=f"{first.lower()}@acme.com", source_url=url, raw_name=f"{first} Smith")
+        for first, url in [
+            ("Anna", "https://acme.com/a"),
+            ("Ben", "https://acme.com/b"),
+            ("Cara", "https://acme.com/a"),
+        ]
+    ]
+    refined, metrics = wrapper.refine_candidates_with_ai(
+        company_name="Acme", domain="acme.com", raw_candidates=cands, tenant_id="t1"
+    )
+    assert sorted(pages) == ["https://acme.com/a", "https://acme.com/b"]
+    assert [c.source_url for c in refined] == [
+        "https://acme.com/a",
+        "https://acme.com/a",
+        "https://acme.com/b",
+    ]
+    assert metrics.ai_outcome == "ok_nonempty"
+
+
+class _RateLimited(Exception):
+    def __init__(self, retry_after=None):
+        super().__init__("429 Too Many Requests")
+        self.status_code = 429
+        self.response = SimpleNamespace(
+            status_code=429, headers={"retry-after": retry_after} if retry_after else {}
+        )
+
+
+def test_call_model_retries_rate_limits(monkeypatch):
+    sleeps: list[float] = []
+    monkeypatch.setattr(ai_candidates.time, "sleep", sleeps.append)
+    monkeypatch.setattr(ai_candidates, "AI_RETRY_MAX", 3)
+    errors = [_RateLimited(), _RateLimited(retry_after="2")]
+
+    def _create(client, messages):
+        if errors:
+            raise errors.pop(0)
+        return '{"people": []}', 10
+
+    monkeypatch.setattr(ai_candidates, "_create_completion", _create)
+    assert ai_candidates._call_model(None, []) == ('{"people": []}', 10)
+    assert len(sleeps) == 2 and sleeps[1] == 2.0
+
+    def _boom(client, messages):
+        raise RuntimeError("bad request")
+
+    monkeypatch.setattr(ai_candidates, "_create_completion", _boom)
+    with pytest.raises(RuntimeError):
+        ai_candidates._call_model(None, [])
+    assert len(sleeps) == 2
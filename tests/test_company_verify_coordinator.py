@@ -0,0 +1,100 @@
+# tests/test_company_verify_coordinator.py
+"""
+Company-level verification coordinator (tasks.task_generate_company_people_emails).
+
+Verifies that:
+  - people are probed with full permutations until one address is confirmed,
+    then the confirmed pattern is locked and cached in domain_patterns
+  - later people get a single RCPT for the locked pattern
+  - a person whose pattern address misses falls back to full permutations
+    (without re-probing the missed address)
+  - one person's exception is recorded as an error and the rest still run
+"""
+
+from __future__ import annotations
+
+import contextlib
+import sqlite3
+
+import pytest
+
+from src.queueing import tasks
+
+# flast is rank 5 in the default ordering; bob uses first.last instead.
+_MAILBOXES = {"jdoe@acme.com", "jroe@acme.com", "alee@acme.com", "bob.kim@acme.com"}
+
+
+@pytest.fixture
+def probes(tmp_path, monkeypatch):
+    db = tmp_path / "coord.db"
+    con = sqlite3.connect(db)
+    con.execute(
+        "CREATE TABLE domain_patterns (domain TEXT PRIMARY KEY, pattern TEXT, "
+        "confidence REAL, samples INTEGER, inferred_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+    )
+    con.commit()
+    con.close()
+
+    sent: list[str] = []
+
+    def _fake_sequential(*, person_id, ranked_candidates, **_kw):
+        for email, _pattern in ranked_candidates:
+            sent.append(email)
+            if email in _MAILBOXES:
+                return {"status": "valid_found", "valid_email": email, "verified": 1}
+        return {"status": "all_invalid", "valid_email": None, "verified": len(ranked_candidates)}
+
+    monkeypatch.setattr(tasks, "get_conn", lambda: sqlite3.connect(db))
+    monkeypatch.setattr(tasks, "_mx_info", lambda *a, **k: ("mx.acme.com", None))
+    monkeypatch.setattr(tasks, "_open_smtp_session", lambda mx: contextlib.nullcontext())
+    monkeypatch.setattr(tasks, "_generate_emails_sequential_on_session", _fake_sequential)
+    return sent, db
+
+
+def test_pattern_locked_after_first_confirmation(probes):
+    sent, db = probes
+    people = [[1, "Jane", "Doe"], [2, "John", "Roe"], [3, "Amy", "Lee"], [4, "Bob", "Kim"]]
+    out = tasks.task_generate_company_people_emails(company_id=7, domain="acme.com", people=people)
+
+    assert out["locked_pattern"] == "flast"
+    assert [r["valid_email"] for r in out["results"]] == [
+        "jdoe@acme.com",
+        "jroe@acme.com",
+        "alee@acme.com",
+        "bob.kim@acme.com",
+    ]
+    # Jane: full walk to flast; John/Amy: one RCPT each; Bob: miss + fallback
+    jane_probes = sent.index("jdoe@acme.com") + 1
+    assert jane_probes > 1 and len(sent) == jane_probes + 4
+    assert sent[jane_probes:] == [
+        "jroe@acme.com",
+        "alee@acme.com",
+        "bkim@acme.com",
+        "bob.kim@acme.com",
+    ]
+    assert (out["pattern_hits"], out["fallbacks"]) == (2, 1)
+    assert sent.count("bkim@acme.com") == 1
+
+    con = sqlite3.connect(db)
+    row = con.execute("SELECT pattern FROM domain_patterns WHERE domain='acme.com'").fetchone()
+    con.close()
+    assert row == ("flast",)
+
+
+def test_person_failure_does_not_abort_company(probes, monkeypatch):
+    sent, _db = probes
+    real = tasks._generate_emails_sequential_on_session
+
+    def _flaky(*, person_id, **kw):
+        if person_id == 2:
+            raise sqlite3.OperationalError("database is locked")
+        return real(person_id=person_id, **kw)
+
+    monkeypatch.setattr(tasks, "_generate_emails_sequential_on_session", _flaky)
+    people = [[1, "Jane", "Doe"], [2, "John", "Roe"], [3, "Amy", "Lee"]]
+    out = tasks.task_generate_company_people_emails(company_id=7, domain="acme.com", people=people)
+
+    assert out["status"] == "ok"
+    assert [r["person_id"] for r in out["results"]] == [1, 2, 3]
+    assert out["results"][1] == {"person_id": 2, "status": "error", "error": "OperationalError"}
+    assert out["results"][2]["valid_email"] == "alee@acme.com"
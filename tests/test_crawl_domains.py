@@ -0,0 +1,233 @@
+# tests/test_crawl_domains.py
+"""
+Concurrent multi-domain crawl engine (crawl_domains).
+
+Verifies that the asyncio engine:
+  - returns one page list per input domain, in input order
+  - applies the same robots/seed logic as crawl_domain()
+  - keeps at most one in-flight request per host across concurrent runs
+  - paces each host through the throttle, shared across workers via Redis
+  - force=[...] bypasses the HTTP cache per domain, and autodiscover_companies
+    passes each company's force flag through
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+import respx
+from httpx import Response
+
+import src.crawl.runner as runner
+import src.fetch.cache as cache_mod
+from src.fetch import robots, throttle
+from src.queueing import tasks
+
+_BODY_FILLER = "We build things for customers around the world. " * 10
+
+
+def _html(title: str, extra: str = "") -> str:
+    return (
+        f"<html><head><title>{title}</title></head><body>"
+        f'<a href="/team">Team</a><p>{_BODY_FILLER}</p>{extra}</body></html>'
+    )
+
+
+def _site_handler(request):
+    path = request.url.path
+    if path == "/robots.txt":
+        return Response(200, text="User-agent: *\nAllow: /\n")
+    if path in {"/", "/team"}:
+        title = "Our Team" if path == "/team" else f"Home of {request.url.host}"
+        return Response(200, text=_html(title), headers={"content-type": "text/html"})
+    return Response(404, text="not found", headers={"content-type": "text/html"})
+
+
+@pytest.fixture(autouse=True)
+def _no_headless(monkeypatch):
+    monkeypatch.setattr(runner, "_HAS_HEADLESS", False)
+    monkeypatch.setattr(robots, "get_crawl_delay", lambda host: 0.0)
+    robots.clear_cache()
+    throttle.clear()
+    yield
+    robots.clear_cache()
+    throttle.clear()
+
+
+@respx.mock
+def test_crawl_domains_returns_pages_per_domain_in_order():
+    respx.route(host="alpha.example").mock(side_effect=_site_handler)
+    respx.route(host="beta.example").mock(side_effect=_site_handler)
+
+    out = runner.crawl_domains(["beta.example", "alpha.example"], concurrency=2)
+
+    assert len(out) == 2
+    beta_urls = {p.url for p in out[0]}
+    alpha_urls = {p.url for p in out[1]}
+    assert beta_urls == {"https://beta.example/", "https://beta.example/team"}
+    assert alpha_urls == {"https://alpha.example/", "https://alpha.example/team"}
+
+
+@respx.mock
+def test_crawl_domains_respects_robots_deny_all():
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return Response(200, text="User-agent: *\nDisallow: /\n")
+        return Response(200, text=_html("Home"), headers={"content-type": "text/html"})
+
+    route = respx.route(host="blocked.example").mock(side_effect=handler)
+
+    out = runner.crawl_domains(["blocked.example"])
+
+    assert out == [[]]
+    # Only the origin probe and robots.txt were requested; no seeds.
+    paths = sorted(call.request.url.path for call in route.calls)
+    assert paths == ["/", "/robots.txt"]
+
+
+@respx.mock
+def test_crawl_domains_attaches_metrics_to_results():
+    respx.route(host="gamma.example").mock(side_effect=_site_handler)
+
+    class _Result:
+        def __init__(self):
+            self.metrics: dict = {}
+
+    res = _Result()
+    out = runner.crawl_domains(["gamma.example"], results=[res])
+
+    assert len(out[0]) == 2
+    crawl = res.metrics["crawl"]
+    assert crawl["pages_crawled"] == 2
+    assert crawl["canonical_host"] == "gamma.example"
+
+
+def test_crawl_domains_empty_input():
+    assert runner.crawl_domains([]) == []
+
+
+def test_host_gate_serializes_requests_per_host():
+    in_flight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    class _FakeClient:
+        async def get(self, url, **kwargs):
+            host = runner._normalize_host(url.split("/")[2])
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return SimpleNamespace(status_code=200, url=url)
+
+    async def _go():
+        client = runner._GatedAsyncClient(_FakeClient(), runner._HostGate())
+        urls = [f"https://www.shared.example/p{i}" for i in range(3)]
+        urls += [f"https://shared.example/q{i}" for i in range(3)]
+        urls += [f"https://other.example/r{i}" for i in range(3)]
+        await asyncio.gather(*(client.get(u) for u in urls))
+
+    asyncio.run(_go())
+
+    assert peak["shared.example"] == 1
+    assert peak["other.example"] == 1
+
+
+def test_throttle_spaces_fetches_across_workers(monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    pytest.importorskip("lupa")
+    monkeypatch.setattr(robots, "get_crawl_delay", lambda host: 0.2)
+    backend = throttle.RedisThrottleBackend(fakeredis.FakeStrictRedis(), prefix="t-crawl")
+    throttle.set_shared_backend(backend)
+    started: list[float] = []
+
+    class _FakeClient:
+        async def get(self, url, **kwargs):
+            started.append(time.monotonic())
+            return SimpleNamespace(status_code=200, url=url)
+
+    async def _go():
+        # Two crawl workers: separate clients and host gates, one shared Redis
+        workers = [runner._GatedAsyncClient(_FakeClient(), runner._HostGate()) for _ in range(2)]
+        await asyncio.gather(
+            *(w.get(f"https://paced.example/p{i}") for w in workers for i in range(2))
+        )
+
+    try:
+        asyncio.run(_go())
+    finally:
+        throttle.set_shared_backend(None)
+
+    started.sort()
+    gaps = [b - a for a, b in zip(started, started[1:], strict=False)]
+    assert len(started) == 4
+    assert min(gaps) >= 0.15
+
+
+@respx.mock
+def test_crawl_domain_sync_matches_concurrent_engine():
+    respx.route(host="delta.example").mock(side_effect=_site_handler)
+
+    sync_urls = [p.url for p in runner.crawl_domain("delta.example")]
+    robots.clear_cache()
+    async_urls = [p.url for p in runner.crawl_domains(["delta.example"])[0]]
+
+    assert sync_urls == async_urls
+
+
+@respx.mock
+def test_forced_domains_bypass_http_cache(monkeypatch):
+    monkeypatch.setattr(runner, "_CRAWL_HTTP_CACHE", True)
+    shared = cache_mod.Cache(":memory:")
+    monkeypatch.setattr(cache_mod, "_default_cache", shared)
+
+    def handler(request):
+        resp = _site_handler(request)
+        resp.headers["cache-control"] = "max-age=3600"
+        return resp
+
+    forced = respx.route(host="forced.example").mock(side_effect=handler)
+    cached = respx.route(host="cached.example").mock(side_effect=handler)
+    domains = ["forced.example", "cached.example"]
+
+    first = runner.crawl_domains(domains)
+    robots.clear_cache()
+    forced_calls, cached_calls = forced.call_count, cached.call_count
+    second = runner.crawl_domains(domains, force=[True, False])
+    shared.close()
+
+    assert [len(p) for p in second] == [len(p) for p in first] == [2, 2]
+    team = [c for c in forced.calls[forced_calls:] if c.request.url.path == "/team"]
+    assert len(team) == 1
+    assert all(c.request.url.path != "/team" for c in cached.calls[cached_calls:])
+
+
+def test_autodiscover_companies_passes_force_per_company(monkeypatch):
+    seen: dict = {}
+
+    class _Con:
+        def close(self):
+            pass
+
+    def _crawl_domains(domains, *, concurrency=None, results=None, force=None):
+        seen["domains"], seen["force"] = list(domains), list(force)
+        return [[] for _ in domains]
+
+    monkeypatch.setattr(tasks, "_conn", _Con)
+    monkeypatch.setattr(
+        tasks, "_load_company_name_and_domain", lambda con, cid: ("Co", f"c{cid}.example", None)
+    )
+    monkeypatch.setattr(tasks, "crawl_domains", _crawl_domains)
+    monkeypatch.setattr(tasks, "autodiscover_company", lambda cid, crawled=None: {"id": cid})
+
+    out = tasks.autodiscover_companies([1, 2, 3], force=[False, True, False])
+
+    assert [r["id"] for r in out] == [1, 2, 3]
+    assert seen == {
+        "domains": ["c1.example", "c2.example", "c3.example"],
+        "force": [False, True, False],
+    }
+    with pytest.raises(ValueError):
+        tasks.autodiscover_companies([1, 2], force=[True])
@@ -0,0 +1,124 @@
+# tests/test_dns_client.py
+"""
+Shared DNS client (src.resolve.dns_client) and its callers in mx.py / smtp.py.
+
+Verifies that:
+  - batch questions run concurrently and duplicate questions are asked once
+  - positive answers are cached for the clamped record TTL, NXDOMAIN is
+    cached as a negative answer, timeouts are not cached; stats count it all
+  - resolve_batch() also works when called from inside a running event loop
+  - mx._mx_lookup_with_dnspython raises the dnspython error for failures, and
+    smtp._resolve_mx_ips orders/limits addresses from the shared client
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import dns.exception
+import dns.resolver
+import pytest
+
+from src.resolve import dns_client, mx
+from src.verify import smtp
+
+_ZONE = {
+    ("acme.com", "MX"): ((10, "mx1.acme.com"), (5, "mx0.acme.com")),
+    ("acme.com", "A"): ("192.0.2.10",),
+    ("mx0.acme.com", "A"): ("192.0.2.1", "192.0.2.2"),
+    ("mx0.acme.com", "AAAA"): ("2001:db8::1",),
+    ("web-only.io", "A"): ("192.0.2.20",),
+}
+
+
+@pytest.fixture
+def upstream(monkeypatch):
+    asked: list[tuple[str, str]] = []
+
+    def _answer(name, rdtype):
+        asked.append((name, rdtype))
+        if name == "slow.com":
+            raise dns.resolver.LifetimeTimeout(timeout=4.0, errors=[])
+        if (name, rdtype) in _ZONE:
+            return _ZONE[(name, rdtype)], 120
+        if name in {n for n, _ in _ZONE}:
+            raise dns.resolver.NoAnswer()
+        raise dns.resolver.NXDOMAIN()
+
+    async def _resolve_async(name, rdtype):
+        await asyncio.sleep(0.05)
+        return _answer(name, rdtype)
+
+    monkeypatch.setattr(dns_client, "_resolve_async", _resolve_async)
+    monkeypatch.setattr(dns_client, "_resolve_sync", _answer)
+    monkeypatch.setattr(dns_client, "DNS_CACHE_ENABLED", True)
+    dns_client.clear_cache()
+    dns_client.reset_stats()
+    yield asked
+    dns_client.clear_cache()
+    dns_client.reset_stats()
+
+
+def test_batch_runs_concurrently_and_caches(upstream):
+    t0 = time.perf_counter()
+    out = dns_client.has_any_record_many(["acme.com", "web-only.io", "nope.com", "ACME.com."])
+    elapsed = time.perf_counter() - t0
+
+    assert out == {"acme.com": True, "web-only.io": True, "nope.com": False}
+    assert len(upstream) == 9  # 3 hosts x MX/A/AAAA, duplicates asked once
+    assert elapsed < 0.05 * 4
+
+    assert dns_client.has_any_record("nope.com") is False
+    assert len(upstream) == 9
+    st = dns_client.stats()
+    assert (st["queries"], st["cache_hits"], st["negative_hits"]) == (9, 3, 3)
+    assert st["nxdomain"] == 3 and st["noanswer"] == 3
+
+
+def test_ttl_clamp_expiry_and_transient_errors(upstream, monkeypatch):
+    clock = {"t": 1000.0}
+    monkeypatch.setattr(
+        dns_client, "time", SimpleNamespace(time=lambda: clock["t"], perf_counter=time.perf_counter)
+    )
+    monkeypatch.setattr(dns_client, "DNS_CACHE_MAX_TTL_SEC", 60)
+
+    assert dns_client.query("acme.com", "MX").ttl == 60
+    assert dns_client.query("acme.com", "MX").cached
+    clock["t"] += 61
+    assert not dns_client.query("acme.com", "MX").cached
+
+    assert dns_client.query("slow.com", "A").status == "timeout"
+    assert dns_client.query("slow.com", "A").status == "timeout"
+    assert upstream.count(("slow.com", "A")) == 2
+    assert dns_client.stats()["timeouts"] == 2
+
+
+def test_batch_inside_running_loop(upstream):
+    async def _caller():
+        return dns_client.resolve_batch([("acme.com", "A"), ("acme.com", "MX")])
+
+    out = asyncio.run(_caller())
+    assert out[("acme.com", "A")].records == ("192.0.2.10",)
+
+
+def test_mx_and_smtp_callers(upstream, monkeypatch):
+    monkeypatch.setattr(mx, "_DNSPY_AVAILABLE", True)
+    assert mx._mx_lookup_with_dnspython("acme.com") == [(10, "mx1.acme.com"), (5, "mx0.acme.com")]
+    assert 118 <= mx._dns_local.ttl <= 120
+    with pytest.raises(dns.resolver.NXDOMAIN):
+        mx._mx_lookup_with_dnspython("nope.com")
+    with pytest.raises(dns.exception.Timeout):
+        mx._mx_lookup_with_dnspython("slow.com")
+    assert mx._a_or_aaaa_exists("web-only.io") and not mx._a_or_aaaa_exists("nope.com")
+
+    assert smtp._resolve_mx_ips("mx0.acme.com", prefer_ipv4=True, max_addrs=2) == [
+        "192.0.2.1",
+        "192.0.2.2",
+    ]
+    assert smtp._resolve_mx_ips("mx0.acme.com", prefer_ipv4=False, max_addrs=2) == [
+        "2001:db8::1",
+        "192.0.2.1",
+    ]
+    assert smtp._resolve_mx_ips("gone.acme.org", prefer_ipv4=True, max_addrs=2) == ["gone.acme.org"]
@@ -0,0 +1,171 @@
+# tests/test_emails_latest.py
+"""
+emails_latest: maintained latest-verification pointer behind v_emails_latest.
+
+Verifies that:
+  - refresh_email_latest() picks the same row the old DISTINCT ON view did
+  - the pointer only moves forward in that ordering, and is dropped once an
+    email has no results left
+  - refresh_emails_latest_for() restores pointers after a subset delete
+  - upsert_verification_result() keeps emails_latest current
+  - rebuild_emails_latest() repairs drift that check_emails_latest() reports
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import src.db as db
+
+_SCHEMA = """
+CREATE TABLE emails (
+  id INTEGER PRIMARY KEY,
+  tenant_id TEXT NOT NULL DEFAULT 'dev',
+  company_id INTEGER,
+  person_id INTEGER,
+  email TEXT NOT NULL,
+  created_at TEXT,
+  updated_at TEXT,
+  UNIQUE (tenant_id, email)
+);
+CREATE TABLE verification_results (
+  id INTEGER PRIMARY KEY,
+  tenant_id TEXT NOT NULL DEFAULT 'dev',
+  email_id INTEGER NOT NULL,
+  mx_host TEXT,
+  status TEXT,
+  reason TEXT,
+  checked_at TEXT,
+  verify_status TEXT,
+  verify_reason TEXT,
+  verified_mx TEXT,
+  verified_at TEXT
+);
+CREATE TABLE emails_latest (
+  tenant_id TEXT NOT NULL,
+  email_id INTEGER NOT NULL,
+  verification_result_id INTEGER NOT NULL,
+  updated_at TEXT,
+  PRIMARY KEY (tenant_id, email_id)
+);
+"""
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return tmp_path / "latest.db"
+
+
+@pytest.fixture
+def conn(db_path):
+    c = sqlite3.connect(db_path)
+    c.executescript(_SCHEMA)
+    c.executemany(
+        "INSERT INTO emails (id, tenant_id, email) VALUES (?, ?, ?)",
+        [(1, "t1", "a@x.test"), (2, "t1", "b@x.test"), (3, "t2", "c@y.test")],
+    )
+    c.commit()
+    yield c
+    c.close()
+
+
+def _add_result(c, rid, tenant, email_id, verified_at, checked_at="2025-01-01T00:00:00Z"):
+    c.execute(
+        "INSERT INTO verification_results (id, tenant_id, email_id, verified_at, checked_at) "
+        "VALUES (?, ?, ?, ?, ?)",
+        (rid, tenant, email_id, verified_at, checked_at),
+    )
+
+
+def _pointers(c) -> dict[tuple[str, int], int]:
+    rows = c.execute("SELECT tenant_id, email_id, verification_result_id FROM emails_latest")
+    return {(t, e): v for t, e, v in rows}
+
+
+def test_refresh_matches_view_ordering(conn):
+    _add_result(conn, 10, "t1", 1, "2025-03-01T00:00:00Z")
+    _add_result(conn, 11, "t1", 1, "2025-02-01T00:00:00Z")  # older, higher id
+    _add_result(conn, 20, "t1", 2, "2025-03-01T00:00:00Z")
+    _add_result(conn, 21, "t1", 2, "2025-03-01T00:00:00Z")  # tie => higher id wins
+
+    assert db.refresh_email_latest(conn, 1, tenant_id="t1")
+    assert db.refresh_email_latest(conn, 2, tenant_id="t1")
+    assert _pointers(conn) == {("t1", 1): 10, ("t1", 2): 21}
+
+    conn.execute("DELETE FROM verification_results WHERE email_id = 1")
+    db.refresh_email_latest(conn, 1, tenant_id="t1")
+    assert _pointers(conn) == {("t1", 2): 21}
+
+
+def test_refresh_never_moves_pointer_backwards(conn):
+    _add_result(conn, 10, "t1", 1, "2025-03-01T00:00:00Z")
+    _add_result(conn, 11, "t1", 1, "2025-04-01T00:00:00Z")
+    db.refresh_email_latest(conn, 1, tenant_id="t1")
+    assert _pointers(conn) == {("t1", 1): 11}
+
+    # A concurrent refresh whose snapshot only saw row 10 runs the same upsert
+    # (emulated by hiding row 11 from its lookup); the DO UPDATE guard keeps
+    # the newer pointer.
+    conn.execute("UPDATE verification_results SET tenant_id = 'hidden' WHERE id = 11")
+    db.refresh_email_latest(conn, 1, tenant_id="t1")
+    assert _pointers(conn) == {("t1", 1): 11}
+
+
+def test_subset_delete_repoints(conn):
+    _add_result(conn, 10, "t1", 1, "2025-03-01T00:00:00Z")
+    _add_result(conn, 11, "t1", 1, "2025-04-01T00:00:00Z")
+    _add_result(conn, 20, "t1", 2, "2025-03-01T00:00:00Z")
+    assert db.rebuild_emails_latest(conn) == 2
+
+    # Deleting the newest result cascades its pointer away (emulated here).
+    conn.execute("DELETE FROM verification_results WHERE id IN (11, 20)")
+    conn.execute("DELETE FROM emails_latest WHERE verification_result_id IN (11, 20)")
+    assert db.refresh_emails_latest_for(conn, [("t1", 1), ("t1", 2), ("t1", 1)]) == 2
+    assert _pointers(conn) == {("t1", 1): 10}
+    assert db.check_emails_latest(conn)["ok"]
+
+
+def test_refresh_is_noop_without_table():
+    c = sqlite3.connect(":memory:")
+    assert db.refresh_email_latest(c, 1, tenant_id="t1") is False
+
+
+def test_upsert_verification_result_maintains_pointer(conn, db_path, monkeypatch):
+    monkeypatch.setattr(
+        db, "get_conn", lambda: db.CompatConnection(sqlite3.connect(db_path), is_pg=False)
+    )
+
+    def _latest_status() -> str:
+        (vr_id,) = _pointers(conn).values()
+        sql = "SELECT verify_status FROM verification_results WHERE id = ?"
+        return conn.execute(sql, (vr_id,)).fetchone()[0]
+
+    db.upsert_verification_result(1, "a@x.test", "x.test", "valid", "ok", tenant_id="t1")
+    assert _latest_status() == "valid"
+    db.upsert_verification_result(1, "a@x.test", "x.test", "invalid", "5xx", tenant_id="t1")
+    assert _latest_status() == "invalid"
+    assert db.check_emails_latest(conn)["ok"]
+
+
+def test_check_and_rebuild(conn):
+    _add_result(conn, 10, "t1", 1, "2025-03-01T00:00:00Z")
+    _add_result(conn, 11, "t1", 1, "2025-04-01T00:00:00Z")
+    _add_result(conn, 30, "t2", 3, None, None)
+    conn.executemany(
+        "INSERT INTO emails_latest (tenant_id, email_id, verification_result_id) VALUES (?, ?, ?)",
+        [("t1", 1, 10), ("t1", 2, 99)],  # stale + extra; t2/3 missing
+    )
+
+    report = db.check_emails_latest(conn)
+    assert (report["missing"], report["stale"], report["extra"]) == (1, 1, 1)
+    assert not report["ok"]
+    assert {s["kind"] for s in report["samples"]} == {"missing", "stale", "extra"}
+
+    only_t2 = db.check_emails_latest(conn, tenant_id="t2")
+    assert (only_t2["missing"], only_t2["stale"], only_t2["extra"]) == (1, 0, 0)
+
+    assert db.rebuild_emails_latest(conn) == 2
+    assert _pointers(conn) == {("t1", 1): 11, ("t2", 3): 30}
+    assert db.check_emails_latest(conn)["ok"]
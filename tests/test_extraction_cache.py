@@ -0,0 +1,160 @@
+# tests/test_extraction_cache.py
+"""
+Incremental re-extraction (src.extract.extraction_cache + tasks wiring).
+
+Verifies that:
+  - a re-run over unchanged pages reuses cached candidates and does not call
+    the HTML extractor again; only changed/new pages are re-extracted
+  - cached and fresh candidates are merged into one persisted set
+  - pages that yield nothing are cached too
+  - a different extractor version / AI mode misses the cache
+  - the cache is per company: the same page body crawled for another domain
+    is extracted again and cites that company's URL
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+from src.extract import extraction_cache
+from src.extract.candidates import Candidate
+from src.queueing import tasks
+
+
+def _html(email: str, name: str) -> str:
+    return (
+        f'<html><body><div class="team-member"><h3>{name}</h3><p>CTO</p>'
+        f'<a href="mailto:{email}">{email}</a></div></body></html>'
+    )
+
+
+@pytest.fixture
+def con():
+    c = sqlite3.connect(":memory:")
+    c.execute(
+        "CREATE TABLE sources (id INTEGER PRIMARY KEY, company_id INTEGER, "
+        "source_url TEXT, html TEXT)"
+    )
+    c.execute("CREATE TABLE emails (id INTEGER PRIMARY KEY, company_id INTEGER, email TEXT)")
+    c.executemany(
+        "INSERT INTO sources (company_id, source_url, html) VALUES (1, ?, ?)",
+        [
+            ("https://acme.com/team", _html("jane@acme.com", "Jane Doe")),
+            ("https://acme.com/about", _html("info@acme.com", "Contact")),
+            ("https://acme.com/blank", "<html><body>nothing here</body></html>"),
+        ],
+    )
+    return c
+
+
+@pytest.fixture
+def run(con, monkeypatch):
+    calls: list[str] = []
+    persisted: list[set[str]] = []
+    real_extract = tasks.extract_html_candidates
+
+    def _extract(page, *, source_url, company_domain):
+        calls.append(source_url)
+        return real_extract(page, source_url=source_url, company_domain=company_domain)
+
+    def _persist(con, *, company_id, dom, candidates_by_email, candidates_no_email=None):
+        persisted.append(set(candidates_by_email))
+        return 0, 0, 0, 0
+
+    monkeypatch.setattr(tasks, "_conn", lambda: con)
+    companies = {1: ("A", "acme.com", "acme.com"), 2: ("G", "globex.com", "globex.com")}
+    monkeypatch.setattr(tasks, "_load_company_name_and_domain", lambda c, cid: companies[cid])
+    monkeypatch.setattr(tasks, "_ai_enabled_for_run", lambda: False)
+    monkeypatch.setattr(tasks, "_decide_ai_allowed_for_company", lambda c, cid: False)
+    monkeypatch.setattr(tasks, "extract_html_candidates", _extract)
+    monkeypatch.setattr(tasks, "_persist_candidates_for_company", _persist)
+
+    def _run(company_id=1):
+        calls.clear()
+        out = tasks.extract_candidates_for_company(company_id)
+        return out, list(calls), persisted[-1] if persisted else set()
+
+    return _run
+
+
+def test_rerun_skips_unchanged_pages(con, run):
+    out1, calls1, emails1 = run()
+    assert out1["ok"] and out1["pages_extracted"] == 3 and out1["pages_reused"] == 0
+    assert len(calls1) == 3
+    assert {"jane@acme.com", "info@acme.com"} <= emails1
+
+    out2, calls2, emails2 = run()
+    assert calls2 == []
+    assert out2["pages_reused"] == 3
+    assert emails2 == emails1
+
+    # One page changes: only it is extracted; cached candidates are merged in
+    con.execute(
+        "UPDATE sources SET html = ? WHERE source_url = 'https://acme.com/team'",
+        (_html("john@acme.com", "John Roe"),),
+    )
+    out3, calls3, emails3 = run()
+    assert calls3 == ["https://acme.com/team"]
+    assert out3["pages_reused"] == 2
+    assert "john@acme.com" in emails3 and "info@acme.com" in emails3
+    assert "jane@acme.com" not in emails3
+
+
+def test_shared_page_body_is_extracted_per_company(con, run):
+    shared = (
+        '<html><body><div class="team-member"><h3>Jane Doe</h3><p>CTO</p>'
+        '<a href="mailto:jane@acme.com">jane@acme.com</a></div>'
+        '<div class="team-member"><h3>Bob Roe</h3><p>CFO</p>'
+        '<a href="mailto:bob@globex.com">bob@globex.com</a></div></body></html>'
+    )
+    con.execute("DELETE FROM sources")
+    con.executemany(
+        "INSERT INTO sources (company_id, source_url, html) VALUES (?, ?, ?)",
+        [(1, "https://acme.com/partners", shared), (2, "https://globex.com/partners", shared)],
+    )
+
+    _, calls1, emails1 = run(1)
+    assert calls1 == ["https://acme.com/partners"]
+    assert "jane@acme.com" in emails1 and "bob@globex.com" not in emails1
+
+    out2, calls2, emails2 = run(2)
+    assert calls2 == ["https://globex.com/partners"]  # not served from acme's entry
+    assert out2["pages_reused"] == 0
+    assert "bob@globex.com" in emails2 and "jane@acme.com" not in emails2
+
+    url = "https://globex.com/partners"
+    hit = extraction_cache.load_many(
+        con,
+        {url: tasks.page_store.content_sha256(shared)},
+        extraction_cache.extractor_version("html"),
+        scope=extraction_cache.extraction_scope("www.Globex.com"),
+    )[url]
+    assert {c.source_url for c in hit.role + hit.people} == {url}
+
+
+def test_version_and_mode_partition_the_cache(con, monkeypatch):
+    monkeypatch.delenv("EXTRACTION_CACHE_VERSION", raising=False)
+    html_v = extraction_cache.extractor_version("html")
+    page = extraction_cache.PageCandidates(
+        role=[Candidate(email="info@acme.com", source_url="https://acme.com/about")]
+    )
+    scope = extraction_cache.extraction_scope("acme.com")
+    extraction_cache.store_many(con, [("h1", page)], html_v, scope=scope)
+
+    hit = extraction_cache.load_many(con, {"https://acme.com/about": "h1"}, html_v, scope=scope)
+    assert hit["https://acme.com/about"].role[0].email == "info@acme.com"
+    ai_v = extraction_cache.extractor_version("ai")
+    assert extraction_cache.load_many(con, {"u": "h1"}, ai_v, scope=scope) == {}
+    ai_scope = extraction_cache.extraction_scope("acme.com", "Acme  Inc")
+    assert ai_scope == "acme.com|acme inc"
+    assert extraction_cache.load_many(con, {"u": "h1"}, html_v, scope=ai_scope) == {}
+
+    monkeypatch.setenv("EXTRACTION_CACHE_VERSION", "next")
+    assert extraction_cache.extractor_version("html") != html_v
+
+    monkeypatch.setenv("EXTRACTION_CACHE_ENABLED", "0")
+    assert (
+        extraction_cache.load_many(con, {"https://acme.com/about": "h1"}, html_v, scope=scope) == {}
+    )
@@ -0,0 +1,266 @@
+# tests/test_fetch_cache_backends.py
+"""
+Fetch cache storage backends.
+
+Verifies that:
+  - bodies are stored compressed and round-trip unchanged
+  - a shared SQLite file commits every write (no lock held between responses);
+    only ":memory:" batches commits, and flush() commits them
+  - total body size is bounded with least-recently-used eviction
+  - hit/stale/miss counters are exposed via Cache.stats
+  - older cache files are migrated in place
+  - the Redis backend shares identical bodies (content-addressed), and
+    concurrent workers saving/purging the same body keep refcounts and the
+    byte total exact
+  - the crawler serves fresh pages from cache and revalidates stale ones
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+
+import httpx
+import pytest
+import respx
+
+import src.crawl.runner as runner
+import src.fetch.cache as cache_mod
+from src.fetch import robots
+
+HTML_HEADERS = {"content-type": "text/html; charset=utf-8", "cache-control": "max-age=60"}
+
+
+def _page(n: int, size: int = 4000) -> bytes:
+    return (
+        f"<html><body><p>page {n}</p>" + "lorem ipsum " * (size // 12) + "</body></html>"
+    ).encode()
+
+
+def test_sqlite_compresses_and_round_trips(tmp_path):
+    db = str(tmp_path / "c.sqlite")
+    c = cache_mod.Cache(db)
+    body = _page(1)
+    c.store_200("https://a.example/", 200, "text/html", body, HTML_HEADERS)
+    c.flush()
+
+    raw = sqlite3.connect(db).execute("SELECT body, body_encoding, size FROM http_cache").fetchone()
+    assert raw[1] == "zlib"
+    assert raw[2] == len(raw[0]) < len(body)
+
+    entry, fresh = c.get("https://a.example/")
+    assert fresh and entry is not None and entry.body == body
+    c.close()
+
+
+def test_sqlite_file_commits_every_write(tmp_path):
+    db = str(tmp_path / "c.sqlite")
+    backend = cache_mod.SqliteBackend(db, commit_every=64, commit_interval_s=3600)
+    c = cache_mod.Cache(backend=backend)
+
+    c.store_200("https://a.example/1", 200, "text/html", _page(1), HTML_HEADERS)
+    assert not backend._cx.in_transaction
+
+    # Another process on the same file can read and write without waiting.
+    other = sqlite3.connect(db, timeout=0.1)
+    assert other.execute("SELECT COUNT(*) FROM http_cache").fetchone()[0] == 1
+    other.execute("DELETE FROM http_cache WHERE path='/1'")
+    other.commit()
+    other.close()
+
+    c.store_304("https://a.example/1", {"etag": '"x"'})
+    c.store_200("https://a.example/2", 200, "text/html", _page(2), HTML_HEADERS)
+    assert not backend._cx.in_transaction
+    c.close()
+
+
+def test_sqlite_memory_batches_commits():
+    backend = cache_mod.SqliteBackend(":memory:", commit_every=3, commit_interval_s=3600)
+    c = cache_mod.Cache(backend=backend)
+
+    c.store_200("https://a.example/1", 200, "text/html", _page(1), HTML_HEADERS)
+    c.store_200("https://a.example/2", 200, "text/html", _page(2), HTML_HEADERS)
+    assert backend._cx.in_transaction
+
+    c.store_200("https://a.example/3", 200, "text/html", _page(3), HTML_HEADERS)
+    assert not backend._cx.in_transaction
+
+    c.store_200("https://a.example/4", 200, "text/html", _page(4), HTML_HEADERS)
+    assert backend._cx.in_transaction
+    c.flush()
+    assert not backend._cx.in_transaction
+    c.close()
+
+
+def test_sqlite_lru_eviction(monkeypatch):
+    now = {"t": 1_700_000_000.0}
+    monkeypatch.setattr("time.time", lambda: now["t"])
+
+    one = len(cache_mod._pack_body(_page(0))[0])
+    backend = cache_mod.SqliteBackend(":memory:", max_bytes=one * 3, commit_every=1)
+    c = cache_mod.Cache(backend=backend)
+
+    for i in range(3):
+        c.store_200(f"https://a.example/{i}", 200, "text/html", _page(i), HTML_HEADERS)
+        now["t"] += 120
+    # Touch /0 so /1 becomes the least recently used entry.
+    assert c.get("https://a.example/0")[0] is not None
+    now["t"] += 120
+
+    c.store_200("https://a.example/3", 200, "text/html", _page(3), HTML_HEADERS)
+
+    assert c.get("https://a.example/1")[0] is None
+    assert c.get("https://a.example/0")[0] is not None
+    assert c.get("https://a.example/3")[0] is not None
+    assert c.stats.evictions >= 1
+    c.close()
+
+
+def test_stats_counters(monkeypatch):
+    now = {"t": 1_700_000_000.0}
+    monkeypatch.setattr("time.time", lambda: now["t"])
+    c = cache_mod.Cache(":memory:")
+
+    c.get("https://a.example/")
+    c.store_200("https://a.example/", 200, "text/html", _page(1), HTML_HEADERS)
+    c.get("https://a.example/")
+    now["t"] += 120
+    c.get("https://a.example/")
+    c.store_304("https://a.example/", {"etag": '"v2"'})
+
+    s = c.stats.as_dict()
+    assert (s["misses"], s["hits"], s["stale"]) == (1, 1, 1)
+    assert (s["stores"], s["revalidated"]) == (1, 1)
+    assert s["hit_ratio"] == pytest.approx(1 / 3)
+    c.close()
+
+
+def test_old_schema_is_migrated(tmp_path):
+    db = str(tmp_path / "old.sqlite")
+    cx = sqlite3.connect(db)
+    cx.execute(
+        """
+        CREATE TABLE http_cache (
+          scheme TEXT NOT NULL, host TEXT NOT NULL, path TEXT NOT NULL,
+          etag TEXT, last_modified TEXT, status INTEGER NOT NULL,
+          content_type TEXT, body BLOB, fetched_at REAL NOT NULL, expires_at REAL,
+          PRIMARY KEY (scheme, host, path)
+        )
+        """
+    )
+    cx.execute(
+        "INSERT INTO http_cache "
+        "VALUES ('https','a.example','/',NULL,NULL,200,'text/html',?,1,NULL)",
+        (b"<html>old</html>",),
+    )
+    cx.commit()
+    cx.close()
+
+    c = cache_mod.Cache(db)
+    entry, _ = c.get("https://a.example/")
+    assert entry is not None and entry.body == b"<html>old</html>"
+    c.close()
+
+
+def test_redis_backend_shares_identical_bodies():
+    fakeredis = pytest.importorskip("fakeredis")
+    r = fakeredis.FakeRedis()
+    backend = cache_mod.RedisBackend(r, prefix="t")
+    c = cache_mod.Cache(backend=backend)
+    body = _page(1)
+
+    c.store_200("https://a.example/x", 200, "text/html", body, HTML_HEADERS)
+    c.store_200("https://b.example/y", 200, "text/html", body, HTML_HEADERS)
+    assert len(list(r.scan_iter(match="t:b:*"))) == 1
+
+    entry, fresh = c.get("https://b.example/y")
+    assert fresh and entry is not None and entry.body == body
+
+    c.purge("https://a.example/x")
+    assert len(list(r.scan_iter(match="t:b:*"))) == 1
+    c.purge("https://b.example/y")
+    assert list(r.scan_iter(match="t:b:*")) == []
+    assert int(r.get("t:bytes") or 0) == 0
+
+
+def test_redis_backend_refcounts_atomic_across_workers():
+    fakeredis = pytest.importorskip("fakeredis")
+    server = fakeredis.FakeServer()
+    body = _page(7)
+    stored = len(cache_mod._pack_body(body)[0])
+
+    def _worker(n: int) -> None:
+        c = cache_mod.Cache(
+            backend=cache_mod.RedisBackend(fakeredis.FakeRedis(server=server), prefix="t")
+        )
+        for i in range(25):
+            c.store_200(f"https://w{n}.example/{i}", 200, "text/html", body, HTML_HEADERS)
+            if i % 2:
+                c.purge(f"https://w{n}.example/{i - 1}")
+
+    threads = [threading.Thread(target=_worker, args=(n,)) for n in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    r = fakeredis.FakeRedis(server=server)
+    refs = {k.decode(): int(v) for k, v in r.hgetall("t:r").items()}
+    assert list(refs.values()) == [4 * 13]  # 25 saves - 12 purges per worker
+    assert int(r.get("t:bytes")) == stored
+    assert len(list(r.scan_iter(match="t:b:*"))) == 1
+
+
+def test_redis_backend_evicts_lru():
+    fakeredis = pytest.importorskip("fakeredis")
+    one = len(cache_mod._pack_body(_page(0))[0])
+    backend = cache_mod.RedisBackend(fakeredis.FakeRedis(), prefix="t", max_bytes=one * 2 + 10)
+    c = cache_mod.Cache(backend=backend)
+
+    for i in range(4):
+        c.store_200(f"https://a.example/{i}", 200, "text/html", _page(i), HTML_HEADERS)
+
+    assert c.get("https://a.example/0")[0] is None
+    assert c.get("https://a.example/3")[0] is not None
+    assert c.stats.evictions >= 2
+
+
+@respx.mock
+def test_crawler_uses_cache_when_enabled(monkeypatch):
+    monkeypatch.setattr(runner, "_HAS_HEADLESS", False)
+    monkeypatch.setattr(runner, "_CRAWL_HTTP_CACHE", True)
+    shared = cache_mod.Cache(":memory:")
+    monkeypatch.setattr(cache_mod, "_default_cache", shared)
+    robots.clear_cache()
+
+    html = (
+        "<html><head><title>Team</title></head><body><a href='/team'>Team</a>"
+        + "<p>We build things for customers around the world.</p>" * 10
+        + "</body></html>"
+    )
+    seen_conditional: list[str] = []
+
+    def handler(request):
+        if request.url.path == "/robots.txt":
+            return httpx.Response(200, text="User-agent: *\nAllow: /\n")
+        if request.headers.get("if-none-match") == '"v1"':
+            seen_conditional.append(request.url.path)
+            return httpx.Response(304, headers={"etag": '"v1"'})
+        return httpx.Response(
+            200,
+            text=html,
+            headers={"content-type": "text/html", "etag": '"v1"', "cache-control": "max-age=0"},
+        )
+
+    respx.route(host="cached.example").mock(side_effect=handler)
+
+    first = [p.url for p in runner.crawl_domain("cached.example")]
+    robots.clear_cache()
+    second = [p.url for p in runner.crawl_domain("cached.example")]
+
+    assert first == second and first
+    # max-age=0 => stale immediately, so the second run revalidates every page.
+    assert set(seen_conditional) >= {"/team"}
+    assert shared.stats.revalidated >= 1
+    robots.clear_cache()
+    shared.close()
@@ -197,3 +197,34 @@ def test_robots_server_error_denies_all():
 
     # 5xx on robots.txt → deny_all → 451
     assert res.status == 451
+
+
+@pytest.mark.skipif(not HAS_CLIENT, reason="Fetch client not available")
+@respx.mock
+def test_304_serves_refreshed_entry_without_reloading(monkeypatch):
+    """A 304 is answered from the entry store_304 returns; no second cache read."""
+    respx.get("https://example.com/robots.txt").mock(
+        return_value=Response(200, text="User-agent: *\nAllow: /")
+    )
+    respx.get("https://example.com/page").mock(
+        return_value=Response(304, headers={"ETag": '"v1"', "Cache-Control": "max-age=60"})
+    )
+
+    with client_mod.FetcherClient(cache_db=":memory:") as fc:
+        fc.cache.store_200(
+            "https://example.com/page",
+            200,
+            "text/html",
+            b"<html>cached</html>",
+            {"ETag": '"v1"', "Cache-Control": "max-age=0"},
+        )
+        gets: list[str] = []
+        real_get = fc.cache.get
+        monkeypatch.setattr(fc.cache, "get", lambda url: gets.append(url) or real_get(url))
+
+        res = fc.fetch("https://example.com/page")
+
+    assert res.status == 200
+    assert res.body == b"<html>cached</html>"
+    assert res.reason == "validated-cache"
+    assert gets == ["https://example.com/page"]
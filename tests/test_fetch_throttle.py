@@ -161,3 +161,15 @@ def test_non_waf_non_success_still_respects_crawl_delay(monkeypatch):
         slept = throttle.wait_for_turn(host)
         assert slept == pytest.approx(0.75)
         assert clk.slept() == pytest.approx(0.75)
+
+
+def test_success_during_cooloff_stacks_crawl_delay(monkeypatch):
+    """In-process state: a success inside a WAF cool-off adds the crawl-delay on top of it."""
+    monkeypatch.setattr(throttle.robots, "get_crawl_delay", lambda host: 1.5, raising=False)
+
+    with fake_clock(monkeypatch) as clk:
+        host = "stack.test"
+        cooloff = throttle.after_response(host, 429)
+        throttle.after_response(host, 200)
+        assert throttle.waf_strikes(host) == 0
+        assert throttle.next_allowed_at(host) == pytest.approx(clk.now() + cooloff + 1.5)
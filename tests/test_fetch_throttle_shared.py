@@ -0,0 +1,99 @@
+# tests/test_fetch_throttle_shared.py
+"""
+Cross-worker throttle state (RedisThrottleBackend) and reserve_slot().
+
+Verifies that:
+  - WAF strikes and backoff learned by one worker apply to another
+  - a success seen by any worker resets the shared strike count
+  - reserve_slot() hands concurrent callers distinct, spaced slots (both backends)
+  - wait_for_turn() claims its turn atomically on the shared backend, and the
+    response's crawl-delay does not stack on top of that claim
+  - a broken shared backend degrades to process-local state
+"""
+
+from __future__ import annotations
+
+import pytest
+
+from src.fetch import throttle
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+@pytest.fixture
+def shared(monkeypatch):
+    monkeypatch.setattr(throttle, "BASE_BACKOFF_S", 3.0)
+    monkeypatch.setattr(throttle, "MAX_BACKOFF_S", 60.0)
+    backend = throttle.RedisThrottleBackend(fakeredis.FakeStrictRedis(), prefix="t-throttle")
+    throttle.set_shared_backend(backend)
+    throttle.clear()
+    yield backend
+    throttle.set_shared_backend(None)
+    throttle.clear()
+
+
+def _other_worker() -> None:
+    """A second process would start with no local state."""
+    with throttle._GLOBAL_LOCK:
+        throttle._MEMO.clear()
+
+
+def test_waf_backoff_shared_between_workers(shared):
+    assert throttle.penalize("cms.test") == pytest.approx(6.0)
+    _other_worker()
+    assert throttle.waf_strikes("cms.test") == 1
+    assert throttle.after_response("cms.test", 429) == pytest.approx(12.0)
+    assert throttle.next_allowed_at("cms.test") - throttle._now() > 17.0
+
+    _other_worker()
+    throttle.mark_ok("cms.test", crawl_delay_s=0.5)
+    assert throttle.waf_strikes("cms.test") == 0
+    assert throttle._MEMO == {}  # local dicts untouched while shared is on
+
+
+def test_backoff_capped(shared, monkeypatch):
+    monkeypatch.setattr(throttle, "MAX_BACKOFF_S", 10.0)
+    assert [throttle.penalize("h.test") for _ in range(3)] == pytest.approx([6.0, 10.0, 10.0])
+
+
+def test_reserve_slot_spaces_callers_shared(shared):
+    delays = [throttle.reserve_slot("jobs.test", crawl_delay_s=2.0) for _ in range(3)]
+    assert delays[0] == 0.0
+    assert delays[1] == pytest.approx(2.0, abs=0.05)
+    assert delays[2] == pytest.approx(4.0, abs=0.05)
+
+
+def test_reserve_slot_spaces_callers_local():
+    throttle.clear()
+    delays = [throttle.reserve_slot("local.test", crawl_delay_s=1.5) for _ in range(3)]
+    assert delays[0] == 0.0
+    assert delays[1] == pytest.approx(1.5, abs=0.05)
+    assert delays[2] == pytest.approx(3.0, abs=0.05)
+    throttle.clear()
+
+
+def test_wait_for_turn_claims_distinct_slots(shared, monkeypatch):
+    slept: list[float] = []
+    monkeypatch.setattr(throttle, "_sleep", slept.append)
+
+    # Three workers race for the host: each sleeps to its own slot
+    waits = [throttle.wait_for_turn("race.test", crawl_delay_s=2.0) for _ in range(3)]
+    assert waits[0] == 0.0
+    assert waits[1] == pytest.approx(2.0, abs=0.05)
+    assert waits[2] == pytest.approx(4.0, abs=0.05)
+    assert slept == waits[1:]
+
+    # A response inside the claimed window keeps the schedule, it doesn't add a gap
+    before = throttle.next_allowed_at("race.test")
+    assert throttle.mark_ok("race.test", crawl_delay_s=2.0) == 2.0
+    assert throttle.next_allowed_at("race.test") == pytest.approx(before, abs=0.05)
+
+
+def test_shared_errors_fall_back_to_local(shared, monkeypatch):
+    def _boom(*a, **kw):
+        raise ConnectionError("redis down")
+
+    monkeypatch.setattr(shared, "call", _boom)
+    assert throttle.penalize("down.test") == pytest.approx(6.0)
+    assert throttle._MEMO["down.test"].waf_strikes == 1
@@ -0,0 +1,234 @@
+# tests/test_headless_pool.py
+"""
+RenderPool: one long-lived headless browser per process.
+
+Verifies that the pool:
+  - launches the browser once and reuses warm contexts across renders/crawls
+  - aborts blocked resource types at the network layer
+  - waits for DOM stability instead of a fixed sleep
+  - bounds concurrent renders across sync and async callers
+  - recycles contexts after max uses and relaunches a disconnected browser
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+
+import pytest
+
+import src.crawl.headless as headless
+
+
+class _FakeRequest:
+    def __init__(self, resource_type: str):
+        self.resource_type = resource_type
+
+
+class _FakeRoute:
+    def __init__(self, resource_type: str, log: list[str]):
+        self.request = _FakeRequest(resource_type)
+        self._log = log
+
+    async def abort(self):
+        self._log.append(f"abort:{self.request.resource_type}")
+
+    async def continue_(self):
+        self._log.append(f"continue:{self.request.resource_type}")
+
+
+class _FakePage:
+    def __init__(self, browser: _FakeBrowser, context: _FakeContext):
+        self.browser = browser
+        self.context = context
+
+    async def goto(self, url, wait_until=None, timeout=None):
+        b = self.browser
+        with b.lock:
+            b.in_flight += 1
+            b.peak = max(b.peak, b.in_flight)
+        try:
+            b.gotos.append((url, wait_until))
+            # Simulate subresource requests going through the context route.
+            for rt in ("document", "image", "font", "script", "media"):
+                if self.context.route_handler is not None:
+                    await self.context.route_handler(_FakeRoute(rt, b.route_log))
+            await asyncio.sleep(0.02)
+            if "fail" in url:
+                raise RuntimeError("net::ERR_FAILED")
+        finally:
+            with b.lock:
+                b.in_flight -= 1
+        self.url = url
+
+    async def evaluate(self, script, arg=None):
+        self.browser.evaluates.append(arg)
+        return 0
+
+    async def wait_for_timeout(self, ms):  # pragma: no cover - must not be used
+        raise AssertionError("fixed sleep used")
+
+    async def content(self):
+        return f"<html><body>rendered {self.url}</body></html>"
+
+    async def close(self):
+        pass
+
+
+class _FakeContext:
+    def __init__(self, browser: _FakeBrowser, opts: dict):
+        self.browser = browser
+        self.opts = opts
+        self.route_handler = None
+        self.closed = False
+
+    async def route(self, pattern, handler):
+        self.route_handler = handler
+
+    async def new_page(self):
+        return _FakePage(self.browser, self)
+
+    async def clear_cookies(self):
+        pass
+
+    async def close(self):
+        self.closed = True
+
+
+class _FakeBrowser:
+    def __init__(self):
+        self.contexts: list[_FakeContext] = []
+        self.gotos: list[tuple[str, str | None]] = []
+        self.evaluates: list = []
+        self.route_log: list[str] = []
+        self.connected = True
+        self.in_flight = 0
+        self.peak = 0
+        self.lock = threading.Lock()
+
+    def is_connected(self):
+        return self.connected
+
+    async def new_context(self, **opts):
+        ctx = _FakeContext(self, opts)
+        self.contexts.append(ctx)
+        return ctx
+
+    async def close(self):
+        self.connected = False
+
+
+class _FakePW:
+    async def stop(self):
+        pass
+
+
+@pytest.fixture
+def launched():
+    browsers: list[_FakeBrowser] = []
+
+    async def _launcher():
+        b = _FakeBrowser()
+        browsers.append(b)
+        return _FakePW(), b
+
+    return browsers, _launcher
+
+
+@pytest.fixture
+def pool(launched):
+    _, launcher = launched
+    p = headless.RenderPool(max_concurrency=2, launcher=launcher, dom_quiet_ms=10)
+    yield p
+    p.close()
+
+
+def test_browser_launched_once_and_contexts_reused(pool, launched):
+    browsers, _ = launched
+
+    for i in range(3):
+        with headless.HeadlessBrowser(pool=pool, user_agent="UA") as hb:
+            assert hb.render(f"https://site{i}.example/") is not None
+
+    assert pool.launches == 1
+    assert len(browsers) == 1
+    assert pool.contexts_created == 1
+    assert browsers[0].contexts[0].opts == {"user_agent": "UA"}
+    assert pool.renders == 3
+
+
+def test_blocks_heavy_resources_and_waits_for_dom(pool, launched):
+    browsers, _ = launched
+    out = pool.render("https://a.example/")
+
+    assert out == b"<html><body>rendered https://a.example/</body></html>"
+    log = browsers[0].route_log
+    assert {"abort:image", "abort:font", "abort:media"} <= set(log)
+    assert {"continue:document", "continue:script"} <= set(log)
+    assert browsers[0].evaluates == [[10, pool.dom_stable_max_ms]]
+    assert browsers[0].gotos[0][1] == headless.HEADLESS_WAIT_UNTIL
+
+
+def test_concurrency_bounded_across_async_callers(pool, launched):
+    browsers, _ = launched
+
+    async def _go():
+        return await asyncio.gather(
+            *(pool.render_async(f"https://s{i}.example/") for i in range(6))
+        )
+
+    results = asyncio.run(_go())
+
+    assert all(r is not None for r in results)
+    assert browsers[0].peak <= 2
+    assert pool.peak_in_flight == 2
+    assert pool.contexts_created <= 2
+
+
+def test_per_crawl_budget(pool, monkeypatch):
+    monkeypatch.setattr(headless, "HEADLESS_MAX_RENDERS_PER_CRAWL", 2)
+    hb = headless.HeadlessBrowser(pool=pool)
+    assert [hb.render(f"https://x.example/{i}") is not None for i in range(3)] == [
+        True,
+        True,
+        False,
+    ]
+    # A new crawl gets a fresh budget on the same warm browser.
+    assert headless.HeadlessBrowser(pool=pool).render("https://x.example/again") is not None
+    assert pool.launches == 1
+
+
+def test_failed_render_discards_context(pool, launched):
+    browsers, _ = launched
+    assert pool.render("https://fail.example/") is None
+    assert browsers[0].contexts[0].closed
+    assert pool.render("https://ok.example/") is not None
+    assert pool.contexts_created == 2
+
+
+def test_context_recycled_after_max_uses(launched):
+    browsers, launcher = launched
+    p = headless.RenderPool(max_concurrency=1, context_max_uses=2, launcher=launcher)
+    try:
+        for i in range(5):
+            p.render(f"https://r.example/{i}")
+        assert p.contexts_created == 3
+        assert sum(c.closed for c in browsers[0].contexts) == 2
+    finally:
+        p.close()
+
+
+def test_relaunch_after_disconnect(pool, launched):
+    browsers, _ = launched
+    pool.render("https://a.example/")
+    browsers[0].connected = False
+
+    assert pool.render("https://b.example/") is not None
+    assert pool.launches == 2
+
+
+def test_closed_pool_returns_none(launched):
+    _, launcher = launched
+    p = headless.RenderPool(launcher=launcher)
+    p.close()
+    assert p.render("https://a.example/") is None
@@ -0,0 +1,142 @@
+# tests/test_ingest_bulk.py
+"""
+Bulk ingest path (src.ingest.persist.persist_rows, set-based).
+
+Verifies that:
+  - the bulk path writes the same companies and people as the per-row path
+    (domain keying, exact-name keying, fill-if-empty on existing companies)
+  - follow-up jobs are deduplicated per company / (company, domain), freemail
+    domains get no MX job, and each chunk enqueues in a single batch
+  - domain resolution goes out as resolve_company_domains jobs of
+    INGEST_RESOLVE_BATCH companies
+  - list/dict values are stored as JSON text on both COPY and executemany paths
+"""
+
+from __future__ import annotations
+
+import json
+import sqlite3
+
+import pytest
+
+from src.db import CompatConnection
+from src.ingest import persist
+from src.queueing import fanout
+
+_ROWS = [
+    {"company": "Acme Inc", "domain": "acme.com", "first_name": "Jane", "last_name": "Doe"},
+    {"company": "Acme Inc", "domain": "acme.com", "first_name": "John", "last_name": "Roe"},
+    {"company": "", "domain": "globex.com", "first_name": "Ann", "last_name": "Lee"},
+    {"company": "Globex", "domain": "globex.com", "first_name": "Bo", "last_name": "Ng"},
+    {"company": "Initech", "domain": "", "first_name": "Pete", "last_name": "Gibbons"},
+    {"company": "Initech", "domain": "", "first_name": "Sam", "last_name": "Nye"},
+    {"company": "Solo", "domain": "gmail.com", "first_name": "Al", "last_name": "Bee"},
+]
+
+
+def _make_db(path) -> str:
+    con = sqlite3.connect(path)
+    con.executescript(
+        """
+        CREATE TABLE companies (id INTEGER PRIMARY KEY, name TEXT, domain TEXT,
+                                name_norm TEXT, norm_key TEXT);
+        CREATE TABLE people (id INTEGER PRIMARY KEY, company_id INTEGER, first_name TEXT,
+                             last_name TEXT, full_name TEXT, title TEXT, source_url TEXT);
+        INSERT INTO companies (name, domain) VALUES ('', 'globex.com');
+        """
+    )
+    con.commit()
+    con.close()
+    return f"sqlite:///{path}"
+
+
+def _dump(path):
+    """Companies and people by content (ids may be assigned in a different order)."""
+    con = sqlite3.connect(path)
+    companies = {
+        r[0]: r[1:]
+        for r in con.execute("SELECT id, name, domain, name_norm, norm_key FROM companies")
+    }
+    people = sorted(
+        (companies[r[0]], r[1], r[2])
+        for r in con.execute("SELECT company_id, first_name, last_name FROM people")
+    )
+    con.close()
+    return sorted(companies.values(), key=repr), people
+
+
+@pytest.fixture
+def batches(monkeypatch):
+    calls: list[list[fanout.JobSpec]] = []
+    monkeypatch.setattr(fanout, "enqueue_bulk", lambda specs, **kw: calls.append(list(specs)))
+    monkeypatch.setattr("src.queueing.redis_conn.get_redis", lambda: None)
+    monkeypatch.setattr(persist, "_enqueue_domain_resolution", lambda *a, **k: None)
+    monkeypatch.setattr(persist, "_enqueue_mx_resolution", lambda *a, **k: None)
+    return calls
+
+
+def test_bulk_matches_per_row_path(tmp_path, monkeypatch, batches):
+    row_db, bulk_db = tmp_path / "row.db", tmp_path / "bulk.db"
+
+    monkeypatch.setenv("DATABASE_URL", _make_db(row_db))
+    monkeypatch.setattr(persist, "INGEST_BULK_ENABLED", False)
+    assert persist.persist_rows(_ROWS) == len(_ROWS)
+
+    monkeypatch.setenv("DATABASE_URL", _make_db(bulk_db))
+    monkeypatch.setattr(persist, "INGEST_BULK_ENABLED", True)
+    assert persist.persist_rows(_ROWS, chunk_size=4) == len(_ROWS)
+
+    assert _dump(bulk_db) == _dump(row_db)
+    companies, _ = _dump(bulk_db)
+    assert len(companies) == 4
+    assert ("Globex", "globex.com", "Globex", "globex") in companies  # existing row filled
+
+
+def test_bulk_followups_deduplicated(tmp_path, monkeypatch, batches):
+    monkeypatch.setenv("DATABASE_URL", _make_db(tmp_path / "bulk.db"))
+    monkeypatch.setattr(persist, "INGEST_BULK_ENABLED", True)
+    monkeypatch.setattr(persist, "INGEST_RESOLVE_BATCH", 3)
+    persist.persist_rows(_ROWS, chunk_size=100)
+
+    assert len(batches) == 1
+    specs = batches[0]
+    domain_jobs = [s for s in specs if s.queue == "default"]
+    mx_jobs = sorted(s.kwargs["domain"] for s in specs if s.queue == "mx")
+    assert {s.func for s in domain_jobs} == {"src.queueing.tasks.resolve_company_domains"}
+    names = [[c["company_name"] for c in s.kwargs["companies"]] for s in domain_jobs]
+    assert [len(n) for n in names] == [3, 1]  # acme, globex, initech, solo
+    assert mx_jobs == ["acme.com", "globex.com"]
+
+
+class _CopyCursor:
+    def __init__(self, sink: list[str]):
+        self.sink = sink
+
+    def copy_expert(self, sql, buf):
+        self.sink.append(buf.read())
+
+    def close(self):
+        pass
+
+
+class _CopyConn:
+    def __init__(self):
+        self.copied: list[str] = []
+
+    def cursor(self):
+        return _CopyCursor(self.copied)
+
+
+def test_copy_rows_json_encodes_non_scalars():
+    row = [1, ["dup_name", "bad title"], {"k": "v"}]
+    cols = ("id", "errors", "notes")
+
+    raw = sqlite3.connect(":memory:")
+    raw.execute("CREATE TABLE people (id INTEGER, errors TEXT, notes TEXT)")
+    persist._copy_rows(CompatConnection(raw, is_pg=False), "people", cols, [row])
+    stored = raw.execute("SELECT errors, notes FROM people").fetchone()
+    assert [json.loads(v) for v in stored] == [row[1], row[2]]
+
+    pg = _CopyConn()
+    persist._copy_rows(CompatConnection(pg, is_pg=True), "people", cols, [row])
+    assert pg.copied == ['1,"[""dup_name"", ""bad title""]","{""k"": ""v""}"\n']
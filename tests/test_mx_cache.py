@@ -0,0 +1,181 @@
+# tests/test_mx_cache.py
+"""
+Domain-keyed MX cache (src.resolve.mx: MXCache, resolve_mx_domain,
+resolve_mx_many).
+
+Verifies that:
+  - a domain already resolved for one company costs no DNS lookup for another,
+    and entries live for the (clamped) DNS TTL
+  - NXDOMAIN / null MX answers are cached; transient failures are not
+  - the Redis and DB layers serve other processes and promote into the LRU
+  - resolve_mx_many() dedupes, skips cached domains and resolves the rest
+    concurrently; prefetch() warms the cache so later per-company lookups
+    cost no DNS
+  - an A/AAAA-fallback answer lives for the address TTL (or the floor), not 24h
+  - get_or_resolve_mx() keeps the MX behavior hint for a domain no company
+    has resolved, on a company_id=0 row
+"""
+
+from __future__ import annotations
+
+import sqlite3
+import threading
+import time
+
+import pytest
+
+from src.resolve import mx
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+class NXDOMAIN(Exception):
+    pass
+
+
+class Timeout(Exception):
+    pass
+
+
+@pytest.fixture
+def dns(tmp_path, monkeypatch):
+    db = tmp_path / "mx.db"
+    con = sqlite3.connect(db)
+    con.execute(
+        "CREATE TABLE domain_resolutions (id INTEGER PRIMARY KEY, company_id INTEGER, "
+        "domain TEXT, mx_hosts TEXT, preference_map TEXT, lowest_mx TEXT, resolved_at TEXT, "
+        "ttl INTEGER, failure TEXT)"
+    )
+    con.commit()
+    con.close()
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db}")
+    calls: list[str] = []
+    answers = {
+        "acme.com": [(10, "mx1.acme.com."), (5, "mx0.acme.com.")],
+        "globex.com": [(10, "mx.globex.com.")],
+        "nullmx.com": [(0, ".")],
+    }
+    lock = threading.Lock()
+
+    def _lookup(domain):
+        with lock:
+            calls.append(domain)
+        time.sleep(0.02)
+        if domain == "slow.com":
+            raise Timeout()
+        if domain not in answers:
+            raise NXDOMAIN()
+        mx._dns_local.ttl = 120
+        return answers[domain]
+
+    monkeypatch.setattr(mx, "_DNSPY_AVAILABLE", True)
+    monkeypatch.setattr(mx, "mx_lookup", _lookup)
+    monkeypatch.setattr(mx, "a_aaaa_fallback", lambda d: [])
+    monkeypatch.setattr(mx, "MX_CACHE_ENABLED", True)
+    redis = fakeredis.FakeRedis()
+    cache = mx.MXCache(redis=redis)
+    mx.set_mx_cache(cache)
+    yield calls, cache, redis
+    mx.set_mx_cache(None)
+
+
+def test_second_company_reuses_domain_answer(dns):
+    calls, cache, _ = dns
+    first = mx.resolve_mx(1, "Acme.com")
+    second = mx.resolve_mx(2, "acme.com")
+
+    assert calls == ["acme.com"]
+    assert (first.cached, second.cached) == (False, True)
+    assert second.mx_hosts == ["mx0.acme.com", "mx1.acme.com"]
+    assert second.lowest_mx == "mx0.acme.com"
+    assert 0 < second.ttl <= 120  # DNS TTL, not the 24h default
+    assert mx.get_or_resolve_mx("acme.com").lowest_mx == "mx0.acme.com"
+    assert calls == ["acme.com"]
+    assert cache.stats.lru_hits == 2 and cache.stats.dns_lookups == 1
+
+
+def test_negative_answers_cached_transient_not(dns):
+    calls, cache, _ = dns
+    for _ in range(2):
+        assert mx.resolve_mx_domain("nullmx.com").failure == "null_mx"
+        assert mx.resolve_mx_domain("nope.com").failure == "mx_lookup_failed:NXDOMAIN"
+        assert mx.resolve_mx_domain("slow.com").failure == "mx_lookup_failed:Timeout"
+    assert calls == ["nullmx.com", "nope.com", "slow.com", "slow.com"]
+    assert cache.stats.negative_hits == 2
+
+
+def test_redis_and_db_layers_shared(dns):
+    calls, _, redis = dns
+    mx.resolve_mx_domain("globex.com")
+
+    other_worker = mx.MXCache(redis=redis)
+    assert other_worker.get("globex.com").source == "redis"
+    assert other_worker.get("globex.com").source == "lru"
+
+    no_redis = mx.MXCache(use_redis=False)
+    rec = no_redis.get("globex.com")
+    assert rec is not None and rec.source == "db" and rec.lowest_mx == "mx.globex.com"
+    assert calls == ["globex.com"]
+
+
+def test_resolve_mx_many_concurrent(dns):
+    calls, _, _ = dns
+    mx.resolve_mx_domain("acme.com")
+    calls.clear()
+
+    t0 = time.perf_counter()
+    out = mx.resolve_mx_many(
+        ["ACME.com", "globex.com", "nullmx.com", "nope.com", "globex.com", ""], max_workers=4
+    )
+    elapsed = time.perf_counter() - t0
+
+    assert list(out) == ["acme.com", "globex.com", "nullmx.com", "nope.com"]
+    assert out["acme.com"].source == "lru"
+    assert sorted(calls) == ["globex.com", "nope.com", "nullmx.com"]
+    assert elapsed < 0.06 * 3  # three 20ms lookups ran in parallel
+    assert mx.resolve_mx_many(["globex.com", "nope.com"])["nope.com"].source == "lru"
+
+
+def test_prefetch_warms_cache_for_later_lookups(dns):
+    calls, _, _ = dns
+    assert mx.prefetch(["acme.com", "Globex.com", "nope.com"]) == {
+        "acme.com": "mx0.acme.com",
+        "globex.com": "mx.globex.com",
+        "nope.com": None,
+    }
+    calls.clear()
+
+    assert mx.resolve_mx(7, "globex.com").lowest_mx == "mx.globex.com"
+    assert mx.get_or_resolve_mx("acme.com").lowest_mx == "mx0.acme.com"
+    assert calls == []
+
+
+def test_a_fallback_uses_address_ttl(dns, monkeypatch):
+    def _fallback(domain):
+        if domain == "web-only.io":
+            mx._dns_local.ttl = 90
+        return [(0, domain)]
+
+    monkeypatch.setattr(mx, "a_aaaa_fallback", _fallback)
+    monkeypatch.setattr(mx, "MX_CACHE_MIN_TTL_SEC", 60)
+    rec = mx.resolve_mx_domain("web-only.io")
+    assert rec.lowest_mx == "web-only.io" and 0 < rec.ttl <= 90
+    assert 0 < mx.resolve_mx_domain("no-ttl.io").ttl <= 60
+
+
+def test_behavior_hint_kept_without_company_row(dns, monkeypatch, tmp_path):
+    db = tmp_path / "mx.db"
+    con = sqlite3.connect(db)
+    con.execute("ALTER TABLE domain_resolutions ADD COLUMN mx_behavior TEXT")
+    con.commit()
+    monkeypatch.setattr(mx, "get_conn", lambda: sqlite3.connect(db))
+    hint = {"p95_ms": 800, "tarpit": False}
+    monkeypatch.setattr(mx, "get_mx_behavior_hint", lambda host, **kw: hint)
+
+    info = mx.get_or_resolve_mx("globex.com")
+    assert (info.lowest_mx, info.mx_behavior) == ("mx.globex.com", hint)
+    rows = con.execute(
+        "SELECT company_id, mx_behavior FROM domain_resolutions WHERE domain = 'globex.com'"
+    ).fetchall()
+    con.close()
+    assert rows == [(0, '{"p95_ms": 800, "tarpit": false}')]
@@ -0,0 +1,200 @@
+# tests/test_mx_scheduler.py
+"""
+MX-aware verification scheduler (src.queueing.mx_scheduler).
+
+Verifies that:
+  - schedule_probe_jobs() groups work by resolved MX (one lookup per domain)
+  - dispatch_due() releases each host's jobs up to its free slots and rate,
+    leaving the rest parked instead of failing them
+  - a congested host does not hold back other hosts
+  - dispatched-but-not-started jobs keep their slot until mark_started()
+  - a dispatcher that dies between pop and enqueue loses nothing: the claim
+    expires and the jobs are re-parked
+  - when only some enqueue chunks fail, just those jobs are re-parked and
+    the ones already on RQ are not dispatched a second time
+  - a throttled job in a worker is parked in its MX delay queue
+  - MX_SCHEDULER_ENABLED=0 keeps the direct RQ path
+"""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+from rq import Queue
+from rq.job import Job
+
+from src.queueing import mx_scheduler as ms
+from src.queueing import rate_limit as rl
+from src.queueing import tasks
+from src.queueing.fanout import JobSpec
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeStrictRedis()
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    rate = SimpleNamespace(
+        global_max_concurrency=100,
+        per_mx_max_concurrency_default=2,
+        global_rps=0,
+        per_mx_rps_default=0,
+    )
+    monkeypatch.setattr(ms, "_cfg", SimpleNamespace(rate=rate))
+    monkeypatch.delenv("MX_SCHEDULER_ENABLED", raising=False)
+    return rate
+
+
+def _spec(email: str) -> JobSpec:
+    return JobSpec("verify", "builtins.dict", kwargs={"email": email})
+
+
+def _domain(spec: JobSpec) -> str:
+    return spec.kwargs["email"].split("@")[1]
+
+
+def test_groups_by_resolved_mx(redis, limits):
+    lookups: list[str] = []
+
+    def resolver(dom):
+        lookups.append(dom)
+        return ("aspmx.l.google.com." if dom != "own.test" else "mx.own.test", 10)
+
+    specs = [_spec(f"u{i}@{d}") for i, d in enumerate(["a.test", "b.test", "a.test", "own.test"])]
+    assert ms.schedule_probe_jobs(redis, specs, domain_of=_domain, resolver=resolver) == 4
+
+    assert sorted(lookups) == ["a.test", "b.test", "own.test"]
+    assert ms.pending_count(redis, "aspmx.l.google.com") == 3
+    assert ms.pending_count(redis, "mx.own.test") == 1
+    assert Queue("verify", connection=redis).count == 0
+
+    # The MX hint is cached in Redis for later fan-outs
+    assert ms.mx_for_domain(redis, "b.test", resolver=lambda d: 1 / 0) == "aspmx.l.google.com"
+
+
+def test_dispatch_respects_free_slots_and_other_hosts(redis, limits):
+    ms.park_many(redis, [("mx-busy", _spec(f"u{i}@a.test")) for i in range(5)])
+    ms.park_many(redis, [("mx-idle", _spec("x@b.test"))])
+
+    # One slot on mx-busy is already held by a running probe
+    held = rl.acquire(redis, semaphores=((rl.MX_LEASES.format(mx="mx-busy"), 2, "cap"),))
+
+    stats = ms.dispatch_due(redis)
+    assert stats.dispatched == 2
+    assert ms.pending_count(redis, "mx-busy") == 4
+    assert ms.pending_count(redis, "mx-idle") == 0
+    assert Queue("verify", connection=redis).count == 2
+
+    # mx-busy is rescheduled a tick later, not dropped
+    assert redis.zscore(ms.MXQ_HOSTS, "mx-busy") is not None
+    assert redis.zscore(ms.MXQ_HOSTS, "mx-idle") is None
+    rl.release_lease(redis, held.lease)
+
+
+def test_inflight_jobs_hold_slots_until_started(redis, limits):
+    specs = [_spec(f"u{i}@a.test") for i in range(5)]
+    ms.park_many(redis, [("mx-a", s) for s in specs])
+
+    assert ms.dispatch_due(redis).dispatched == 2
+    redis.zadd(ms.MXQ_HOSTS, {"mx-a": 0})  # next tick, host due again
+    assert ms.dispatch_due(redis).dispatched == 0  # both slots still in flight
+
+    queued = Queue("verify", connection=redis).job_ids
+    for job_id in queued:
+        ms.mark_started(redis, "mx-a", job_id)
+    redis.zadd(ms.MXQ_HOSTS, {"mx-a": 0})
+    assert ms.dispatch_due(redis).dispatched == 2
+    assert ms.pending_count(redis, "mx-a") == 1
+
+
+def test_crashed_dispatch_is_recovered(redis, limits, monkeypatch):
+    ms.park_many(redis, [("mx-a", _spec(f"u{i}@a.test")) for i in range(2)])
+    monkeypatch.setattr(ms, "_claim_ms", lambda: 50)
+
+    def _die(*a, **k):
+        raise KeyboardInterrupt  # worker killed mid-dispatch
+
+    real_enqueue = ms.enqueue_bulk
+    monkeypatch.setattr(ms, "enqueue_bulk", _die)
+    with pytest.raises(KeyboardInterrupt):
+        ms.dispatch_due(redis)
+    assert ms.pending_count(redis, "mx-a") == 0
+    assert redis.hlen(ms.MXQ_PAYLOAD) == 2  # payloads kept while claimed
+
+    monkeypatch.setattr(ms, "enqueue_bulk", real_enqueue)
+    time.sleep(0.1)
+    assert ms.dispatch_due(redis).dispatched == 2
+    assert Queue("verify", connection=redis).count == 2
+    assert redis.hlen(ms.MXQ_PAYLOAD) == 0 and redis.zcard(ms.MXQ_CLAIMED) == 0
+
+
+def test_partial_enqueue_failure_reparks_only_failed(redis, limits, monkeypatch):
+    ms.park_many(redis, [("mx-a", _spec(f"u{i}@a.test")) for i in range(2)])
+    real_enqueue = ms.enqueue_bulk
+
+    def _first_chunk_only(specs, *, connection, failed):
+        failed.extend(specs[1:])  # second chunk's transaction failed
+        return real_enqueue(specs[:1], connection=connection)
+
+    monkeypatch.setattr(ms, "enqueue_bulk", _first_chunk_only)
+    assert ms.dispatch_due(redis).dispatched == 1
+    assert Queue("verify", connection=redis).count == 1
+    assert ms.pending_count(redis, "mx-a") == 1
+    assert redis.hlen(ms.MXQ_PAYLOAD) == 1 and redis.zcard(ms.MXQ_CLAIMED) == 0
+
+    # The re-parked job is the failed one, never the job already on RQ
+    sent = Queue("verify", connection=redis).job_ids
+    parked = [j.decode() for j in redis.zrange(ms.MXQ_JOBS.format(mx="mx-a"), 0, -1)]
+    assert len(parked) == 1 and parked[0] not in sent
+
+
+def test_dispatch_paces_by_host_rate(redis, limits):
+    limits.per_mx_max_concurrency_default = 0
+    limits.per_mx_rps_default = 20
+    ms.park_many(redis, [("mx-a", _spec(f"u{i}@a.test")) for i in range(30)])
+
+    assert ms.dispatch_due(redis).dispatched == 20  # burst
+    assert ms.dispatch_due(redis).dispatched == 0  # host not due yet
+    time.sleep(0.12)
+    assert 1 <= ms.dispatch_due(redis).dispatched <= 4
+    assert ms.pending_count(redis) == ms.pending_count(redis, "mx-a")
+
+
+def test_delayed_jobs_wait(redis, limits):
+    ms.park(redis, "mx-a", _spec("u@a.test"), delay_s=0.1)
+    assert ms.dispatch_due(redis).dispatched == 0
+    time.sleep(0.12)
+    assert ms.dispatch_due(redis).dispatched == 1
+
+
+def test_throttled_job_is_parked(redis, limits, monkeypatch):
+    job = Job.create(
+        "src.queueing.tasks.task_probe_email",
+        kwargs={"email_id": 1, "email": "u@a.test", "domain": "a.test"},
+        connection=redis,
+        origin="verify",
+        meta={"run_id": "r1"},
+    )
+    monkeypatch.setattr(tasks, "get_current_job", lambda: job)
+
+    job_id = tasks._defer_current_job(5.0, mx_host="mx-a")
+    assert job_id is not None and ms.pending_count(redis, "mx-a") == 1
+
+    monkeypatch.setenv("MX_SCHEDULER_ENABLED", "0")
+    assert tasks._defer_current_job(5.0, mx_host="mx-a") is not None
+    assert ms.pending_count(redis, "mx-a") == 1  # went to RQ's scheduled registry instead
+
+
+def test_disabled_enqueues_directly(redis, limits, monkeypatch):
+    monkeypatch.setenv("MX_SCHEDULER_ENABLED", "0")
+    n = ms.schedule_probe_jobs(redis, [_spec("u@a.test")], domain_of=_domain)
+    assert n == 1
+    assert Queue("verify", connection=redis).count == 1
+    assert ms.pending_count(redis) == 0
@@ -1,7 +1,16 @@
 # tests/test_o02_title_normalization.py
+import os
+import threading
+import time
+
 import pytest
 
-from src.ingest.title_norm import canonicalize
+from src.ingest.title_norm import (
+    TitleClassifier,
+    _AhoCorasick,
+    canonicalize,
+    canonicalize_many,
+)
 
 
 @pytest.mark.parametrize(
@@ -33,3 +42,70 @@ from src.ingest.title_norm import canonicalize
 def test_canonicalize_title(title_norm, exp_role, exp_seniority):
     role, seniority = canonicalize(title_norm)
     assert (role, seniority) == (exp_role, exp_seniority)
+
+
+def test_canonicalize_many_matches_single():
+    titles = ["VP, Sales", None, "vp, sales", "Head of Data", "", "Security Architect"]
+    assert canonicalize_many(titles) == [canonicalize(t) for t in titles]
+
+
+def test_aho_corasick_picks_lowest_rule_index():
+    m = _AhoCorasick(["head of sales", "sales", "he", "of s"])
+    assert m.first_match("vp, head of sales") == 0
+    assert m.first_match("inside sales") == 1
+    assert m.first_match("chef of staff") == 2
+    assert m.first_match("xyz") is None
+
+
+def test_classifier_reloads_on_mtime_change(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "title_map.yaml"
+    path.write_text(
+        'rules:\n  - match: "widget"\n    role_family: "Product"\n    seniority: "IC"\n'
+    )
+    clf = TitleClassifier(path, cache_size=2, reload_check_s=0)
+
+    assert clf.canonicalize("Widget Wrangler") == ("Product", "IC")
+    clf.canonicalize("a")
+    clf.canonicalize("b")
+    assert clf.cache_info()["size"] == 2
+
+    path.write_text('rules:\n  - match: "widget"\n    role_family: "Design"\n    seniority: "VP"\n')
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+    assert clf.canonicalize("Widget Wrangler") == ("Design", "VP")
+    assert clf.cache_info()["reloads"] == 2
+
+
+def test_classifier_reloads_once_under_concurrency(tmp_path):
+    pytest.importorskip("yaml")
+    path = tmp_path / "title_map.yaml"
+    path.write_text('rules:\n  - match: "widget"\n    role_family: "Product"\n')
+    clf = TitleClassifier(path, reload_check_s=0)
+
+    real_compile = clf._compile
+
+    def _slow_compile(**kw):
+        time.sleep(0.05)  # widen the window for racing threads
+        return real_compile(**kw)
+
+    clf._compile = _slow_compile
+    path.write_text('rules:\n  - match: "widget"\n    role_family: "Design"\n')
+    st = path.stat()
+    os.utime(path, ns=(st.st_atime_ns, st.st_mtime_ns + 1_000_000_000))
+
+    barrier = threading.Barrier(8)
+    results: list[str] = []
+
+    def _worker():
+        barrier.wait()
+        results.append(clf.canonicalize("Widget Wrangler")[0])
+
+    threads = [threading.Thread(target=_worker) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert results == ["Design"] * 8
+    assert clf.cache_info()["reloads"] == 2
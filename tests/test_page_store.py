@@ -0,0 +1,101 @@
+# tests/test_page_store.py
+"""
+Content-addressed page store (src.page_store) and its save_pages() wiring.
+
+Verifies that:
+  - save_pages() writes one compressed blob per distinct body and leaves
+    sources.html NULL, with rows pointing at the blob by SHA-256
+  - company page loads return lazy StoredBlobs that decompress to the HTML
+  - backfill() moves inline html into the store; gc_unreferenced() drops
+    blobs no row points at
+  - schemas without the store keep writing/reading sources.html
+"""
+
+from __future__ import annotations
+
+import sqlite3
+from types import SimpleNamespace
+
+import pytest
+
+from src import page_store
+from src.db_pages import save_pages
+from src.queueing import tasks
+
+HTML = "<html><body>" + "<p>Jane Doe, CTO</p>" * 200 + "</body></html>"
+
+
+def _conn(with_store: bool = True) -> sqlite3.Connection:
+    con = sqlite3.connect(":memory:")
+    extra = ", html_sha256 TEXT" if with_store else ""
+    con.execute(
+        "CREATE TABLE sources (id INTEGER PRIMARY KEY, company_id INTEGER, "
+        f"source_url TEXT NOT NULL, html TEXT, fetched_at TEXT{extra})"
+    )
+    if with_store:
+        con.execute(
+            "CREATE TABLE page_blobs (sha256 TEXT PRIMARY KEY, codec TEXT NOT NULL, "
+            "raw_size INTEGER NOT NULL, stored_size INTEGER NOT NULL, body BLOB NOT NULL, "
+            "created_at TEXT DEFAULT CURRENT_TIMESTAMP)"
+        )
+    return con
+
+
+def _page(url: str, html: str = HTML) -> SimpleNamespace:
+    return SimpleNamespace(url=url, html=html)
+
+
+def test_save_pages_dedupes_into_compressed_blobs():
+    con = _conn()
+    pages = [_page("https://a.test/team"), _page("https://a.test/about"), _page("https://a.test/x")]
+    pages[2].html = "<html>other</html>"
+    assert save_pages(con, pages, company_id=1) == 3
+    save_pages(con, [_page("https://a.test/team")], company_id=1)  # re-crawl, unchanged
+
+    assert con.execute("SELECT COUNT(*) FROM sources").fetchone()[0] == 3
+    assert con.execute("SELECT COUNT(*) FROM sources WHERE html IS NOT NULL").fetchone()[0] == 0
+    raw, stored = con.execute(
+        "SELECT raw_size, stored_size FROM page_blobs WHERE sha256 = ?",
+        (page_store.html_sha256(HTML),),
+    ).fetchone()
+    assert con.execute("SELECT COUNT(*) FROM page_blobs").fetchone()[0] == 2
+    assert stored < raw // 10
+
+    rows = dict(tasks._load_company_sources(con, 1, "a.test"))
+    assert isinstance(rows["https://a.test/team"], page_store.StoredBlob)
+    assert page_store.as_html(rows["https://a.test/team"]) == HTML
+    assert page_store.get_html(con, page_store.html_sha256(HTML)) == HTML
+
+
+def test_backfill_and_gc():
+    con = _conn()
+    con.executemany(
+        "INSERT INTO sources (company_id, source_url, html) VALUES (1, ?, ?)",
+        [("https://a.test/1", HTML), ("https://a.test/2", HTML), ("https://a.test/3", "<p>x</p>")],
+    )
+    assert page_store.backfill(con, batch_size=2) == 3
+    assert page_store.backfill(con) == 0
+    assert page_store.stats(con)["blobs"] == 2
+    assert con.execute("SELECT COUNT(*) FROM sources WHERE html IS NULL").fetchone()[0] == 3
+
+    con.execute("DELETE FROM sources WHERE source_url = 'https://a.test/3'")
+    assert page_store.gc_unreferenced(con, dry_run=True) == 1
+    assert page_store.gc_unreferenced(con) == 1
+    assert page_store.stats(con)["blobs"] == 1
+    assert page_store.as_html(dict(tasks._load_company_sources(con, 1, ""))["https://a.test/1"])
+
+
+@pytest.mark.parametrize("codec", ["gzip", "raw"])
+def test_codecs_roundtrip(monkeypatch, codec):
+    monkeypatch.setenv("PAGE_STORE_CODEC", codec)
+    used, body = page_store.compress(HTML.encode())
+    assert used == codec
+    assert page_store.decompress(used, body) == HTML.encode()
+    assert page_store.compress(b"ab") == ("raw", b"ab")  # never grows a blob
+
+
+def test_schema_without_store_stays_inline():
+    con = _conn(with_store=False)
+    save_pages(con, [_page("https://a.test/team")], company_id=1)
+    assert con.execute("SELECT html FROM sources").fetchone()[0] == HTML
+    assert tasks._load_company_sources(con, 1, "a.test") == [("https://a.test/team", HTML)]
@@ -0,0 +1,127 @@
+# tests/test_parsed_page.py
+"""
+ParsedPage: one parse per page, shared by the HTML extractors.
+"""
+
+from __future__ import annotations
+
+import pytest
+
+import src.extract.parsed_page as pp_mod
+import src.extract.source_filters as sf_mod
+from src.extract.ai_candidates import _extract_text_for_ai
+from src.extract.candidates import extract_candidates
+from src.extract.parsed_page import ParsedPage
+
+TEAM_HTML = """
+<html><head><title>Our Team | Acme</title>
+<script>var tracking = "jane.doe@acme.com";</script></head>
+<body>
+  <nav><a href="/">Home</a><a href="/team">Team</a></nav>
+  <section id="team">
+    <h2>Leadership Team</h2>
+    <div class="team-member"><h3>Jane Doe</h3><p>Chief Executive Officer</p>
+      <a href="mailto:jane.doe@acme.com">Email Jane</a></div>
+    <div class="team-member"><h3>John Smith</h3><p>Chief Financial Officer</p></div>
+    <div class="team-member"><h3>Maria Garcia</h3><p>VP of Engineering</p></div>
+  </section>
+</body></html>
+"""
+
+URL = "https://acme.com/team"
+
+
+@pytest.fixture
+def parse_counter(monkeypatch):
+    calls: list[str] = []
+    real = pp_mod.BeautifulSoup
+
+    def _counting(html, parser):
+        calls.append(parser)
+        return real(html, parser)
+
+    monkeypatch.setattr(pp_mod, "BeautifulSoup", _counting)
+    return calls
+
+
+def _key(c) -> tuple:
+    return (c.email, c.raw_name, c.title, c.source_type)
+
+
+def test_extract_candidates_parses_once_including_people_cards(parse_counter):
+    page = ParsedPage(TEAM_HTML, url=URL)
+    cands = extract_candidates(page, "acme.com", source_url=URL)
+
+    names = {c.raw_name for c in cands if c.raw_name}
+    assert {"John Smith", "Maria Garcia"} <= names
+    assert len(parse_counter) == 1
+
+
+def test_parsed_page_matches_raw_string_output():
+    from_str = extract_candidates(TEAM_HTML, "acme.com", source_url=URL)
+    from_page = extract_candidates(ParsedPage(TEAM_HTML, url=URL), "acme.com", source_url=URL)
+    assert sorted(map(_key, from_str), key=repr) == sorted(map(_key, from_page), key=repr)
+
+
+def test_views_are_lazy_and_skip_invisible_text(parse_counter):
+    page = ParsedPage(TEAM_HTML.encode("utf-8"), url=URL)
+    assert page.head_lower.startswith("\n<html>")
+    assert parse_counter == []  # raw-string views never build the tree
+
+    assert page.title == "Our Team | Acme"
+    assert ("h2", "Leadership Team") in page.headings
+    assert ("mailto:jane.doe@acme.com", "Email Jane") in page.anchors
+    assert "Jane Doe" in page.text
+    assert "tracking" not in page.text
+    assert len(parse_counter) == 1
+
+
+def test_parser_selection(monkeypatch):
+    monkeypatch.setenv("EXTRACT_HTML_PARSER", "lxml")
+    expected = "lxml" if pp_mod._HAS_LXML else "html.parser"
+    assert ParsedPage("<p>x</p>").parser == expected
+    assert ParsedPage("<p>x</p>", parser="html.parser").parser == "html.parser"
+
+    monkeypatch.setenv("EXTRACT_HTML_PARSER", "no-such-parser")
+    assert ParsedPage("<p>x</p>").parser == "html.parser"
+
+
+@pytest.mark.skipif(not pp_mod._HAS_LXML, reason="lxml not installed")
+def test_lxml_mode_extracts_same_people():
+    base = extract_candidates(TEAM_HTML, "acme.com", source_url=URL)
+    fast = extract_candidates(
+        ParsedPage(TEAM_HTML, url=URL, parser="lxml"), "acme.com", source_url=URL
+    )
+    assert {c.raw_name for c in base} == {c.raw_name for c in fast}
+
+
+def test_classifier_scores_page_html_once(monkeypatch):
+    calls: list[int] = []
+    real = sf_mod._score_html_signals
+
+    def _counting(text, reasons):
+        calls.append(1)
+        return real(text, reasons)
+
+    monkeypatch.setattr(sf_mod, "_score_html_signals", _counting)
+
+    page = ParsedPage(TEAM_HTML, url=URL)
+    a = sf_mod.classify_page_for_people_extraction(URL, page, min_score=4)
+    b = sf_mod.classify_page_for_people_extraction(URL, page, min_score=8)
+    c = sf_mod.classify_page_for_people_extraction(URL, TEAM_HTML, min_score=8)
+
+    assert len(calls) == 2  # once for the page, once for the raw string
+    assert (a.score, a.reasons) == (b.score, b.reasons) == (c.score, c.reasons)
+
+
+def test_ai_text_does_not_mutate_shared_soup():
+    page = ParsedPage(TEAM_HTML, url=URL)
+    _ = page.soup
+    text = _extract_text_for_ai(page)
+
+    assert "Jane Doe" in text
+    assert "tracking" not in text
+    # Cleanup ran on a copy: the shared tree still has its <script>/<nav>.
+    assert page.soup.find("script") is not None
+    assert page.soup.find("nav") is not None
+    assert text == _extract_text_for_ai(TEAM_HTML)
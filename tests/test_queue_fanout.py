@@ -0,0 +1,249 @@
+# tests/test_queue_fanout.py
+"""
+Bulk RQ fan-out (enqueue_bulk).
+
+Verifies that:
+  - jobs come back in input order with the pre-assigned ids
+  - dependency chains stay in one transaction and run in order
+  - a whole batch costs one pipeline execute per chunk
+  - with failed=[...], a failing chunk is recorded and later chunks still go out
+  - pipeline_start_v2's per-domain specs are wired with depends_on
+  - pipeline_start_v2 writes throttled progress while planning the fan-out, and
+    a generating run enqueues one MX prefetch for all its domains first
+  - task_generate_company_emails retries only the specs of a failed chunk
+"""
+
+from __future__ import annotations
+
+import pytest
+from rq import Queue, SimpleWorker
+
+from src.queueing import fanout, pipeline_v2, tasks
+from src.queueing.fanout import JobSpec, enqueue_bulk
+
+fakeredis = pytest.importorskip("fakeredis")
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeStrictRedis()
+
+
+def _fail_pipeline_execute(redis, monkeypatch, nth: int) -> dict[str, int]:
+    real_pipeline = redis.pipeline
+    calls = {"n": 0}
+
+    def _pipeline(*a, **kw):
+        pipe = real_pipeline(*a, **kw)
+        calls["n"] += 1
+        if calls["n"] == nth:
+
+            def _boom(*_a, **_kw):
+                raise ConnectionError("redis went away")
+
+            pipe.execute = _boom
+        return pipe
+
+    monkeypatch.setattr(redis, "pipeline", _pipeline)
+    return calls
+
+
+def test_order_ids_and_queues(redis):
+    specs = [JobSpec("a", "builtins.dict", kwargs={"n": i}) for i in range(5)]
+    specs.append(JobSpec("b", "builtins.dict", kwargs={"n": 99}))
+
+    jobs = enqueue_bulk(specs, connection=redis, chunk_size=2)
+
+    assert [j.id for j in jobs] == [s.job_id for s in specs]
+    assert Queue("a", connection=redis).count == 5
+    assert Queue("b", connection=redis).count == 1
+    assert jobs[3].kwargs == {"n": 3}
+
+
+def test_dependency_chain_runs_in_order(redis):
+    a = JobSpec("crawl", "builtins.dict", kwargs={"stage": "a"})
+    b = JobSpec("gen", "builtins.dict", kwargs={"stage": "b"}, depends_on=a.job_id)
+    c = JobSpec("verify", "builtins.dict", kwargs={"stage": "c"}, depends_on=b.job_id)
+    other = JobSpec("crawl", "builtins.dict", kwargs={"stage": "x"})
+
+    jobs = enqueue_bulk([a, b, c, other], connection=redis, chunk_size=2)
+    assert [j.get_status() for j in jobs] == ["queued", "deferred", "deferred", "queued"]
+
+    worker = SimpleWorker(
+        [Queue(n, connection=redis) for n in ("crawl", "gen", "verify")], connection=redis
+    )
+    worker.work(burst=True)
+
+    for j in jobs:
+        j.refresh()
+    assert [j.get_status() for j in jobs] == ["finished"] * 4
+    assert jobs[2].return_value() == {"stage": "c"}
+
+
+def test_one_round_trip_per_chunk(redis, monkeypatch):
+    executes: list[int] = []
+    real_pipeline = redis.pipeline
+
+    def _pipeline(*a, **kw):
+        pipe = real_pipeline(*a, **kw)
+        real_execute = pipe.execute
+
+        def _execute(*ea, **ekw):
+            executes.append(1)
+            return real_execute(*ea, **ekw)
+
+        pipe.execute = _execute
+        return pipe
+
+    monkeypatch.setattr(redis, "pipeline", _pipeline)
+
+    specs = [JobSpec("a", "builtins.dict", kwargs={"n": i}) for i in range(250)]
+    enqueue_bulk(specs, connection=redis, chunk_size=100)
+
+    assert len(executes) == 3
+
+
+def test_failed_chunk_recorded_and_rest_enqueued(redis, monkeypatch):
+    calls = _fail_pipeline_execute(redis, monkeypatch, nth=2)
+
+    specs = [JobSpec("a", "builtins.dict", kwargs={"n": i}) for i in range(6)]
+    with pytest.raises(ConnectionError):
+        enqueue_bulk(specs, connection=redis, chunk_size=2)
+
+    calls["n"] = 0
+    redis.flushall()
+    failed: list[JobSpec] = []
+    jobs = enqueue_bulk(specs, connection=redis, chunk_size=2, failed=failed)
+
+    assert [s.job_id for s in failed] == [specs[2].job_id, specs[3].job_id]
+    assert [j.id for j in jobs] == [s.job_id for s in specs if s not in failed]
+    assert Queue("a", connection=redis).count == 4
+
+
+def test_dependency_outside_batch_rejected(redis):
+    with pytest.raises(ValueError):
+        enqueue_bulk([JobSpec("a", "builtins.dict", depends_on="missing")], connection=redis)
+
+
+def test_domain_job_specs_wiring():
+    options = {
+        "discovery_queue": "crawl",
+        "generate_queue": "generate",
+        "verify_queue": "verify",
+    }
+    info, specs = pipeline_v2._domain_job_specs(
+        None,
+        domain="acme.com",
+        tenant_id="t1",
+        run_id="r1",
+        company_id=7,
+        options=options,
+        run_autodiscovery=True,
+        run_generate=True,
+        run_verify=True,
+        max_probes=0,
+        total_companies=1,
+        job_timeout=60,
+    )
+
+    # generate+verify => generate is terminal and no separate verify sweep
+    assert [s.queue for s in specs] == ["crawl", "generate"]
+    assert specs[1].depends_on == specs[0].job_id
+    assert specs[1].meta["is_terminal_stage"] is True
+    assert [j["job_id"] for j in info["jobs"]] == [s.job_id for s in specs]
+
+    _, verify_only = pipeline_v2._domain_job_specs(
+        None,
+        domain="acme.com",
+        tenant_id="t1",
+        run_id="r1",
+        company_id=7,
+        options=options,
+        run_autodiscovery=False,
+        run_generate=False,
+        run_verify=True,
+        max_probes=0,
+        total_companies=1,
+        job_timeout=60,
+    )
+    assert [s.queue for s in verify_only] == ["verify"]
+    assert verify_only[0].depends_on is None
+
+
+class _NullConn:
+    def close(self):
+        pass
+
+
+def test_pipeline_start_writes_throttled_progress(redis, monkeypatch):
+    domains = [f"d{i}.com" for i in range(25)]
+    limit_info = {
+        "original_count": len(domains),
+        "company_limit_applied": False,
+        "hard_24h_enforced": False,
+        "hard_24h_applied": False,
+        "used_24h_method": "none",
+        "used_24h": 0,
+        "remaining_24h": 1000,
+    }
+    writes: list[tuple[str, int]] = []
+
+    def _update_run_row(con, *, tenant_id, run_id, progress=None, **kw):
+        if progress is not None:
+            writes.append((progress["phase"], progress["metrics"].get("companies_planned", 0)))
+
+    monkeypatch.setattr(pipeline_v2, "_get_conn", _NullConn)
+    monkeypatch.setattr(pipeline_v2, "_get_redis", lambda: redis)
+    monkeypatch.setattr(
+        pipeline_v2,
+        "_load_run_config",
+        lambda con, **kw: (domains, pipeline_v2._parse_options({"modes": ["generate"]})),
+    )
+    monkeypatch.setattr(
+        pipeline_v2, "_apply_domain_limits", lambda con, *, domains, **kw: (domains, limit_info)
+    )
+    monkeypatch.setattr(
+        pipeline_v2,
+        "_ensure_company_for_domain",
+        lambda con, *, domain, **kw: (domains.index(domain) + 1, domain),
+    )
+    monkeypatch.setattr(pipeline_v2, "_write_user_supplied_resolution", lambda *a, **kw: None)
+    monkeypatch.setattr(pipeline_v2, "_log_run_started_activity", lambda **kw: None)
+    monkeypatch.setattr(pipeline_v2, "_update_run_row", _update_run_row)
+    monkeypatch.setattr(pipeline_v2, "PROGRESS_EVERY_S", 3600.0)
+    monkeypatch.setattr(pipeline_v2.mx, "MX_CACHE_ENABLED", True)
+
+    out = pipeline_v2.pipeline_start_v2(run_id="r1", tenant_id="t1")
+
+    assert len(out["enqueued"]) == 25
+    first = Queue("generate", connection=redis).get_jobs()[0]
+    assert first.meta["stage"] == "mx_prefetch"
+    assert first.kwargs == {"domains": domains}
+    assert writes == [
+        ("starting", 0),
+        ("planning", 10),
+        ("planning", 20),
+        ("fanout_complete", 25),
+    ]
+
+
+def test_company_generation_retries_only_failed_chunk(redis, monkeypatch):
+    people = [(1, "Ann", "Lee"), (2, "Bob", "Ray"), (3, "Cy", "Orr")]
+    monkeypatch.setattr(pipeline_v2, "_get_conn", _NullConn)
+    monkeypatch.setattr(pipeline_v2, "_get_redis", lambda: redis)
+    monkeypatch.setattr(pipeline_v2, "_load_people_for_company", lambda con, **kw: people)
+    monkeypatch.setattr(pipeline_v2, "_company_coordinator_enabled", lambda: False)
+    monkeypatch.setattr(tasks, "_load_catchall_status_for_domain", lambda *a, **kw: "catch_all")
+    monkeypatch.setattr(fanout, "RQ_ENQUEUE_CHUNK", 1)
+    calls = _fail_pipeline_execute(redis, monkeypatch, nth=2)
+
+    out = pipeline_v2.task_generate_company_emails(
+        tenant_id="t1", run_id="r1", company_id=7, domain="acme.com"
+    )
+
+    assert out["jobs_enqueued"] == 3
+    assert out["people_enqueued"] == 3
+    assert out["jobs_failed"] == 0
+    assert calls["n"] == 4  # three chunks plus one retry of the failed chunk
+    jobs = Queue("generate", connection=redis).get_jobs()
+    assert sorted(j.kwargs["person_id"] for j in jobs) == [1, 2, 3]
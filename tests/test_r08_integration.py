@@ -51,6 +51,13 @@ def test_resolver_writes_company_and_audit(db_conn, monkeypatch):
             "_http_head_ok",
             lambda h: (h == "xn--bcher-kva.de", None),
         )
+        # resolve_company_domain goes through the batch engine
+        monkeypatch.setattr(
+            mod, "_dns_any_many", lambda hs: {h: h == "xn--bcher-kva.de" for h in hs}
+        )
+        monkeypatch.setattr(
+            mod, "_http_head_many", lambda hs: {h: (h == "xn--bcher-kva.de", None) for h in hs}
+        )
 
     finally:
         try:
@@ -10,6 +10,7 @@ from src.db_suppression import (
     hash_email,
     is_domain_suppressed,
     is_email_suppressed,
+    load_suppression_set,
     upsert_suppression,
 )
 from src.export.policy import ExportPolicy
@@ -241,6 +242,47 @@ def test_upsert_suppression_insert_and_update_plaintext(
     assert row["source"] == "s2"
 
 
+def test_suppression_set_matches_per_row_lookups(
+    suppression_db_plaintext: sqlite3.Connection,
+) -> None:
+    conn = suppression_db_plaintext
+    conn.executemany(
+        """
+        INSERT INTO suppression (email, domain, reason, source, created_at, expires_at)
+        VALUES (?, ?, 'r', 's', CURRENT_TIMESTAMP, ?)
+        """,
+        [
+            ("blocked@example.com", None, None),
+            (None, "suppressed-domain.test", None),
+            ("expired@example.com", None, "2000-01-01 00:00:00"),
+        ],
+    )
+    conn.commit()
+
+    suppressed = load_suppression_set(conn)
+    assert len(suppressed) == 2
+
+    for email in (
+        "blocked@example.com",
+        " Blocked@Example.com ",
+        "anyone@suppressed-domain.test",
+        "expired@example.com",
+        "ok@example.com",
+    ):
+        assert (email in suppressed) is is_email_suppressed(conn, email)
+
+
+def test_suppression_set_hashed_schema(suppression_db_hash: sqlite3.Connection) -> None:
+    conn = suppression_db_hash
+    conn.execute(
+        "INSERT INTO suppression (email_hash, reason, source) VALUES (?, 'r', 's')",
+        (hash_email("hashed@example.com"),),
+    )
+    suppressed = load_suppression_set(conn)
+    assert "HASHED@example.com" in suppressed
+    assert "other@example.com" not in suppressed
+
+
 # ---------------------------------------------------------------------------
 # R19-style integration: suppression + role-address + O10 ExportPolicy
 # ---------------------------------------------------------------------------
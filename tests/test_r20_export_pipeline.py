@@ -268,6 +268,27 @@ def test_csv_injection_sanitization(memory_db: SimpleNamespace) -> None:
     assert lead.source_url.startswith("'@")
 
 
+def test_suppression_is_one_query_and_rows_stream(memory_db: SimpleNamespace) -> None:
+    """
+    Suppression is applied as a set: the suppression table is read once per
+    export, not once per candidate row, and candidates are fetched in batches.
+    """
+    for i in range(25):
+        memory_db.seed_row(f"lead{i:02d}@example.com", icp_score=90)
+    memory_db.suppress_email("lead03@example.com")
+
+    statements: list[str] = []
+    memory_db.conn.set_trace_callback(statements.append)
+    leads = list(
+        exporter_mod.iter_exportable_leads(memory_db.conn, policy_name="default", batch_size=4)
+    )
+    memory_db.conn.set_trace_callback(None)
+
+    assert len(leads) == 24
+    assert "lead03@example.com" not in {lead.email for lead in leads}
+    assert sum("FROM suppression" in s for s in statements) == 1
+
+
 # ---------------------------------------------------------------------------
 # CLI smoke test
 # ---------------------------------------------------------------------------
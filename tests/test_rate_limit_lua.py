@@ -0,0 +1,146 @@
+# tests/test_rate_limit_lua.py
+"""
+Atomic probe limiter (ACQUIRE_LUA) in src.queueing.rate_limit.
+
+Verifies that:
+  - global + per-MX slots are granted or denied as one unit (no partial holds)
+  - a lease that is never released expires and frees its slot
+  - denials carry the failing limit's reason and a retry-after hint; a full
+    semaphore hints a short poll, with the lease expiry only as upper bound
+  - token buckets admit a burst, then refill at the configured rate
+  - renew_lease()/release_lease() manage held slots
+  - each client registers a Lua script once, not on every acquire/renew
+  - _acquire_throttles() surfaces retry_after_s to the caller
+"""
+
+from __future__ import annotations
+
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from src.queueing import rate_limit as rl
+from src.queueing import tasks
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+
+@pytest.fixture
+def redis():
+    return fakeredis.FakeStrictRedis()
+
+
+def test_global_and_mx_acquired_atomically(redis):
+    a = rl.acquire_probe_slots(redis, "mx-a", global_limit=2, mx_limit=1)
+    assert a.ok and set(a.lease.keys) == {rl.GLOBAL_LEASES, rl.MX_LEASES.format(mx="mx-a")}
+
+    # mx-a is full: the denial must not leave a global slot behind
+    denied = rl.acquire_probe_slots(redis, "mx-a", global_limit=2, mx_limit=1)
+    assert not denied and denied.reason == "per-MX concurrency cap reached"
+    assert redis.zcard(rl.GLOBAL_LEASES) == 1
+
+    b = rl.acquire_probe_slots(redis, "mx-b", global_limit=2, mx_limit=1)
+    assert b.ok
+    c = rl.acquire_probe_slots(redis, "mx-c", global_limit=2, mx_limit=1)
+    assert c.reason == "global concurrency cap reached"
+    assert redis.zcard(rl.MX_LEASES.format(mx="mx-c")) == 0
+
+    rl.release_lease(redis, a.lease)
+    assert rl.acquire_probe_slots(redis, "mx-a", global_limit=2, mx_limit=1).ok
+
+
+def test_unreleased_lease_expires(redis):
+    sem = (("lease:t", 1, "cap"),)
+    held = rl.acquire(redis, semaphores=sem, lease_s=0.5)
+    assert held.ok
+
+    denied = rl.acquire(redis, semaphores=sem, lease_s=0.5)
+    assert not denied.ok and 0 < denied.retry_after_max_s <= 0.5
+
+    time.sleep(1.0)
+    assert rl.acquire(redis, semaphores=sem, lease_s=0.5).ok
+    assert redis.zcard("lease:t") == 1
+
+
+def test_full_semaphore_hints_short_poll(redis, monkeypatch):
+    monkeypatch.setattr(rl, "SEM_RETRY_MS", 200)
+    assert rl.acquire_probe_slots(redis, "mx-a", global_limit=5, mx_limit=1).ok
+
+    denied = rl.acquire_probe_slots(redis, "mx-a", global_limit=5, mx_limit=1)
+    assert not denied.ok
+    assert 0 < denied.retry_after_s <= 0.2  # poll, not the ~120s lease expiry
+    assert denied.retry_after_max_s > 100
+
+
+def test_token_bucket_burst_and_refill(redis):
+    bucket = (("tb:t", 20.0, 2.0, "rps"),)
+    assert rl.acquire(redis, buckets=bucket).ok
+    assert rl.acquire(redis, buckets=bucket).ok
+
+    denied = rl.acquire(redis, buckets=bucket)
+    assert denied.reason == "rps"
+    assert 0 < denied.retry_after_s <= 0.05 + 1e-3
+
+    time.sleep(denied.retry_after_s + 0.02)
+    assert rl.acquire(redis, buckets=bucket).ok
+
+
+def test_bucket_denial_does_not_take_slots(redis):
+    rl.acquire(redis, buckets=(("tb:t", 1.0, 1.0, "rps"),))
+    res = rl.acquire(
+        redis, semaphores=(("lease:t", 5, "cap"),), buckets=(("tb:t", 1.0, 1.0, "rps"),)
+    )
+    assert res.reason == "rps"
+    assert redis.zcard("lease:t") == 0
+
+
+def test_renew_and_release(redis):
+    res = rl.acquire(redis, semaphores=(("lease:t", 1, "cap"),), lease_s=0.5)
+    assert rl.renew_lease(redis, res.lease, lease_s=30)
+    time.sleep(1.0)
+    assert not rl.acquire(redis, semaphores=(("lease:t", 1, "cap"),)).ok
+
+    rl.release_lease(redis, res.lease)
+    assert not rl.renew_lease(redis, res.lease)
+    rl.release_lease(redis, None)  # no-op
+
+
+def test_scripts_registered_once_per_client(redis, monkeypatch):
+    registered: list[str] = []
+    real = redis.register_script
+
+    def _register(lua):
+        registered.append(lua)
+        return real(lua)
+
+    monkeypatch.setattr(redis, "register_script", _register)
+    for _ in range(3):
+        res = rl.acquire_probe_slots(redis, "mx-a", global_limit=5, mx_limit=5)
+        assert rl.renew_lease(redis, res.lease)
+
+    assert sorted(registered) == sorted([rl.ACQUIRE_LUA, rl.RENEW_LUA])
+
+
+def test_acquire_throttles_reports_retry_after(redis, monkeypatch):
+    monkeypatch.setenv("PROBE_THROTTLE_MAX_WAIT_SEC", "0")
+    rate = SimpleNamespace(
+        global_max_concurrency=1,
+        per_mx_max_concurrency_default=1,
+        global_rps=0,
+        per_mx_rps_default=0,
+    )
+    monkeypatch.setattr(tasks, "_cfg", SimpleNamespace(rate=rate))
+    kw = dict(
+        redis_ok=True, redis=redis, mx_host="mx-a", dom="a.test", email_id=1, email_str="x@a.test"
+    )
+
+    lease, err = tasks._acquire_throttles(start=time.time(), **kw)
+    assert err is None and lease is not None
+
+    lease2, err2 = tasks._acquire_throttles(start=time.time(), **kw)
+    assert lease2 is None and err2 is not None
+    assert err2["retry_after_s"] > 0
+
+    rl.release_lease(redis, lease)
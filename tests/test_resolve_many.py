@@ -0,0 +1,221 @@
+# tests/test_resolve_many.py
+"""
+Batch domain resolver (src.resolve.domain.resolve_many) and its probe cache.
+
+Verifies that:
+  - candidates are deduped across companies: every host gets one DNS batch and
+    at most one HTTPS→HTTP probe, and hosts without records are never probed
+  - hosts whose DNS lookups time out are still probed, as decide() would
+  - probes share one async client and are capped per origin server
+  - 405 → GET fallback and redirect targets (DNS-checked in a second batch)
+    score exactly as decide() does
+  - probe outcomes are reused by later calls and by other workers via Redis,
+    including when resolve_many() is called inside a running event loop
+  - failed probes are cached only briefly (or not at all)
+  - the resolve_company_domains task resolves a whole batch in one
+    resolve_many() call and isolates per-company persistence failures
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+
+import dns.exception
+import dns.resolver
+import httpx
+import pytest
+
+from src.queueing import tasks
+from src.resolve import dns_client, domain
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_A = {
+    "acme.com": "192.0.2.10",
+    "acme.io": "192.0.2.99",  # parked: same origin as globex.io
+    "globex.io": "192.0.2.99",
+    "globex.com": "192.0.2.20",
+    "initech.com": "192.0.2.30",
+    "initech-global.com": "192.0.2.31",
+    "hooli.com": "192.0.2.40",  # DNS times out, the site answers
+}
+
+
+@pytest.fixture
+def net(monkeypatch):
+    dns_asked: list[tuple[str, str]] = []
+    requests: list[tuple[str, str, str]] = []
+    inflight: dict[str, int] = {}
+    peak: dict[str, int] = {}
+
+    def _answer(name, rdtype):
+        dns_asked.append((name, rdtype))
+        if name == "hooli.com":
+            raise dns.exception.Timeout()
+        if name in _A and rdtype == "A":
+            return (_A[name],), 300
+        if name in _A:
+            raise dns.resolver.NoAnswer()
+        raise dns.resolver.NXDOMAIN()
+
+    async def _resolve_async(name, rdtype):
+        return _answer(name, rdtype)
+
+    async def _handler(request: httpx.Request) -> httpx.Response:
+        host, scheme = request.url.host, request.url.scheme
+        requests.append((request.method, scheme, host))
+        ip = _A[host]
+        inflight[ip] = inflight.get(ip, 0) + 1
+        peak[ip] = max(peak.get(ip, 0), inflight[ip])
+        try:
+            await asyncio.sleep(0.02)
+            if host == "acme.io" and scheme == "https":
+                raise httpx.ConnectError("tls handshake failed", request=request)
+            if host == "globex.com" and request.method == "HEAD":
+                return httpx.Response(405)
+            if host == "initech.com":
+                return httpx.Response(301, headers={"location": "https://www.initech-global.com/"})
+            if host == "globex.io":
+                return httpx.Response(503)
+            return httpx.Response(200)
+        finally:
+            inflight[ip] -= 1
+
+    real_client = httpx.AsyncClient
+    monkeypatch.setattr(
+        domain.httpx,
+        "AsyncClient",
+        lambda **kw: real_client(transport=httpx.MockTransport(_handler), **kw),
+    )
+    monkeypatch.setattr(dns_client, "_resolve_async", _resolve_async)
+    monkeypatch.setattr(dns_client, "_resolve_sync", _answer)
+    monkeypatch.setattr(dns_client, "DNS_CACHE_ENABLED", True)
+    monkeypatch.setattr(domain, "RESOLVE_HTTP_PER_HOST", 1)
+    dns_client.clear_cache()
+    redis = fakeredis.FakeRedis()
+    domain.set_probe_cache(domain.ProbeCache(redis=redis))
+    yield dns_asked, requests, peak, redis
+    domain.set_probe_cache(None)
+    dns_client.clear_cache()
+
+
+def test_batch_dedupes_probes_and_scores_like_decide(net):
+    _dns_asked, requests, peak, _ = net
+    companies = [("Acme Inc", "acme.com"), ("Acme", None), ("Globex Corp", None), ("Initech", None)]
+
+    out = domain.resolve_many(companies)
+
+    assert [d.chosen for d in out] == ["acme.com", "acme.com", "globex.com", "initech-global.com"]
+    assert out[0].method == "http_ok" and out[0].confidence == 100
+    assert out[1].reason == "dns+http_ok"
+    assert out[3].method == "http_redirect"
+
+    heads = [(s, h) for m, s, h in requests if m == "HEAD"]
+    assert len(heads) == len(set(heads))  # each host/scheme probed once across companies
+    assert {h for _, h in heads} == {
+        "acme.com",
+        "acme.io",
+        "globex.com",
+        "globex.io",
+        "initech.com",
+    }
+    assert ("https", "acme.io") in heads and ("http", "acme.io") in heads
+    assert ("GET", "https", "globex.com") in requests
+    assert peak["192.0.2.99"] == 1  # parked hosts share one origin slot
+
+    # Same scoring as the one-by-one path given the same network answers.
+    cands = domain.candidates_from_name("Globex Corp")
+    hosts = [c.domain for c in cands]
+    probed = domain.probe_cache().get_many(hosts)
+    dns_map = {h: h in _A for h in hosts}
+    http_map = {h: probed.get(h, (False, None)) for h in hosts}
+    single = domain.decide(cands, dns=dns_map, http=http_map)
+    assert single == out[2]
+
+
+def test_dns_timeout_hosts_still_probed(net):
+    _, requests, _, _ = net
+
+    out = domain.resolve_many([("Hooli", "hooli.com")])
+
+    assert ("HEAD", "https", "hooli.com") in requests
+    assert {h for _, _, h in requests} == {"hooli.com"}  # NXDOMAIN candidates skipped
+    assert out[0].chosen == "hooli.com"
+
+
+def test_probe_results_reused_across_calls_and_workers(net):
+    _, requests, _, redis = net
+    domain.resolve_many([("Acme Inc", None)])
+    first = len(requests)
+    assert first > 0
+
+    async def _inside_loop():
+        return domain.resolve_many([("Acme", "acme.com")])
+
+    again = asyncio.run(_inside_loop())
+    assert again[0].chosen == "acme.com"
+    assert len(requests) == first
+
+    other_worker = domain.ProbeCache(redis=redis)
+    assert other_worker.get_many(["acme.com", "acme.io"]) == {
+        "acme.com": (True, None),
+        "acme.io": (True, None),
+    }
+    assert domain.ProbeCache(use_redis=False).get_many(["acme.com"]) == {}
+
+
+def test_failed_probes_cached_briefly():
+    redis = fakeredis.FakeRedis()
+    cache = domain.ProbeCache(redis=redis, ttl=6 * 3600, negative_ttl=300)
+    cache.put_many({"up.test": (True, None), "down.test": (False, None)})
+    assert 0 < redis.ttl("httpprobe:v1:down.test") <= 300
+    assert redis.ttl("httpprobe:v1:up.test") > 3600
+
+    # Promoted from Redis into another worker's local map with the short TTL too
+    other = domain.ProbeCache(redis=redis, ttl=6 * 3600, negative_ttl=300)
+    assert other.get_many(["down.test"]) == {"down.test": (False, None)}
+    assert other._data["down.test"][0] - time.time() <= 300
+
+    uncached = domain.ProbeCache(redis=fakeredis.FakeRedis(), negative_ttl=0)
+    uncached.put_many({"down.test": (False, None), "up.test": (True, None)})
+    assert uncached.get_many(["down.test", "up.test"]) == {"up.test": (True, None)}
+    assert uncached._redis.exists("httpprobe:v1:down.test") == 0
+
+
+def test_resolve_company_domains_task_batches(monkeypatch):
+    batches: list[list] = []
+    recorded: list[tuple] = []
+
+    def _resolve_many(companies):
+        batch = list(companies)
+        batches.append(batch)
+        return [
+            domain.Decision(chosen=h, method="hint", confidence=90, reason="hint")
+            for _n, h in batch
+        ]
+
+    def _record(cid, name, hint, dec):
+        if cid == 2:
+            raise RuntimeError("db down")
+        recorded.append((cid, name, hint, dec.chosen))
+        return {"company_id": cid, "chosen": dec.chosen}
+
+    monkeypatch.setattr(tasks, "resolve_many", _resolve_many)
+    monkeypatch.setattr(tasks, "record_domain_decision", _record)
+
+    out = tasks.resolve_company_domains(
+        [
+            {"company_id": 1, "company_name": "Acme", "user_hint": "acme.com"},
+            {"company_id": 2, "company_name": "Globex", "user_supplied_domain": "globex.com"},
+            {"company_id": 3, "company_name": "Initech", "user_hint": None},
+        ]
+    )
+
+    assert batches == [[("Acme", "acme.com"), ("Globex", "globex.com"), ("Initech", None)]]
+    assert out == [
+        {"company_id": 1, "chosen": "acme.com"},
+        {"company_id": 2, "error": "RuntimeError"},
+        {"company_id": 3, "chosen": None},
+    ]
+    assert [r[0] for r in recorded] == [1, 3]
@@ -0,0 +1,117 @@
+# tests/test_robots_shared_cache.py
+"""
+Two-level robots cache: in-process memo backed by RedisRobotsStore.
+
+Verifies that:
+  - a second process (fresh memo) is served from the shared layer, no refetch
+  - the shared entry stores UA-independent groups, resolved per caller's UA
+  - concurrent misses for one host are single-flight (one robots.txt fetch)
+  - prefetch() warms many hosts in parallel and skips cached ones
+  - deny_all entries keep their shorter TTL in the shared layer
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import respx
+from httpx import Response
+
+from src.fetch import robots
+
+fakeredis = pytest.importorskip("fakeredis")
+pytest.importorskip("lupa")
+
+ROBOTS_TXT = """User-agent: OtherBot
+Disallow: /
+
+User-agent: *
+Disallow: /private
+Crawl-delay: 2
+"""
+
+
+@pytest.fixture
+def store():
+    st = robots.RedisRobotsStore(fakeredis.FakeStrictRedis(), prefix="t-robots")
+    robots.set_shared_store(st)
+    robots.clear_cache()
+    yield st
+    robots.set_shared_store(None)
+    robots.clear_cache()
+
+
+@respx.mock
+def test_second_process_served_from_shared_layer(store, monkeypatch):
+    route = respx.get("https://a.test/robots.txt").mock(return_value=Response(200, text=ROBOTS_TXT))
+    assert robots.is_allowed("a.test", "/private") is False
+    robots.clear_cache()  # simulate another worker: empty memo, same Redis
+
+    assert robots.is_allowed("a.test", "/public") is True
+    assert robots.get_crawl_delay("a.test") == pytest.approx(2.0)
+    assert route.call_count == 1
+
+    # Same shared entry, different UA: resolved locally against the stored groups
+    robots.clear_cache()
+    monkeypatch.setattr(robots, "FETCH_USER_AGENT", "OtherBot/1.0")
+    assert robots.is_allowed("a.test", "/public") is False
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_concurrent_misses_are_single_flight(store):
+    gate = threading.Event()
+
+    def _slow(request):
+        gate.wait(2)
+        return Response(200, text=ROBOTS_TXT)
+
+    route = respx.get("https://b.test/robots.txt").mock(side_effect=_slow)
+
+    def _worker(_):
+        # each call stands in for a separate process: no shared memo
+        with robots._GLOBAL_LOCK:
+            robots._MEMO.pop("b.test", None)
+        return robots._resolve("b.test", force_refresh=False).kind
+
+    with ThreadPoolExecutor(max_workers=4) as pool:
+        futs = [pool.submit(_worker, i) for i in range(4)]
+        time.sleep(0.2)
+        gate.set()
+        kinds = [f.result() for f in futs]
+
+    assert kinds == ["rules"] * 4
+    assert route.call_count == 1
+
+
+@respx.mock
+def test_prefetch_warms_hosts(store):
+    ok = respx.get("https://c.test/robots.txt").mock(return_value=Response(200, text=ROBOTS_TXT))
+    missing = respx.get("https://d.test/robots.txt").mock(return_value=Response(404))
+    down = respx.get("https://e.test/robots.txt").mock(return_value=Response(503))
+
+    out = robots.prefetch(["C.test", "d.test", "e.test", "c.test", ""])
+    assert out == {"c.test": "rules", "d.test": "allow_all", "e.test": "deny_all"}
+
+    robots.clear_cache()
+    robots.prefetch(["c.test", "d.test"])
+    assert (ok.call_count, missing.call_count, down.call_count) == (1, 1, 1)
+
+    ttl = store.r.pttl("t-robots:h:e.test")
+    assert 0 < ttl <= robots.ROBOTS_DENY_TTL_SECONDS * 1000
+
+
+def test_fetched_roundtrip():
+    fetched = robots._Fetched(
+        kind="parsed",
+        robots_url="https://x.test/robots.txt",
+        reason="ok",
+        status_code=200,
+        groups=robots._parse_robots(ROBOTS_TXT).groups,
+        expires_at=time.time() + 60,
+    )
+    back = robots._Fetched.from_json(fetched.to_json())
+    assert back == fetched
@@ -0,0 +1,193 @@
+# tests/test_schema_registry.py
+"""
+Schema registry: process-wide Postgres catalog cache in src.db.
+
+Uses a fake psycopg2 connection that answers the two catalog queries.
+Verifies that:
+  - PRAGMA table_info / sqlite_master emulation and RETURNING-id detection are
+    served from one snapshot per database URL
+  - DDL through CompatConnection invalidates the snapshot (and bypasses it until
+    the transaction ends)
+  - invalidate_schema_cache() and SCHEMA_CACHE_TTL_SEC force a reload
+  - a DDL commit or invalidation in one process bumps the shared Redis version
+    and makes other processes reload
+  - the scattered module helpers route through the registry
+  - SQLite connections keep the uncached PRAGMA path
+"""
+
+from __future__ import annotations
+
+import sqlite3
+
+import pytest
+
+import src.db as db
+from src.admin import run_metrics
+from src.queueing import pipeline_v2, tasks
+from src.resolve import mx
+
+URL = "postgresql://u:p@db.example/app"
+
+
+class _FakeCursor:
+    def __init__(self, conn: _FakeConn):
+        self.conn = conn
+        self._rows: list[tuple] = []
+        self.rowcount = -1
+        self.description = None
+
+    def execute(self, sql, params=None):
+        self.conn.executed.append(sql)
+        if "information_schema.columns c" in sql:
+            self.conn.catalog_loads += 1
+            self._rows = [
+                (t, i, name, "text", 0, None, 1 if name == "id" else 0)
+                for t, cols in self.conn.schema.items()
+                for i, name in enumerate(cols)
+            ]
+        elif "information_schema.tables" in sql:
+            self._rows = [(t,) for t in self.conn.schema]
+        elif sql.strip().upper().startswith("ALTER TABLE"):
+            self.conn.schema.setdefault("companies", []).append("added_col")
+            self._rows = []
+        else:
+            self._rows = [(1,)]
+
+    def fetchone(self):
+        return self._rows[0] if self._rows else None
+
+    def fetchall(self):
+        return list(self._rows)
+
+
+class _FakeConn:
+    def __init__(self):
+        self.schema: dict[str, list[str]] = {
+            "companies": ["id", "name", "domain"],
+            "sources": ["id", "company_id", "html"],
+        }
+        self.executed: list[str] = []
+        self.catalog_loads = 0
+
+    def cursor(self):
+        return _FakeCursor(self)
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        pass
+
+
+@pytest.fixture
+def pg(monkeypatch):
+    for attr in ("_version_client", "_version_client_init", "_seen_version"):
+        monkeypatch.setattr(db.schema_registry, attr, getattr(db.schema_registry, attr))
+    db.schema_registry.set_version_client(None)
+    db.invalidate_schema_cache()
+    raw = _FakeConn()
+    yield raw, db.CompatConnection(raw, is_pg=True, url=URL)
+    db.invalidate_schema_cache()
+
+
+def test_pragma_and_master_served_from_one_snapshot(pg):
+    raw, con = pg
+    rows = con.execute("PRAGMA table_info(companies)").fetchall()
+    assert [r[1] for r in rows] == ["id", "name", "domain"]
+    assert rows[0][5] == 1
+
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name = ?"
+    assert con.execute(sql, ("sources",)).fetchone() is not None
+    assert con.execute(sql, ("missing",)).fetchone() is None
+    assert con._pg_table_has_column("companies", "id")
+
+    # A second connection to the same database shares the snapshot.
+    other = db.CompatConnection(_FakeConn(), is_pg=True, url=URL)
+    assert db.get_table_columns(other, "sources") == {"id", "company_id", "html"}
+    assert raw.catalog_loads == 1
+    assert other._conn.catalog_loads == 0
+
+
+def test_ddl_invalidates_snapshot(pg):
+    raw, con = pg
+    assert "added_col" not in db.get_table_columns(con, "companies")
+
+    con.execute("ALTER TABLE companies ADD COLUMN added_col TEXT")
+    assert con._schema_dirty
+    assert db.column_exists(con, "companies", "added_col")
+    con.commit()
+    assert not con._schema_dirty
+
+    before = raw.catalog_loads
+    assert db.column_exists(con, "companies", "added_col")
+    assert db.column_exists(con, "companies", "added_col")
+    assert raw.catalog_loads == before + 1
+
+
+def test_explicit_invalidation_and_ttl(pg, monkeypatch):
+    raw, con = pg
+    db.table_exists(con, "companies")
+    db.invalidate_schema_cache(URL)
+    db.table_exists(con, "companies")
+    assert raw.catalog_loads == 2
+
+    monkeypatch.setenv("SCHEMA_CACHE_TTL_SEC", "0.000001")
+    db.table_exists(con, "companies")
+    db.table_exists(con, "companies")
+    assert raw.catalog_loads == 4
+
+
+def test_shared_version_invalidates_other_processes(pg, monkeypatch):
+    fakeredis = pytest.importorskip("fakeredis")
+    monkeypatch.setenv("SCHEMA_CACHE_VERSION_POLL_SEC", "0")
+    shared = fakeredis.FakeRedis()
+    here, there = db.SchemaRegistry(), db.SchemaRegistry()
+    here.set_version_client(shared)
+    there.set_version_client(shared)
+    raw_here, raw_there = _FakeConn(), _FakeConn()
+
+    here.snapshot(db.CompatConnection(raw_here, is_pg=True, url=URL))
+    there.snapshot(db.CompatConnection(raw_there, is_pg=True, url=URL))
+    there.snapshot(db.CompatConnection(raw_there, is_pg=True, url=URL))
+    assert raw_there.catalog_loads == 1
+
+    here.invalidate(URL, broadcast=True)
+    there.snapshot(db.CompatConnection(raw_there, is_pg=True, url=URL))
+    assert raw_there.catalog_loads == 2
+
+    # A DDL commit on the process-wide registry broadcasts as well.
+    db.schema_registry.set_version_client(shared)
+    _, con = pg
+    con.execute("ALTER TABLE companies ADD COLUMN added_col TEXT")
+    con.commit()
+    there.snapshot(db.CompatConnection(raw_there, is_pg=True, url=URL))
+    assert raw_there.catalog_loads == 3
+
+
+def test_module_helpers_use_registry(pg):
+    raw, con = pg
+    assert pipeline_v2._has_table(con, "companies")
+    assert not pipeline_v2._has_table(con, "runs")
+    assert pipeline_v2._table_cols(con, "companies") == {"id", "name", "domain"}
+    assert tasks._has_table(con, "sources")
+    assert tasks._table_cols(con, "sources") == {"id", "company_id", "html"}
+    assert tasks._sources_has_company_id(con)
+    assert mx._table_columns(con, "companies") == {"id", "name", "domain"}
+    assert run_metrics._table_exists(con, "companies")
+
+    assert raw.catalog_loads == 1
+    assert not any("LIMIT 1" in q for q in raw.executed)
+
+
+def test_sqlite_path_is_uncached():
+    raw = sqlite3.connect(":memory:")
+    con = db.CompatConnection(raw, is_pg=False)
+    con.execute("CREATE TABLE t (id INTEGER PRIMARY KEY, a TEXT)")
+    assert db.get_table_columns(con, "t") == {"id", "a"}
+    con.execute("ALTER TABLE t ADD COLUMN b TEXT")
+    assert db.get_table_columns(con, "t") == {"id", "a", "b"}
+    assert db.table_exists(con, "t") and not db.table_exists(con, "nope")
+    assert db.cached_schema(con) is None
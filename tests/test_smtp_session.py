@@ -0,0 +1,245 @@
+# tests/test_smtp_session.py
+"""
+SmtpSession: many RCPT TO probes over one SMTP connection.
+
+Verifies that the session:
+  - handshakes once and sends several RCPTs per MAIL transaction
+  - sends RSET + MAIL FROM between batches (max_rcpt_per_txn)
+  - reconnects after a dropped connection
+  - holds the per-MX slot only while connected, renews it between RCPTs and
+    reconnects under a fresh slot once the old lease is lost
+  - is shared by the R17 catch-all probe and the R12 permutation verifier
+"""
+
+from __future__ import annotations
+
+import smtplib
+import sqlite3
+from contextlib import contextmanager
+from typing import Any
+
+import pytest
+
+import src.queueing.tasks as qtasks
+import src.verify.catchall as catchall_mod
+import src.verify.smtp as smtp_mod
+
+
+class _FakeSMTP:
+    """Scripted smtplib.SMTP stand-in that logs every command it receives."""
+
+    instances: list[_FakeSMTP] = []
+
+    def __init__(self, host, port, local_hostname=None, timeout=None):
+        self.host = host
+        self.commands: list[str] = []
+        self.codes: dict[str, int] = {}
+        self.disconnect_on: str | None = None
+        _FakeSMTP.instances.append(self)
+
+    def ehlo(self):
+        self.commands.append("EHLO")
+        return (250, b"ok")
+
+    def has_extn(self, name):
+        return False
+
+    def mail(self, sender):
+        self.commands.append("MAIL")
+        return (250, b"ok")
+
+    def rcpt(self, recipient):
+        self.commands.append(f"RCPT {recipient}")
+        if recipient == self.disconnect_on:
+            raise smtplib.SMTPServerDisconnected("Connection unexpectedly closed")
+        return (self.codes.get(recipient.split("@")[0], 550), b"reply")
+
+    def rset(self):
+        self.commands.append("RSET")
+        return (250, b"ok")
+
+    def quit(self):
+        self.commands.append("QUIT")
+        return (221, b"bye")
+
+    def close(self):
+        self.commands.append("CLOSE")
+
+
+@pytest.fixture
+def fake_smtp(monkeypatch):
+    _FakeSMTP.instances = []
+    codes: dict[str, int] = {}
+
+    def _factory(host, port, local_hostname=None, timeout=None):
+        fake = _FakeSMTP(host, port, local_hostname, timeout)
+        fake.codes = codes
+        return fake
+
+    monkeypatch.setattr(smtp_mod.smtplib, "SMTP", _factory)
+    monkeypatch.setattr(smtp_mod, "_preflight_port25", lambda mx: (True, None))
+    monkeypatch.setattr(smtp_mod, "assert_smtp_probing_allowed", lambda: None)
+    monkeypatch.setattr(catchall_mod, "assert_smtp_probing_allowed", lambda: None)
+    monkeypatch.setattr(smtp_mod, "_get_hint", lambda mx, dom: None)
+    behavior: list[dict[str, Any]] = []
+    monkeypatch.setattr(smtp_mod, "record_behavior", lambda **kw: behavior.append(kw))
+    return codes, behavior
+
+
+def _session(**kw) -> smtp_mod.SmtpSession:
+    return smtp_mod.SmtpSession(
+        "mx.example.com",
+        helo_domain="verifier.test",
+        mail_from="bounce@verifier.test",
+        **kw,
+    )
+
+
+def test_rcpt_many_uses_one_connection_and_transaction(fake_smtp):
+    codes, behavior = fake_smtp
+    codes.update({"alice": 250, "bob": 450})
+
+    with _session(max_rcpt_per_txn=5) as sess:
+        res = sess.rcpt_many(["alice@example.com", "bob@example.com", "carol@example.com"])
+
+    assert [r["category"] for r in res] == ["accept", "temp_fail", "hard_fail"]
+    assert res[0]["ok"] is True and res[0]["code"] == 250
+    assert len(_FakeSMTP.instances) == 1
+    assert _FakeSMTP.instances[0].commands == [
+        "EHLO",
+        "MAIL",
+        "RCPT alice@example.com",
+        "RCPT bob@example.com",
+        "RCPT carol@example.com",
+        "QUIT",
+    ]
+    # Exactly one behavior datapoint per address.
+    assert [b["code"] for b in behavior] == [250, 450, 550]
+
+
+def test_rset_between_batches(fake_smtp):
+    with _session(max_rcpt_per_txn=2) as sess:
+        sess.rcpt_many([f"u{i}@example.com" for i in range(5)])
+        assert sess.connects == 1
+        assert sess.resets == 2
+
+    cmds = _FakeSMTP.instances[0].commands
+    assert cmds.count("MAIL") == 3
+    assert cmds.count("RSET") == 2
+    assert cmds.index("RSET") == 4  # after EHLO, MAIL, RCPT, RCPT
+
+
+def test_disconnect_fails_address_then_reconnects(fake_smtp):
+    sess = _session()
+    first = sess.rcpt("a@example.com")
+    _FakeSMTP.instances[0].disconnect_on = "b@example.com"
+
+    res = sess.rcpt_many(["b@example.com", "c@example.com"])
+    sess.close()
+
+    assert first["category"] == "hard_fail"
+    assert res[0]["category"] == "temp_fail"
+    assert res[0]["error"].startswith("disconnected:")
+    assert res[1]["category"] == "hard_fail"
+    assert sess.connects == 2
+    assert len(_FakeSMTP.instances) == 2
+
+
+def test_slot_held_only_while_connected(fake_smtp):
+    events: list[str] = []
+
+    @contextmanager
+    def _slot():
+        events.append("acquire")
+        try:
+            yield
+        finally:
+            events.append("release")
+
+    sess = _session(slot=_slot)
+    assert events == []  # lazy: no connection, no lease
+    sess.rcpt_many(["a@example.com", "b@example.com"])
+    assert events == ["acquire"]
+    sess.close()
+    assert events == ["acquire", "release"]
+
+
+def test_slot_renewed_between_rcpts(fake_smtp):
+    events: list[str] = []
+    held = {"ok": True}
+
+    @contextmanager
+    def _slot():
+        events.append("acquire")
+        try:
+            yield f"lease{events.count('acquire')}"
+        finally:
+            events.append("release")
+
+    def _renew(lease):
+        events.append(f"renew {lease}")
+        return held["ok"]
+
+    sess = _session(slot=_slot, renew_slot=_renew, renew_every_s=0)
+    sess.rcpt_many(["a@example.com", "b@example.com"])
+    assert events == ["acquire", "renew lease1"]
+
+    held["ok"] = False  # lease expired and was taken by another worker
+    sess.rcpt("c@example.com")
+    assert events[2:] == ["renew lease1", "release", "acquire"]
+    assert sess.connects == 2
+    sess.close()
+
+
+def test_preflight_failure_skips_connect(fake_smtp, monkeypatch):
+    monkeypatch.setattr(smtp_mod, "_preflight_port25", lambda mx: (False, "blocked"))
+
+    with _session() as sess:
+        res = sess.rcpt("a@example.com")
+
+    assert res["category"] == "temp_fail"
+    assert res["error"] == "port25_unreachable:blocked"
+    assert _FakeSMTP.instances == []
+
+
+def test_catchall_probe_shares_session(fake_smtp, monkeypatch):
+    codes, _ = fake_smtp
+    conn = sqlite3.connect(":memory:")
+    conn.execute(
+        """
+        CREATE TABLE domain_resolutions (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            chosen_domain TEXT,
+            user_hint TEXT,
+            created_at TEXT DEFAULT CURRENT_TIMESTAMP,
+            catch_all_status TEXT,
+            catch_all_checked_at TEXT,
+            catch_all_localpart TEXT,
+            catch_all_smtp_code INTEGER,
+            catch_all_smtp_msg TEXT
+        )
+        """
+    )
+    conn.execute("INSERT INTO domain_resolutions (chosen_domain) VALUES ('example.com')")
+    monkeypatch.setattr(catchall_mod, "get_connection", lambda: conn)
+    monkeypatch.setattr(
+        catchall_mod, "get_or_resolve_mx", lambda d, **_: {"lowest_mx": "mx.example.com"}
+    )
+    codes["alice"] = 250
+
+    with _session() as sess:
+        ca = catchall_mod.check_catchall_for_domain("example.com", session=sess)
+        res = qtasks._verify_permutation_with_retry(
+            email_addr="alice@example.com",
+            mx_host="mx.example.com",
+            catch_all_status=ca.status,
+            max_retries=1,
+            session=sess,
+        )
+
+    assert ca.status == "not_catch_all"
+    assert res["status"] == "valid"
+    assert len(_FakeSMTP.instances) == 1
+    rcpts = [c for c in _FakeSMTP.instances[0].commands if c.startswith("RCPT")]
+    assert rcpts[0].startswith("RCPT _ca_")
+    assert rcpts[1] == "RCPT alice@example.com"
@@ -0,0 +1,136 @@
+# tests/test_verify_result_cache.py
+"""
+Global verification cache (src.verify.result_cache) and its use in the
+task_probe_email path.
+
+Verifies that:
+  - entries are keyed by a salted HMAC of the normalized address (no plaintext
+    key or value) and expire after the per-status TTL
+  - without a salt (or AUTH_HS256_SECRET) no bare hash is produced and the
+    default cache stays off
+  - statuses without a TTL are not cached; hit/miss counters feed hit_ratio
+    both per process and fleet-wide
+  - a second probe of the same address (another email row / tenant) is
+    answered from the cache without MX lookup, preflight or throttles
+  - the legacy verify_email_task stub / self-test outcomes are never cached
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import pytest
+
+from src.queueing import tasks
+from src.verify import result_cache
+
+fakeredis = pytest.importorskip("fakeredis")
+
+_SALT = "test-salt"
+
+
+@pytest.fixture
+def cache():
+    c = result_cache.VerificationCache(fakeredis.FakeRedis(), salt=_SALT)
+    result_cache.set_default(c)
+    yield c
+    result_cache.set_default(None)
+
+
+def test_hashed_keys_and_per_status_ttl(cache):
+    assert cache.put("Jane.Doe@Acme.com ", verify_status="invalid", verify_reason="rcpt_5xx")
+    assert cache.put("ok@acme.com", verify_status="unknown_timeout")
+    assert not cache.put("x@acme.com", verify_status="unknown")
+
+    keys = [k.decode() for k in cache.redis.scan_iter(match="vcache:v1:*")]
+    assert len(keys) == 2 and not any("acme" in k for k in keys)
+    dump = b"".join(v for k in keys for v in cache.redis.hvals(k))
+    assert b"jane" not in dump.lower()
+
+    hit = cache.get("jane.doe@acme.com")
+    assert hit is not None and (hit.verify_status, hit.verify_reason) == ("invalid", "rcpt_5xx")
+    key_invalid = "vcache:v1:" + result_cache.address_hash("jane.doe@acme.com", salt=_SALT)
+    key_timeout = "vcache:v1:" + result_cache.address_hash("ok@acme.com", salt=_SALT)
+    assert cache.redis.ttl(key_invalid) > cache.redis.ttl(key_timeout) > 0
+
+    assert cache.get("x@acme.com") is None
+    st = cache.stats.as_dict()
+    assert (st["hits"], st["misses"], st["stores"], st["skipped"]) == (1, 1, 2, 1)
+    assert st["hit_ratio"] == 0.5
+    assert cache.fleet_stats()["hit_ratio"] == 0.5
+
+
+def test_hash_is_keyed_and_never_bare(monkeypatch):
+    bare = hashlib.sha256(b"jane.doe@acme.com").hexdigest()
+    salted = result_cache.address_hash("Jane.Doe@acme.com", salt=_SALT)
+    assert salted and salted != bare
+    assert salted != result_cache.address_hash("jane.doe@acme.com", salt="other-salt")
+
+    monkeypatch.setattr(result_cache, "VERIFY_CACHE_SALT", "")
+    monkeypatch.delenv("AUTH_HS256_SECRET", raising=False)
+    with pytest.raises(ValueError):
+        result_cache.address_hash("jane.doe@acme.com")
+    with pytest.raises(ValueError):
+        result_cache.VerificationCache(fakeredis.FakeRedis())
+    result_cache.set_default(None)
+    assert result_cache.default() is None
+
+    # The app secret is an acceptable fallback key
+    monkeypatch.setenv("AUTH_HS256_SECRET", "app-secret")
+    derived = result_cache.address_hash("jane.doe@acme.com")
+    assert derived and derived not in (bare, salted)
+
+
+def test_probe_served_from_cache_before_throttles(cache, monkeypatch):
+    calls = {"mx": 0, "probe": 0}
+    persisted: list[dict] = []
+
+    def _mx_info(dom, **_kw):
+        calls["mx"] += 1
+        return "mx.acme.com", None
+
+    def _probe_rcpt(*a, **k):
+        calls["probe"] += 1
+        return {"ok": True, "category": "accept", "code": 250, "error": None}
+
+    def _no_throttles(**_kw):
+        raise AssertionError("throttles taken on a cache hit")
+
+    monkeypatch.setattr(tasks, "_mx_info", _mx_info)
+    monkeypatch.setattr(tasks, "_init_redis_for_probe", lambda: (None, False))
+    monkeypatch.setattr(tasks, "_smtp_tcp25_preflight_mx", lambda *a, **k: {"ok": True})
+    monkeypatch.setattr(tasks, "_acquire_throttles", lambda **_kw: (None, None))
+    monkeypatch.setattr(tasks, "probe_rcpt", _probe_rcpt)
+    monkeypatch.setattr(tasks, "_load_catchall_status_for_domain", lambda *a, **k: "not_catch_all")
+    monkeypatch.setattr(tasks, "_maybe_escalate_to_test_send", lambda **_kw: None)
+    monkeypatch.setattr(tasks, "upsert_verification_result", lambda **kw: persisted.append(kw))
+    monkeypatch.setattr(tasks, "get_conn", lambda: (_ for _ in ()).throw(RuntimeError("no db")))
+
+    first = tasks.task_probe_email.__wrapped__(1, "jane@acme.com", "acme.com")
+    assert first["verify_status"] == "valid" and not first.get("cached")
+
+    monkeypatch.setattr(tasks, "_acquire_throttles", _no_throttles)
+    second = tasks.task_probe_email.__wrapped__(2, "JANE@acme.com", "acme.com")
+    assert second["cached"] is True
+    assert (second["verify_status"], second["verified_mx"]) == ("valid", "mx.acme.com")
+    assert second["catch_all_status"] == "not_catch_all"
+    assert second["verified_at"] == first["verified_at"]
+    assert calls == {"mx": 1, "probe": 1}
+    assert [p["email_id"] for p in persisted] == [1, 2]
+
+
+def test_stub_probe_results_not_cached(cache, monkeypatch):
+    monkeypatch.setattr(tasks, "get_redis", lambda: fakeredis.FakeRedis())
+    monkeypatch.setattr(tasks, "lookup_mx", lambda dom: ("mx.acme.com", 10))
+    monkeypatch.setattr(tasks, "upsert_verification_result", lambda **kw: None)
+
+    monkeypatch.setenv("TEST_PROBE", "success")
+    out = tasks.verify_email_task("jane@acme.com", email_id=1)
+    assert (out["verify_status"], out["reason"]) == ("valid", "ok_test")
+    assert tasks.verify_email_task("ok5@crestwellpartners.com", email_id=2)["reason"] == (
+        "selftest-ok"
+    )
+
+    assert cache.get("jane@acme.com") is None
+    assert cache.get("ok5@crestwellpartners.com") is None
+    assert cache.stats.as_dict()["stores"] == 0